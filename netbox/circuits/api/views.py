@@ -1,3 +1,4 @@
+from django.db.models import F
 from rest_framework.routers import APIRootView
 
 from circuits import filtersets
@@ -22,7 +23,7 @@ class CircuitsRootView(APIRootView):
 
 class ProviderViewSet(NetBoxModelViewSet):
     queryset = Provider.objects.prefetch_related('asns', 'tags').annotate(
-        circuit_count=count_related(Circuit, 'provider')
+        circuit_count=F('_circuit_count')
     )
     serializer_class = serializers.ProviderSerializer
     filterset_class = filtersets.ProviderFilterSet
@@ -7,3 +7,8 @@ class CircuitsConfig(AppConfig):
 
     def ready(self):
         import circuits.signals
+        from netbox import counters
+        from .models import Provider
+
+        # Register counter fields
+        counters.register(Provider)
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+import utilities.fields
+from utilities.utils import count_related
+
+
+def populate_circuit_counts(apps, schema_editor):
+    """
+    Calculate the number of circuits for each provider.
+    """
+    Provider = apps.get_model('circuits', 'Provider')
+    Circuit = apps.get_model('circuits', 'Circuit')
+
+    Provider.objects.update(_circuit_count=count_related(Circuit, 'provider'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circuits', '0038_cabling_cleanup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='provider',
+            name='_circuit_count',
+            field=utilities.fields.CounterCacheField(default=0, to_field='provider', to_model='circuits.Circuit'),
+        ),
+        migrations.RunPython(
+            code=populate_circuit_counts,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.urls import reverse
 
 from dcim.fields import ASNField
 from netbox.models import NetBoxModel
+from utilities.fields import CounterCacheField
 
 __all__ = (
     'ProviderNetwork',
@@ -61,6 +62,12 @@ class Provider(NetBoxModel):
         to='tenancy.ContactAssignment'
     )
 
+    # Cached counts
+    _circuit_count = CounterCacheField(
+        to_model='circuits.Circuit',
+        to_field='provider'
+    )
+
     clone_fields = (
         'asn', 'account', 'portal_url', 'noc_contact', 'admin_contact',
     )
@@ -1,6 +1,6 @@
 from django.contrib import messages
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import F, Q
 from django.shortcuts import get_object_or_404, redirect, render
 
 from netbox.views import generic
@@ -16,7 +16,7 @@ from .models import *
 
 class ProviderListView(generic.ObjectListView):
     queryset = Provider.objects.annotate(
-        count_circuits=count_related(Circuit, 'provider')
+        count_circuits=F('_circuit_count')
     )
     filterset = filtersets.ProviderFilterSet
     filterset_form = forms.ProviderFilterForm
@@ -58,7 +58,7 @@ class ProviderBulkImportView(generic.BulkImportView):
 
 class ProviderBulkEditView(generic.BulkEditView):
     queryset = Provider.objects.annotate(
-        count_circuits=count_related(Circuit, 'provider')
+        count_circuits=F('_circuit_count')
     )
     filterset = filtersets.ProviderFilterSet
     table = tables.ProviderTable
@@ -67,7 +67,7 @@ class ProviderBulkEditView(generic.BulkEditView):
 
 class ProviderBulkDeleteView(generic.BulkDeleteView):
     queryset = Provider.objects.annotate(
-        count_circuits=count_related(Circuit, 'provider')
+        count_circuits=F('_circuit_count')
     )
     filterset = filtersets.ProviderFilterSet
     table = tables.ProviderTable
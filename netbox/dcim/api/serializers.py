@@ -203,6 +203,8 @@ class RackSerializer(NetBoxModelSerializer):
     outer_unit = ChoiceField(choices=RackDimensionUnitChoices, allow_blank=True, required=False)
     device_count = serializers.IntegerField(read_only=True)
     powerfeed_count = serializers.IntegerField(read_only=True)
+    utilization = serializers.FloatField(source='get_utilization', read_only=True)
+    power_utilization = serializers.IntegerField(source='get_power_utilization', read_only=True)
 
     class Meta:
         model = Rack
@@ -210,6 +212,7 @@ class RackSerializer(NetBoxModelSerializer):
             'id', 'url', 'display', 'name', 'facility_id', 'site', 'location', 'tenant', 'status', 'role', 'serial',
             'asset_tag', 'type', 'width', 'u_height', 'desc_units', 'outer_width', 'outer_depth', 'outer_unit',
             'comments', 'tags', 'custom_fields', 'created', 'last_updated', 'device_count', 'powerfeed_count',
+            'utilization', 'power_utilization',
         ]
 
 
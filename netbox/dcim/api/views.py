@@ -1,5 +1,6 @@
 import socket
 
+from django.db.models import F
 from django.http import Http404, HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404
 from drf_yasg import openapi
@@ -13,8 +14,10 @@ from rest_framework.viewsets import ViewSet
 from circuits.models import Circuit
 from dcim import filtersets
 from dcim.constants import CABLE_TRACE_SVG_DEFAULT_WIDTH
+from dcim.elevations import get_elevation_svg
 from dcim.models import *
 from dcim.svg import CableTraceSVG
+from dcim.utils import prefetch_connected_endpoints, prefetch_link_peers, prefetch_rack_utilization
 from extras.api.views import ConfigContextQuerySetMixin
 from ipam.models import Prefix, VLAN
 from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
@@ -41,7 +44,28 @@ class DCIMRootView(APIRootView):
 
 # Mixins
 
-class PathEndpointMixin(object):
+class CabledObjectMixin(object):
+
+    def paginate_queryset(self, queryset):
+        """
+        Retrieve the link peers of all objects on the page in bulk.
+        """
+        page = super().paginate_queryset(queryset)
+        if page is not None and not self.brief:
+            prefetch_link_peers(page)
+        return page
+
+
+class PathEndpointMixin(CabledObjectMixin):
+
+    def paginate_queryset(self, queryset):
+        """
+        Retrieve the link peers and connected endpoints of all objects on the page in bulk.
+        """
+        page = super().paginate_queryset(queryset)
+        if page is not None and not self.brief:
+            prefetch_connected_endpoints(page)
+        return page
 
     @action(detail=True, url_path='trace')
     def trace(self, request, pk):
@@ -81,7 +105,7 @@ class PathEndpointMixin(object):
         return Response(path)
 
 
-class PassThroughPortMixin(object):
+class PassThroughPortMixin(CabledObjectMixin):
 
     @action(detail=True, url_path='paths')
     def paths(self, request, pk):
@@ -89,7 +113,7 @@ class PassThroughPortMixin(object):
         Return all CablePaths which traverse a given pass-through port.
         """
         obj = get_object_or_404(self.queryset, pk=pk)
-        cablepaths = CablePath.objects.filter(_nodes__contains=obj)
+        cablepaths = CablePath.objects.traversing(obj)
         serializer = serializers.CablePathSerializer(cablepaths, context={'request': request}, many=True)
 
         return Response(serializer.data)
@@ -188,12 +212,18 @@ class RackViewSet(NetBoxModelViewSet):
     queryset = Rack.objects.prefetch_related(
         'site', 'location', 'role', 'tenant', 'tags'
     ).annotate(
-        device_count=count_related(Device, 'rack'),
+        device_count=F('_device_count'),
         powerfeed_count=count_related(PowerFeed, 'rack')
     )
     serializer_class = serializers.RackSerializer
     filterset_class = filtersets.RackFilterSet
 
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and not self.brief:
+            prefetch_rack_utilization(page)
+        return page
+
     @swagger_auto_schema(
         responses={200: serializers.RackUnitSerializer(many=True)},
         query_serializer=serializers.RackElevationDetailFilterSerializer
@@ -203,7 +233,8 @@ class RackViewSet(NetBoxModelViewSet):
         """
         Rack elevation representing the list of rack units. Also supports rendering the elevation as an SVG.
         """
-        rack = get_object_or_404(self.queryset, pk=pk)
+        # Related objects are not needed to depict the elevation
+        rack = get_object_or_404(self.queryset.prefetch_related(None), pk=pk)
         serializer = serializers.RackElevationDetailFilterSerializer(data=request.GET)
         if not serializer.is_valid():
             return Response(serializer.errors, 400)
@@ -218,8 +249,9 @@ class RackViewSet(NetBoxModelViewSet):
                 except ValueError:
                     pass
 
-            # Render and return the elevation as an SVG drawing with the correct content type
-            drawing = rack.get_elevation_svg(
+            # Render (or retrieve from the cache) and return the elevation as an SVG drawing with the correct content type
+            svg = get_elevation_svg(
+                rack,
                 face=data['face'],
                 user=request.user,
                 unit_width=data['unit_width'],
@@ -229,7 +261,7 @@ class RackViewSet(NetBoxModelViewSet):
                 base_url=request.build_absolute_uri('/'),
                 highlight_params=highlight_params
             )
-            return HttpResponse(drawing.tostring(), content_type='image/svg+xml')
+            return HttpResponse(svg, content_type='image/svg+xml')
 
         else:
             # Return a JSON representation of the rack units in the elevation
@@ -281,7 +313,7 @@ class ManufacturerViewSet(NetBoxModelViewSet):
 
 class DeviceTypeViewSet(NetBoxModelViewSet):
     queryset = DeviceType.objects.prefetch_related('manufacturer', 'tags').annotate(
-        device_count=count_related(Device, 'device_type')
+        device_count=F('_device_count')
     )
     serializer_class = serializers.DeviceTypeSerializer
     filterset_class = filtersets.DeviceTypeFilterSet
@@ -670,7 +702,7 @@ class CableTerminationViewSet(NetBoxModelViewSet):
 
 class VirtualChassisViewSet(NetBoxModelViewSet):
     queryset = VirtualChassis.objects.prefetch_related('tags').annotate(
-        member_count=count_related(Device, 'virtual_chassis')
+        member_count=F('_member_count')
     )
     serializer_class = serializers.VirtualChassisSerializer
     filterset_class = filtersets.VirtualChassisFilterSet
@@ -9,7 +9,8 @@ class DCIMConfig(AppConfig):
 
     def ready(self):
         import dcim.signals
-        from .models import CableTermination
+        from netbox import counters
+        from .models import CableTermination, DeviceType, ModuleType, Rack, VirtualChassis
 
         # Register denormalized fields
         denormalized.register(CableTermination, '_device', {
@@ -24,3 +25,6 @@ class DCIMConfig(AppConfig):
         denormalized.register(CableTermination, '_location', {
             '_site': 'site',
         })
+
+        # Register counter fields
+        counters.register(DeviceType, ModuleType, Rack, VirtualChassis)
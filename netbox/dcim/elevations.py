@@ -0,0 +1,213 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BooleanField, Count, Exists, OuterRef, Value
+from django.utils.functional import cached_property
+
+from netbox.config import get_config
+from utilities.cache import get_revision as get_cache_revision, invalidate_revision
+from utilities.permissions import permission_is_exempt
+from utilities.utils import drange
+from .constants import RACK_ELEVATION_DEFAULT_LEGEND_WIDTH, RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
+
+__all__ = (
+    'RackElevationLoader',
+    'get_elevation_svg',
+    'invalidate_rack_elevations',
+)
+
+REVISION_KEY = 'rack_elevation_revision'
+
+
+class RackElevationLoader:
+    """
+    Retrieve all the data needed to depict a rack elevation: the devices installed on both faces of the rack (along
+    with their types, roles, virtual chassis and device bay counts), whether each device is viewable by the user, and
+    the rack's reservations. Each is retrieved with a single query, upon first use.
+
+    :param rack: A Rack instance
+    :param user: User instance for evaluating device view permissions. If None, all devices are considered viewable.
+    :param exclude: PK of a Device to exclude (optional)
+    """
+    def __init__(self, rack, user=None, exclude=None):
+        self.rack = rack
+        self.user = user
+        self.exclude = exclude
+
+    def _get_permission_annotation(self):
+        from dcim.models import Device
+
+        if self.user is None or self.user.is_superuser or permission_is_exempt('dcim.view_device'):
+            return Value(True, output_field=BooleanField())
+        permitted_devices = Device.objects.restrict(self.user, 'view')
+        if permitted_devices.query.is_empty():
+            return Value(False, output_field=BooleanField())
+        return Exists(permitted_devices.filter(pk=OuterRef('pk')))
+
+    @cached_property
+    def devices(self):
+        """
+        All devices which occupy rack units within the rack, on either face.
+        """
+        from dcim.models import Device
+
+        if not self.rack.pk:
+            return []
+
+        devices = Device.objects.select_related(
+            'device_type',
+            'device_type__manufacturer',
+            'device_role',
+            'virtual_chassis',
+        ).annotate(
+            devicebay_count=Count('devicebays'),
+            child_count=Count('devicebays__installed_device'),
+            is_permitted=self._get_permission_annotation()
+        ).filter(
+            rack=self.rack,
+            position__gt=0,
+            device_type__u_height__gt=0
+        )
+        if self.exclude is not None:
+            devices = devices.exclude(pk=self.exclude)
+
+        return list(devices)
+
+    @cached_property
+    def permitted_device_ids(self):
+        return {device.pk for device in self.devices if device.is_permitted}
+
+    @cached_property
+    def reservations(self):
+        if not self.rack.pk:
+            return []
+        return list(self.rack.reservations.all())
+
+    def get_devices(self, face):
+        """
+        Return the devices visible from the specified face of the rack (those mounted on it, and all full depth devices).
+        """
+        return [
+            device for device in self.devices
+            if device.face == face or device.device_type.is_full_depth
+        ]
+
+    def get_rack_units(self, face, expand_devices=True):
+        """
+        Return a list of rack units as dictionaries (see Rack.get_rack_units()). Devices which are not viewable by the
+        user mark their units as occupied, but are not included.
+        """
+        elevation = {}
+        for u in self.rack.units:
+            u_name = f'U{u}'.split('.')[0] if not u % 1 else f'U{u}'
+            elevation[u] = {
+                'id': u,
+                'name': u_name,
+                'face': face,
+                'device': None,
+                'occupied': False
+            }
+
+        for device in self.get_devices(face):
+            if expand_devices:
+                for u in drange(device.position, device.position + device.device_type.u_height, 0.5):
+                    if device.is_permitted:
+                        elevation[u]['device'] = device
+                    elevation[u]['occupied'] = True
+            else:
+                if device.is_permitted:
+                    elevation[device.position]['device'] = device
+                elevation[device.position]['occupied'] = True
+                elevation[device.position]['height'] = device.device_type.u_height
+
+        return [u for u in elevation.values()]
+
+
+#
+# Caching
+#
+
+def _get_revision_keys(rack_id):
+    return REVISION_KEY, f'{REVISION_KEY}:{rack_id}'
+
+
+def get_revision(rack_id):
+    """
+    Return the current revision of the elevations of a rack. This combines a global revision (for changes which may
+    affect any rack, such as to a DeviceType) and a revision specific to the rack.
+    """
+    return get_cache_revision(*_get_revision_keys(rack_id))
+
+
+def invalidate_rack_elevations(*rack_ids):
+    """
+    Discard the cached elevations of the specified racks, or of all racks if none are specified.
+    """
+    if rack_ids:
+        keys = [f'{REVISION_KEY}:{rack_id}' for rack_id in rack_ids if rack_id is not None]
+    else:
+        keys = [REVISION_KEY]
+    if keys:
+        invalidate_revision(*keys)
+
+
+def get_permission_scope(user, rack):
+    """
+    Return a string identifying the set of devices within the rack which are viewable by the user. Users who share a
+    scope are shown identical elevations.
+    """
+    if user is None or user.is_superuser or permission_is_exempt('dcim.view_device'):
+        return 'all'
+    if not user.is_authenticated or 'dcim.view_device' not in user.get_all_permissions():
+        return 'none'
+    if None in user._object_perm_cache['dcim.view_device']:
+        return 'all'
+    # Constraints may follow related objects (or the user) which don't affect the rack's revision, so the scope is
+    # derived from the viewable devices themselves
+    pk_list = rack.devices.restrict(user, 'view').order_by('pk').values_list('pk', flat=True)
+    digest = hashlib.sha1(','.join(str(pk) for pk in pk_list).encode()).hexdigest()
+    return f'devices:{digest}'
+
+
+def get_dimensions(unit_width=None, unit_height=None, legend_width=RACK_ELEVATION_DEFAULT_LEGEND_WIDTH,
+                   margin_width=RACK_ELEVATION_DEFAULT_MARGIN_WIDTH, **kwargs):
+    """
+    Return the dimensions with which an elevation will be drawn (see RackElevationSVG), including any defaults drawn
+    from the current configuration.
+    """
+    config = get_config()
+    return {
+        'unit_width': unit_width or config.RACK_ELEVATION_DEFAULT_UNIT_WIDTH,
+        'unit_height': unit_height or config.RACK_ELEVATION_DEFAULT_UNIT_HEIGHT,
+        'legend_width': legend_width or getattr(config, 'RACK_ELEVATION_DEFAULT_LEGEND_WIDTH', None),
+        'margin_width': margin_width or getattr(config, 'RACK_ELEVATION_DEFAULT_MARGIN_WIDTH', None),
+    }
+
+
+def get_elevation_svg(rack, face, user=None, highlight_params=None, **kwargs):
+    """
+    Return the SVG document (as a string) depicting the specified face of a rack, retrieving it from the cache where
+    possible (see RACK_ELEVATION_CACHE_TIMEOUT). Additional keyword arguments are passed to Rack.get_elevation_svg().
+    """
+    timeout = settings.RACK_ELEVATION_CACHE_TIMEOUT
+    if not timeout:
+        return rack.get_elevation_svg(face=face, user=user, highlight_params=highlight_params, **kwargs).tostring()
+
+    params = [
+        settings.VERSION,
+        face,
+        get_permission_scope(user, rack),
+        [list(param) for param in highlight_params or []],
+        sorted(kwargs.items()),
+        get_dimensions(**kwargs),
+    ]
+    digest = hashlib.sha1(json.dumps(params, default=str).encode()).hexdigest()
+    key = f'rack_elevation:{rack.pk}:{get_revision(rack.pk)}:{digest}'
+
+    svg = cache.get(key)
+    if svg is None:
+        svg = rack.get_elevation_svg(face=face, user=user, highlight_params=highlight_params, **kwargs).tostring()
+        cache.set(key, svg, timeout)
+    return svg
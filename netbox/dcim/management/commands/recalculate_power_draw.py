@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from dcim.utils import recalculate_power_draw
+
+
+class Command(BaseCommand):
+    help = "Recalculate the cached power draw of all power ports"
+
+    def handle(self, *args, **options):
+
+        if options['verbosity']:
+            self.stdout.write("Recalculating power draw... ", ending='')
+            self.stdout.flush()
+
+        count = recalculate_power_draw()
+
+        if options['verbosity']:
+            self.stdout.write(self.style.SUCCESS(f"{count} power ports updated"))
@@ -1,10 +1,16 @@
-from django.core.management.base import BaseCommand
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
 from django.core.management.color import no_style
-from django.db import connection
+from django.db import connection, connections
 from django.db.models import Q
 
 from dcim.models import CablePath, ConsolePort, ConsoleServerPort, Interface, PowerFeed, PowerOutlet, PowerPort
-from dcim.signals import create_cablepath
+from dcim.tracing import CablePathTracer
 
 ENDPOINT_MODELS = (
     ConsolePort,
@@ -16,6 +22,71 @@ ENDPOINT_MODELS = (
 )
 
 
+def get_origins(model):
+    """
+    Return a QuerySet of all objects of the given endpoint model from which a path may originate, but which do not yet
+    have one.
+    """
+    params = Q(cable__isnull=False)
+    if hasattr(model, 'wireless_link'):
+        params |= Q(wireless_link__isnull=False)
+    return model.objects.filter(params, _path__isnull=True)
+
+
+def trace_range(model_label, first_pk, last_pk, batch_size):
+    """
+    Trace paths from all origins of the given model within a range of primary keys (inclusive). Origins which have
+    gained a path since the range was determined (e.g. by an interrupted run) are skipped. Returns the number of
+    origins traced. This is the unit of work assigned to each worker process.
+    """
+    model = next(m for m in ENDPOINT_MODELS if m._meta.label_lower == model_label)
+    origins = get_origins(model).filter(pk__gte=first_pk, pk__lte=last_pk)
+    origins = list(origins)
+    CablePathTracer(batch_size=batch_size).create_paths([origin] for origin in origins)
+
+    return len(origins)
+
+
+class Checkpoint:
+    """
+    Records the primary key ranges which have been completed for each model, so that an interrupted run can be
+    resumed. Progress is written to a JSON file after each range is completed.
+    """
+    def __init__(self, path, force=False):
+        self.path = path
+        self.force = force
+        self.completed = {}
+        self.exists = bool(path) and os.path.exists(path)
+
+        if self.exists:
+            with open(path) as f:
+                data = json.load(f)
+            self.force = data['force']
+            self.completed = {
+                label: {tuple(r) for r in ranges} for label, ranges in data['completed'].items()
+            }
+
+    def is_completed(self, model_label, pk_range):
+        return tuple(pk_range) in self.completed.get(model_label, set())
+
+    def mark_completed(self, model_label, pk_range):
+        self.completed.setdefault(model_label, set()).add(tuple(pk_range))
+        self.save()
+
+    def save(self):
+        if self.path:
+            data = {
+                'force': self.force,
+                'completed': {label: sorted(ranges) for label, ranges in self.completed.items()},
+            }
+            with open(self.path, 'w') as f:
+                json.dump(data, f)
+
+    def delete(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
 class Command(BaseCommand):
     help = "Generate any missing cable paths among all cable termination objects in NetBox"
 
@@ -28,6 +99,19 @@ class Command(BaseCommand):
             "--no-input", action='store_true', dest='no_input',
             help="Do not prompt user for any input/confirmation"
         )
+        parser.add_argument(
+            "--workers", type=int, default=1, dest='workers',
+            help="Number of worker processes with which to trace paths in parallel (default: 1)"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, dest='batch_size',
+            help="Number of origins to trace per batch (default: 1000)"
+        )
+        parser.add_argument(
+            "--checkpoint", dest='checkpoint',
+            help="Path to a file in which to record progress. If the file exists, resume the interrupted run it "
+                 "describes."
+        )
 
     def draw_progress_bar(self, percentage):
         """
@@ -36,10 +120,30 @@ class Command(BaseCommand):
         bar_size = int(percentage / 5)
         self.stdout.write(f"\r  [{'#' * bar_size}{' ' * (20-bar_size)}] {int(percentage)}%", ending='')
 
+    def get_pk_ranges(self, origins, batch_size):
+        """
+        Divide a QuerySet into disjoint ranges of primary keys, each spanning up to batch_size objects. Returns a list
+        of two-tuples: the (first, last) PKs of each range and the number of objects within it.
+        """
+        pks = list(origins.order_by('pk').values_list('pk', flat=True))
+        return [
+            ((chunk[0], chunk[-1]), len(chunk))
+            for chunk in (pks[i:i + batch_size] for i in range(0, len(pks), batch_size))
+        ]
+
     def handle(self, *model_names, **options):
+        if options['workers'] < 1:
+            raise CommandError("--workers must be at least 1")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        checkpoint = Checkpoint(options['checkpoint'], force=options['force'])
+        if checkpoint.exists:
+            self.stdout.write(f"Resuming from checkpoint {checkpoint.path}")
+        force = checkpoint.force
 
-        # If --force was passed, first delete all existing CablePaths
-        if options['force']:
+        # If --force was passed, first delete all existing CablePaths (unless resuming an interrupted run)
+        if force and not checkpoint.exists:
             cable_paths = CablePath.objects.all()
             paths_count = cable_paths.count()
 
@@ -60,31 +164,73 @@ class Command(BaseCommand):
             self.stdout.write((self.style.SUCCESS(f'  Deleted {deleted_count} paths')))
 
             # Reinitialize the model's PK sequence
-            self.stdout.write(f'Resetting database sequence for CablePath model')
+            self.stdout.write('Resetting database sequence for CablePath model')
             sequence_sql = connection.ops.sequence_reset_sql(no_style(), [CablePath])
             with connection.cursor() as cursor:
                 for sql in sequence_sql:
                     cursor.execute(sql)
 
-        # Retrace paths
+        # Record the start of the run, so that existing paths are not deleted again when resuming
+        checkpoint.save()
+
+        # Trace paths from all origins which lack one. (If --force was passed, this is all origins; any which have
+        # since been traced by an interrupted run are skipped.)
+        report = []
         for model in ENDPOINT_MODELS:
-            params = Q(cable__isnull=False)
-            if hasattr(model, 'wireless_link'):
-                params |= Q(wireless_link__isnull=False)
-            origins = model.objects.filter(params)
-            if not options['force']:
-                origins = origins.filter(_path__isnull=True)
-            origins_count = origins.count()
+            model_label = model._meta.label_lower
+            origins = get_origins(model)
+            pk_ranges = [
+                (pk_range, count) for pk_range, count in self.get_pk_ranges(origins, options['batch_size'])
+                if not checkpoint.is_completed(model_label, pk_range)
+            ]
+            origins_count = sum(count for _, count in pk_ranges)
             if not origins_count:
                 self.stdout.write(f'Found no missing {model._meta.verbose_name} paths; skipping')
                 continue
             self.stdout.write(f'Retracing {origins_count} cabled {model._meta.verbose_name_plural}...')
+
             i = 0
-            for i, obj in enumerate(origins, start=1):
-                create_cablepath([obj])
-                if not i % 100:
-                    self.draw_progress_bar(i * 100 / origins_count)
+            start = time.monotonic()
+            for pk_range, count in self.trace_ranges(model_label, [r for r, _ in pk_ranges], options):
+                checkpoint.mark_completed(model_label, pk_range)
+                i += count
+                self.draw_progress_bar(i * 100 / origins_count)
+            elapsed = time.monotonic() - start
             self.draw_progress_bar(100)
             self.stdout.write(self.style.SUCCESS(f'\n  Retraced {i} {model._meta.verbose_name_plural}'))
+            report.append((model, i, elapsed))
 
+        # Print a throughput report
+        if report:
+            self.stdout.write('Throughput:')
+            for model, count, elapsed in report:
+                rate = count / elapsed if elapsed else count
+                self.stdout.write(
+                    f'  {model._meta.verbose_name_plural}: {count} paths in {elapsed:.2f}s ({rate:.1f} paths/sec)'
+                )
+
+        checkpoint.delete()
         self.stdout.write(self.style.SUCCESS('Finished.'))
+
+    def trace_ranges(self, model_label, pk_ranges, options):
+        """
+        Trace paths for each range of primary keys, either in-process or using a pool of worker processes. Yields a
+        two-tuple of the PK range and the number of origins traced as each range is completed.
+        """
+        batch_size = options['batch_size']
+
+        if options['workers'] == 1:
+            for pk_range in pk_ranges:
+                yield pk_range, trace_range(model_label, *pk_range, batch_size)
+            return
+
+        # Close the database connection before forking, so that each worker opens its own
+        connections.close_all()
+        mp_context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=options['workers'], mp_context=mp_context) as executor:
+            futures = {
+                executor.submit(trace_range, model_label, *pk_range, batch_size): pk_range
+                for pk_range in pk_ranges
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
@@ -0,0 +1,56 @@
+import itertools
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from dcim.utils import decompile_path_node
+
+
+def populate_cablepath_nodes(apps, schema_editor):
+    CablePath = apps.get_model('dcim', 'CablePath')
+    CablePathNode = apps.get_model('dcim', 'CablePathNode')
+
+    nodes = []
+    for cablepath in CablePath.objects.only('pk', 'path').iterator(chunk_size=1000):
+        for node in set(itertools.chain(*cablepath.path)):
+            node_type_id, node_id = decompile_path_node(node)
+            nodes.append(CablePathNode(cable_path_id=cablepath.pk, node_type_id=node_type_id, node_id=node_id))
+        if len(nodes) >= 10000:
+            CablePathNode.objects.bulk_create(nodes)
+            nodes = []
+    CablePathNode.objects.bulk_create(nodes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('dcim', '0161_cabling_cleanup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CablePathNode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('node_id', models.PositiveBigIntegerField()),
+                ('cable_path', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='dcim.cablepath')),
+                ('node_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ('cable_path', 'pk'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='cablepathnode',
+            index=models.Index(fields=['node_type', 'node_id'], name='dcim_cablep_node_ty_adf4e2_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='cablepathnode',
+            constraint=models.UniqueConstraint(fields=('cable_path', 'node_type', 'node_id'), name='dcim_cablepathnode_unique_node'),
+        ),
+        migrations.RunPython(
+            code=populate_cablepath_nodes,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+import utilities.fields
+from utilities.utils import count_related
+
+
+def populate_counters(apps, schema_editor):
+    """
+    Calculate the cached counts of related objects.
+    """
+    Device = apps.get_model('dcim', 'Device')
+    DeviceType = apps.get_model('dcim', 'DeviceType')
+    Module = apps.get_model('dcim', 'Module')
+    ModuleType = apps.get_model('dcim', 'ModuleType')
+    Rack = apps.get_model('dcim', 'Rack')
+    VirtualChassis = apps.get_model('dcim', 'VirtualChassis')
+
+    DeviceType.objects.update(_device_count=count_related(Device, 'device_type'))
+    ModuleType.objects.update(_module_count=count_related(Module, 'module_type'))
+    Rack.objects.update(_device_count=count_related(Device, 'rack'))
+    VirtualChassis.objects.update(_member_count=count_related(Device, 'virtual_chassis'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dcim', '0162_cablepathnode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devicetype',
+            name='_device_count',
+            field=utilities.fields.CounterCacheField(default=0, to_field='device_type', to_model='dcim.Device'),
+        ),
+        migrations.AddField(
+            model_name='moduletype',
+            name='_module_count',
+            field=utilities.fields.CounterCacheField(default=0, to_field='module_type', to_model='dcim.Module'),
+        ),
+        migrations.AddField(
+            model_name='rack',
+            name='_device_count',
+            field=utilities.fields.CounterCacheField(default=0, to_field='rack', to_model='dcim.Device'),
+        ),
+        migrations.AddField(
+            model_name='virtualchassis',
+            name='_member_count',
+            field=utilities.fields.CounterCacheField(default=0, to_field='virtual_chassis', to_model='dcim.Device'),
+        ),
+        migrations.RunPython(
+            code=populate_counters,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
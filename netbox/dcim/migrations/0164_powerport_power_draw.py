@@ -0,0 +1,92 @@
+from collections import Counter, defaultdict
+
+from django.db import migrations
+import utilities.fields
+
+FEED_LEGS = ('A', 'B', 'C')
+
+
+def opposite_end(cable_end):
+    return 'A' if cable_end == 'B' else 'B'
+
+
+def populate_power_draw(apps, schema_editor):
+    """
+    Calculate the power draw of each PowerPort from its child PowerOutlets.
+    """
+    PowerPort = apps.get_model('dcim', 'PowerPort')
+    PowerOutlet = apps.get_model('dcim', 'PowerOutlet')
+    PowerFeed = apps.get_model('dcim', 'PowerFeed')
+    CableTermination = apps.get_model('dcim', 'CableTermination')
+
+    powerports = PowerPort.objects.values_list('pk', 'cable_id', 'cable_end')
+    if not powerports:
+        return
+
+    # PowerPorts connected to a single three-phase PowerFeed also record per-leg draw
+    far_ends = {(cable_id, opposite_end(cable_end)): pk for pk, cable_id, cable_end in powerports if cable_id}
+    peer_counts = Counter(CableTermination.objects.values_list('cable_id', 'cable_end'))
+    three_phase = {
+        far_ends[end] for end in PowerFeed.objects.filter(phase='three-phase').values_list('cable_id', 'cable_end')
+        if end in far_ends and peer_counts[end] == 1
+    }
+
+    def get_totals():
+        return {'allocated': 0, 'maximum': 0, 'outlet_count': 0}
+
+    totals = {pk: {**get_totals(), 'legs': []} for pk, _, _ in powerports}
+    leg_totals = {pk: {leg: get_totals() for leg in FEED_LEGS} for pk in three_phase}
+
+    outlet_ends = defaultdict(dict)
+    poweroutlets = PowerOutlet.objects.filter(power_port__isnull=False).values_list(
+        'pk', 'power_port_id', 'feed_leg', 'cable_id', 'cable_end'
+    )
+    for pk, power_port_id, feed_leg, cable_id, cable_end in poweroutlets:
+        totals[power_port_id]['outlet_count'] += 1
+        if feed_leg in leg_totals.get(power_port_id, {}):
+            leg_totals[power_port_id][feed_leg]['outlet_count'] += 1
+        if cable_id:
+            outlet_ends[(cable_id, opposite_end(cable_end))][pk] = (power_port_id, feed_leg)
+
+    downstream_powerports = PowerPort.objects.filter(cable__isnull=False).values_list(
+        'cable_id', 'cable_end', 'allocated_draw', 'maximum_draw'
+    )
+    for cable_id, cable_end, allocated, maximum in downstream_powerports:
+        outlets = outlet_ends.get((cable_id, cable_end), {}).values()
+        subtotals = {(power_port_id, None) for power_port_id, _ in outlets}
+        subtotals.update(
+            (power_port_id, feed_leg) for power_port_id, feed_leg in outlets
+            if feed_leg in leg_totals.get(power_port_id, {})
+        )
+        for power_port_id, feed_leg in subtotals:
+            subtotal = leg_totals[power_port_id][feed_leg] if feed_leg else totals[power_port_id]
+            subtotal['allocated'] += allocated or 0
+            subtotal['maximum'] += maximum or 0
+
+    for pk, legs in leg_totals.items():
+        totals[pk]['legs'] = [{'name': leg, **legs[leg]} for leg in FEED_LEGS]
+
+    PowerPort.objects.bulk_update(
+        [PowerPort(pk=pk, _power_draw=power_draw) for pk, power_draw in totals.items()],
+        fields=['_power_draw'],
+        batch_size=100
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dcim', '0163_counter_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='powerport',
+            name='_power_draw',
+            field=utilities.fields.CachedValueField(default=dict),
+        ),
+        migrations.RunPython(
+            code=populate_power_draw,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
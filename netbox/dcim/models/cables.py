@@ -5,24 +5,24 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import Sum
+from django.db.models import Q, Sum
 from django.dispatch import Signal
 from django.urls import reverse
 
 from dcim.choices import *
 from dcim.constants import *
 from dcim.fields import PathField
-from dcim.utils import decompile_path_node, object_to_path_node, path_node_to_object
+from dcim.utils import compile_path_node, decompile_path_node, get_objects_by_type, path_node_to_object
 from netbox.models import NetBoxModel
 from utilities.fields import ColorField
 from utilities.querysets import RestrictedQuerySet
 from utilities.utils import to_meters
-from wireless.models import WirelessLink
 from .device_components import FrontPort, RearPort
 
 __all__ = (
     'Cable',
     'CablePath',
+    'CablePathNode',
     'CableTermination',
 )
 
@@ -337,6 +337,24 @@ class CableTermination(models.Model):
             self._site = self.termination.site
 
 
+class CablePathQuerySet(models.QuerySet):
+
+    def traversing(self, *objects):
+        """
+        Return all CablePaths which traverse any of the given objects, using the CablePathNode index.
+        """
+        object_ids = defaultdict(list)
+        for obj in objects:
+            object_ids[ContentType.objects.get_for_model(obj)].append(obj.pk)
+        params = Q()
+        for node_type, node_ids in object_ids.items():
+            params |= Q(node_type=node_type, node_id__in=node_ids)
+        if not params:
+            return self.none()
+
+        return self.filter(pk__in=CablePathNode.objects.filter(params).values('cable_path'))
+
+
 class CablePath(models.Model):
     """
     A CablePath instance represents the physical path from a set of origin nodes to a set of destination nodes,
@@ -370,7 +388,8 @@ class CablePath(models.Model):
     if the instance represents a complete end-to-end path from origin(s) to destination(s). `is_split` is True if the
     path diverges across multiple cables.
 
-    `_nodes` retains a flattened list of all nodes within the path to enable simple filtering.
+    `_nodes` retains a flattened list of all nodes within the path to enable simple filtering. Each node is also
+    recorded as a CablePathNode, which serves as an indexed reverse lookup from objects to the paths traversing them.
     """
     path = models.JSONField(
         default=list
@@ -386,6 +405,8 @@ class CablePath(models.Model):
     )
     _nodes = PathField()
 
+    objects = CablePathQuerySet.as_manager()
+
     def __str__(self):
         return f"Path #{self.pk}: {len(self.path)} hops"
 
@@ -396,6 +417,9 @@ class CablePath(models.Model):
 
         super().save(*args, **kwargs)
 
+        # Update the reverse node index
+        CablePathNode.update_index([self])
+
         # Record a direct reference to this CablePath on its originating object(s)
         origin_model = self.origin_type.model_class()
         origin_ids = [decompile_path_node(node)[1] for node in self.path[0]]
@@ -419,7 +443,7 @@ class CablePath(models.Model):
         Cache and return the complete path as lists of objects, derived from their annotation within the path.
         """
         if not hasattr(self, '_path_objects'):
-            self._path_objects = self._get_path()
+            self.prefetch_path_objects([self])
         return self._path_objects
 
     @property
@@ -448,8 +472,10 @@ class CablePath(models.Model):
         Create a new CablePath instance as traced from the given termination objects. These can be any object to which a
         Cable or WirelessLink connects (interfaces, console ports, circuit termination, etc.). All terminations must be
         of the same type and must belong to the same parent object.
+
+        To trace paths from many sets of origins at once, use dcim.tracing.CablePathTracer directly.
         """
-        from circuits.models import CircuitTermination
+        from dcim.tracing import CablePathTracer
 
         if not terminations:
             return None
@@ -458,140 +484,32 @@ class CablePath(models.Model):
         if len(terminations) > 1:
             assert all(t.link == terminations[0].link for t in terminations[1:])
 
-        path = []
-        position_stack = []
-        is_complete = False
-        is_active = True
-        is_split = False
-
-        while terminations:
-
-            # Terminations must all be of the same type
-            assert all(isinstance(t, type(terminations[0])) for t in terminations[1:])
-
-            # Check for a split path (e.g. rear port fanning out to multiple front ports with
-            # different cables attached)
-            if len(set(t.link for t in terminations)) > 1:
-                is_split = True
-                break
-
-            # Step 1: Record the near-end termination object(s)
-            path.append([
-                object_to_path_node(t) for t in terminations
-            ])
-
-            # Step 2: Determine the attached link (Cable or WirelessLink), if any
-            link = terminations[0].link
-            if link is None and len(path) == 1:
-                # If this is the start of the path and no link exists, return None
-                return None
-            elif link is None:
-                # Otherwise, halt the trace if no link exists
-                break
-            assert type(link) in (Cable, WirelessLink)
-
-            # Step 3: Record the link and update path status if not "connected"
-            path.append([object_to_path_node(link)])
-            if hasattr(link, 'status') and link.status != LinkStatusChoices.STATUS_CONNECTED:
-                is_active = False
-
-            # Step 4: Determine the far-end terminations
-            if isinstance(link, Cable):
-                termination_type = ContentType.objects.get_for_model(terminations[0])
-                local_cable_terminations = CableTermination.objects.filter(
-                    termination_type=termination_type,
-                    termination_id__in=[t.pk for t in terminations]
-                )
-                # Terminations must all belong to same end of Cable
-                local_cable_end = local_cable_terminations[0].cable_end
-                assert all(ct.cable_end == local_cable_end for ct in local_cable_terminations[1:])
-                remote_cable_terminations = CableTermination.objects.filter(
-                    cable=link,
-                    cable_end='A' if local_cable_end == 'B' else 'B'
-                )
-                remote_terminations = [ct.termination for ct in remote_cable_terminations]
-            else:
-                # WirelessLink
-                remote_terminations = [link.interface_b] if link.interface_a is terminations[0] else [link.interface_a]
-
-            # Step 5: Record the far-end termination object(s)
-            path.append([
-                object_to_path_node(t) for t in remote_terminations
-            ])
-
-            # Step 6: Determine the "next hop" terminations, if applicable
-            if not remote_terminations:
-                break
-
-            if isinstance(remote_terminations[0], FrontPort):
-                # Follow FrontPorts to their corresponding RearPorts
-                rear_ports = RearPort.objects.filter(
-                    pk__in=[t.rear_port_id for t in remote_terminations]
-                )
-                if len(rear_ports) > 1:
-                    assert all(rp.positions == 1 for rp in rear_ports)
-                elif rear_ports[0].positions > 1:
-                    position_stack.append([fp.rear_port_position for fp in remote_terminations])
-
-                terminations = rear_ports
-
-            elif isinstance(remote_terminations[0], RearPort):
-
-                if len(remote_terminations) > 1 or remote_terminations[0].positions == 1:
-                    front_ports = FrontPort.objects.filter(
-                        rear_port_id__in=[rp.pk for rp in remote_terminations],
-                        rear_port_position=1
-                    )
-                elif position_stack:
-                    front_ports = FrontPort.objects.filter(
-                        rear_port_id=remote_terminations[0].pk,
-                        rear_port_position__in=position_stack.pop()
-                    )
-                else:
-                    # No position indicated: path has split, so we stop at the RearPorts
-                    is_split = True
-                    break
-
-                terminations = front_ports
-
-            elif isinstance(remote_terminations[0], CircuitTermination):
-                # Follow a CircuitTermination to its corresponding CircuitTermination (A to Z or vice versa)
-                term_side = remote_terminations[0].term_side
-                assert all(ct.term_side == term_side for ct in remote_terminations[1:])
-                circuit_termination = CircuitTermination.objects.filter(
-                    circuit=remote_terminations[0].circuit,
-                    term_side='Z' if term_side == 'A' else 'A'
-                ).first()
-                if circuit_termination is None:
-                    break
-                elif circuit_termination.provider_network:
-                    # Circuit terminates to a ProviderNetwork
-                    path.extend([
-                        [object_to_path_node(circuit_termination)],
-                        [object_to_path_node(circuit_termination.provider_network)],
-                    ])
-                    break
-                elif circuit_termination.site and not circuit_termination.cable:
-                    # Circuit terminates to a Site
-                    path.extend([
-                        [object_to_path_node(circuit_termination)],
-                        [object_to_path_node(circuit_termination.site)],
-                    ])
-                    break
-
-                terminations = [circuit_termination]
-
-            # Anything else marks the end of the path
-            else:
-                is_complete = True
-                break
-
-        return cls(
-            path=path,
-            is_complete=is_complete,
-            is_active=is_active,
-            is_split=is_split
-        )
+        return CablePathTracer().trace([terminations])[0]
+
+    @classmethod
+    def prefetch_path_objects(cls, paths):
+        """
+        Populate the path objects of the given CablePaths in bulk, using one query per model type across all paths.
+        Parent objects (devices, circuits, etc.) are prefetched where appropriate.
+        """
+        # Compile a list of IDs to prefetch for each type of model in the paths
+        to_prefetch = defaultdict(set)
+        for cablepath in paths:
+            for node in cablepath._nodes:
+                ct_id, object_id = decompile_path_node(node)
+                to_prefetch[ct_id].add(object_id)
+        prefetched = get_objects_by_type(to_prefetch)
+
+        # Replicate each path using the prefetched objects, ignoring stale (deleted) object IDs
+        for cablepath in paths:
+            cablepath._path_objects = []
+            for step in cablepath.path:
+                nodes = []
+                for node in step:
+                    ct_id, object_id = decompile_path_node(node)
+                    if object_id in prefetched[ct_id]:
+                        nodes.append(prefetched[ct_id][object_id])
+                cablepath._path_objects.append(nodes)
 
     def retrace(self):
         """
@@ -607,42 +525,6 @@ class CablePath(models.Model):
         else:
             self.delete()
 
-    def _get_path(self):
-        """
-        Return the path as a list of prefetched objects.
-        """
-        # Compile a list of IDs to prefetch for each type of model in the path
-        to_prefetch = defaultdict(list)
-        for node in self._nodes:
-            ct_id, object_id = decompile_path_node(node)
-            to_prefetch[ct_id].append(object_id)
-
-        # Prefetch path objects using one query per model type. Prefetch related devices where appropriate.
-        prefetched = {}
-        for ct_id, object_ids in to_prefetch.items():
-            model_class = ContentType.objects.get_for_id(ct_id).model_class()
-            queryset = model_class.objects.filter(pk__in=object_ids)
-            if hasattr(model_class, 'device'):
-                queryset = queryset.prefetch_related('device')
-            prefetched[ct_id] = {
-                obj.id: obj for obj in queryset
-            }
-
-        # Replicate the path using the prefetched objects.
-        path = []
-        for step in self.path:
-            nodes = []
-            for node in step:
-                ct_id, object_id = decompile_path_node(node)
-                try:
-                    nodes.append(prefetched[ct_id][object_id])
-                except KeyError:
-                    # Ignore stale (deleted) object IDs
-                    pass
-            path.append(nodes)
-
-        return path
-
     def get_cable_ids(self):
         """
         Return all Cable IDs within the path.
@@ -682,3 +564,51 @@ class CablePath(models.Model):
         # RearPorts connected to different cables
         elif type(nodes[0]) is FrontPort:
             return RearPort.objects.filter(pk__in=[fp.rear_port_id for fp in nodes])
+
+
+class CablePathNode(models.Model):
+    """
+    An entry in the reverse index of CablePath nodes, recording that a CablePath traverses a particular object. This
+    allows locating all paths affected by a change to an object without scanning the `_nodes` array of every path.
+    """
+    cable_path = models.ForeignKey(
+        to=CablePath,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    node_type = models.ForeignKey(
+        to=ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    node_id = models.PositiveBigIntegerField()
+
+    class Meta:
+        ordering = ('cable_path', 'pk')
+        indexes = (
+            models.Index(fields=('node_type', 'node_id')),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=('cable_path', 'node_type', 'node_id'),
+                name='dcim_cablepathnode_unique_node'
+            ),
+        )
+
+    def __str__(self):
+        return f'Path #{self.cable_path_id}: {compile_path_node(self.node_type_id, self.node_id)}'
+
+    @classmethod
+    def update_index(cls, cablepaths):
+        """
+        Replace the indexed nodes of the given (saved) CablePaths with the nodes currently present in each path.
+        """
+        cablepaths = [cp for cp in cablepaths if cp.pk]
+        cls.objects.filter(cable_path__in=cablepaths).delete()
+
+        nodes = []
+        for cablepath in cablepaths:
+            for node in set(itertools.chain(*cablepath.path)):
+                node_type_id, node_id = decompile_path_node(node)
+                nodes.append(cls(cable_path=cablepath, node_type_id=node_type_id, node_id=node_id))
+        cls.objects.bulk_create(nodes, batch_size=1000)
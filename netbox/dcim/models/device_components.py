@@ -5,7 +5,6 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Sum
 from django.urls import reverse
 from mptt.models import MPTTModel, TreeForeignKey
 
@@ -14,7 +13,7 @@ from dcim.constants import *
 from dcim.fields import MACAddressField, WWNField
 from netbox.models import OrganizationalModel, NetBoxModel
 from utilities.choices import ColorChoices
-from utilities.fields import ColorField, NaturalOrderingField
+from utilities.fields import CachedValueField, ColorField, NaturalOrderingField
 from utilities.mptt import TreeManager
 from utilities.ordering import naturalize_interface
 from utilities.query_functions import CollateAsChar
@@ -327,6 +326,11 @@ class PowerPort(ModularComponentModel, CabledObjectModel, PathEndpoint):
         help_text="Allocated power draw (watts)"
     )
 
+    # Cached power draw of downstream PowerPorts (see update_power_draw())
+    _power_draw = CachedValueField(
+        default=dict
+    )
+
     clone_fields = ('device', 'module', 'maximum_draw', 'allocated_draw')
 
     class Meta:
@@ -374,45 +378,26 @@ class PowerPort(ModularComponentModel, CabledObjectModel, PathEndpoint):
 
     def get_power_draw(self):
         """
-        Return the allocated and maximum power draw (in VA) and child PowerOutlet count for this PowerPort.
+        Return the allocated and maximum power draw (in VA) and child PowerOutlet count for this PowerPort. Aggregate
+        draw is read from the totals maintained by update_power_draw().
         """
-        from dcim.models import PowerFeed
+        power_draw = self._power_draw
+        outlet_count = power_draw.get('outlet_count', 0)
 
-        # Calculate aggregate draw of all child power outlets if no numbers have been defined manually
+        # Report the aggregate draw of all child power outlets if no numbers have been defined manually
         if self.allocated_draw is None and self.maximum_draw is None:
-            utilization = self.get_downstream_powerports().aggregate(
-                maximum_draw_total=Sum('maximum_draw'),
-                allocated_draw_total=Sum('allocated_draw'),
-            )
-            ret = {
-                'allocated': utilization['allocated_draw_total'] or 0,
-                'maximum': utilization['maximum_draw_total'] or 0,
-                'outlet_count': self.poweroutlets.count(),
-                'legs': [],
+            return {
+                'allocated': power_draw.get('allocated', 0),
+                'maximum': power_draw.get('maximum', 0),
+                'outlet_count': outlet_count,
+                'legs': power_draw.get('legs', []),
             }
 
-            # Calculate per-leg aggregates for three-phase power feeds
-            if len(self.link_peers) == 1 and isinstance(self.link_peers[0], PowerFeed) and \
-                    self.link_peers[0].phase == PowerFeedPhaseChoices.PHASE_3PHASE:
-                for leg, leg_name in PowerOutletFeedLegChoices:
-                    utilization = self.get_downstream_powerports(leg=leg).aggregate(
-                        maximum_draw_total=Sum('maximum_draw'),
-                        allocated_draw_total=Sum('allocated_draw'),
-                    )
-                    ret['legs'].append({
-                        'name': leg_name,
-                        'allocated': utilization['allocated_draw_total'] or 0,
-                        'maximum': utilization['maximum_draw_total'] or 0,
-                        'outlet_count': self.poweroutlets.filter(feed_leg=leg).count(),
-                    })
-
-            return ret
-
         # Default to administratively defined values
         return {
             'allocated': self.allocated_draw or 0,
             'maximum': self.maximum_draw or 0,
-            'outlet_count': self.poweroutlets.count(),
+            'outlet_count': outlet_count,
             'legs': [],
         }
 
@@ -509,7 +494,15 @@ class BaseInterface(models.Model):
         abstract = True
 
     def save(self, *args, **kwargs):
+        self.prepare_save()
 
+        return super().save(*args, **kwargs)
+
+    def prepare_save(self):
+        """
+        Clear any VLAN assignments which are not valid for the interface's mode. Called by save() and prior to saving
+        interfaces in bulk.
+        """
         # Remove untagged VLAN assignment for non-802.1Q interfaces
         if not self.mode:
             self.untagged_vlan = None
@@ -518,8 +511,6 @@ class BaseInterface(models.Model):
         if self.pk and self.mode != InterfaceModeChoices.MODE_TAGGED:
             self.tagged_vlans.clear()
 
-        return super().save(*args, **kwargs)
-
     @property
     def count_ipaddresses(self):
         return self.ip_addresses.count()
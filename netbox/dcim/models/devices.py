@@ -13,12 +13,13 @@ from django.utils.safestring import mark_safe
 
 from dcim.choices import *
 from dcim.constants import *
+from dcim.utils import update_power_draw
 from extras.models import ConfigContextModel
 from extras.querysets import ConfigContextModelQuerySet
 from netbox.config import ConfigItem
 from netbox.models import OrganizationalModel, NetBoxModel
 from utilities.choices import ColorChoices
-from utilities.fields import ColorField, NaturalOrderingField
+from utilities.fields import ColorField, CounterCacheField, NaturalOrderingField
 from .device_components import *
 
 
@@ -137,6 +138,12 @@ class DeviceType(NetBoxModel):
         blank=True
     )
 
+    # Cached counts
+    _device_count = CounterCacheField(
+        to_model='dcim.Device',
+        to_field='device_type'
+    )
+
     clone_fields = (
         'manufacturer', 'u_height', 'is_full_depth', 'subdevice_role', 'airflow',
     )
@@ -337,6 +344,12 @@ class ModuleType(NetBoxModel):
         to='extras.ImageAttachment'
     )
 
+    # Cached counts
+    _module_count = CounterCacheField(
+        to_model='dcim.Module',
+        to_field='module_type'
+    )
+
     clone_fields = ('manufacturer',)
 
     class Meta:
@@ -841,7 +854,7 @@ class Device(NetBoxModel, ConfigContextModel):
             PowerPort.objects.bulk_create(
                 [x.instantiate(device=self) for x in self.device_type.powerporttemplates.all()]
             )
-            PowerOutlet.objects.bulk_create(
+            poweroutlets = PowerOutlet.objects.bulk_create(
                 [x.instantiate(device=self) for x in self.device_type.poweroutlettemplates.all()]
             )
             Interface.objects.bulk_create(
@@ -863,6 +876,9 @@ class Device(NetBoxModel, ConfigContextModel):
             for x in self.device_type.inventoryitemtemplates.all():
                 x.instantiate(device=self).save()
 
+            # Count the child PowerOutlets of each PowerPort
+            update_power_draw(poweroutlet.power_port_id for poweroutlet in poweroutlets)
+
         # Update Site and Rack assignment for any child Devices
         devices = Device.objects.filter(parent_bay__device=self)
         for device in devices:
@@ -1039,6 +1055,10 @@ class Module(NetBoxModel, ConfigContextModel):
             component_model.objects.bulk_create(create_instances)
             component_model.objects.bulk_update(update_instances, ['module'])
 
+            # Count the child PowerOutlets of each PowerPort
+            if component_model is PowerOutlet:
+                update_power_draw(poweroutlet.power_port_id for poweroutlet in create_instances)
+
 
 #
 # Virtual chassis
@@ -1063,6 +1083,12 @@ class VirtualChassis(NetBoxModel):
         blank=True
     )
 
+    # Cached counts
+    _member_count = CounterCacheField(
+        to_model='dcim.Device',
+        to_field='virtual_chassis'
+    )
+
     class Meta:
         ordering = ['name']
         verbose_name_plural = 'virtual chassis'
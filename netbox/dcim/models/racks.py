@@ -8,19 +8,20 @@ from django.contrib.postgres.fields import ArrayField
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Count, Sum
+from django.db.models import Sum
 from django.urls import reverse
 
 from dcim.choices import *
 from dcim.constants import *
+from dcim.elevations import RackElevationLoader
 from dcim.svg import RackElevationSVG
+from dcim.utils import get_rack_power_utilization, get_rack_utilization
 from netbox.models import OrganizationalModel, NetBoxModel
 from utilities.choices import ColorChoices
-from utilities.fields import ColorField, NaturalOrderingField
+from utilities.fields import ColorField, CounterCacheField, NaturalOrderingField
 from utilities.utils import array_to_string, drange
-from .device_components import PowerOutlet, PowerPort
+from .device_components import PowerOutlet
 from .devices import Device
-from .power import PowerFeed
 
 __all__ = (
     'Rack',
@@ -184,6 +185,12 @@ class Rack(NetBoxModel):
         to='extras.ImageAttachment'
     )
 
+    # Cached counts
+    _device_count = CounterCacheField(
+        to_model='dcim.Device',
+        to_field='rack'
+    )
+
     clone_fields = (
         'site', 'location', 'tenant', 'status', 'role', 'type', 'width', 'u_height', 'desc_units', 'outer_width',
         'outer_depth', 'outer_unit',
@@ -269,55 +276,8 @@ class Rack(NetBoxModel):
             reference to the device. When False, only the bottom most unit for a device is included and that unit
             contains a height attribute for the device
         """
-        elevation = {}
-        for u in self.units:
-            u_name = f'U{u}'.split('.')[0] if not u % 1 else f'U{u}'
-            elevation[u] = {
-                'id': u,
-                'name': u_name,
-                'face': face,
-                'device': None,
-                'occupied': False
-            }
-
-        # Add devices to rack units list
-        if self.pk:
-
-            # Retrieve all devices installed within the rack
-            devices = Device.objects.prefetch_related(
-                'device_type',
-                'device_type__manufacturer',
-                'device_role'
-            ).annotate(
-                devicebay_count=Count('devicebays')
-            ).exclude(
-                pk=exclude
-            ).filter(
-                rack=self,
-                position__gt=0,
-                device_type__u_height__gt=0
-            ).filter(
-                Q(face=face) | Q(device_type__is_full_depth=True)
-            )
-
-            # Determine which devices the user has permission to view
-            permitted_device_ids = []
-            if user is not None:
-                permitted_device_ids = self.devices.restrict(user, 'view').values_list('pk', flat=True)
-
-            for device in devices:
-                if expand_devices:
-                    for u in drange(device.position, device.position + device.device_type.u_height, 0.5):
-                        if user is None or device.pk in permitted_device_ids:
-                            elevation[u]['device'] = device
-                        elevation[u]['occupied'] = True
-                else:
-                    if user is None or device.pk in permitted_device_ids:
-                        elevation[device.position]['device'] = device
-                    elevation[device.position]['occupied'] = True
-                    elevation[device.position]['height'] = device.device_type.u_height
-
-        return [u for u in elevation.values()]
+        loader = RackElevationLoader(self, user=user, exclude=exclude)
+        return loader.get_rack_units(face, expand_devices=expand_devices)
 
     def get_available_units(self, u_height=1, rack_face=None, exclude=None):
         """
@@ -411,43 +371,23 @@ class Rack(NetBoxModel):
     def get_utilization(self):
         """
         Determine the utilization rate of the rack and return it as a percentage. Occupied and reserved units both count
-        as utilized.
+        as utilized. (If utilization has been calculated in bulk by prefetch_rack_utilization(), the cached value is
+        returned.)
         """
-        # Determine unoccupied units
-        total_units = len(list(self.units))
-        available_units = self.get_available_units(u_height=0.5)
-
-        # Remove reserved units
-        for ru in self.get_reserved_units():
-            for u in drange(ru, ru + 1, 0.5):
-                if u in available_units:
-                    available_units.remove(u)
+        if hasattr(self, '_utilization'):
+            return self._utilization
 
-        occupied_unit_count = total_units - len(available_units)
-        percentage = float(occupied_unit_count) / total_units * 100
-
-        return percentage
+        return get_rack_utilization([self])[self.pk]
 
     def get_power_utilization(self):
         """
-        Determine the utilization rate of power in the rack and return it as a percentage.
+        Determine the utilization rate of power in the rack and return it as a percentage. (If utilization has been
+        calculated in bulk by prefetch_rack_utilization(), the cached value is returned.)
         """
-        powerfeeds = PowerFeed.objects.filter(rack=self)
-        available_power_total = sum(pf.available_power for pf in powerfeeds)
-        if not available_power_total:
-            return 0
-
-        powerports = []
-        for powerfeed in powerfeeds:
-            powerports.extend([
-                peer for peer in powerfeed.link_peers if isinstance(peer, PowerPort)
-            ])
-
-        allocated_draw = sum([
-            powerport.get_power_draw()['allocated'] for powerport in powerports
-        ])
-
-        return int(allocated_draw / available_power_total * 100)
+        if hasattr(self, '_power_utilization'):
+            return self._power_utilization
+
+        return get_rack_power_utilization([self])[self.pk]
 
 
 class RackReservation(NetBoxModel):
@@ -1,12 +1,19 @@
 import logging
 
-from django.db.models.signals import post_save, post_delete, pre_delete
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
 
 from .choices import CableEndChoices, LinkStatusChoices
-from .models import Cable, CablePath, CableTermination, Device, PathEndpoint, PowerPanel, Rack, Location, VirtualChassis
+from .elevations import invalidate_rack_elevations
+from .models import (
+    Cable, CablePath, CableTermination, Device, DeviceBay, DeviceRole, DeviceType, Manufacturer, PathEndpoint,
+    PowerFeed, PowerOutlet, PowerPanel, PowerPort, Rack, RackReservation, Location, VirtualChassis,
+)
 from .models.cables import trace_paths
-from .utils import create_cablepath, rebuild_paths
+from .tracing import CablePathTracer
+from .utils import (
+    compile_path_node, get_cable_powerport_ids, object_to_path_node, rebuild_paths, update_power_draw,
+)
 
 
 #
@@ -64,6 +71,63 @@ def clear_virtualchassis_members(instance, **kwargs):
         device.save()
 
 
+#
+# Rack elevations
+#
+
+@receiver(post_init, sender=Device)
+@receiver(post_init, sender=RackReservation)
+def cache_previous_rack(instance, **kwargs):
+    """
+    Record the Rack to which an object is assigned when it is loaded, so that the elevations of both the previous and
+    the new Rack can be invalidated once it has been saved. (The previous Rack is unknown if the field is deferred.)
+    """
+    instance._previous_rack_id = instance.__dict__.get('rack_id')
+
+
+@receiver(post_save, sender=Device)
+@receiver(post_delete, sender=Device)
+@receiver(post_save, sender=RackReservation)
+@receiver(post_delete, sender=RackReservation)
+def invalidate_rack_elevation(instance, **kwargs):
+    """
+    Invalidate the cached elevations of the Rack to which a Device or RackReservation is (or was) assigned.
+    """
+    invalidate_rack_elevations(*{instance.rack_id, getattr(instance, '_previous_rack_id', None)})
+    instance._previous_rack_id = instance.rack_id
+
+
+@receiver(post_save, sender=Rack)
+def invalidate_rack_elevation_on_rack_change(instance, **kwargs):
+    invalidate_rack_elevations(instance.pk)
+
+
+@receiver(post_save, sender=DeviceBay)
+@receiver(post_delete, sender=DeviceBay)
+def invalidate_rack_elevation_on_devicebay_change(instance, **kwargs):
+    """
+    Device bays are counted within the name of each parent device.
+    """
+    rack_id = Device.objects.filter(pk=instance.device_id).values_list('rack_id', flat=True).first()
+    invalidate_rack_elevations(rack_id)
+
+
+@receiver(post_save, sender=DeviceType)
+@receiver(post_delete, sender=DeviceType)
+@receiver(post_save, sender=DeviceRole)
+@receiver(post_delete, sender=DeviceRole)
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_delete, sender=Manufacturer)
+@receiver(post_save, sender=VirtualChassis)
+@receiver(post_delete, sender=VirtualChassis)
+def invalidate_all_rack_elevations(**kwargs):
+    """
+    Device types (including their images), roles, manufacturers and virtual chassis may be depicted within the
+    elevations of any number of racks.
+    """
+    invalidate_rack_elevations()
+
+
 #
 # Cables
 #
@@ -87,19 +151,28 @@ def update_connected_endpoints(instance, created, raw=False, **kwargs):
                 a_terminations.append(t.termination)
             else:
                 b_terminations.append(t.termination)
+        origin_groups = []
+        pass_through_nodes = []
         for nodes in [a_terminations, b_terminations]:
             # Examine type of first termination to determine object type (all must be the same)
             if not nodes:
                 continue
             if isinstance(nodes[0], PathEndpoint):
-                create_cablepath(nodes)
+                origin_groups.append(nodes)
             else:
-                rebuild_paths(nodes)
+                pass_through_nodes.extend(nodes)
+
+        # Trace paths from both ends of the Cable together
+        tracer = CablePathTracer()
+        if origin_groups:
+            tracer.create_paths(origin_groups)
+        if pass_through_nodes:
+            tracer.rebuild_paths(pass_through_nodes)
 
     # Update status of CablePaths if Cable status has been changed
     elif instance.status != instance._orig_status:
         if instance.status != LinkStatusChoices.STATUS_CONNECTED:
-            CablePath.objects.filter(_nodes__contains=instance).update(is_active=False)
+            CablePath.objects.traversing(instance).update(is_active=False)
         else:
             rebuild_paths([instance])
 
@@ -109,8 +182,10 @@ def retrace_cable_paths(instance, **kwargs):
     """
     When a Cable is deleted, check for and update its connected endpoints
     """
-    for cablepath in CablePath.objects.filter(_nodes__contains=instance):
-        cablepath.retrace()
+    CablePathTracer().retrace_paths(
+        CablePath.objects.traversing(instance),
+        changed_nodes=[object_to_path_node(instance)]
+    )
 
 
 @receiver(post_delete, sender=CableTermination)
@@ -121,5 +196,74 @@ def nullify_connected_endpoints(instance, **kwargs):
     model = instance.termination_type.model_class()
     model.objects.filter(pk=instance.termination_id).update(cable=None, cable_end='')
 
-    for cablepath in CablePath.objects.filter(_nodes__contains=instance.cable):
-        cablepath.retrace()
+    CablePathTracer().retrace_paths(
+        CablePath.objects.traversing(instance.cable),
+        changed_nodes=[
+            object_to_path_node(instance.cable),
+            compile_path_node(instance.termination_type_id, instance.termination_id),
+        ]
+    )
+
+
+#
+# Power draw
+#
+
+@receiver(pre_save, sender=PowerOutlet)
+def cache_previous_power_port(instance, **kwargs):
+    """
+    Record the PowerPort to which an existing PowerOutlet was assigned before it is saved, so that the power draw of
+    both the previous and the new PowerPort can be updated.
+    """
+    if not instance._state.adding:
+        instance._previous_power_port_id = PowerOutlet.objects.filter(pk=instance.pk).values_list(
+            'power_port_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=PowerOutlet)
+@receiver(post_delete, sender=PowerOutlet)
+def update_power_draw_on_poweroutlet_change(instance, **kwargs):
+    update_power_draw({instance.power_port_id, getattr(instance, '_previous_power_port_id', None)})
+
+
+@receiver(post_save, sender=PowerPort)
+@receiver(post_delete, sender=PowerPort)
+def update_power_draw_on_powerport_change(instance, **kwargs):
+    """
+    The draw of a PowerPort counts toward that of the PowerPort to whose PowerOutlet it is connected.
+    """
+    update_power_draw(get_cable_powerport_ids([instance.cable_id]))
+
+
+@receiver(post_save, sender=PowerFeed)
+def update_power_draw_on_powerfeed_change(instance, **kwargs):
+    """
+    Per-leg draw is calculated only for PowerPorts connected to a three-phase PowerFeed.
+    """
+    if instance.cable_id:
+        update_power_draw(PowerPort.objects.filter(cable=instance.cable_id).values_list('pk', flat=True))
+
+
+@receiver(trace_paths, sender=Cable)
+def update_power_draw_on_cable_change(instance, raw=False, **kwargs):
+    if not raw and instance._terminations_modified:
+        update_power_draw(get_cable_powerport_ids([instance.pk]))
+
+
+@receiver(post_delete, sender=CableTermination)
+def update_power_draw_on_termination_delete(instance, **kwargs):
+    """
+    Update the power draw of a disconnected PowerPort (or the parent of a disconnected PowerOutlet), and of any
+    PowerPorts remaining on the cable. Connected objects have already been disassociated from the cable (see
+    nullify_connected_endpoints()).
+    """
+    powerport_ids = get_cable_powerport_ids([instance.cable_id])
+    model = instance.termination_type.model_class()
+    if model is PowerPort:
+        powerport_ids.add(instance.termination_id)
+    elif model is PowerOutlet:
+        powerport_ids.update(
+            PowerOutlet.objects.filter(pk=instance.termination_id).values_list('power_port_id', flat=True)
+        )
+    update_power_draw(powerport_ids)
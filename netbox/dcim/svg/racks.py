@@ -16,6 +16,7 @@ from django.utils.http import urlencode
 from netbox.config import get_config
 from utilities.utils import foreground_color, array_to_ranges
 from dcim.constants import RACK_ELEVATION_BORDER_WIDTH
+from dcim.elevations import RackElevationLoader
 
 
 __all__ = (
@@ -31,7 +32,8 @@ def get_device_name(device):
     else:
         name = str(device.device_type)
     if device.devicebay_count:
-        name += ' ({}/{})'.format(device.get_children().count(), device.devicebay_count)
+        child_count = device.child_count if hasattr(device, 'child_count') else device.get_children().count()
+        name += ' ({}/{})'.format(child_count, device.devicebay_count)
 
     return name
 
@@ -53,6 +55,7 @@ class RackElevationSVG:
     Use this class to render a rack elevation as an SVG image.
 
     :param rack: A NetBox Rack instance
+    :param loader: A RackElevationLoader for the rack and user (optional). If none, one is created.
     :param unit_width: Rendered unit width, in pixels
     :param unit_height: Rendered unit height, in pixels
     :param legend_width: Legend width, in pixels (where the unit labels appear)
@@ -63,8 +66,9 @@ class RackElevationSVG:
     :param highlight_params: Iterable of two-tuples which identifies attributes of devices to highlight
     """
     def __init__(self, rack, unit_height=None, unit_width=None, legend_width=None, margin_width=None, user=None,
-                 include_images=True, base_url=None, highlight_params=None):
+                 include_images=True, base_url=None, highlight_params=None, loader=None):
         self.rack = rack
+        self.loader = loader or RackElevationLoader(rack, user=user)
         self.include_images = include_images
         self.base_url = base_url.rstrip('/') if base_url is not None else ''
 
@@ -75,20 +79,17 @@ class RackElevationSVG:
         self.legend_width = legend_width or config.RACK_ELEVATION_DEFAULT_LEGEND_WIDTH
         self.margin_width = margin_width or config.RACK_ELEVATION_DEFAULT_MARGIN_WIDTH
 
-        # Determine the subset of devices within this rack that are viewable by the user, if any
-        permitted_devices = self.rack.devices
-        if user is not None:
-            permitted_devices = permitted_devices.restrict(user, 'view')
-        self.permitted_device_ids = permitted_devices.values_list('pk', flat=True)
-
         # Determine device(s) to highlight within the elevation (if any)
-        self.highlight_devices = []
+        self.highlight_device_ids = set()
         if highlight_params:
+            permitted_devices = self.rack.devices
+            if user is not None:
+                permitted_devices = permitted_devices.restrict(user, 'view')
             q = Q()
             for k, v in highlight_params:
                 q |= Q(**{k: v})
             try:
-                self.highlight_devices = permitted_devices.filter(q)
+                self.highlight_device_ids = set(permitted_devices.filter(q).values_list('pk', flat=True))
             except FieldError:
                 pass
 
@@ -148,7 +149,7 @@ class RackElevationSVG:
         )
 
         # Determine whether highlighting is in use, and if so, whether to shade this device
-        is_shaded = self.highlight_devices and device not in self.highlight_devices
+        is_shaded = self.highlight_device_ids and device.pk not in self.highlight_device_ids
         css_extra = ' shaded' if is_shaded else ''
 
         # Create hyperlink element
@@ -227,7 +228,7 @@ class RackElevationSVG:
         """
         Draw any rack reservations in the right-hand margin alongside the rack elevation.
         """
-        for reservation in self.rack.reservations.all():
+        for reservation in self.loader.reservations:
             for segment in array_to_ranges(reservation.units):
                 u_height = 1 if len(segment) == 1 else segment[1] + 1 - segment[0]
                 coords = self._get_device_coords(segment[0], u_height)
@@ -251,8 +252,8 @@ class RackElevationSVG:
         url_string = '{}?{}&position={{}}'.format(
             reverse('dcim:device_add'),
             urlencode({
-                'site': self.rack.site.pk,
-                'location': self.rack.location.pk if self.rack.location else '',
+                'site': self.rack.site_id,
+                'location': self.rack.location_id or '',
                 'rack': self.rack.pk,
                 'face': face,
             })
@@ -276,7 +277,7 @@ class RackElevationSVG:
         """
         Draw any occupied rack units for the specified rack face.
         """
-        for unit in self.rack.get_rack_units(face=face, expand_devices=False):
+        for unit in self.loader.get_rack_units(face=face, expand_devices=False):
 
             # Loop through all units in the elevation
             device = unit['device']
@@ -289,13 +290,13 @@ class RackElevationSVG:
             )
 
             # Draw the device
-            if device and device.pk in self.permitted_device_ids:
+            if device:
                 if device.face == face and not opposite:
                     self.draw_device_front(device, device_coords, device_size)
                 else:
                     self.draw_device_rear(device, device_coords, device_size)
 
-            elif device:
+            elif unit['occupied']:
                 # Devices which the user does not have permission to view are rendered only as unavailable space
                 self.drawing.add(Rect(device_coords, device_size, class_='blocked'))
 
@@ -5,6 +5,7 @@ from dcim.models import (
     ConsolePort, ConsoleServerPort, Device, DeviceBay, DeviceRole, FrontPort, Interface, InventoryItem,
     InventoryItemRole, ModuleBay, Platform, PowerOutlet, PowerPort, RearPort, VirtualChassis,
 )
+from dcim.utils import prefetch_connected_endpoints, prefetch_link_peers
 from netbox.tables import NetBoxTable, columns
 from tenancy.tables import TenancyColumnsMixin
 from .template_code import *
@@ -293,6 +294,17 @@ class CableTerminationTable(NetBoxTable):
     )
     mark_connected = columns.BooleanColumn()
 
+    def _is_rendered(self, name, visible_only):
+        return name in self.columns and (self.columns[name].visible or not visible_only)
+
+    def prefetch_records(self, records, visible_only=False):
+        """
+        Retrieve the link peers of all records in bulk, if they are to be rendered.
+        """
+        super().prefetch_records(records, visible_only=visible_only)
+        if self._is_rendered('link_peer', visible_only):
+            prefetch_link_peers(records)
+
 
 class PathEndpointTable(CableTerminationTable):
     connection = columns.TemplateColumn(
@@ -302,6 +314,14 @@ class PathEndpointTable(CableTerminationTable):
         orderable=False
     )
 
+    def prefetch_records(self, records, visible_only=False):
+        """
+        Retrieve the CablePaths (and connected endpoints) of all records in bulk, if the connection is to be rendered.
+        """
+        super().prefetch_records(records, visible_only=visible_only)
+        if self._is_rendered('connection', visible_only):
+            prefetch_connected_endpoints(records)
+
 
 class ConsolePortTable(ModularDeviceComponentTable, PathEndpointTable):
     device = tables.Column(
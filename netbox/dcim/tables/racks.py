@@ -2,6 +2,7 @@ import django_tables2 as tables
 from django_tables2.utils import Accessor
 
 from dcim.models import Rack, RackReservation, RackRole
+from dcim.utils import prefetch_rack_utilization
 from netbox.tables import NetBoxTable, columns
 from tenancy.tables import TenancyColumnsMixin
 
@@ -95,6 +96,19 @@ class RackTable(TenancyColumnsMixin, NetBoxTable):
             'get_utilization',
         )
 
+    def prefetch_records(self, records, visible_only=False):
+        """
+        Calculate the space and power utilization of all records in bulk, if either column is to be rendered.
+        """
+        super().prefetch_records(records, visible_only=visible_only)
+
+        utilization_columns = [
+            name for name in ('get_utilization', 'get_power_utilization')
+            if name in self.columns and (self.columns[name].visible or not visible_only)
+        ]
+        if utilization_columns:
+            prefetch_rack_utilization(records, power='get_power_utilization' in utilization_columns)
+
 
 #
 # Rack reservations
@@ -1,9 +1,16 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
 from circuits.models import *
 from dcim.choices import LinkStatusChoices
 from dcim.models import *
 from dcim.svg import CableTraceSVG
+from dcim.tracing import CablePathTracer
 from dcim.utils import object_to_path_node
 
 
@@ -15,6 +22,7 @@ class CablePathTestCase(TestCase):
         1XX: Test direct connections between different endpoint types
         2XX: Test different cable topologies
         3XX: Test responses to changes in existing objects
+        4XX: Test the trace_paths management command
     """
     @classmethod
     def setUpTestData(cls):
@@ -1803,3 +1811,118 @@ class CablePathTestCase(TestCase):
             is_active=True
         )
         self.assertEqual(CablePath.objects.count(), 2)
+
+    def test_303_trace_multiple_paths_at_once(self):
+        """
+        [IF1] --C1-- [FP1] [RP1] --C2-- [RP2] [FP2] --C3-- [IF2]
+        [IF3] --C4-- [IF4]
+        """
+        interface1 = Interface.objects.create(device=self.device, name='Interface 1')
+        interface2 = Interface.objects.create(device=self.device, name='Interface 2')
+        interface3 = Interface.objects.create(device=self.device, name='Interface 3')
+        interface4 = Interface.objects.create(device=self.device, name='Interface 4')
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=1)
+        rearport2 = RearPort.objects.create(device=self.device, name='Rear Port 2', positions=1)
+        frontport1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1', rear_port=rearport1, rear_port_position=1
+        )
+        frontport2 = FrontPort.objects.create(
+            device=self.device, name='Front Port 2', rear_port=rearport2, rear_port_position=1
+        )
+        cable1 = Cable(a_terminations=[interface1], b_terminations=[frontport1])
+        cable1.save()
+        cable2 = Cable(a_terminations=[rearport1], b_terminations=[rearport2])
+        cable2.save()
+        cable3 = Cable(a_terminations=[frontport2], b_terminations=[interface2])
+        cable3.save()
+        cable4 = Cable(a_terminations=[interface3], b_terminations=[interface4])
+        cable4.save()
+        self.assertEqual(CablePath.objects.count(), 4)
+
+        # Delete all paths and retrace them together
+        CablePath.objects.all().delete()
+        origins = Interface.objects.filter(pk__in=[interface1.pk, interface2.pk, interface3.pk, interface4.pk])
+        CablePathTracer().create_paths([origin] for origin in origins)
+
+        path1 = self.assertPathExists(
+            (interface1, cable1, frontport1, rearport1, cable2, rearport2, frontport2, cable3, interface2),
+            is_complete=True,
+            is_active=True
+        )
+        path2 = self.assertPathExists(
+            (interface2, cable3, frontport2, rearport2, cable2, rearport1, frontport1, cable1, interface1),
+            is_complete=True,
+            is_active=True
+        )
+        path3 = self.assertPathExists(
+            (interface3, cable4, interface4),
+            is_complete=True,
+            is_active=True
+        )
+        path4 = self.assertPathExists(
+            (interface4, cable4, interface3),
+            is_complete=True,
+            is_active=True
+        )
+        self.assertEqual(CablePath.objects.count(), 4)
+        for interface, path in ((interface1, path1), (interface2, path2), (interface3, path3), (interface4, path4)):
+            interface.refresh_from_db()
+            self.assertPathIsSet(interface, path)
+
+    def test_304_node_index(self):
+        """
+        [IF1] --C1-- [FP1] [RP1] --C2-- [IF2]
+        """
+        interface1 = Interface.objects.create(device=self.device, name='Interface 1')
+        interface2 = Interface.objects.create(device=self.device, name='Interface 2')
+        rearport1 = RearPort.objects.create(device=self.device, name='Rear Port 1', positions=1)
+        frontport1 = FrontPort.objects.create(
+            device=self.device, name='Front Port 1', rear_port=rearport1, rear_port_position=1
+        )
+        cable1 = Cable(a_terminations=[interface1], b_terminations=[frontport1])
+        cable1.save()
+        cable2 = Cable(a_terminations=[rearport1], b_terminations=[interface2])
+        cable2.save()
+        path1 = self.assertPathExists(
+            (interface1, cable1, frontport1, rearport1, cable2, interface2),
+            is_complete=True
+        )
+        path2 = self.assertPathExists(
+            (interface2, cable2, rearport1, frontport1, cable1, interface1),
+            is_complete=True
+        )
+        self.assertEqual(CablePathNode.objects.filter(cable_path=path1).count(), 6)
+        self.assertSetEqual(set(CablePath.objects.traversing(frontport1)), {path1, path2})
+        self.assertSetEqual(set(CablePath.objects.traversing(cable1, cable2)), {path1, path2})
+
+        # Delete cable 2; the path from interface 1 is retraced up to rear port 1
+        cable2.delete()
+        path1 = self.assertPathExists(
+            (interface1, cable1, frontport1, rearport1),
+            is_complete=False
+        )
+        self.assertEqual(CablePath.objects.count(), 1)
+        self.assertFalse(CablePath.objects.traversing(interface2).exists())
+        self.assertEqual(CablePathNode.objects.count(), 4)
+
+    def test_401_trace_paths_resume(self):
+        """
+        Resuming an interrupted forced run of trace_paths traces only those origins which lack a path.
+        """
+        interface1 = Interface.objects.create(device=self.device, name='Interface 1')
+        interface2 = Interface.objects.create(device=self.device, name='Interface 2')
+        cable1 = Cable(a_terminations=[interface1], b_terminations=[interface2])
+        cable1.save()
+        self.assertEqual(CablePath.objects.count(), 2)
+
+        # Simulate a run interrupted after tracing the path from interface 1
+        Interface.objects.get(pk=interface2.pk)._path.delete()
+        with tempfile.TemporaryDirectory() as tempdir:
+            checkpoint = os.path.join(tempdir, 'checkpoint.json')
+            with open(checkpoint, 'w') as f:
+                json.dump({'force': True, 'completed': {}}, f)
+            call_command('trace_paths', checkpoint=checkpoint, no_input=True, stdout=StringIO())
+
+        self.assertEqual(CablePath.objects.count(), 2)
+        self.assertPathExists((interface1, cable1, interface2), is_complete=True)
+        self.assertPathExists((interface2, cable1, interface1), is_complete=True)
@@ -0,0 +1,108 @@
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+
+from dcim.choices import DeviceFaceChoices
+from dcim.elevations import RackElevationLoader, get_elevation_svg, get_permission_scope, get_revision
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Rack, Site
+from tenancy.models import Tenant, TenantGroup
+from users.models import ObjectPermission
+
+
+class RackElevationTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        rack = Rack.objects.create(name='Rack 1', site=site, u_height=42)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_types = (
+            DeviceType(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1', u_height=1),
+            DeviceType(manufacturer=manufacturer, model='Device Type 2', slug='device-type-2', is_full_depth=False),
+        )
+        DeviceType.objects.bulk_create(device_types)
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+
+        Device.objects.create(
+            name='Device 1', device_type=device_types[0], device_role=device_role, site=site, rack=rack, position=1,
+            face=DeviceFaceChoices.FACE_FRONT
+        )
+        Device.objects.create(
+            name='Device 2', device_type=device_types[1], device_role=device_role, site=site, rack=rack, position=2,
+            face=DeviceFaceChoices.FACE_REAR
+        )
+
+    def test_loader(self):
+        rack = Rack.objects.first()
+        loader = RackElevationLoader(rack)
+
+        # Both faces are depicted using a single query
+        with self.assertNumQueries(1):
+            front = {u['id']: u for u in loader.get_rack_units(DeviceFaceChoices.FACE_FRONT)}
+            rear = {u['id']: u for u in loader.get_rack_units(DeviceFaceChoices.FACE_REAR)}
+
+        # Device 1 is full depth
+        self.assertEqual(front[1]['device'].name, 'Device 1')
+        self.assertEqual(rear[1]['device'].name, 'Device 1')
+        self.assertIsNone(front[2]['device'])
+        self.assertEqual(rear[2]['device'].name, 'Device 2')
+
+    def test_cached_svg(self):
+        rack = Rack.objects.first()
+        svg = get_elevation_svg(rack, face=DeviceFaceChoices.FACE_FRONT)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_elevation_svg(rack, face=DeviceFaceChoices.FACE_FRONT), svg)
+
+        # Changes to the default dimensions are reflected
+        with override_settings(RACK_ELEVATION_DEFAULT_UNIT_WIDTH=300):
+            self.assertNotEqual(get_elevation_svg(rack, face=DeviceFaceChoices.FACE_FRONT), svg)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_constrained_permission_scope(self):
+        rack = Rack.objects.first()
+        tenant_groups = (
+            TenantGroup.objects.create(name='Tenant Group 1', slug='tenant-group-1'),
+            TenantGroup.objects.create(name='Tenant Group 2', slug='tenant-group-2'),
+        )
+        tenant = Tenant.objects.create(name='Tenant 1', slug='tenant-1', group=tenant_groups[0])
+        Device.objects.filter(name='Device 1').update(tenant=tenant)
+
+        user = User.objects.create_user(username='User 1')
+        obj_perm = ObjectPermission.objects.create(
+            name='Test permission',
+            constraints={'tenant__group__name': 'Tenant Group 1'},
+            actions=['view']
+        )
+        obj_perm.users.add(user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Device))
+        scope = get_permission_scope(User.objects.get(pk=user.pk), rack)
+        revision = get_revision(rack.pk)
+
+        # Moving the tenant to another group does not touch the rack, but changes the devices viewable by the user
+        tenant.group = tenant_groups[1]
+        tenant.save()
+        self.assertEqual(get_revision(rack.pk), revision)
+        self.assertNotEqual(get_permission_scope(User.objects.get(pk=user.pk), rack), scope)
+
+    def test_invalidation(self):
+        rack = Rack.objects.first()
+        revision = get_revision(rack.pk)
+
+        device = Device.objects.get(name='Device 1')
+        device.name = 'Device 3'
+        device.save()
+        self.assertNotEqual(get_revision(rack.pk), revision)
+        revision = get_revision(rack.pk)
+
+        # Changes to a DeviceType invalidate the elevations of all racks
+        device_type = DeviceType.objects.first()
+        device_type.save()
+        self.assertNotEqual(get_revision(rack.pk), revision)
+        revision = get_revision(rack.pk)
+
+        # Moving a device out of the rack invalidates its elevations
+        rack2 = Rack.objects.create(name='Rack 2', site=rack.site, u_height=42)
+        device.rack = rack2
+        device.save()
+        self.assertNotEqual(get_revision(rack.pk), revision)
@@ -1,9 +1,11 @@
+from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
 from circuits.models import *
 from dcim.choices import *
 from dcim.models import *
+from dcim.utils import prefetch_connected_endpoints, prefetch_link_peers, prefetch_rack_utilization
 from tenancy.models import Tenant
 from utilities.utils import drange
 
@@ -212,6 +214,92 @@ class RackTestCase(TestCase):
 
         self.assertEqual(len(rack.get_available_units()), rack.u_height * 2 - 3)
 
+    def test_utilization(self):
+        site = Site.objects.first()
+        rack1 = Rack.objects.first()
+        rack2 = Rack.objects.create(name='Rack 2', site=site, u_height=10)
+        attrs = {
+            'device_role': DeviceRole.objects.first(),
+            'site': site,
+            'rack': rack1,
+            'face': DeviceFaceChoices.FACE_FRONT,
+        }
+        Device(name='Device 1', device_type=DeviceType.objects.get(u_height=1), position=10, **attrs).save()
+        Device(name='Device 2', device_type=DeviceType.objects.get(u_height=0.5), position=1, **attrs).save()
+        Device(name='Device 3', device_type=DeviceType.objects.get(u_height=0), **attrs).save()
+        RackReservation.objects.create(
+            rack=rack1,
+            units=[20, 21],
+            user=User.objects.create(username='User 1'),
+            description='Reservation 1'
+        )
+
+        # 1U + 0.5U devices and two reserved units occupy 7 of 84 half-units
+        self.assertEqual(rack1.get_utilization(), 7 / 84 * 100)
+        self.assertEqual(rack2.get_utilization(), 0)
+
+        racks = list(Rack.objects.filter(pk__in=(rack1.pk, rack2.pk)))
+        prefetch_rack_utilization(racks)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                {rack.name: rack.get_utilization() for rack in racks},
+                {'Rack 1': 7 / 84 * 100, 'Rack 2': 0}
+            )
+
+    def test_power_utilization(self):
+        site = Site.objects.first()
+        rack1 = Rack.objects.first()
+        rack2 = Rack.objects.create(name='Rack 2', site=site)
+        power_panel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+        attrs = {
+            'power_panel': power_panel,
+            'rack': rack1,
+            'voltage': 100,
+            'amperage': 10,
+            'max_utilization': 100,
+        }
+        powerfeed1 = PowerFeed.objects.create(name='Power Feed 1', **attrs)
+        powerfeed2 = PowerFeed.objects.create(name='Power Feed 2', **attrs)
+
+        attrs = {
+            'device_type': DeviceType.objects.first(),
+            'device_role': DeviceRole.objects.first(),
+            'site': site,
+        }
+        pdu = Device.objects.create(name='PDU 1', **attrs)
+        device = Device.objects.create(name='Device 1', **attrs)
+
+        # Power Feed 1 supplies a PDU, whose draw is the sum of the power ports connected to its outlets
+        pdu_powerport = PowerPort.objects.create(device=pdu, name='Power Port 1')
+        poweroutlets = (
+            PowerOutlet.objects.create(device=pdu, name='Power Outlet 1', power_port=pdu_powerport),
+            PowerOutlet.objects.create(device=pdu, name='Power Outlet 2', power_port=pdu_powerport),
+        )
+        powerports = (
+            PowerPort.objects.create(device=device, name='Power Port 1', allocated_draw=100),
+            PowerPort.objects.create(device=device, name='Power Port 2', allocated_draw=200),
+            PowerPort.objects.create(device=device, name='Power Port 3', allocated_draw=300),
+        )
+        Cable(a_terminations=[powerfeed1], b_terminations=[pdu_powerport]).save()
+        Cable(a_terminations=[poweroutlets[0]], b_terminations=[powerports[0]]).save()
+        Cable(a_terminations=[poweroutlets[1]], b_terminations=[powerports[1]]).save()
+
+        # Power Feed 2 supplies a power port with an allocated draw
+        Cable(a_terminations=[powerports[2]], b_terminations=[powerfeed2]).save()
+
+        # 600VA is allocated of 2000VA available
+        rack1 = Rack.objects.get(pk=rack1.pk)
+        self.assertEqual(rack1.get_power_utilization(), 30)
+        self.assertEqual(rack2.get_power_utilization(), 0)
+
+        racks = list(Rack.objects.filter(pk__in=(rack1.pk, rack2.pk)))
+        prefetch_rack_utilization(racks)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                {rack.name: rack.get_power_utilization() for rack in racks},
+                {'Rack 1': 30, 'Rack 2': 0}
+            )
+
     def test_change_rack_site(self):
         """
         Check that child Devices get updated when a Rack is moved to a new Site.
@@ -567,3 +655,149 @@ class CableTestCase(TestCase):
         cable = Cable(a_terminations=[self.interface2], b_terminations=[wireless_interface])
         with self.assertRaises(ValidationError):
             cable.clean()
+
+
+class PowerPortTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        pdu = Device.objects.create(name='PDU 1', device_type=device_type, device_role=device_role, site=site)
+        device = Device.objects.create(name='Device 1', device_type=device_type, device_role=device_role, site=site)
+
+        power_port = PowerPort.objects.create(device=pdu, name='Power Port 1')
+        PowerOutlet.objects.create(
+            device=pdu, name='Power Outlet 1', power_port=power_port, feed_leg=PowerOutletFeedLegChoices.FEED_LEG_A
+        )
+        PowerOutlet.objects.create(
+            device=pdu, name='Power Outlet 2', power_port=power_port, feed_leg=PowerOutletFeedLegChoices.FEED_LEG_B
+        )
+        PowerPort.objects.create(device=device, name='Power Port 1', allocated_draw=100, maximum_draw=150)
+        PowerPort.objects.create(device=device, name='Power Port 2', allocated_draw=200, maximum_draw=250)
+
+        power_panel = PowerPanel.objects.create(site=site, name='Power Panel 1')
+        PowerFeed.objects.create(power_panel=power_panel, name='Power Feed 1')
+
+    def get_power_draw(self):
+        return PowerPort.objects.get(device__name='PDU 1').get_power_draw()
+
+    def test_power_draw(self):
+        self.assertEqual(self.get_power_draw(), {'allocated': 0, 'maximum': 0, 'outlet_count': 2, 'legs': []})
+
+        powerports = PowerPort.objects.filter(device__name='Device 1')
+        for poweroutlet, powerport in zip(PowerOutlet.objects.all(), powerports):
+            Cable(a_terminations=[poweroutlet], b_terminations=[powerport]).save()
+        self.assertEqual(self.get_power_draw(), {'allocated': 300, 'maximum': 400, 'outlet_count': 2, 'legs': []})
+
+        # Changes to the draw of a downstream power port are reflected
+        powerport = powerports.get(name='Power Port 2')
+        powerport.allocated_draw = 50
+        powerport.save()
+        self.assertEqual(self.get_power_draw()['allocated'], 150)
+
+        # Disconnected power ports are excluded
+        PowerPort.objects.get(pk=powerport.pk).cable.delete()
+        self.assertEqual(self.get_power_draw()['allocated'], 100)
+
+    def test_power_draw_multiple_outlets(self):
+        # A power port connected to several outlets is counted once
+        Cable(
+            a_terminations=list(PowerOutlet.objects.all()),
+            b_terminations=[PowerPort.objects.get(device__name='Device 1', name='Power Port 1')]
+        ).save()
+        self.assertEqual(self.get_power_draw(), {'allocated': 100, 'maximum': 150, 'outlet_count': 2, 'legs': []})
+
+    def test_power_draw_not_saved(self):
+        # Saving a stale instance does not overwrite the cached power draw
+        powerport = PowerPort.objects.get(device__name='PDU 1')
+        Cable(
+            a_terminations=[PowerOutlet.objects.get(name='Power Outlet 1')],
+            b_terminations=[PowerPort.objects.get(device__name='Device 1', name='Power Port 1')]
+        ).save()
+        powerport.description = 'Updated'
+        powerport.save()
+        self.assertEqual(self.get_power_draw()['allocated'], 100)
+
+    def test_power_draw_legs(self):
+        powerfeed = PowerFeed.objects.first()
+        powerport = PowerPort.objects.get(device__name='PDU 1')
+        Cable(a_terminations=[powerfeed], b_terminations=[powerport]).save()
+        Cable(
+            a_terminations=[PowerOutlet.objects.get(name='Power Outlet 1')],
+            b_terminations=[PowerPort.objects.get(device__name='Device 1', name='Power Port 1')]
+        ).save()
+        self.assertEqual(self.get_power_draw()['legs'], [])
+
+        # Per-leg draw is calculated once the feed is three-phase
+        powerfeed.phase = PowerFeedPhaseChoices.PHASE_3PHASE
+        powerfeed.save()
+        self.assertEqual(self.get_power_draw()['legs'], [
+            {'name': 'A', 'allocated': 100, 'maximum': 150, 'outlet_count': 1},
+            {'name': 'B', 'allocated': 0, 'maximum': 0, 'outlet_count': 1},
+            {'name': 'C', 'allocated': 0, 'maximum': 0, 'outlet_count': 0},
+        ])
+
+
+class CabledObjectPrefetchTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        devices = (
+            Device.objects.create(name='Device 1', device_type=device_type, device_role=device_role, site=site),
+            Device.objects.create(name='Device 2', device_type=device_type, device_role=device_role, site=site),
+        )
+        for device in devices:
+            Interface.objects.bulk_create([
+                Interface(device=device, name=f'Interface {i}', type=InterfaceTypeChoices.TYPE_1GE_FIXED)
+                for i in range(1, 4)
+            ])
+        a_interfaces = list(Interface.objects.filter(device=devices[0]))
+        b_interfaces = list(Interface.objects.filter(device=devices[1]))
+
+        Cable(a_terminations=[a_interfaces[0]], b_terminations=[b_interfaces[0]]).save()
+        Cable(a_terminations=[a_interfaces[1]], b_terminations=[b_interfaces[1], b_interfaces[2]]).save()
+
+    def test_prefetch_link_peers(self):
+        interfaces = list(Interface.objects.filter(device__name='Device 1'))
+
+        # One query for all cable terminations, and two for the peer interfaces and their devices
+        with self.assertNumQueries(3):
+            prefetch_link_peers(interfaces)
+        with self.assertNumQueries(0):
+            link_peers = [
+                [(peer.device.name, peer.name) for peer in interface.link_peers] for interface in interfaces
+            ]
+
+        self.assertEqual(link_peers, [
+            [('Device 2', 'Interface 1')],
+            [('Device 2', 'Interface 2'), ('Device 2', 'Interface 3')],
+            [],
+        ])
+        for interface in interfaces:
+            self.assertEqual(interface.link_peers, Interface.objects.get(pk=interface.pk).link_peers)
+
+    def test_prefetch_connected_endpoints(self):
+        interfaces = list(Interface.objects.filter(device__name='Device 1'))
+
+        # One query for all CablePaths, and one for each type of path object (and related devices)
+        with self.assertNumQueries(4):
+            prefetch_connected_endpoints(interfaces)
+        with self.assertNumQueries(0):
+            connected_endpoints = [
+                [(endpoint.device.name, endpoint.name) for endpoint in interface.connected_endpoints]
+                for interface in interfaces
+            ]
+            self.assertTrue(interfaces[0]._path.is_active)
+
+        self.assertEqual(connected_endpoints, [
+            [('Device 2', 'Interface 1')],
+            [('Device 2', 'Interface 2'), ('Device 2', 'Interface 3')],
+            [],
+        ])
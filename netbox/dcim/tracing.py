@@ -0,0 +1,504 @@
+import itertools
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from circuits.models import CircuitTermination, ProviderNetwork
+from dcim.choices import CableEndChoices, LinkStatusChoices
+from dcim.models import Cable, CablePath, CablePathNode, CableTermination, FrontPort, RearPort, Site
+from dcim.utils import compile_path_node, decompile_path_node, object_to_path_node
+from wireless.models import WirelessLink
+
+__all__ = (
+    'CablePathTracer',
+)
+
+
+class Trace:
+    """
+    The state of a single CablePath being traced by CablePathTracer.
+    """
+    def __init__(self, origins):
+        self.origins = list(origins)
+        self.terminations = self.origins
+        self.remote_terminations = []
+        self.link = None
+        self.path = []
+        self.position_stack = []
+        self.is_complete = False
+        self.is_active = True
+        self.is_split = False
+        self.is_finished = not self.origins
+        self.is_empty = not self.origins
+
+    def finish(self, is_empty=False):
+        self.is_finished = True
+        self.is_empty = is_empty
+
+    def to_cablepath(self):
+        if self.is_empty:
+            return None
+        return CablePath(
+            path=self.path,
+            is_complete=self.is_complete,
+            is_active=self.is_active,
+            is_split=self.is_split
+        )
+
+
+def get_link_key(termination):
+    """
+    Return a hashable (model, ID) reference to the link (Cable or WirelessLink) attached to a termination, if any.
+    """
+    if termination.cable_id:
+        return Cable, termination.cable_id
+    if getattr(termination, 'wireless_link_id', None):
+        return WirelessLink, termination.wireless_link_id
+    return None
+
+
+class CablePathTracer:
+    """
+    Trace CablePaths for many sets of originating terminations at once.
+
+    All paths are advanced together one hop at a time. Each hop fetches the links, cable terminations, far-end
+    objects and pass-through ports needed by *every* path using a single query per model, so the number of queries
+    is proportional to the length of the longest path rather than to the number of paths being traced.
+
+    :param batch_size: The number of objects written per query when saving paths
+    """
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+
+    def trace(self, origin_groups):
+        """
+        Trace a path from each set of origins and return a list of unsaved CablePaths (or None where no path
+        exists), in the same order as the given origins. The originating terminations in each set must all be of the
+        same type and must be attached to the same link.
+        """
+        return self._run([Trace(origins) for origins in origin_groups])
+
+    def _run(self, traces):
+        """
+        Advance all the given traces until each is finished, and return the resulting CablePaths.
+        """
+        active = [t for t in traces if not t.is_finished]
+        while active:
+            for step in (self._record_near_end, self._follow_links, self._follow_next_hops):
+                step(active)
+                active = [t for t in active if not t.is_finished]
+
+        return [t.to_cablepath() for t in traces]
+
+    def create_paths(self, origin_groups):
+        """
+        Trace and save a new CablePath for each set of origins, recording it on the originating terminations.
+        """
+        origin_groups = [list(origins) for origins in origin_groups]
+        cablepaths = self.trace(origin_groups)
+
+        self._save_paths([
+            (cablepath, origins) for cablepath, origins in zip(cablepaths, origin_groups) if cablepath is not None
+        ])
+
+    def rebuild_paths(self, objects):
+        """
+        Retrace all CablePaths which traverse any of the given objects, starting from the hop at which each object
+        appears.
+        """
+        objects = list(objects)
+        self.retrace_paths(
+            CablePath.objects.traversing(*objects),
+            changed_nodes=[object_to_path_node(obj) for obj in objects]
+        )
+
+    def retrace_paths(self, cablepaths, changed_nodes=None):
+        """
+        Retrace existing CablePaths, updating them in place. Paths which no longer have an attached link are deleted.
+
+        If changed_nodes is given, the portion of each path preceding the first hop affected by a change to any of
+        these nodes is retained, and only the remainder of the path is retraced.
+        """
+        cablepaths = list(cablepaths)
+        if not cablepaths:
+            return
+        origin_groups = self._get_origins(cablepaths)
+        traces = [Trace(origins) for origins in origin_groups]
+        if changed_nodes:
+            self._resume_traces(traces, cablepaths, changed_nodes)
+        new_cablepaths = self._run(traces)
+
+        to_update = []
+        to_delete = []
+        for cablepath, new_cablepath, origins in zip(cablepaths, new_cablepaths, origin_groups):
+            if new_cablepath is None:
+                to_delete.append(cablepath.pk)
+                continue
+            cablepath.path = new_cablepath.path
+            cablepath.is_complete = new_cablepath.is_complete
+            cablepath.is_active = new_cablepath.is_active
+            cablepath.is_split = new_cablepath.is_split
+            to_update.append((cablepath, origins))
+
+        with transaction.atomic():
+            CablePath.objects.filter(pk__in=to_delete).delete()
+            self._save_paths(to_update, update=True)
+
+    #
+    # Tracing steps
+    #
+
+    def _record_near_end(self, traces):
+        """
+        Record the near-end terminations of each path and determine their attached link.
+        """
+        for trace in traces:
+            terminations = trace.terminations
+            if not terminations:
+                trace.finish()
+                continue
+
+            # Terminations must all be of the same type
+            assert all(isinstance(t, type(terminations[0])) for t in terminations[1:])
+
+            # Check for a split path (e.g. rear port fanning out to multiple front ports with
+            # different cables attached)
+            links = {get_link_key(t) for t in terminations}
+            if len(links) > 1:
+                trace.is_split = True
+                trace.finish()
+                continue
+
+            # Step 1: Record the near-end termination object(s)
+            trace.path.append([
+                object_to_path_node(t) for t in terminations
+            ])
+
+            # Step 2: Determine the attached link (Cable or WirelessLink), if any. If this is the start of the path
+            # and no link exists, no path is created. Otherwise, halt the trace.
+            trace.link = links.pop()
+            if trace.link is None:
+                trace.finish(is_empty=len(trace.path) == 1)
+
+    def _follow_links(self, traces):
+        """
+        Record the link attached to each path and its far-end terminations.
+        """
+        link_ids = defaultdict(set)
+        for trace in traces:
+            model, pk = trace.link
+            link_ids[model].add(pk)
+
+        cables = Cable.objects.in_bulk(link_ids[Cable])
+        wireless_links = WirelessLink.objects.select_related('interface_a', 'interface_b').in_bulk(
+            link_ids[WirelessLink]
+        )
+        cable_ends = defaultdict(lambda: defaultdict(list))
+        for cable_termination in CableTermination.objects.filter(cable_id__in=link_ids[Cable]):
+            cable_ends[cable_termination.cable_id][cable_termination.cable_end].append(
+                (cable_termination.termination_type_id, cable_termination.termination_id)
+            )
+
+        # Determine the far-end terminations (as content type & object ID pairs) for each Cable
+        remote_ids = {}
+        to_fetch = defaultdict(set)
+        for trace in traces:
+            model, pk = trace.link
+            link = cables.get(pk) if model is Cable else wireless_links.get(pk)
+            if link is None:
+                # The link has been deleted
+                trace.finish(is_empty=len(trace.path) == 1)
+                continue
+
+            # Step 3: Record the link and update path status if not "connected"
+            trace.path.append([object_to_path_node(link)])
+            if hasattr(link, 'status') and link.status != LinkStatusChoices.STATUS_CONNECTED:
+                trace.is_active = False
+
+            # Step 4: Determine the far-end terminations
+            if model is Cable:
+                termination_type = ContentType.objects.get_for_model(trace.terminations[0])
+                local_cable_ends = [
+                    end for end, terminations in cable_ends[pk].items()
+                    if (termination_type.pk, trace.terminations[0].pk) in terminations
+                ]
+                # Terminations must all belong to same end of Cable
+                local_cable_end = local_cable_ends[0]
+                assert all(
+                    (termination_type.pk, t.pk) in cable_ends[pk][local_cable_end] for t in trace.terminations[1:]
+                )
+                remote_cable_end = CableEndChoices.SIDE_A if local_cable_end == CableEndChoices.SIDE_B \
+                    else CableEndChoices.SIDE_B
+                remote_ids[trace] = cable_ends[pk][remote_cable_end]
+                for ct_id, object_id in remote_ids[trace]:
+                    to_fetch[ct_id].add(object_id)
+            else:
+                # WirelessLink
+                if link.interface_a_id == trace.terminations[0].pk:
+                    trace.remote_terminations = [link.interface_b]
+                else:
+                    trace.remote_terminations = [link.interface_a]
+
+        # Fetch the far-end termination objects using one query per type
+        remote_objects = self._get_objects(to_fetch)
+        for trace, object_ids in remote_ids.items():
+            trace.remote_terminations = [remote_objects[i] for i in object_ids if i in remote_objects]
+
+        # Step 5: Record the far-end termination object(s)
+        for trace in traces:
+            if trace.is_finished:
+                continue
+            trace.path.append([
+                object_to_path_node(t) for t in trace.remote_terminations
+            ])
+            if not trace.remote_terminations:
+                trace.finish()
+
+    def _follow_next_hops(self, traces):
+        """
+        Determine the "next hop" terminations of each path, if applicable.
+        """
+        rear_port_ids = set()
+        front_port_rear_port_ids = set()
+        circuit_ids = set()
+        for trace in traces:
+            remote_termination = trace.remote_terminations[0]
+            if isinstance(remote_termination, FrontPort):
+                rear_port_ids.update(fp.rear_port_id for fp in trace.remote_terminations)
+            elif isinstance(remote_termination, RearPort):
+                front_port_rear_port_ids.update(rp.pk for rp in trace.remote_terminations)
+            elif isinstance(remote_termination, CircuitTermination):
+                circuit_ids.add(remote_termination.circuit_id)
+
+        # Fetch all pass-through ports and circuit terminations at once. Ports are ranked by their position within
+        # each (ordered) queryset so that each path lists them in the same order a dedicated query would return.
+        all_rear_ports = list(RearPort.objects.filter(pk__in=rear_port_ids)) if rear_port_ids else []
+        rear_ports_by_id = {rp.pk: rp for rp in all_rear_ports}
+        all_front_ports = list(
+            FrontPort.objects.filter(rear_port_id__in=front_port_rear_port_ids)
+        ) if front_port_rear_port_ids else []
+        front_ports_by_rear_port = defaultdict(list)
+        for front_port in all_front_ports:
+            front_ports_by_rear_port[front_port.rear_port_id].append(front_port)
+        rank = {
+            (type(port), port.pk): i for i, port in enumerate(itertools.chain(all_rear_ports, all_front_ports))
+        }
+        circuit_terminations = {
+            (ct.circuit_id, ct.term_side): ct
+            for ct in CircuitTermination.objects.filter(circuit_id__in=circuit_ids)
+        } if circuit_ids else {}
+
+        def ranked(ports):
+            return sorted(ports, key=lambda port: rank[(type(port), port.pk)])
+
+        for trace in traces:
+            remote_terminations = trace.remote_terminations
+
+            if isinstance(remote_terminations[0], FrontPort):
+                # Follow FrontPorts to their corresponding RearPorts
+                rear_ports = ranked({
+                    rear_ports_by_id[t.rear_port_id] for t in remote_terminations
+                })
+                if len(rear_ports) > 1:
+                    assert all(rp.positions == 1 for rp in rear_ports)
+                elif rear_ports[0].positions > 1:
+                    trace.position_stack.append([fp.rear_port_position for fp in remote_terminations])
+
+                trace.terminations = rear_ports
+
+            elif isinstance(remote_terminations[0], RearPort):
+
+                if len(remote_terminations) > 1 or remote_terminations[0].positions == 1:
+                    front_ports = ranked([
+                        fp for rp in remote_terminations for fp in front_ports_by_rear_port[rp.pk]
+                        if fp.rear_port_position == 1
+                    ])
+                elif trace.position_stack:
+                    positions = trace.position_stack.pop()
+                    front_ports = [
+                        fp for fp in front_ports_by_rear_port[remote_terminations[0].pk]
+                        if fp.rear_port_position in positions
+                    ]
+                else:
+                    # No position indicated: path has split, so we stop at the RearPorts
+                    trace.is_split = True
+                    trace.finish()
+                    continue
+
+                trace.terminations = front_ports
+
+            elif isinstance(remote_terminations[0], CircuitTermination):
+                # Follow a CircuitTermination to its corresponding CircuitTermination (A to Z or vice versa)
+                term_side = remote_terminations[0].term_side
+                assert all(ct.term_side == term_side for ct in remote_terminations[1:])
+                circuit_termination = circuit_terminations.get(
+                    (remote_terminations[0].circuit_id, 'Z' if term_side == 'A' else 'A')
+                )
+                if circuit_termination is None:
+                    trace.finish()
+                    continue
+                elif circuit_termination.provider_network_id:
+                    # Circuit terminates to a ProviderNetwork
+                    provider_network_type = ContentType.objects.get_for_model(ProviderNetwork)
+                    trace.path.extend([
+                        [object_to_path_node(circuit_termination)],
+                        [compile_path_node(provider_network_type.pk, circuit_termination.provider_network_id)],
+                    ])
+                    trace.finish()
+                    continue
+                elif circuit_termination.site_id and not circuit_termination.cable_id:
+                    # Circuit terminates to a Site
+                    site_type = ContentType.objects.get_for_model(Site)
+                    trace.path.extend([
+                        [object_to_path_node(circuit_termination)],
+                        [compile_path_node(site_type.pk, circuit_termination.site_id)],
+                    ])
+                    trace.finish()
+                    continue
+
+                trace.terminations = [circuit_termination]
+
+            # Anything else marks the end of the path
+            else:
+                trace.is_complete = True
+                trace.finish()
+
+    #
+    # Helpers
+    #
+
+    def _resume_traces(self, traces, cablepaths, changed_nodes):
+        """
+        Prepare each trace to resume from its existing CablePath at the last hop unaffected by the changed nodes. The
+        state accumulated over the retained hops (the position stack and the status of each link) is replayed from
+        the existing path. Traces which cannot be resumed are left to be retraced from their origins.
+        """
+        changed_nodes = set(changed_nodes)
+        front_port_type = ContentType.objects.get_for_model(FrontPort).pk
+        rear_port_type = ContentType.objects.get_for_model(RearPort).pk
+
+        # Determine the near-end hop from which to resume each trace. A hop is affected if its near-end
+        # terminations, link, or far-end terminations have changed. Because the near-end terminations are derived
+        # from the preceding hop, a change to one of them also affects the preceding hop.
+        resume = {}
+        for trace, cablepath in zip(traces, cablepaths):
+            for i, step in enumerate(cablepath.path):
+                if changed_nodes.intersection(step):
+                    index = max(0, (i - 1) // 3 * 3)
+                    if index and trace.origins:
+                        resume[trace] = (cablepath.path[:index + 1], index)
+                    break
+
+        # Fetch the links and pass-through ports within the retained hops, and the terminations to resume from
+        to_fetch = defaultdict(set)
+        for path, index in resume.values():
+            for i, step in enumerate(path):
+                for node in step:
+                    ct_id, object_id = decompile_path_node(node)
+                    if i == index or i % 3 == 1 or ct_id in (front_port_type, rear_port_type):
+                        to_fetch[ct_id].add(object_id)
+        objects = self._get_objects(to_fetch)
+
+        for trace, (path, index) in resume.items():
+            steps = []
+            for i, step in enumerate(path):
+                keys = [decompile_path_node(node) for node in step]
+                if i == index or i % 3 == 1 or any(ct_id in (front_port_type, rear_port_type) for ct_id, _ in keys):
+                    if not all(key in objects for key in keys):
+                        # An object within the retained hops no longer exists; retrace the entire path
+                        break
+                    steps.append([objects[key] for key in keys])
+                else:
+                    steps.append(None)
+            else:
+                is_active = True
+                position_stack = []
+                for hop in range(index // 3):
+                    link = steps[hop * 3 + 1][0]
+                    if hasattr(link, 'status') and link.status != LinkStatusChoices.STATUS_CONNECTED:
+                        is_active = False
+                    remote_terminations, next_terminations = steps[hop * 3 + 2], steps[hop * 3 + 3]
+                    if not remote_terminations or not next_terminations:
+                        continue
+                    if isinstance(remote_terminations[0], FrontPort):
+                        if len(next_terminations) == 1 and next_terminations[0].positions > 1:
+                            position_stack.append([fp.rear_port_position for fp in remote_terminations])
+                    elif isinstance(remote_terminations[0], RearPort):
+                        if len(remote_terminations) == 1 and remote_terminations[0].positions > 1 and position_stack:
+                            position_stack.pop()
+
+                trace.path = [list(step) for step in path[:index]]
+                trace.terminations = steps[index]
+                trace.position_stack = position_stack
+                trace.is_active = is_active
+
+    @staticmethod
+    def _get_objects(object_ids):
+        """
+        Given a mapping of content type IDs to sets of object IDs, return a dictionary mapping each (content type ID,
+        object ID) pair to its instance, using one query per content type. Objects which no longer exist are omitted.
+        """
+        objects = {}
+        for ct_id, pks in object_ids.items():
+            model = ContentType.objects.get_for_id(ct_id).model_class()
+            for obj in model.objects.filter(pk__in=pks):
+                objects[(ct_id, obj.pk)] = obj
+        return objects
+
+    def _get_origins(self, cablepaths):
+        """
+        Return the list of originating objects for each of the given CablePaths.
+        """
+        to_fetch = defaultdict(set)
+        for cablepath in cablepaths:
+            for node in cablepath.path[0]:
+                ct_id, object_id = decompile_path_node(node)
+                to_fetch[ct_id].add(object_id)
+        objects = self._get_objects(to_fetch)
+
+        return [
+            [
+                objects[key] for key in map(decompile_path_node, cablepath.path[0]) if key in objects
+            ] for cablepath in cablepaths
+        ]
+
+    def _save_paths(self, cablepaths, update=False):
+        """
+        Write the given CablePaths to the database and record each on its originating objects.
+
+        :param cablepaths: Iterable of (CablePath, origins) tuples
+        :param update: If True, update existing CablePaths instead of creating new ones
+        """
+        if not cablepaths:
+            return
+
+        with transaction.atomic():
+
+            # Save the flattened nodes list
+            for cablepath, _ in cablepaths:
+                cablepath._nodes = list(itertools.chain(*cablepath.path))
+
+            if update:
+                CablePath.objects.bulk_update(
+                    [cablepath for cablepath, _ in cablepaths],
+                    ['path', 'is_active', 'is_complete', 'is_split', '_nodes'],
+                    batch_size=self.batch_size
+                )
+            else:
+                CablePath.objects.bulk_create(
+                    [cablepath for cablepath, _ in cablepaths],
+                    batch_size=self.batch_size
+                )
+
+            # Record a direct reference to each CablePath on its originating object(s)
+            origins_by_model = defaultdict(list)
+            for cablepath, origins in cablepaths:
+                for origin in origins:
+                    origin._path = cablepath
+                    origins_by_model[type(origin)].append(origin)
+            for model, origins in origins_by_model.items():
+                model.objects.bulk_update(origins, ['_path'], batch_size=self.batch_size)
+
+            # Update the reverse node index
+            CablePathNode.update_index([cablepath for cablepath, _ in cablepaths])
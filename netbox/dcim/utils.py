@@ -1,7 +1,9 @@
-import itertools
+from collections import Counter, defaultdict
 
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
+
+from utilities.utils import drange
+from .choices import CableEndChoices, PowerFeedPhaseChoices, PowerOutletFeedLegChoices
 
 
 def compile_path_node(ct_id, object_id):
@@ -38,23 +40,300 @@ def create_cablepath(terminations):
 
     :param terminations: Iterable of CableTermination objects
     """
-    from dcim.models import CablePath
+    from dcim.tracing import CablePathTracer
 
-    cp = CablePath.from_origin(terminations)
-    if cp:
-        cp.save()
+    CablePathTracer().create_paths([terminations])
 
 
 def rebuild_paths(terminations):
     """
     Rebuild all CablePaths which traverse the specified nodes.
     """
+    from dcim.tracing import CablePathTracer
+
+    CablePathTracer().rebuild_paths(terminations)
+
+
+def _opposite_cable_end(cable_end):
+    return CableEndChoices.SIDE_A if cable_end == CableEndChoices.SIDE_B else CableEndChoices.SIDE_B
+
+
+def get_rack_utilization(racks):
+    """
+    Calculate the utilization (as a percentage) of each of the given Racks, using a constant number of queries. Occupied
+    and reserved units both count as utilized. Returns a dictionary mapping rack PKs to their utilization.
+    """
+    from dcim.models import Device, RackReservation
+
+    racks = {rack.pk: rack for rack in racks}
+    utilized_units = defaultdict(set)
+
+    # Gather the units consumed by installed devices
+    devices = Device.objects.filter(rack__in=racks, position__gte=1).values_list(
+        'rack_id', 'position', 'device_type__u_height'
+    )
+    for rack_id, position, u_height in devices:
+        utilized_units[rack_id].update(drange(position, position + u_height, 0.5))
+
+    # Gather reserved units
+    reservations = RackReservation.objects.filter(rack__in=racks).values_list('rack_id', 'units')
+    for rack_id, units in reservations:
+        for u in units:
+            utilized_units[rack_id].update(drange(u, u + 1, 0.5))
+
+    utilization = {}
+    for pk, rack in racks.items():
+        units = set(rack.units)
+        utilization[pk] = float(len(units & utilized_units[pk])) / len(units) * 100
+
+    return utilization
+
+
+def get_rack_power_utilization(racks):
+    """
+    Calculate the power utilization (as a percentage) of each of the given Racks, using a constant number of queries.
+    The power allocated to each PowerPort connected to a PowerFeed within the rack is summed, as per
+    PowerPort.get_power_draw(). Returns a dictionary mapping rack PKs to their power utilization.
+    """
+    from dcim.models import PowerFeed, PowerPort
+
+    rack_ids = [rack.pk for rack in racks]
+    available_power = defaultdict(int)
+    allocated_draw = defaultdict(int)
+
+    # Map the near end of each cabled PowerFeed to its rack
+    feed_ends = {}
+    powerfeeds = PowerFeed.objects.filter(rack__in=rack_ids).values_list(
+        'rack_id', 'available_power', 'cable_id', 'cable_end'
+    )
+    for rack_id, power, cable_id, cable_end in powerfeeds:
+        available_power[rack_id] += power
+        if cable_id:
+            feed_ends[(cable_id, cable_end)] = rack_id
+
+    # Find the PowerPorts attached to the far end of each PowerFeed's cable, and sum their allocated draw
+    powerports = PowerPort.objects.filter(cable__in={cable_id for cable_id, _ in feed_ends}).values_list(
+        'cable_id', 'cable_end', 'allocated_draw', 'maximum_draw', '_power_draw'
+    )
+    for cable_id, cable_end, allocated, maximum, power_draw in powerports:
+        rack_id = feed_ends.get((cable_id, _opposite_cable_end(cable_end)))
+        if rack_id is None:
+            continue
+        if allocated is None and maximum is None:
+            allocated_draw[rack_id] += power_draw.get('allocated', 0)
+        else:
+            allocated_draw[rack_id] += allocated or 0
+
+    return {
+        pk: int(allocated_draw[pk] / available_power[pk] * 100) if available_power[pk] else 0
+        for pk in rack_ids
+    }
+
+
+def update_power_draw(powerport_ids):
+    """
+    Recalculate the power draw of the given PowerPorts from their child PowerOutlets and the PowerPorts connected to
+    them (see PowerPort.get_power_draw()), and store it on each PowerPort. A constant number of queries is used.
+    """
+    from dcim.models import CableTermination, PowerFeed, PowerOutlet, PowerPort
+
+    powerport_ids = set(powerport_ids) - {None}
+    if not powerport_ids:
+        return
+    powerports = PowerPort.objects.filter(pk__in=powerport_ids).values_list('pk', 'cable_id', 'cable_end')
+
+    # Identify the PowerPorts connected to a single three-phase PowerFeed, for which per-leg draw is calculated
+    far_ends = {(cable_id, _opposite_cable_end(cable_end)): pk for pk, cable_id, cable_end in powerports if cable_id}
+    three_phase = set()
+    if far_ends:
+        cables = {cable_id for cable_id, _ in far_ends}
+        peer_counts = Counter(CableTermination.objects.filter(cable__in=cables).values_list('cable_id', 'cable_end'))
+        feed_ends = PowerFeed.objects.filter(
+            cable__in=cables,
+            phase=PowerFeedPhaseChoices.PHASE_3PHASE
+        ).values_list('cable_id', 'cable_end')
+        for end in feed_ends:
+            if end in far_ends and peer_counts[end] == 1:
+                three_phase.add(far_ends[end])
+
+    def get_totals():
+        return {'allocated': 0, 'maximum': 0, 'outlet_count': 0}
+
+    totals = {pk: {**get_totals(), 'legs': []} for pk, _, _ in powerports}
+    leg_totals = {pk: {leg: get_totals() for leg, _ in PowerOutletFeedLegChoices} for pk in three_phase}
+
+    # Count the child PowerOutlets of each PowerPort, and map the far end of each cabled PowerOutlet to the outlet's
+    # PowerPort and feed leg. Several outlets may terminate to the same end of a cable.
+    outlet_ends = defaultdict(dict)
+    poweroutlets = PowerOutlet.objects.filter(power_port__in=totals).values_list(
+        'pk', 'power_port_id', 'feed_leg', 'cable_id', 'cable_end'
+    )
+    for pk, power_port_id, feed_leg, cable_id, cable_end in poweroutlets:
+        totals[power_port_id]['outlet_count'] += 1
+        if feed_leg in leg_totals.get(power_port_id, {}):
+            leg_totals[power_port_id][feed_leg]['outlet_count'] += 1
+        if cable_id:
+            outlet_ends[(cable_id, _opposite_cable_end(cable_end))][pk] = (power_port_id, feed_leg)
+
+    # Sum the draw of all PowerPorts connected to a child PowerOutlet. A PowerPort connected to several outlets of the
+    # same PowerPort (or feed leg) is counted only once toward its total.
+    if outlet_ends:
+        downstream_powerports = PowerPort.objects.filter(
+            cable__in={cable_id for cable_id, _ in outlet_ends}
+        ).values_list('cable_id', 'cable_end', 'allocated_draw', 'maximum_draw')
+        for cable_id, cable_end, allocated, maximum in downstream_powerports:
+            outlets = outlet_ends.get((cable_id, cable_end), {}).values()
+            subtotals = {(power_port_id, None) for power_port_id, _ in outlets}
+            subtotals.update(
+                (power_port_id, feed_leg) for power_port_id, feed_leg in outlets
+                if feed_leg in leg_totals.get(power_port_id, {})
+            )
+            for power_port_id, feed_leg in subtotals:
+                subtotal = leg_totals[power_port_id][feed_leg] if feed_leg else totals[power_port_id]
+                subtotal['allocated'] += allocated or 0
+                subtotal['maximum'] += maximum or 0
+
+    for pk, legs in leg_totals.items():
+        totals[pk]['legs'] = [
+            {'name': leg_name, **legs[leg]} for leg, leg_name in PowerOutletFeedLegChoices
+        ]
+
+    PowerPort.objects.bulk_update(
+        [PowerPort(pk=pk, _power_draw=power_draw) for pk, power_draw in totals.items()],
+        fields=['_power_draw'],
+        batch_size=100
+    )
+
+
+def recalculate_power_draw(chunk_size=1000):
+    """
+    Recalculate the power draw of all PowerPorts, in chunks. Returns the number of PowerPorts updated.
+    """
+    from dcim.models import PowerPort
+
+    pks = list(PowerPort.objects.order_by('pk').values_list('pk', flat=True))
+    for i in range(0, len(pks), chunk_size):
+        update_power_draw(pks[i:i + chunk_size])
+
+    return len(pks)
+
+
+def get_cable_powerport_ids(cable_ids):
+    """
+    Return the PKs of all PowerPorts whose power draw may be affected by a change to the given cables: PowerPorts
+    terminating on the cables, and the parents of PowerOutlets terminating on the cables.
+    """
+    from dcim.models import PowerOutlet, PowerPort
+
+    cable_ids = set(cable_ids) - {None}
+    if not cable_ids:
+        return set()
+
+    poweroutlets = PowerOutlet.objects.filter(cable__in=cable_ids, power_port__isnull=False)
+    return {
+        *PowerPort.objects.filter(cable__in=cable_ids).values_list('pk', flat=True),
+        *poweroutlets.values_list('power_port_id', flat=True),
+    }
+
+
+def prefetch_rack_utilization(racks, power=True):
+    """
+    Calculate the space (and optionally power) utilization of the given Racks in bulk, and cache the results on each
+    instance for use by Rack.get_utilization() and Rack.get_power_utilization().
+    """
+    racks = list(racks)
+    if not racks:
+        return
+
+    utilization = get_rack_utilization(racks)
+    power_utilization = get_rack_power_utilization(racks) if power else {}
+    for rack in racks:
+        rack._utilization = utilization[rack.pk]
+        if power:
+            rack._power_utilization = power_utilization[rack.pk]
+
+
+def get_objects_by_type(object_ids):
+    """
+    Retrieve objects of any type using one query per model, given a mapping of ContentType IDs to object IDs. The
+    parent objects (device, circuit, etc.) of each object are prefetched as well. Returns a mapping of ContentType IDs
+    to dictionaries of objects by ID; objects which no longer exist are omitted.
+    """
+    prefetched = {}
+    for ct_id, ids in object_ids.items():
+        model = ContentType.objects.get_for_id(ct_id).model_class()
+        field_names = {field.name for field in model._meta.get_fields()}
+        queryset = model.objects.filter(pk__in=ids).prefetch_related(
+            *[name for name in ('device', 'circuit', 'power_panel') if name in field_names]
+        )
+        prefetched[ct_id] = {obj.pk: obj for obj in queryset}
+
+    return prefetched
+
+
+def prefetch_link_peers(objects):
+    """
+    Populate the `link_peers` of the given cabled objects (interfaces, console ports, etc.) in bulk. The terminations
+    of all attached cables are retrieved using a single query, and their peer objects using one query per type.
+    """
+    from dcim.models import CableTermination, Interface
+
+    objects = [obj for obj in objects if 'link_peers' not in obj.__dict__]
+
+    # Map each cable end to the objects terminating on the opposite end
+    cable_ids = {obj.cable_id for obj in objects if obj.cable_id}
+    peer_nodes = defaultdict(list)
+    object_ids = defaultdict(set)
+    if cable_ids:
+        terminations = CableTermination.objects.filter(cable__in=cable_ids).order_by('cable', 'cable_end', 'pk')
+        for cable_id, cable_end, ct_id, object_id in terminations.values_list(
+            'cable', 'cable_end', 'termination_type', 'termination_id'
+        ):
+            peer_nodes[(cable_id, _opposite_cable_end(cable_end))].append((ct_id, object_id))
+            object_ids[ct_id].add(object_id)
+    prefetched = get_objects_by_type(object_ids)
+
+    # The peer of an interface attached to a wireless link is the other interface which references it
+    wireless_link_ids = {
+        obj.wireless_link_id for obj in objects if isinstance(obj, Interface) and not obj.cable_id
+    } - {None}
+    wireless_peers = defaultdict(list)
+    if wireless_link_ids:
+        for interface in Interface.objects.filter(wireless_link__in=wireless_link_ids).prefetch_related('device'):
+            wireless_peers[interface.wireless_link_id].append(interface)
+
+    for obj in objects:
+        if obj.cable_id:
+            obj.link_peers = [
+                prefetched[ct_id][object_id] for ct_id, object_id in peer_nodes[(obj.cable_id, obj.cable_end)]
+                if object_id in prefetched[ct_id]
+            ]
+        elif getattr(obj, 'wireless_link_id', None):
+            obj.link_peers = [peer for peer in wireless_peers[obj.wireless_link_id] if peer.pk != obj.pk]
+        else:
+            obj.link_peers = []
+
+
+def prefetch_connected_endpoints(objects):
+    """
+    Populate the CablePath and `connected_endpoints` of the given path endpoints in bulk. All paths are retrieved using
+    a single query (unless already cached), and the objects within them using one query per type.
+    """
     from dcim.models import CablePath
 
-    for obj in terminations:
-        cable_paths = CablePath.objects.filter(_nodes__contains=obj)
+    objects = [obj for obj in objects if obj._path_id]
+
+    # Reuse any CablePaths already retrieved (e.g. by prefetch_related())
+    paths = {}
+    for obj in objects:
+        if obj._meta.get_field('_path').is_cached(obj) and obj._path is not None:
+            paths.setdefault(obj._path_id, obj._path)
+    missing = {obj._path_id for obj in objects} - set(paths)
+    if missing:
+        paths.update(CablePath.objects.in_bulk(missing))
+    CablePath.prefetch_path_objects([path for path in paths.values() if not hasattr(path, '_path_objects')])
 
-        with transaction.atomic():
-            for cp in cable_paths:
-                cp.delete()
-                create_cablepath(cp.origins)
+    for obj in objects:
+        if path := paths.get(obj._path_id):
+            obj._path = path
+            obj.connected_endpoints = path.destinations
@@ -2,7 +2,7 @@ from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
 from django.core.paginator import EmptyPage, PageNotAnInteger
 from django.db import transaction
-from django.db.models import Prefetch
+from django.db.models import F, Prefetch
 from django.forms import ModelMultipleChoiceField, MultipleHiddenInput, modelformset_factory
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -521,7 +521,7 @@ class RackRoleView(generic.ObjectView):
 
     def get_extra_context(self, request, instance):
         racks = Rack.objects.restrict(request.user, 'view').filter(role=instance).annotate(
-            device_count=count_related(Device, 'rack')
+            device_count=F('_device_count')
         )
 
         racks_table = tables.RackTable(racks, user=request.user, exclude=(
@@ -571,7 +571,7 @@ class RackRoleBulkDeleteView(generic.BulkDeleteView):
 
 class RackListView(generic.ObjectListView):
     queryset = Rack.objects.annotate(
-        device_count=count_related(Device, 'rack')
+        device_count=F('_device_count')
     )
     filterset = filtersets.RackFilterSet
     filterset_form = forms.RackFilterForm
@@ -783,7 +783,7 @@ class ManufacturerView(generic.ObjectView):
         device_types = DeviceType.objects.restrict(request.user, 'view').filter(
             manufacturer=instance
         ).annotate(
-            instance_count=count_related(Device, 'device_type')
+            instance_count=F('_device_count')
         )
         module_types = ModuleType.objects.restrict(request.user, 'view').filter(
             manufacturer=instance
@@ -839,7 +839,7 @@ class ManufacturerBulkDeleteView(generic.BulkDeleteView):
 
 class DeviceTypeListView(generic.ObjectListView):
     queryset = DeviceType.objects.annotate(
-        instance_count=count_related(Device, 'device_type')
+        instance_count=F('_device_count')
     )
     filterset = filtersets.DeviceTypeFilterSet
     filterset_form = forms.DeviceTypeFilterForm
@@ -972,7 +972,7 @@ class DeviceTypeImportView(generic.ObjectImportView):
 
 class DeviceTypeBulkEditView(generic.BulkEditView):
     queryset = DeviceType.objects.annotate(
-        instance_count=count_related(Device, 'device_type')
+        instance_count=F('_device_count')
     )
     filterset = filtersets.DeviceTypeFilterSet
     table = tables.DeviceTypeTable
@@ -981,7 +981,7 @@ class DeviceTypeBulkEditView(generic.BulkEditView):
 
 class DeviceTypeBulkDeleteView(generic.BulkDeleteView):
     queryset = DeviceType.objects.annotate(
-        instance_count=count_related(Device, 'device_type')
+        instance_count=F('_device_count')
     )
     filterset = filtersets.DeviceTypeFilterSet
     table = tables.DeviceTypeTable
@@ -993,7 +993,7 @@ class DeviceTypeBulkDeleteView(generic.BulkDeleteView):
 
 class ModuleTypeListView(generic.ObjectListView):
     queryset = ModuleType.objects.annotate(
-        instance_count=count_related(Module, 'module_type')
+        instance_count=F('_module_count')
     )
     filterset = filtersets.ModuleTypeFilterSet
     filterset_form = forms.ModuleTypeFilterForm
@@ -1099,7 +1099,7 @@ class ModuleTypeImportView(generic.ObjectImportView):
 
 class ModuleTypeBulkEditView(generic.BulkEditView):
     queryset = ModuleType.objects.annotate(
-        instance_count=count_related(Module, 'module_type')
+        instance_count=F('_module_count')
     )
     filterset = filtersets.ModuleTypeFilterSet
     table = tables.ModuleTypeTable
@@ -1108,7 +1108,7 @@ class ModuleTypeBulkEditView(generic.BulkEditView):
 
 class ModuleTypeBulkDeleteView(generic.BulkDeleteView):
     queryset = ModuleType.objects.annotate(
-        instance_count=count_related(Module, 'module_type')
+        instance_count=F('_module_count')
     )
     filterset = filtersets.ModuleTypeFilterSet
     table = tables.ModuleTypeTable
@@ -1736,7 +1736,7 @@ class DeviceConfigView(generic.ObjectView):
 
 
 class DeviceConfigContextView(ObjectConfigContextView):
-    queryset = Device.objects.annotate_config_context_data()
+    queryset = Device.objects.all()
     base_template = 'dcim/device/base.html'
 
 
@@ -2735,7 +2735,7 @@ class PathTraceView(generic.ObjectView):
 
         # Otherwise, find all CablePaths which traverse the specified object
         else:
-            related_paths = CablePath.objects.filter(_nodes__contains=instance)
+            related_paths = CablePath.objects.traversing(instance)
             # Check for specification of a particular path (when tracing pass-through ports)
             try:
                 path_id = int(request.GET.get('cablepath_id'))
@@ -2882,7 +2882,7 @@ class InterfaceConnectionsListView(generic.ObjectListView):
 
 class VirtualChassisListView(generic.ObjectListView):
     queryset = VirtualChassis.objects.annotate(
-        member_count=count_related(Device, 'virtual_chassis')
+        member_count=F('_member_count')
     )
     table = tables.VirtualChassisTable
     filterset = filtersets.VirtualChassisFilterSet
@@ -1,6 +1,6 @@
 from django.contrib.contenttypes.models import ContentType
 from rest_framework.fields import Field
-from rest_framework.serializers import ValidationError
+from rest_framework.serializers import ListSerializer, ValidationError
 
 from extras.choices import CustomFieldTypeChoices
 from extras.models import CustomField
@@ -46,9 +46,31 @@ class CustomFieldsDataField(Field):
             self._custom_fields = CustomField.objects.filter(content_types=content_type)
         return self._custom_fields
 
+    def _prefetch_objects(self):
+        """
+        Retrieve the objects referenced by object and multi-object custom fields for all objects being serialized (e.g.
+        a page of results) at once, rather than individually for each object.
+        """
+        if getattr(self, '_objects_prefetched', False):
+            return
+        self._objects_prefetched = True
+
+        list_serializer = getattr(self.parent, 'parent', None)
+        if isinstance(list_serializer, ListSerializer) and list_serializer.instance is not None:
+            instances = list_serializer.instance
+        elif self.parent.instance is not None:
+            instances = [self.parent.instance]
+        else:
+            return
+        instances = [instance for instance in instances if hasattr(instance, 'custom_field_data')]
+
+        for cf in self._get_custom_fields():
+            cf.prefetch_objects(instance.custom_field_data.get(cf.name) for instance in instances)
+
     def to_representation(self, obj):
         # TODO: Fix circular import
         from utilities.api import get_serializer_for_model
+        self._prefetch_objects()
         data = {}
         for cf in self._get_custom_fields():
             value = cf.deserialize(obj.get(cf.name))
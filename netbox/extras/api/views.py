@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.http import Http404
 from django_rq.queues import get_connection
@@ -12,6 +13,7 @@ from rq import Worker
 
 from extras import filtersets
 from extras.choices import JobResultStatusChoices
+from extras.configcontexts import prefetch_config_contexts
 from extras.models import *
 from extras.models import CustomField
 from extras.reports import get_report, get_reports, run_report
@@ -45,14 +47,26 @@ class ConfigContextQuerySetMixin:
         If the `brief` query param equates to True or the `exclude` query param
         includes `config_context` as a value, return the base queryset.
 
+        If config contexts are cached (CONFIG_CONTEXT_CACHE_TIMEOUT), also return the base
+        queryset: rendered config contexts are retrieved from the cache for each page of results.
+
         Else, return the queryset annotated with config context data
         """
         queryset = super().get_queryset()
-        request = self.get_serializer_context()['request']
-        if self.brief or 'config_context' in request.query_params.get('exclude', []):
+        if not self._include_config_context() or settings.CONFIG_CONTEXT_CACHE_TIMEOUT:
             return queryset
         return queryset.annotate_config_context_data()
 
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and self._include_config_context() and settings.CONFIG_CONTEXT_CACHE_TIMEOUT:
+            prefetch_config_contexts(page)
+        return page
+
+    def _include_config_context(self):
+        request = self.get_serializer_context()['request']
+        return not (self.brief or 'config_context' in request.query_params.get('exclude', []))
+
 
 #
 # Webhooks
@@ -0,0 +1,99 @@
+from django.contrib.contenttypes.models import ContentType
+
+from .choices import ObjectChangeActionChoices
+from .models import ObjectChange
+from .webhooks import get_snapshots, has_webhooks, serialize_for_webhook, supports_webhooks
+
+
+def enqueue_change(queue, instance, action, user, request_id):
+    """
+    Buffer a change to an object for deferred change logging. Multiple changes to the same object within a request
+    are coalesced into a single change:
+
+      * A creation followed by any number of updates is recorded as a creation.
+      * Successive updates are recorded as a single update, retaining the original pre-change data.
+      * A creation followed by a deletion is discarded entirely.
+      * An update followed by a deletion is recorded as a deletion, retaining the original pre-change data.
+
+    :param queue: A dictionary of buffered changes, keyed by object
+    :param instance: The object being changed
+    :param action: The ObjectChangeActionChoices value for the change
+    :param user: The User responsible for the change
+    :param request_id: The UUID of the current request
+    """
+    content_type = ContentType.objects.get_for_model(instance)
+    key = (content_type.pk, instance.pk)
+
+    objectchange = instance.to_objectchange(action)
+    objectchange.user = user
+    objectchange.user_name = user.username
+    objectchange.request_id = request_id
+    prechange_snapshot = getattr(instance, '_prechange_snapshot', None)
+
+    change = queue.get(key)
+    if change is not None and change['event'] == ObjectChangeActionChoices.ACTION_DELETE:
+        # The object was deleted earlier in this request (and its PK since reused); leave that change as-is
+        queue[(*key, len(queue))] = queue.pop(key)
+        change = None
+    if change is not None:
+        if change['event'] == ObjectChangeActionChoices.ACTION_CREATE:
+            if action == ObjectChangeActionChoices.ACTION_DELETE:
+                del queue[key]
+                return
+            objectchange.action = ObjectChangeActionChoices.ACTION_CREATE
+        objectchange.prechange_data = change['objectchange'].prechange_data
+        prechange_snapshot = change['prechange_snapshot']
+
+    queue[key] = {
+        'content_type': content_type,
+        'object_id': instance.pk,
+        'event': objectchange.action,
+        'instance': instance,
+        'objectchange': objectchange,
+        'prechange_snapshot': prechange_snapshot,
+        'username': user.username,
+        'request_id': request_id,
+    }
+
+    # Deleted objects cannot be serialized once the request has completed, so their webhook data must be captured
+    # now (but only if a webhook will consume it)
+    if action == ObjectChangeActionChoices.ACTION_DELETE and supports_webhooks(instance) and \
+            has_webhooks(content_type, action):
+        queue[key]['data'] = serialize_for_webhook(instance)
+        queue[key]['snapshots'] = {
+            'prechange': prechange_snapshot,
+            'postchange': None,
+        }
+
+
+def flush_changes(queue):
+    """
+    Write all buffered changes to the database as ObjectChange records, and return a list of webhook queue entries
+    for those changes which trigger at least one webhook. Webhook data for created and updated objects is serialized
+    only at this point, reflecting each object's final state.
+    """
+    ObjectChange.objects.bulk_create(
+        [change['objectchange'] for change in queue.values()],
+        batch_size=100
+    )
+
+    webhook_queue = []
+    for change in queue.values():
+        instance = change['instance']
+        if not supports_webhooks(instance) or not has_webhooks(change['content_type'], change['event']):
+            continue
+        if 'data' not in change:
+            change['data'] = serialize_for_webhook(instance)
+            change['snapshots'] = get_snapshots(instance, change['event'])
+            change['snapshots']['prechange'] = change['prechange_snapshot']
+        webhook_queue.append({
+            'content_type': change['content_type'],
+            'object_id': change['object_id'],
+            'event': change['event'],
+            'data': change['data'],
+            'snapshots': change['snapshots'],
+            'username': change['username'],
+            'request_id': change['request_id'],
+        })
+
+    return webhook_queue
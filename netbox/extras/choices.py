@@ -143,6 +143,7 @@ class JobResultStatusChoices(ChoiceSet):
     STATUS_COMPLETED = 'completed'
     STATUS_ERRORED = 'errored'
     STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
 
     CHOICES = (
         (STATUS_PENDING, 'Pending'),
@@ -150,12 +151,14 @@ class JobResultStatusChoices(ChoiceSet):
         (STATUS_COMPLETED, 'Completed'),
         (STATUS_ERRORED, 'Errored'),
         (STATUS_FAILED, 'Failed'),
+        (STATUS_CANCELLED, 'Cancelled'),
     )
 
     TERMINAL_STATE_CHOICES = (
         STATUS_COMPLETED,
         STATUS_ERRORED,
         STATUS_FAILED,
+        STATUS_CANCELLED,
     )
 
 
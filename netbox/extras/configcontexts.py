@@ -0,0 +1,97 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utilities.cache import get_revision, invalidate_revision
+from utilities.utils import deepmerge
+
+__all__ = (
+    'ASSIGNMENT_FIELDS',
+    'get_cached_config_context',
+    'invalidate_config_contexts',
+    'prefetch_config_contexts',
+)
+
+REVISION_KEY = 'config_context_revision'
+
+# The fields of each model which determine the ConfigContexts that apply to an object. Changes to the related objects
+# themselves (e.g. moving a Site to a different Region) are handled by invalidate_config_contexts().
+ASSIGNMENT_FIELDS = {
+    'dcim.device': (
+        'site', 'location', 'device_type', 'device_role', 'platform', 'cluster', 'tenant',
+    ),
+    'virtualization.virtualmachine': (
+        'site', 'cluster', 'role', 'platform', 'tenant',
+    ),
+}
+
+
+def is_cacheable(instance):
+    return bool(settings.CONFIG_CONTEXT_CACHE_TIMEOUT) and instance._meta.label_lower in ASSIGNMENT_FIELDS
+
+
+def invalidate_config_contexts():
+    """
+    Discard all cached config contexts, following a change to any ConfigContext or the objects it may be assigned to.
+    """
+    invalidate_revision(REVISION_KEY)
+
+
+def get_fingerprint(instance):
+    """
+    Return a digest of the object's assignments (site, role, tags, etc.). Objects which share a fingerprint inherit
+    the same config context data.
+    """
+    label = instance._meta.label_lower
+    assignments = [getattr(instance, f'{field}_id') for field in ASSIGNMENT_FIELDS[label]]
+    # Use tags.all() rather than tags.slugs() to take advantage of any prefetched tags
+    tags = sorted(tag.pk for tag in instance.tags.all())
+    return hashlib.sha1(json.dumps([label, assignments, tags]).encode()).hexdigest()
+
+
+def get_cache_key(instance, revision):
+    return f'config_context:{revision}:{get_fingerprint(instance)}'
+
+
+def prefetch_config_contexts(instances):
+    """
+    Attach the inherited (non-local) config context data to each of the given objects, retrieving it from the cache
+    where possible. Data for any objects not found in the cache is retrieved from the database in a single query.
+    """
+    instances = [instance for instance in instances if is_cacheable(instance)]
+    if not instances:
+        return
+
+    revision = get_revision(REVISION_KEY)
+    keys = [get_cache_key(instance, revision) for instance in instances]
+    cached = cache.get_many(set(keys))
+
+    missing = {instance.pk: key for instance, key in zip(instances, keys) if key not in cached}
+    if missing:
+        model = type(instances[0])
+        queryset = model.objects.filter(pk__in=missing).annotate_config_context_data()
+        new_values = {}
+        for pk, config_context_data in queryset.values_list('pk', 'config_context_data'):
+            data = {}
+            for context in config_context_data or []:
+                data = deepmerge(data, context)
+            new_values[missing[pk]] = data
+        cache.set_many(new_values, settings.CONFIG_CONTEXT_CACHE_TIMEOUT)
+        cached.update(new_values)
+
+    for instance, key in zip(instances, keys):
+        instance._config_context_cache = cached.get(key, {})
+
+
+def get_cached_config_context(instance):
+    """
+    Return the inherited (non-local) config context data for an object from the cache, or None if the object's model
+    does not support caching. Data attached by prefetch_config_contexts() is consumed by the first call.
+    """
+    if not is_cacheable(instance):
+        return None
+    if not hasattr(instance, '_config_context_cache'):
+        prefetch_config_contexts([instance])
+    return instance.__dict__.pop('_config_context_cache')
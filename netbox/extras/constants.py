@@ -11,3 +11,6 @@ EXTRAS_FEATURES = [
     'tags',
     'webhooks'
 ]
+
+# The duration (in seconds) for which the progress and cancellation of background jobs are tracked
+JOBRESULT_CACHE_TIMEOUT = 86400
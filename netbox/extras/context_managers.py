@@ -1,10 +1,12 @@
 from contextlib import contextmanager
 
+from django.conf import settings
 from django.db.models.signals import m2m_changed, pre_delete, post_save
 
 from extras.signals import clear_webhooks, clear_webhook_queue, handle_changed_object, handle_deleted_object
 from netbox import thread_locals
 from netbox.request_context import set_request
+from .changelog import flush_changes
 from .webhooks import flush_webhooks
 
 
@@ -12,12 +14,17 @@ from .webhooks import flush_webhooks
 def change_logging(request):
     """
     Enable change logging by connecting the appropriate signals to their receivers before code is run, and
-    disconnecting them afterward.
+    disconnecting them afterward. Deferred changes and queued webhooks are discarded if an exception is raised.
 
     :param request: WSGIRequest object with a unique `id` set
     """
     set_request(request)
     thread_locals.webhook_queue = []
+    thread_locals.webhooks_cache = {}
+
+    # If deferred change logging is enabled, changes are buffered and written once the request has completed
+    if settings.CHANGELOG_DEFERRED:
+        thread_locals.changelog_queue = {}
 
     # Connect our receivers to the post_save and post_delete signals.
     post_save.connect(handle_changed_object, dispatch_uid='handle_changed_object')
@@ -25,18 +32,48 @@ def change_logging(request):
     pre_delete.connect(handle_deleted_object, dispatch_uid='handle_deleted_object')
     clear_webhooks.connect(clear_webhook_queue, dispatch_uid='clear_webhook_queue')
 
-    yield
+    completed = False
+    try:
+        yield
+        completed = True
+
+    finally:
+        # Disconnect change logging signals. This is necessary to avoid recording any errant
+        # changes during test cleanup.
+        post_save.disconnect(handle_changed_object, dispatch_uid='handle_changed_object')
+        m2m_changed.disconnect(handle_changed_object, dispatch_uid='handle_changed_object')
+        pre_delete.disconnect(handle_deleted_object, dispatch_uid='handle_deleted_object')
+        clear_webhooks.disconnect(clear_webhook_queue, dispatch_uid='clear_webhook_queue')
+
+        # Write any deferred changes and flush queued webhooks to RQ. If an exception was raised, these are discarded.
+        if completed:
+            if settings.CHANGELOG_DEFERRED:
+                thread_locals.webhook_queue.extend(flush_changes(thread_locals.changelog_queue))
+            flush_webhooks(thread_locals.webhook_queue)
+        if settings.CHANGELOG_DEFERRED:
+            del thread_locals.changelog_queue
+        del thread_locals.webhook_queue
+        del thread_locals.webhooks_cache
+
+        # Clear the request from thread-local storage
+        set_request(None)
 
-    # Disconnect change logging signals. This is necessary to avoid recording any errant
-    # changes during test cleanup.
-    post_save.disconnect(handle_changed_object, dispatch_uid='handle_changed_object')
-    m2m_changed.disconnect(handle_changed_object, dispatch_uid='handle_changed_object')
-    pre_delete.disconnect(handle_deleted_object, dispatch_uid='handle_deleted_object')
-    clear_webhooks.disconnect(clear_webhook_queue, dispatch_uid='clear_webhook_queue')
 
-    # Flush queued webhooks to RQ
-    flush_webhooks(thread_locals.webhook_queue)
-    del thread_locals.webhook_queue
+@contextmanager
+def deferred_change_logging():
+    """
+    Buffer changes made within the block and write their change records in bulk once it exits (queuing any resulting
+    webhooks), as CHANGELOG_DEFERRED does for an entire request. Has no effect if changes are already being deferred,
+    or if change logging has not been enabled. Buffered changes are discarded if an exception is raised.
+    """
+    if not hasattr(thread_locals, 'webhook_queue') or getattr(thread_locals, 'changelog_queue', None) is not None:
+        yield
+        return
 
-    # Clear the request from thread-local storage
-    set_request(None)
+    thread_locals.changelog_queue = {}
+    try:
+        yield
+        changelog_queue = thread_locals.changelog_queue
+    finally:
+        del thread_locals.changelog_queue
+    thread_locals.webhook_queue.extend(flush_changes(changelog_queue))
@@ -44,7 +44,7 @@ class WebhookFilterSet(BaseFilterSet):
         model = Webhook
         fields = [
             'id', 'name', 'type_create', 'type_update', 'type_delete', 'payload_url', 'enabled', 'http_method',
-            'http_content_type', 'secret', 'ssl_verification', 'ca_file_path',
+            'http_content_type', 'secret', 'retry_server_errors', 'ssl_verification', 'ca_file_path',
         ]
 
     def search(self, queryset, name, value):
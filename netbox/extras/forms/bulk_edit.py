@@ -136,6 +136,10 @@ class WebhookBulkEditForm(BulkEditForm):
         required=False,
         label='Payload URL'
     )
+    retry_server_errors = forms.NullBooleanField(
+        required=False,
+        widget=BulkEditNullBooleanSelect()
+    )
     ssl_verification = forms.NullBooleanField(
         required=False,
         widget=BulkEditNullBooleanSelect(),
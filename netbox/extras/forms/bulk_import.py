@@ -92,8 +92,8 @@ class WebhookCSVForm(CSVModelForm):
         model = Webhook
         fields = (
             'name', 'enabled', 'content_types', 'type_create', 'type_update', 'type_delete', 'payload_url',
-            'http_method', 'http_content_type', 'additional_headers', 'body_template', 'secret', 'ssl_verification',
-            'ca_file_path'
+            'http_method', 'http_content_type', 'additional_headers', 'body_template', 'secret', 'retry_server_errors',
+            'ssl_verification', 'ca_file_path'
         )
 
 
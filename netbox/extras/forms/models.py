@@ -119,6 +119,7 @@ class WebhookForm(BootstrapMixin, forms.ModelForm):
         ('Events', ('type_create', 'type_update', 'type_delete')),
         ('HTTP Request', (
             'payload_url', 'http_method', 'http_content_type', 'additional_headers', 'body_template', 'secret',
+            'retry_server_errors',
         )),
         ('Conditions', ('conditions',)),
         ('SSL', ('ssl_verification', 'ca_file_path')),
@@ -0,0 +1,65 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox.counters import get_counters, recalculate
+
+
+class Command(BaseCommand):
+    help = "Recalculate the cached counts of related objects for the specified models"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args', metavar='app_label.ModelName', nargs='*',
+            help='One or more specific models (each prefixed with its app_label) to recalculate',
+        )
+
+    def _get_counters(self, names):
+        """
+        Compile a list of counters to be recalculated. If no names are specified, all registered counters will be
+        included.
+        """
+        if not names:
+            return get_counters()
+
+        counters = []
+        for name in names:
+            try:
+                app_label, model_name = name.split('.')
+            except ValueError:
+                raise CommandError(
+                    f"Invalid format: {name}. Models must be specified in the form app_label.ModelName."
+                )
+            try:
+                app_config = apps.get_app_config(app_label)
+            except LookupError as e:
+                raise CommandError(str(e))
+            try:
+                model = app_config.get_model(model_name)
+            except LookupError:
+                raise CommandError(f"Unknown model: {app_label}.{model_name}")
+            model_counters = get_counters(model)
+            if not model_counters:
+                raise CommandError(f"Invalid model: {app_label}.{model_name} has no counter fields")
+            counters.extend(model_counters)
+
+        return counters
+
+    def handle(self, *args, **options):
+
+        counters = self._get_counters(args)
+
+        if options['verbosity']:
+            self.stdout.write(f"Recalculating {len(counters)} counters.")
+
+        for model, counter_name, to_field in counters:
+            if options['verbosity']:
+                self.stdout.write(f"{model._meta.label}.{counter_name}... ", ending='')
+                self.stdout.flush()
+
+            count = recalculate(model, counter_name, to_field)
+
+            if options['verbosity']:
+                self.stdout.write(self.style.SUCCESS(f"{count} {model._meta.verbose_name_plural} updated"))
+
+        if options['verbosity']:
+            self.stdout.write(self.style.SUCCESS("Done."))
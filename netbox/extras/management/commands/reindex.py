@@ -0,0 +1,67 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+
+from extras.models import CachedValue
+from extras.search import cache_model, get_indexed_models
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search index for all (or the specified) searchable models"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'args', metavar='app_label[.ModelName]', nargs='*',
+            help='One or more apps or models to reindex',
+        )
+        parser.add_argument(
+            "--lazy", action='store_true', dest='lazy',
+            help="Index only those models which have no indexed objects"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, dest='batch_size',
+            help="Number of values to write per query (default: 1000)"
+        )
+
+    def get_models(self, names):
+        """
+        Return the searchable models identified by the given app labels and/or model names.
+        """
+        indexed_models = list(get_indexed_models())
+        if not names:
+            return indexed_models
+
+        models = []
+        for name in names:
+            if '.' in name:
+                try:
+                    model = apps.get_model(name)
+                except LookupError:
+                    raise CommandError(f"Unknown model: {name}")
+                if model not in indexed_models:
+                    raise CommandError(f"Model {name} is not searchable")
+                models.append(model)
+            else:
+                app_models = [model for model in indexed_models if model._meta.app_label == name]
+                if not app_models:
+                    raise CommandError(f"No searchable models found in app {name}")
+                models.extend(app_models)
+
+        return models
+
+    def handle(self, *model_names, **options):
+        models = self.get_models(model_names)
+
+        for model in models:
+            verbose_name_plural = model._meta.verbose_name_plural
+            if options['lazy']:
+                content_type = ContentType.objects.get_for_model(model)
+                if CachedValue.objects.filter(object_type=content_type).exists():
+                    self.stdout.write(f"Skipping {verbose_name_plural} (already indexed)")
+                    continue
+            self.stdout.write(f"Reindexing {verbose_name_plural}...", ending='')
+            self.stdout.flush()
+            count = cache_model(model, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f" {count} objects"))
+
+        self.stdout.write(self.style.SUCCESS('Finished.'))
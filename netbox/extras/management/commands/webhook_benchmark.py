@@ -0,0 +1,160 @@
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from jinja2.sandbox import SandboxedEnvironment
+
+from extras.choices import ObjectChangeActionChoices
+from extras.models import Webhook
+from extras.webhooks import generate_signature
+from extras.webhooks_worker import process_webhook_batch
+from .webhook_receiver import WebhookHandler
+
+BODY_TEMPLATE = '{"event": "{{ event }}", "model": "{{ model }}", "name": "{{ data.name }}"}'
+
+
+class QuietWebhookHandler(WebhookHandler):
+    """
+    A WebhookHandler which keeps connections alive and does not print the requests it receives.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format_str, *args):
+        pass
+
+    def do_ANY(self):
+        content_length = self.headers.get('Content-Length')
+        if content_length is not None:
+            self.rfile.read(int(content_length))
+
+        body = b'Webhook received!\n'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def render_legacy(template_code, context):
+    """
+    Render a Jinja2 template as templates were rendered prior to the introduction of the compiled template cache: within
+    a new environment, compiling the template from scratch.
+    """
+    return SandboxedEnvironment().from_string(source=template_code).render(**context)
+
+
+def send_legacy(webhook, event):
+    """
+    Deliver an event as webhooks were delivered prior to the introduction of pooled sessions: rendering each template
+    from scratch and opening a new Session (and connection) for every request.
+    """
+    context = {
+        'event': dict(ObjectChangeActionChoices)[event['event']].lower(),
+        'timestamp': event['timestamp'],
+        'model': event['model_name'],
+        'username': event['username'],
+        'request_id': event['request_id'],
+        'data': event['data'],
+        'snapshots': event['snapshots'],
+    }
+    headers = {
+        'Content-Type': webhook.http_content_type,
+    }
+    for line in render_legacy(webhook.additional_headers, context).splitlines():
+        header, value = line.split(':', 1)
+        headers[header.strip()] = value.strip()
+    prepared_request = requests.Request(
+        method=webhook.http_method,
+        url=render_legacy(webhook.payload_url, context),
+        headers=headers,
+        data=render_legacy(webhook.body_template, context).encode('utf8')
+    ).prepare()
+    prepared_request.headers['X-Hook-Signature'] = generate_signature(prepared_request.body, webhook.secret)
+    with requests.Session() as session:
+        session.verify = webhook.ssl_verification
+        response = session.send(prepared_request, proxies=settings.HTTP_PROXIES)
+    response.raise_for_status()
+
+
+class Command(BaseCommand):
+    help = "Measure the throughput of webhook delivery against a local receiver"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count', type=int, default=1000,
+            help="Number of events to deliver (default: 1000)"
+        )
+        parser.add_argument(
+            '--webhooks', type=int, default=4,
+            help="Number of webhooks to which each event is delivered (default: 4)"
+        )
+        parser.add_argument(
+            '--url',
+            help="URL of an external receiver (e.g. one started with the webhook_receiver command). If not specified, "
+                 "a receiver is started in-process."
+        )
+
+    def handle(self, *args, **options):
+        if options['count'] < 1 or options['webhooks'] < 1:
+            raise CommandError("--count and --webhooks must be at least 1")
+
+        # Start a local receiver (unless an external one has been specified)
+        httpd = None
+        url = options['url']
+        if url is None:
+            httpd = ThreadingHTTPServer(('localhost', 0), QuietWebhookHandler)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            url = f'http://localhost:{httpd.server_address[1]}/'
+        self.stdout.write(f"Delivering to {url}")
+
+        # Create unsaved Webhooks (assigned fake PKs so that they may be referenced by events)
+        now = timezone.now()
+        webhooks = [
+            Webhook(
+                pk=-i,
+                name=f'Benchmark {i}',
+                type_create=True,
+                payload_url=url,
+                additional_headers='X-Event: {{ event }}\nX-Model: {{ model }}',
+                body_template=BODY_TEMPLATE,
+                secret='benchmark',
+                last_updated=now
+            ) for i in range(1, options['webhooks'] + 1)
+        ]
+        events = [
+            {
+                'webhook_ids': [webhook.pk for webhook in webhooks],
+                'model_name': 'site',
+                'event': ObjectChangeActionChoices.ACTION_CREATE,
+                'data': {'id': i, 'name': f'Site {i}'},
+                'snapshots': {'prechange': None, 'postchange': {'name': f'Site {i}'}},
+                'timestamp': str(now),
+                'username': 'benchmark',
+                'request_id': None,
+            } for i in range(options['count'])
+        ]
+        deliveries = len(webhooks) * len(events)
+
+        try:
+            self.stdout.write(f"Legacy (sequential, unpooled): {deliveries} deliveries...")
+            start = time.monotonic()
+            for event in events:
+                for webhook in webhooks:
+                    send_legacy(webhook, event)
+            self.report(deliveries, time.monotonic() - start)
+
+            self.stdout.write(f"Batched (concurrent, pooled): {deliveries} deliveries...")
+            start = time.monotonic()
+            process_webhook_batch(webhooks=webhooks, events=events)
+            self.report(deliveries, time.monotonic() - start)
+        finally:
+            if httpd is not None:
+                httpd.shutdown()
+
+    def report(self, deliveries, elapsed):
+        rate = deliveries / elapsed if elapsed else deliveries
+        self.stdout.write(self.style.SUCCESS(f"  {elapsed:.2f}s ({rate:.1f} deliveries/sec)"))
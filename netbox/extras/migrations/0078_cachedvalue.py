@@ -0,0 +1,37 @@
+from django.contrib.postgres.operations import TrigramExtension
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('extras', '0077_customlink_extend_text_and_url'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='CachedValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('field', models.CharField(max_length=200)),
+                ('value', models.TextField()),
+                ('object_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ('object_type', 'object_id', 'field'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='cachedvalue',
+            index=models.Index(fields=['object_type', 'object_id'], name='extras_cach_object__d92213_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cachedvalue',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['value'], name='extras_cachedvalue_value_trgm', opclasses=('gin_trgm_ops',)),
+        ),
+    ]
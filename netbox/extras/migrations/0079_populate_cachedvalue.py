@@ -0,0 +1,77 @@
+from django.db import migrations
+
+# The fields indexed for each model at the time of this migration (see SEARCH_TYPES)
+INDEXED_FIELDS = {
+    ('circuits', 'provider'): ('name', 'account', 'noc_contact', 'admin_contact', 'comments'),
+    ('circuits', 'providernetwork'): ('name', 'service_id', 'description', 'comments'),
+    ('dcim', 'rack'): ('name', 'facility_id', 'serial', 'asset_tag', 'comments'),
+    ('dcim', 'location'): ('name', 'description'),
+    ('dcim', 'module'): ('serial', 'asset_tag', 'comments'),
+    ('dcim', 'cable'): ('label',),
+    ('dcim', 'powerfeed'): ('name', 'comments'),
+    ('ipam', 'vrf'): ('name', 'rd', 'description'),
+    ('ipam', 'ipaddress'): ('address', 'dns_name', 'description'),
+    ('ipam', 'vlan'): ('name', 'vid', 'description'),
+    ('ipam', 'asn'): ('asn', 'description'),
+    ('ipam', 'service'): ('name', 'description'),
+    ('tenancy', 'tenant'): ('name', 'slug', 'description', 'comments'),
+    ('tenancy', 'contact'): ('name', 'title', 'phone', 'email', 'address', 'link', 'comments'),
+    ('virtualization', 'cluster'): ('name', 'comments'),
+    ('virtualization', 'virtualmachine'): ('name', 'comments'),
+    ('wireless', 'wirelesslan'): ('ssid', 'description'),
+    ('wireless', 'wirelesslink'): ('ssid', 'description'),
+    ('extras', 'journalentry'): ('comments',),
+}
+
+
+def populate_cachedvalues(apps, schema_editor):
+    """
+    Build the search index for all existing objects.
+    """
+    CachedValue = apps.get_model('extras', 'CachedValue')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+
+    for (app_label, model_name), field_names in INDEXED_FIELDS.items():
+        model = apps.get_model(app_label, model_name)
+        if not model.objects.exists():
+            continue
+        content_type, _ = ContentType.objects.get_or_create(app_label=app_label, model=model_name)
+        CachedValue.objects.filter(object_type=content_type).delete()
+
+        fields = [model._meta.get_field(name) for name in field_names]
+        cached_values = []
+        for instance in model.objects.only('pk', *field_names).iterator(chunk_size=1000):
+            for field in fields:
+                value = field.value_from_object(instance)
+                if value in (None, ''):
+                    continue
+                cached_values.append(CachedValue(
+                    object_type=content_type,
+                    object_id=instance.pk,
+                    field=field.name,
+                    value=str(value).strip().lower()
+                ))
+            if len(cached_values) >= 1000:
+                CachedValue.objects.bulk_create(cached_values)
+                cached_values = []
+        CachedValue.objects.bulk_create(cached_values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circuits', '0039_provider_circuit_count'),
+        ('dcim', '0164_powerport_power_draw'),
+        ('extras', '0078_cachedvalue'),
+        ('ipam', '0061_vlangroup_vlan_count'),
+        ('tenancy', '0007_contact_link'),
+        ('virtualization', '0033_cluster_counter_fields'),
+        ('wireless', '0005_wirelesslink_interface_types'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            code=populate_cachedvalues,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0079_populate_cachedvalue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhook',
+            name='retry_server_errors',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -144,17 +144,20 @@ class ConfigContextModel(models.Model):
         Compile all config data, overwriting lower-weight values with higher-weight values where a collision occurs.
         Return the rendered configuration context for a device or VM.
         """
+        from extras.configcontexts import get_cached_config_context
+
         data = {}
 
-        if not hasattr(self, 'config_context_data'):
-            # The annotation is not available, so we fall back to manually querying for the config context objects
-            config_context_data = ConfigContext.objects.get_for_object(self, aggregate_data=True)
-        else:
+        if hasattr(self, 'config_context_data'):
             # The attribute may exist, but the annotated value could be None if there is no config context data
-            config_context_data = self.config_context_data or []
-
-        for context in config_context_data:
-            data = deepmerge(data, context)
+            for context in self.config_context_data or []:
+                data = deepmerge(data, context)
+        elif (cached_data := get_cached_config_context(self)) is not None:
+            data = cached_data
+        else:
+            # The annotation is not available, so we fall back to manually querying for the config context objects
+            for context in ConfigContext.objects.get_for_object(self, aggregate_data=True):
+                data = deepmerge(data, context)
 
         # If the object has local config context data defined, merge it last
         if self.local_context_data:
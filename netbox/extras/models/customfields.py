@@ -289,14 +289,47 @@ class CustomField(CloningMixin, ExportTemplatesMixin, WebhooksMixin, ChangeLogge
         """
         if value is None:
             return value
+        prefetched_objects = getattr(self, '_prefetched_objects', {})
         if self.type == CustomFieldTypeChoices.TYPE_OBJECT:
+            if value in prefetched_objects:
+                return prefetched_objects[value][1]
             model = self.object_type.model_class()
             return model.objects.filter(pk=value).first()
         if self.type == CustomFieldTypeChoices.TYPE_MULTIOBJECT:
+            if all(pk in prefetched_objects for pk in value):
+                objects = sorted(prefetched_objects[pk] for pk in set(value) if prefetched_objects[pk][1] is not None)
+                return [obj for _, obj in objects]
             model = self.object_type.model_class()
             return model.objects.filter(pk__in=value)
         return value
 
+    def prefetch_objects(self, values):
+        """
+        Retrieve all objects referenced by the given values of an object or multi-object field using a single query,
+        and retain them for use by deserialize(). Only the objects referenced by the most recent call are retained, so
+        that large sets of objects may be processed in chunks.
+
+        values: An iterable of field values (primary keys or lists of primary keys)
+        """
+        if self.type not in (CustomFieldTypeChoices.TYPE_OBJECT, CustomFieldTypeChoices.TYPE_MULTIOBJECT):
+            return
+
+        pks = set()
+        for value in values:
+            if isinstance(value, list):
+                pks.update(value)
+            elif value is not None:
+                pks.add(value)
+
+        # Map each PK to a two-tuple of its position in the model's default ordering and the object itself (or None
+        # if the object no longer exists)
+        prefetched_objects = {pk: (0, None) for pk in pks}
+        if pks:
+            model = self.object_type.model_class()
+            for position, obj in enumerate(model.objects.filter(pk__in=pks)):
+                prefetched_objects[obj.pk] = (position, obj)
+        self._prefetched_objects = prefetched_objects
+
     def to_form_field(self, set_initial=True, enforce_required=True, enforce_visibility=True, for_csv_import=False):
         """
         Return a form field suitable for setting a CustomField's value for an object.
@@ -1,5 +1,6 @@
 import json
 import uuid
+from itertools import chain
 
 from django.contrib import admin
 from django.contrib.auth.models import User
@@ -8,7 +9,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.core.validators import ValidationError
 from django.db import models
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.formats import date_format
@@ -24,7 +25,8 @@ from netbox.models.features import (
     CloningMixin, CustomFieldsMixin, CustomLinksMixin, ExportTemplatesMixin, JobResultsMixin, TagsMixin, WebhooksMixin,
 )
 from utilities.querysets import RestrictedQuerySet
-from utilities.utils import render_jinja2
+from utilities.streaming import LazyQuerySet, iter_buffered
+from utilities.utils import get_jinja2_template, render_jinja2
 
 __all__ = (
     'ConfigRevision',
@@ -115,6 +117,11 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
         null=True,
         help_text="A set of conditions which determine whether the webhook will be generated."
     )
+    retry_server_errors = models.BooleanField(
+        default=False,
+        help_text="Also retry requests which time out or fail with a server error (status 500, 502, 503, or 504). "
+                  "Enable only if the receiver tolerates duplicate deliveries."
+    )
     ssl_verification = models.BooleanField(
         default=True,
         verbose_name='SSL verification',
@@ -158,6 +165,13 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
                 'ca_file_path': 'Do not specify a CA certificate file if SSL verification is disabled.'
             })
 
+    def get_template(self, field):
+        """
+        Return the compiled Jinja2 template for the given field. Compiled templates are shared by all Webhooks (and
+        other templated objects) within the process; see get_jinja2_template().
+        """
+        return get_jinja2_template(getattr(self, field))
+
     def render_headers(self, context):
         """
         Render additional_headers and return a dict of Header: Value pairs.
@@ -165,7 +179,7 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
         if not self.additional_headers:
             return {}
         ret = {}
-        data = render_jinja2(self.additional_headers, context)
+        data = self.get_template('additional_headers').render(**context)
         for line in data.splitlines():
             header, value = line.split(':', 1)
             ret[header.strip()] = value.strip()
@@ -176,7 +190,7 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
         Render the body template, if defined. Otherwise, jump the context as a JSON object.
         """
         if self.body_template:
-            return render_jinja2(self.body_template, context)
+            return self.get_template('body_template').render(**context)
         else:
             return json.dumps(context, cls=JSONEncoder)
 
@@ -184,7 +198,7 @@ class Webhook(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
         """
         Render the payload URL.
         """
-        return render_jinja2(self.payload_url, context)
+        return self.get_template('payload_url').render(**context)
 
 
 class CustomLink(CloningMixin, ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
@@ -319,25 +333,41 @@ class ExportTemplate(ExportTemplatesMixin, WebhooksMixin, ChangeLoggedModel):
         """
         Render the contents of the template.
         """
-        context = {
-            'queryset': queryset
-        }
-        output = render_jinja2(self.template_code, context)
+        return ''.join(self.iter_render(queryset))
 
-        # Replace CRLF-style line terminators
-        output = output.replace('\r\n', '\n')
+    def iter_render(self, queryset):
+        """
+        Render the contents of the template incrementally, streaming objects from the queryset as they are consumed
+        by the template. Yields pieces of the output as they are rendered.
+        """
+        template = get_jinja2_template(self.template_code)
+        pending = ''
+        for output in iter_buffered(template.generate(queryset=LazyQuerySet(queryset))):
+            output = pending + output
+
+            # Hold back a trailing CR in case the following piece begins with LF
+            pending = ''
+            if output.endswith('\r'):
+                output, pending = output[:-1], '\r'
+
+            # Replace CRLF-style line terminators
+            yield output.replace('\r\n', '\n')
 
-        return output
+        if pending:
+            yield pending
 
     def render_to_response(self, queryset):
         """
-        Render the template to an HTTP response, delivered as a named file attachment
+        Render the template to an HTTP response, delivered as a named file attachment. The output is streamed to the
+        client as it is rendered. The first piece of output is rendered immediately, so that any errors in the template
+        itself are raised before the response is returned.
         """
-        output = self.render(queryset)
+        output = self.iter_render(queryset)
+        first = next(output, '')
         mime_type = 'text/plain' if not self.mime_type else self.mime_type
 
         # Build the response
-        response = HttpResponse(output, content_type=mime_type)
+        response = StreamingHttpResponse(chain([first], output), content_type=mime_type)
 
         if self.as_attachment:
             basename = queryset.model._meta.verbose_name_plural.replace(' ', '_')
@@ -534,6 +564,42 @@ class JobResult(models.Model):
         if status in JobResultStatusChoices.TERMINAL_STATE_CHOICES:
             self.completed = timezone.now()
 
+    def set_progress(self, completed, total):
+        """
+        Record the progress of a running job. Progress is held in the cache rather than the database, so that it can
+        be reported while the job's changes have yet to be committed.
+        """
+        cache.set(f'jobresult_progress_{self.job_id}', (completed, total), JOBRESULT_CACHE_TIMEOUT)
+
+    @property
+    def progress(self):
+        """
+        Return the progress of a running job as a dictionary of the number of items completed, the total number of
+        items, and the percentage completed (or None if no progress has been reported).
+        """
+        if self.completed:
+            return None
+        progress = cache.get(f'jobresult_progress_{self.job_id}')
+        if progress is None:
+            return None
+        completed, total = progress
+        return {
+            'completed': completed,
+            'total': total,
+            'percentage': int(completed / total * 100) if total else 100,
+        }
+
+    def cancel(self):
+        """
+        Request the cancellation of a pending or running job. The job stops when it next checks for cancellation (see
+        cancel_requested); work which it has already committed is retained.
+        """
+        cache.set(f'jobresult_cancel_{self.job_id}', True, JOBRESULT_CACHE_TIMEOUT)
+
+    @property
+    def cancel_requested(self):
+        return bool(cache.get(f'jobresult_cancel_{self.job_id}'))
+
     @classmethod
     def enqueue_job(cls, func, name, obj_type, user, *args, **kwargs):
         """
@@ -0,0 +1,39 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models
+
+__all__ = (
+    'CachedValue',
+)
+
+
+class CachedValue(models.Model):
+    """
+    A normalized (lowercased) copy of a searchable field value belonging to an object. Together, CachedValues form the
+    index against which global search queries are answered.
+    """
+    object_type = models.ForeignKey(
+        to=ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveBigIntegerField()
+    object = GenericForeignKey(
+        ct_field='object_type',
+        fk_field='object_id'
+    )
+    field = models.CharField(
+        max_length=200
+    )
+    value = models.TextField()
+
+    class Meta:
+        ordering = ('object_type', 'object_id', 'field')
+        indexes = (
+            models.Index(fields=('object_type', 'object_id')),
+            GinIndex(fields=('value',), name='extras_cachedvalue_value_trgm', opclasses=('gin_trgm_ops',)),
+        )
+
+    def __str__(self):
+        return f'{self.object_type.model} {self.object_id}: {self.field}'
@@ -29,3 +29,4 @@ registry['model_features'] = {
     feature: collections.defaultdict(set) for feature in EXTRAS_FEATURES
 }
 registry['denormalized_fields'] = collections.defaultdict(list)
+registry['counter_fields'] = collections.defaultdict(list)
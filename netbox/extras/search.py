@@ -0,0 +1,131 @@
+from collections import defaultdict
+from functools import lru_cache
+
+from django.contrib.contenttypes.models import ContentType
+
+from .models import CachedValue
+
+
+@lru_cache(maxsize=None)
+def get_indexed_models():
+    """
+    Return a dictionary mapping each indexed model to the names of its fields to be indexed. Only search types which
+    declare their fields are indexed.
+    """
+    from netbox.search import SEARCH_TYPES
+
+    return {
+        attrs['queryset'].model: attrs['fields'] for attrs in SEARCH_TYPES.values() if 'fields' in attrs
+    }
+
+
+def normalize_value(value):
+    """
+    Return the normalized representation of a field value (or search query).
+    """
+    return str(value).strip().lower()
+
+
+def get_cached_values(instance, fields, content_type):
+    """
+    Return a list of unsaved CachedValues representing the non-empty values of the given fields on an object.
+    """
+    cached_values = []
+    for field_name in fields:
+        value = instance._meta.get_field(field_name).value_from_object(instance)
+        if value in (None, ''):
+            continue
+        cached_values.append(CachedValue(
+            object_type=content_type,
+            object_id=instance.pk,
+            field=field_name,
+            value=normalize_value(value)
+        ))
+    return cached_values
+
+
+def cache_objects(instances):
+    """
+    Update the search index for the given created or modified objects (ignoring those which are not indexed).
+    """
+    instances_by_model = defaultdict(list)
+    for instance in instances:
+        instances_by_model[type(instance)].append(instance)
+
+    for model, instances in instances_by_model.items():
+        fields = get_indexed_models().get(model)
+        if fields is None:
+            continue
+        content_type = ContentType.objects.get_for_model(model)
+        CachedValue.objects.filter(object_type=content_type, object_id__in=[obj.pk for obj in instances]).delete()
+        CachedValue.objects.bulk_create([
+            cached_value for instance in instances
+            for cached_value in get_cached_values(instance, fields, content_type)
+        ], batch_size=1000)
+
+
+def cache_object(instance):
+    """
+    Update the search index for a created or modified object (if its model is indexed).
+    """
+    cache_objects([instance])
+
+
+def recache_objects(model, pks):
+    """
+    Update the search index for the objects of the given model with the specified primary keys, retrieving their
+    current values from the database (e.g. after a bulk update).
+    """
+    fields = get_indexed_models().get(model)
+    if fields is not None:
+        cache_objects(model.objects.filter(pk__in=pks).only('pk', *fields))
+
+
+def remove_objects(model, pks):
+    """
+    Remove the objects of the given model with the specified primary keys (or a subquery returning them) from the
+    search index (if the model is indexed).
+    """
+    if model not in get_indexed_models():
+        return
+
+    content_type = ContentType.objects.get_for_model(model)
+    CachedValue.objects.filter(object_type=content_type, object_id__in=pks).delete()
+
+
+def remove_object(instance):
+    """
+    Remove a deleted object from the search index (if its model is indexed).
+    """
+    remove_objects(type(instance), [instance.pk])
+
+
+def cache_model(model, batch_size=1000):
+    """
+    Rebuild the search index for all objects of the given model. Returns the number of objects indexed.
+    """
+    fields = get_indexed_models()[model]
+    content_type = ContentType.objects.get_for_model(model)
+    CachedValue.objects.filter(object_type=content_type).delete()
+
+    count = 0
+    cached_values = []
+    for instance in model.objects.only('pk', *fields).iterator(chunk_size=batch_size):
+        cached_values.extend(get_cached_values(instance, fields, content_type))
+        count += 1
+        if len(cached_values) >= batch_size:
+            CachedValue.objects.bulk_create(cached_values)
+            cached_values = []
+    CachedValue.objects.bulk_create(cached_values)
+
+    return count
+
+
+def search(value, content_type=None):
+    """
+    Return a QuerySet of CachedValues matching the given search query, optionally limited to a single content type.
+    """
+    cached_values = CachedValue.objects.filter(value__contains=normalize_value(value))
+    if content_type is not None:
+        cached_values = cached_values.filter(object_type=content_type)
+    return cached_values
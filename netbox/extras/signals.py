@@ -2,7 +2,7 @@ import importlib
 import logging
 
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver, Signal
 from django_prometheus.models import model_deletes, model_inserts, model_updates
 
@@ -11,9 +11,12 @@ from netbox import thread_locals
 from netbox.config import get_config
 from netbox.request_context import get_request
 from netbox.signals import post_clean
+from .changelog import enqueue_change
 from .choices import ObjectChangeActionChoices
-from .models import ConfigRevision, CustomField, ObjectChange
-from .webhooks import enqueue_object, get_snapshots, serialize_for_webhook
+from .configcontexts import invalidate_config_contexts
+from .models import ConfigContext, ConfigRevision, CustomField, ObjectChange, Webhook
+from .search import cache_object, remove_object
+from .webhooks import enqueue_object, get_snapshots, invalidate_webhooks_index, serialize_for_webhook
 
 #
 # Change logging/webhooks
@@ -52,30 +55,37 @@ def handle_changed_object(sender, instance, **kwargs):
     else:
         return
 
-    # Record an ObjectChange if applicable
-    if hasattr(instance, 'to_objectchange'):
-        if m2m_changed:
-            ObjectChange.objects.filter(
-                changed_object_type=ContentType.objects.get_for_model(instance),
-                changed_object_id=instance.pk,
-                request_id=request.id
-            ).update(
-                postchange_data=instance.to_objectchange(action).postchange_data
-            )
-        else:
-            objectchange = instance.to_objectchange(action)
-            objectchange.user = request.user
-            objectchange.request_id = request.id
-            objectchange.save()
+    # If change logging has been deferred, buffer the change until the request has completed. Webhooks for deferred
+    # changes are queued once the buffered changes have been written.
+    changelog_queue = getattr(thread_locals, 'changelog_queue', None)
+    if changelog_queue is not None:
+        enqueue_change(changelog_queue, instance, action, request.user, request.id)
 
-    # If this is an M2M change, update the previously queued webhook (from post_save)
-    webhook_queue = thread_locals.webhook_queue
-    if m2m_changed and webhook_queue and is_same_object(instance, webhook_queue[-1]):
-        instance.refresh_from_db()  # Ensure that we're working with fresh M2M assignments
-        webhook_queue[-1]['data'] = serialize_for_webhook(instance)
-        webhook_queue[-1]['snapshots']['postchange'] = get_snapshots(instance, action)['postchange']
     else:
-        enqueue_object(webhook_queue, instance, request.user, request.id, action)
+        # Record an ObjectChange if applicable
+        if hasattr(instance, 'to_objectchange'):
+            if m2m_changed:
+                ObjectChange.objects.filter(
+                    changed_object_type=ContentType.objects.get_for_model(instance),
+                    changed_object_id=instance.pk,
+                    request_id=request.id
+                ).update(
+                    postchange_data=instance.to_objectchange(action).postchange_data
+                )
+            else:
+                objectchange = instance.to_objectchange(action)
+                objectchange.user = request.user
+                objectchange.request_id = request.id
+                objectchange.save()
+
+        # If this is an M2M change, update the previously queued webhook (from post_save)
+        webhook_queue = thread_locals.webhook_queue
+        if m2m_changed and webhook_queue and is_same_object(instance, webhook_queue[-1]):
+            instance.refresh_from_db()  # Ensure that we're working with fresh M2M assignments
+            webhook_queue[-1]['data'] = serialize_for_webhook(instance)
+            webhook_queue[-1]['snapshots']['postchange'] = get_snapshots(instance, action)['postchange']
+        else:
+            enqueue_object(webhook_queue, instance, request.user, request.id, action)
 
     # Increment metric counters
     if action == ObjectChangeActionChoices.ACTION_CREATE:
@@ -93,16 +103,22 @@ def handle_deleted_object(sender, instance, **kwargs):
 
     request = get_request()
 
-    # Record an ObjectChange if applicable
-    if hasattr(instance, 'to_objectchange'):
-        objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_DELETE)
-        objectchange.user = request.user
-        objectchange.request_id = request.id
-        objectchange.save()
+    # If change logging has been deferred, buffer the change (and any webhooks) until the request has completed
+    changelog_queue = getattr(thread_locals, 'changelog_queue', None)
+    if changelog_queue is not None:
+        enqueue_change(changelog_queue, instance, ObjectChangeActionChoices.ACTION_DELETE, request.user, request.id)
 
-    # Enqueue webhooks
-    webhook_queue = thread_locals.webhook_queue
-    enqueue_object(webhook_queue, instance, request.user, request.id, ObjectChangeActionChoices.ACTION_DELETE)
+    else:
+        # Record an ObjectChange if applicable
+        if hasattr(instance, 'to_objectchange'):
+            objectchange = instance.to_objectchange(ObjectChangeActionChoices.ACTION_DELETE)
+            objectchange.user = request.user
+            objectchange.request_id = request.id
+            objectchange.save()
+
+        # Enqueue webhooks
+        webhook_queue = thread_locals.webhook_queue
+        enqueue_object(webhook_queue, instance, request.user, request.id, ObjectChangeActionChoices.ACTION_DELETE)
 
     # Increment metric counters
     model_deletes.labels(instance._meta.model_name).inc()
@@ -118,6 +134,72 @@ def clear_webhook_queue(sender, **kwargs):
     logger.info(f"Clearing {len(webhook_queue)} queued webhooks ({sender})")
     webhook_queue.clear()
 
+    # Discard any deferred changes
+    changelog_queue = getattr(thread_locals, 'changelog_queue', None)
+    if changelog_queue:
+        logger.info(f"Clearing {len(changelog_queue)} deferred changes ({sender})")
+        changelog_queue.clear()
+
+
+@receiver((post_save, post_delete), sender=Webhook)
+@receiver(m2m_changed, sender=Webhook.content_types.through)
+def handle_webhook_changed(sender, **kwargs):
+    """
+    Invalidate the index of enabled webhooks when a Webhook is created, modified, or deleted.
+    """
+    invalidate_webhooks_index()
+
+
+#
+# Config context cache
+#
+
+# Models whose modification may change the ConfigContexts which apply to a device or VM (e.g. moving a Site to a
+# different Region)
+CONFIG_CONTEXT_ASSIGNMENT_MODELS = (
+    'dcim.Region',
+    'dcim.SiteGroup',
+    'dcim.Site',
+    'tenancy.Tenant',
+    'virtualization.Cluster',
+)
+
+
+def handle_config_context_changed(sender, **kwargs):
+    """
+    Invalidate all cached config contexts when a ConfigContext (or an object to which ConfigContexts may be assigned)
+    is created, modified, or deleted.
+    """
+    invalidate_config_contexts()
+
+
+for model in (ConfigContext, *CONFIG_CONTEXT_ASSIGNMENT_MODELS):
+    post_save.connect(handle_config_context_changed, sender=model)
+    post_delete.connect(handle_config_context_changed, sender=model)
+for field in ConfigContext._meta.many_to_many:
+    m2m_changed.connect(handle_config_context_changed, sender=field.remote_field.through)
+
+
+#
+# Search index
+#
+
+@receiver(post_save)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    """
+    Update the search index when a searchable object is created or modified.
+    """
+    if not raw:
+        cache_object(instance)
+
+
+@receiver(post_delete)
+def remove_from_search_index(sender, instance, **kwargs):
+    """
+    Remove a deleted object from the search index.
+    """
+    remove_object(instance)
+
 
 #
 # Custom fields
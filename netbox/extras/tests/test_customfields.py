@@ -313,6 +313,34 @@ class CustomFieldTest(TestCase):
         instance.refresh_from_db()
         self.assertIsNone(instance.custom_field_data.get(cf.name))
 
+    def test_prefetch_objects(self):
+        vlans = (
+            VLAN(name='VLAN 1', vid=1),
+            VLAN(name='VLAN 2', vid=2),
+            VLAN(name='VLAN 3', vid=3),
+        )
+        VLAN.objects.bulk_create(vlans)
+        cf = CustomField.objects.create(
+            name='object_field',
+            type=CustomFieldTypeChoices.TYPE_MULTIOBJECT,
+            object_type=ContentType.objects.get_for_model(VLAN),
+            required=False
+        )
+        values = [[vlans[2].pk, vlans[0].pk], None, [vlans[1].pk]]
+
+        # All referenced objects should be retrieved with a single query
+        with self.assertNumQueries(1):
+            cf.prefetch_objects(values)
+        with self.assertNumQueries(0):
+            self.assertEqual(cf.deserialize(values[0]), [vlans[0], vlans[2]])
+            self.assertEqual(cf.deserialize(values[2]), [vlans[1]])
+
+        # Deserializing values which were not prefetched should fall back to querying the database
+        VLAN.objects.filter(pk=vlans[0].pk).delete()
+        cf.prefetch_objects([[vlans[0].pk]])
+        self.assertEqual(cf.deserialize([vlans[0].pk]), [])
+        self.assertEqual(list(cf.deserialize([vlans[1].pk])), [vlans[1]])
+
     def test_rename_customfield(self):
         obj_type = ContentType.objects.get_for_model(Site)
         FIELD_DATA = 'abc'
@@ -1,6 +1,7 @@
 from django.test import TestCase
 
 from dcim.models import Device, DeviceRole, DeviceType, Location, Manufacturer, Platform, Region, Site, SiteGroup
+from extras.configcontexts import get_fingerprint, prefetch_config_contexts
 from extras.models import ConfigContext, Tag
 from tenancy.models import Tenant, TenantGroup
 from virtualization.models import Cluster, ClusterGroup, ClusterType, VirtualMachine
@@ -103,6 +104,37 @@ class ConfigContextTest(TestCase):
         }
         self.assertEqual(self.device.get_config_context(), expected_data)
 
+    def test_cached_config_context(self):
+        context = ConfigContext.objects.create(name="context 1", weight=100, data={"a": 1})
+        self.assertEqual(self.device.get_config_context(), {"a": 1})
+
+        # Modifying a ConfigContext invalidates all cached contexts
+        context.data = {"a": 2}
+        context.save()
+        self.assertEqual(self.device.get_config_context(), {"a": 2})
+
+        # Devices with identical assignments share a fingerprint (and cached context)
+        device2 = Device.objects.create(
+            name='Device 2',
+            device_type=self.devicetype,
+            device_role=self.devicerole,
+            site=self.site,
+            location=self.location
+        )
+        self.assertEqual(get_fingerprint(device2), get_fingerprint(self.device))
+
+        # Tags are included in the fingerprint
+        context.tags.add(self.tag)
+        self.assertEqual(self.device.get_config_context(), {})
+        self.device.tags.add(self.tag)
+        self.assertNotEqual(get_fingerprint(device2), get_fingerprint(self.device))
+        self.assertEqual(self.device.get_config_context(), {"a": 2})
+
+        # Contexts prefetched in bulk are identical to those retrieved individually
+        devices = list(Device.objects.prefetch_related('tags'))
+        prefetch_config_contexts(devices)
+        self.assertEqual([device.get_config_context() for device in devices], [{"a": 2}, {}])
+
     def test_annotation_same_as_get_for_object(self):
         """
         This test incorperates features from all of the above tests cases to ensure
@@ -0,0 +1,64 @@
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from extras.models import CachedValue
+from extras.search import cache_model, search
+from tenancy.models import Tenant
+
+
+class SearchIndexTest(TestCase):
+
+    def test_cache_object(self):
+        tenant = Tenant.objects.create(name='Tenant 1', slug='tenant-1', description='Tenant ABC')
+        content_type = ContentType.objects.get_for_model(Tenant)
+
+        cached_values = CachedValue.objects.filter(object_type=content_type, object_id=tenant.pk)
+        self.assertEqual(
+            dict(cached_values.values_list('field', 'value')),
+            {'name': 'tenant 1', 'slug': 'tenant-1', 'description': 'tenant abc'}
+        )
+        self.assertEqual(list(search('ABC').values_list('object_id', flat=True)), [tenant.pk])
+
+        # Modifying the object should update its cached values
+        tenant.description = ''
+        tenant.comments = 'Primary customer'
+        tenant.save()
+        self.assertEqual(
+            dict(cached_values.values_list('field', 'value')),
+            {'name': 'tenant 1', 'slug': 'tenant-1', 'comments': 'primary customer'}
+        )
+        self.assertFalse(search('ABC').exists())
+
+        # Deleting the object should remove its cached values
+        tenant.delete()
+        self.assertFalse(cached_values.exists())
+
+    def test_bulk_writes(self):
+        Tenant.objects.bulk_create((
+            Tenant(name='Tenant 1', slug='tenant-1'),
+            Tenant(name='Tenant 2', slug='tenant-2'),
+            Tenant(name='Tenant 3', slug='tenant-3'),
+        ))
+        self.assertEqual(search('tenant 2').count(), 1)
+
+        Tenant.objects.filter(name='Tenant 2').update(name='Customer 2')
+        self.assertFalse(search('tenant 2').exists())
+        self.assertEqual(search('customer 2').count(), 1)
+
+        tenants = list(Tenant.objects.filter(name='Tenant 3'))
+        tenants[0].description = 'Third'
+        Tenant.objects.bulk_update(tenants, ['description'])
+        self.assertEqual(search('third').count(), 1)
+
+    def test_cache_model(self):
+        Tenant.objects.bulk_create((
+            Tenant(name='Tenant 1', slug='tenant-1'),
+            Tenant(name='Tenant 2', slug='tenant-2'),
+            Tenant(name='Tenant 3', slug='tenant-3'),
+        ))
+        CachedValue.objects.all().delete()
+        self.assertFalse(search('tenant').exists())
+
+        self.assertEqual(cache_model(Tenant), 3)
+        self.assertEqual(search('tenant').values('object_id').distinct().count(), 3)
+        self.assertEqual(search('TENANT 2').count(), 1)
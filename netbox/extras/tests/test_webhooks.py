@@ -5,6 +5,7 @@ from unittest.mock import patch
 import django_rq
 from django.contrib.contenttypes.models import ContentType
 from django.http import HttpResponse
+from django.test import override_settings
 from django.urls import reverse
 from requests import Session
 from rest_framework import status
@@ -14,7 +15,7 @@ from dcim.models import Site
 from extras.choices import ObjectChangeActionChoices
 from extras.models import Tag, Webhook
 from extras.webhooks import enqueue_object, flush_webhooks, generate_signature, serialize_for_webhook
-from extras.webhooks_worker import eval_conditions, process_webhook
+from extras.webhooks_worker import eval_conditions, get_retry, process_webhook, process_webhook_batch
 from utilities.testing import APITestCase
 
 
@@ -121,6 +122,29 @@ class WebhookTest(APITestCase):
             self.assertEqual(job.kwargs['snapshots']['postchange']['name'], response.data[i]['name'])
             self.assertEqual(job.kwargs['snapshots']['postchange']['tags'], ['Bar', 'Foo'])
 
+    @override_settings(WEBHOOKS_BATCHED=True)
+    def test_enqueue_webhook_batched(self):
+        # Create multiple objects via the REST API
+        data = [
+            {'name': f'Site {i}', 'slug': f'site-{i}'} for i in range(1, 4)
+        ]
+        url = reverse('dcim-api:site-list')
+        self.add_permissions('dcim.add_site')
+        response = self.client.post(url, data, format='json', **self.header)
+        self.assertHttpStatus(response, status.HTTP_201_CREATED)
+
+        # Verify that a single job was queued for all objects
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        webhook = Webhook.objects.get(type_create=True)
+        self.assertEqual(job.kwargs['webhooks'], [webhook])
+        self.assertEqual(len(job.kwargs['events']), 3)
+        for i, event in enumerate(job.kwargs['events']):
+            self.assertEqual(event['webhook_ids'], [webhook.pk])
+            self.assertEqual(event['event'], ObjectChangeActionChoices.ACTION_CREATE)
+            self.assertEqual(event['model_name'], 'site')
+            self.assertEqual(event['data']['id'], response.data[i]['id'])
+
     def test_enqueue_webhook_update(self):
         site = Site.objects.create(name='Site 1', slug='site-1')
         site.tags.set(Tag.objects.filter(name__in=['Foo', 'Bar']))
@@ -283,6 +307,29 @@ class WebhookTest(APITestCase):
         # Evaluate the conditions (status='active')
         self.assertTrue(eval_conditions(webhook, data))
 
+    def test_webhook_template_cache(self):
+        webhook = Webhook.objects.get(type_create=True)
+        template = webhook.get_template('additional_headers')
+        self.assertIs(Webhook.objects.get(pk=webhook.pk).get_template('additional_headers'), template)
+
+        # Modifying the webhook should invalidate its compiled templates
+        webhook.additional_headers = 'X-Foo: {{ model }}'
+        webhook.save()
+        self.assertIsNot(webhook.get_template('additional_headers'), template)
+        self.assertEqual(webhook.render_headers({'model': 'site'}), {'X-Foo': 'site'})
+
+    def test_webhook_retry_policy(self):
+        # By default, retry only requests which fail to connect or are rate limited
+        retry = get_retry()
+        self.assertTrue(retry.is_retry('POST', 429, has_retry_after=True))
+        self.assertFalse(retry.is_retry('POST', 503))
+        self.assertEqual(retry.read, 0)
+
+        # Server errors are retried only if enabled for the webhook
+        retry = get_retry(retry_server_errors=True)
+        self.assertTrue(retry.is_retry('POST', 503))
+        self.assertIsNone(retry.read)
+
     def test_webhooks_worker(self):
 
         request_id = uuid.uuid4()
@@ -329,3 +376,38 @@ class WebhookTest(APITestCase):
         # Patch the Session object with our dummy_send() method, then process the webhook for sending
         with patch.object(Session, 'send', dummy_send) as mock_send:
             process_webhook(**job.kwargs)
+
+    @override_settings(WEBHOOKS_BATCHED=True)
+    def test_webhooks_worker_batch_failure(self):
+
+        def dummy_send(_, request, **kwargs):
+            """
+            A dummy implementation of Session.send() which fails to deliver events for Site 2.
+            """
+            if json.loads(request.body)['data']['name'] == 'Site 2':
+                return HttpResponse(status=400)
+            return HttpResponse()
+
+        # Enqueue a batch of webhooks for processing
+        webhooks_queue = []
+        for i in range(1, 4):
+            site = Site.objects.create(name=f'Site {i}', slug=f'site-{i}')
+            enqueue_object(
+                webhooks_queue,
+                instance=site,
+                user=self.user,
+                request_id=uuid.uuid4(),
+                action=ObjectChangeActionChoices.ACTION_CREATE
+            )
+        flush_webhooks(webhooks_queue)
+        job = self.queue.jobs[0]
+        self.queue.empty()
+
+        # Only the failed delivery should be requeued, as a separate job
+        with patch.object(Session, 'send', dummy_send):
+            process_webhook_batch(**job.kwargs)
+        self.assertEqual(self.queue.count, 1)
+        job = self.queue.jobs[0]
+        self.assertEqual(job.func_name, 'extras.webhooks_worker.process_webhook')
+        self.assertEqual(job.kwargs['webhook'], Webhook.objects.get(type_create=True))
+        self.assertEqual(job.kwargs['data']['name'], 'Site 2')
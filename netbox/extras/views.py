@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Count, Q
 from django.http import Http404, HttpResponseForbidden
@@ -334,6 +336,13 @@ class ObjectConfigContextView(generic.ObjectView):
     base_template = None
     template_name = 'extras/object_configcontext.html'
 
+    def get_object(self, **kwargs):
+        queryset = self.queryset
+        if not settings.CONFIG_CONTEXT_CACHE_TIMEOUT:
+            # Config contexts are not cached; annotate the config context data to render it in a single query
+            queryset = queryset.annotate_config_context_data()
+        return get_object_or_404(queryset, **kwargs)
+
     def get_extra_context(self, request, instance):
         source_contexts = ConfigContext.objects.restrict(request.user, 'view').get_for_object(instance)
 
@@ -634,6 +643,50 @@ class ReportResultView(ContentTypePermissionRequiredMixin, View):
         })
 
 
+#
+# Job results
+#
+
+class JobResultView(LoginRequiredMixin, View):
+    """
+    Display the status and outcome of a background job (such as a bulk import) initiated by the current user, who may
+    also cancel it.
+    """
+    def get_job_result(self, request, job_result_pk):
+        job_results = JobResult.objects.all()
+        if not request.user.is_superuser:
+            job_results = job_results.filter(user=request.user)
+        return get_object_or_404(job_results, pk=job_result_pk)
+
+    def get(self, request, job_result_pk):
+        result = self.get_job_result(request, job_result_pk)
+        model = result.obj_type.model_class()
+
+        # If this is an HTMX request, return only the result HTML
+        if is_htmx(request):
+            response = render(request, 'extras/htmx/jobresult.html', {
+                'model': model,
+                'result': result,
+            })
+            if result.completed:
+                response.status_code = 286
+            return response
+
+        return render(request, 'extras/jobresult.html', {
+            'model': model,
+            'result': result,
+        })
+
+    def post(self, request, job_result_pk):
+        result = self.get_job_result(request, job_result_pk)
+
+        if '_cancel' in request.POST and not result.completed:
+            result.cancel()
+            messages.info(request, f"Cancellation of {result.name} has been requested.")
+
+        return redirect('extras:jobresult', job_result_pk=result.pk)
+
+
 #
 # Scripts
 #
@@ -1,17 +1,98 @@
 import hashlib
 import hmac
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 from django_rq import get_queue
 
+from netbox import thread_locals
 from utilities.api import get_serializer_for_model
+from utilities.cache import get_revision, invalidate_revision
 from utilities.utils import serialize_object
 from .choices import *
 from .models import Webhook
 from .registry import registry
 
 
+WEBHOOK_ACTION_FLAGS = {
+    ObjectChangeActionChoices.ACTION_CREATE: 'type_create',
+    ObjectChangeActionChoices.ACTION_UPDATE: 'type_update',
+    ObjectChangeActionChoices.ACTION_DELETE: 'type_delete',
+}
+
+
+def supports_webhooks(instance):
+    """
+    Return True if the given object's model supports webhooks.
+    """
+    app_label = instance._meta.app_label
+    model_name = instance._meta.model_name
+    return model_name in registry['model_features']['webhooks'].get(app_label, [])
+
+
+class WebhooksIndex:
+    """
+    An in-memory index of all enabled Webhooks, keyed by content type ID and event. The index is rebuilt whenever its
+    version (held in the cache and shared among all processes) changes; see invalidate_webhooks_index().
+    """
+    version_key = 'webhooks_index_version'
+
+    def __init__(self):
+        self.version = None
+        self.index = None
+
+    def get(self):
+        version = get_revision(self.version_key)
+        if self.index is None or version != self.version:
+            self.index = self.build()
+            self.version = version
+        return self.index
+
+    @staticmethod
+    def build():
+        index = {}
+        for webhook in Webhook.objects.filter(enabled=True).prefetch_related('content_types'):
+            for content_type in webhook.content_types.all():
+                for event, flag in WEBHOOK_ACTION_FLAGS.items():
+                    if getattr(webhook, flag):
+                        index.setdefault((content_type.pk, event), []).append(webhook)
+        return index
+
+
+webhooks_index = WebhooksIndex()
+
+
+def invalidate_webhooks_index():
+    """
+    Discard the index of enabled Webhooks in all processes, following a change to any Webhook.
+    """
+    invalidate_revision(WebhooksIndex.version_key)
+
+
+def get_webhooks(content_type, event):
+    """
+    Return all enabled Webhooks triggered by the specified event for the given content type. The validity of the
+    webhooks index is checked only once for the remainder of the current request (if any).
+    """
+    request_cache = getattr(thread_locals, 'webhooks_cache', None)
+    if request_cache is not None:
+        if 'index' not in request_cache:
+            request_cache['index'] = webhooks_index.get()
+        index = request_cache['index']
+    else:
+        index = webhooks_index.get()
+
+    return index.get((content_type.pk, event), [])
+
+
+def has_webhooks(content_type, event):
+    """
+    Return True if any enabled Webhook is triggered by the specified event for the given content type.
+    """
+    return bool(get_webhooks(content_type, event))
+
+
 def serialize_for_webhook(instance):
     """
     Return a serialized representation of the given instance suitable for use in a webhook.
@@ -58,9 +139,7 @@ def enqueue_object(queue, instance, user, request_id, action):
     webhooks once the request has completed.
     """
     # Determine whether this type of object supports webhooks
-    app_label = instance._meta.app_label
-    model_name = instance._meta.model_name
-    if model_name not in registry['model_features']['webhooks'].get(app_label, []):
+    if not supports_webhooks(instance):
         return
 
     queue.append({
@@ -76,34 +155,35 @@ def enqueue_object(queue, instance, user, request_id, action):
 
 def flush_webhooks(queue):
     """
-    Flush a list of object representation to RQ for webhook processing.
+    Flush a list of object representation to RQ for webhook processing. If WEBHOOKS_BATCHED is enabled, all events
+    are enqueued as a single job.
     """
     rq_queue = get_queue('default')
-    webhooks_cache = {
-        'type_create': {},
-        'type_update': {},
-        'type_delete': {},
-    }
+    timestamp = str(timezone.now())
+    webhooks = {}
+    events = []
 
     for data in queue:
-
-        action_flag = {
-            ObjectChangeActionChoices.ACTION_CREATE: 'type_create',
-            ObjectChangeActionChoices.ACTION_UPDATE: 'type_update',
-            ObjectChangeActionChoices.ACTION_DELETE: 'type_delete',
-        }[data['event']]
         content_type = data['content_type']
-
-        # Cache applicable Webhooks
-        if content_type not in webhooks_cache[action_flag]:
-            webhooks_cache[action_flag][content_type] = Webhook.objects.filter(
-                **{action_flag: True},
-                content_types=content_type,
-                enabled=True
-            )
-        webhooks = webhooks_cache[action_flag][content_type]
-
-        for webhook in webhooks:
+        matched_webhooks = get_webhooks(content_type, data['event'])
+        if not matched_webhooks:
+            continue
+
+        if settings.WEBHOOKS_BATCHED:
+            webhooks.update({webhook.pk: webhook for webhook in matched_webhooks})
+            events.append({
+                'webhook_ids': [webhook.pk for webhook in matched_webhooks],
+                'model_name': content_type.model,
+                'event': data['event'],
+                'data': data['data'],
+                'snapshots': data['snapshots'],
+                'timestamp': timestamp,
+                'username': data['username'],
+                'request_id': data['request_id'],
+            })
+            continue
+
+        for webhook in matched_webhooks:
             rq_queue.enqueue(
                 "extras.webhooks_worker.process_webhook",
                 webhook=webhook,
@@ -111,7 +191,14 @@ def flush_webhooks(queue):
                 event=data['event'],
                 data=data['data'],
                 snapshots=data['snapshots'],
-                timestamp=str(timezone.now()),
+                timestamp=timestamp,
                 username=data['username'],
                 request_id=data['request_id']
             )
+
+    if events:
+        rq_queue.enqueue(
+            "extras.webhooks_worker.process_webhook_batch",
+            webhooks=list(webhooks.values()),
+            events=events
+        )
@@ -1,9 +1,14 @@
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
 import requests
 from django.conf import settings
-from django_rq import job
+from django_rq import get_queue, job
 from jinja2.exceptions import TemplateError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .choices import ObjectChangeActionChoices
 from .conditions import ConditionSet
@@ -11,6 +16,18 @@ from .webhooks import generate_signature
 
 logger = logging.getLogger('netbox.webhooks_worker')
 
+# Response status codes upon which a request will be retried (with respect for any Retry-After header)
+RETRY_STATUS_CODES = (429,)
+
+# Server errors upon which a request will also be retried, if enabled for the Webhook. A receiver may have processed
+# the request before failing, so these retries risk duplicate deliveries.
+RETRY_SERVER_ERROR_STATUS_CODES = (500, 502, 503, 504)
+
+# Pooled Sessions (by endpoint and retry policy) and concurrency limits (by endpoint)
+_sessions = {}
+_semaphores = {}
+_sessions_lock = threading.Lock()
+
 
 def eval_conditions(webhook, data):
     """
@@ -27,10 +44,53 @@ def eval_conditions(webhook, data):
     return False
 
 
-@job('default')
-def process_webhook(webhook, model_name, event, data, snapshots, timestamp, username, request_id):
+def get_retry(retry_server_errors=False):
     """
-    Make a POST request to the defined Webhook
+    Return the retry policy for webhook requests. Requests are retried with exponential backoff (see WEBHOOKS_RETRIES
+    and WEBHOOKS_RETRY_BACKOFF) if the connection fails or the receiver responds with status 429. Read errors and server
+    errors are retried only if retry_server_errors is True, since the receiver may already have processed the request.
+    """
+    status_forcelist = RETRY_STATUS_CODES
+    if retry_server_errors:
+        status_forcelist += RETRY_SERVER_ERROR_STATUS_CODES
+    return Retry(
+        total=settings.WEBHOOKS_RETRIES,
+        read=None if retry_server_errors else 0,
+        other=None if retry_server_errors else 0,
+        backoff_factor=settings.WEBHOOKS_RETRY_BACKOFF,
+        status_forcelist=status_forcelist,
+        allowed_methods=None,
+        raise_on_status=False
+    )
+
+
+def get_session(url, retry_server_errors=False):
+    """
+    Return the pooled Session for the endpoint (scheme and network location) of the given URL and the retry policy, along
+    with the semaphore limiting concurrent requests to that endpoint. Sessions are shared by all threads within the
+    process, so that connections to each endpoint are reused across deliveries.
+    """
+    endpoint = urlsplit(url)[:2]
+    key = (endpoint, retry_server_errors)
+    with _sessions_lock:
+        if key not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=settings.WEBHOOKS_ENDPOINT_CONCURRENCY,
+                max_retries=get_retry(retry_server_errors)
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[key] = session
+        if endpoint not in _semaphores:
+            _semaphores[endpoint] = threading.BoundedSemaphore(settings.WEBHOOKS_ENDPOINT_CONCURRENCY)
+        return _sessions[key], _semaphores[endpoint]
+
+
+def prepare_webhook_request(webhook, model_name, event, data, snapshots, timestamp, username, request_id):
+    """
+    Render the HTTP request for the defined Webhook. Returns None if the Webhook's conditions are not met.
     """
     # Evaluate webhook conditions (if any)
     if not eval_conditions(webhook, data):
@@ -85,12 +145,18 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
     if webhook.secret != '':
         prepared_request.headers['X-Hook-Signature'] = generate_signature(prepared_request.body, webhook.secret)
 
-    # Send the request
-    with requests.Session() as session:
-        session.verify = webhook.ssl_verification
-        if webhook.ca_file_path:
-            session.verify = webhook.ca_file_path
-        response = session.send(prepared_request, proxies=settings.HTTP_PROXIES)
+    return prepared_request
+
+
+def send_webhook_request(webhook, prepared_request):
+    """
+    Send a prepared HTTP request for the defined Webhook using the pooled Session for its endpoint. No more than
+    WEBHOOKS_ENDPOINT_CONCURRENCY requests are sent to any one endpoint at once.
+    """
+    session, semaphore = get_session(prepared_request.url, webhook.retry_server_errors)
+    verify = webhook.ca_file_path or webhook.ssl_verification
+    with semaphore:
+        response = session.send(prepared_request, proxies=settings.HTTP_PROXIES, verify=verify)
 
     if 200 <= response.status_code <= 299:
         logger.info(f"Request succeeded; response status {response.status_code}")
@@ -100,3 +166,83 @@ def process_webhook(webhook, model_name, event, data, snapshots, timestamp, user
         raise requests.exceptions.RequestException(
             f"Status {response.status_code} returned with content '{response.content}', webhook FAILED to process."
         )
+
+
+@job('default')
+def process_webhook(webhook, model_name, event, data, snapshots, timestamp, username, request_id):
+    """
+    Make a POST request to the defined Webhook
+    """
+    prepared_request = prepare_webhook_request(
+        webhook, model_name, event, data, snapshots, timestamp, username, request_id
+    )
+    if prepared_request is None:
+        return
+
+    return send_webhook_request(webhook, prepared_request)
+
+
+def deliver_webhooks(webhook, deliveries):
+    """
+    Send a series of prepared requests for a single Webhook in order. Returns the events whose delivery failed.
+    """
+    failed_events = []
+    for prepared_request, event in deliveries:
+        try:
+            send_webhook_request(webhook, prepared_request)
+        except Exception as e:
+            logger.warning(f"Delivery of webhook {webhook} failed; requeuing as a separate job: {e}")
+            failed_events.append(event)
+    return failed_events
+
+
+def requeue_webhook(webhook, event):
+    """
+    Enqueue a single event which failed to process as part of a batch as its own job, so that it may be retried without
+    repeating the batch's successful deliveries.
+    """
+    get_queue('default').enqueue(
+        "extras.webhooks_worker.process_webhook",
+        webhook=webhook,
+        **event
+    )
+
+
+@job('default')
+def process_webhook_batch(webhooks, events):
+    """
+    Process a batch of events queued by a single request. All requests are rendered up front; they are then sent to
+    each Webhook in the order in which the events occurred, while deliveries to different Webhooks proceed
+    concurrently (up to WEBHOOKS_CONCURRENCY at once). Any event which fails to process for a Webhook is requeued as a
+    separate job (see process_webhook()).
+    """
+    deliveries = {webhook.pk: [] for webhook in webhooks}
+    webhooks_by_id = {webhook.pk: webhook for webhook in webhooks}
+    failures = []
+    for event in events:
+        event = dict(event)
+        for webhook_id in event.pop('webhook_ids'):
+            webhook = webhooks_by_id[webhook_id]
+            try:
+                prepared_request = prepare_webhook_request(webhook, **event)
+            except Exception:
+                failures.append((webhook, event))
+                continue
+            if prepared_request is not None:
+                deliveries[webhook_id].append((prepared_request, event))
+
+    with ThreadPoolExecutor(max_workers=settings.WEBHOOKS_CONCURRENCY) as executor:
+        results = executor.map(
+            deliver_webhooks,
+            webhooks,
+            [deliveries[webhook.pk] for webhook in webhooks]
+        )
+        for webhook, failed_events in zip(webhooks, results):
+            failures.extend((webhook, event) for event in failed_events)
+
+    for webhook, event in failures:
+        requeue_webhook(webhook, event)
+
+    if failures:
+        return f"{len(events)} events processed; {len(failures)} failed deliveries were requeued."
+    return f"{len(events)} events successfully processed."
@@ -1,7 +1,9 @@
+from itertools import islice
+
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.db import transaction
+from django.db.models import F
 from django.shortcuts import get_object_or_404
-from django_pglocks import advisory_lock
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.response import Response
@@ -11,11 +13,12 @@ from rest_framework.views import APIView
 from circuits.models import Provider
 from dcim.models import Site
 from ipam import filtersets
+from ipam.gaps import allocate_prefixes
+from ipam.locks import ip_allocation_lock, prefix_allocation_lock, vlan_allocation_lock
 from ipam.models import *
 from netbox.api.viewsets import NetBoxModelViewSet
 from netbox.api.viewsets.mixins import ObjectValidationMixin
 from netbox.config import get_config
-from utilities.constants import ADVISORY_LOCK_KEYS
 from utilities.utils import count_related
 from . import serializers
 from ipam.models import L2VPN, L2VPNTermination
@@ -128,7 +131,7 @@ class FHRPGroupAssignmentViewSet(NetBoxModelViewSet):
 
 class VLANGroupViewSet(NetBoxModelViewSet):
     queryset = VLANGroup.objects.annotate(
-        vlan_count=count_related(VLAN, 'group')
+        vlan_count=F('_vlan_count')
     ).prefetch_related('tags')
     serializer_class = serializers.VLANGroupSerializer
     filterset_class = filtersets.VLANGroupFilterSet
@@ -208,11 +211,15 @@ class AvailablePrefixesView(ObjectValidationMixin, APIView):
         request_body=serializers.PrefixLengthSerializer,
         responses={201: serializers.PrefixSerializer(many=True)}
     )
-    @advisory_lock(ADVISORY_LOCK_KEYS['available-prefixes'])
     def post(self, request, pk):
         self.queryset = self.queryset.restrict(request.user, 'add')
         prefix = get_object_or_404(Prefix.objects.restrict(request.user), pk=pk)
-        available_prefixes = prefix.get_available_prefixes()
+
+        # Serialize allocations within this prefix (and any prefix which contains it)
+        with prefix_allocation_lock(prefix):
+            return self._create_prefixes(request, prefix)
+
+    def _create_prefixes(self, request, prefix):
 
         # Validate Requested Prefixes' length
         serializer = serializers.PrefixLengthSerializer(
@@ -230,26 +237,22 @@ class AvailablePrefixesView(ObjectValidationMixin, APIView):
             )
 
         requested_prefixes = serializer.validated_data
-        # Allocate prefixes to the requested objects based on availability within the parent
-        for i, requested_prefix in enumerate(requested_prefixes):
-
-            # Find the first available prefix equal to or larger than the requested size
-            for available_prefix in available_prefixes.iter_cidrs():
-                if requested_prefix['prefix_length'] >= available_prefix.prefixlen:
-                    allocated_prefix = '{}/{}'.format(available_prefix.network, requested_prefix['prefix_length'])
-                    requested_prefix['prefix'] = allocated_prefix
-                    requested_prefix['vrf'] = prefix.vrf.pk if prefix.vrf else None
-                    break
-            else:
-                return Response(
-                    {
-                        "detail": "Insufficient space is available to accommodate the requested prefix size(s)"
-                    },
-                    status=status.HTTP_409_CONFLICT
-                )
-
-            # Remove the allocated prefix from the list of available prefixes
-            available_prefixes.remove(allocated_prefix)
+        # Allocate prefixes to the requested objects based on availability within the parent, finding the first
+        # available prefix equal to or larger than each requested size
+        allocated_prefixes = allocate_prefixes(
+            prefix.iter_available_ranges(),
+            [requested_prefix['prefix_length'] for requested_prefix in requested_prefixes]
+        )
+        if allocated_prefixes is None:
+            return Response(
+                {
+                    "detail": "Insufficient space is available to accommodate the requested prefix size(s)"
+                },
+                status=status.HTTP_409_CONFLICT
+            )
+        for requested_prefix, allocated_prefix in zip(requested_prefixes, allocated_prefixes):
+            requested_prefix['prefix'] = str(allocated_prefix)
+            requested_prefix['vrf'] = prefix.vrf.pk if prefix.vrf else None
 
         # Initialize the serializer with a list or a single object depending on what was requested
         context = {'request': request}
@@ -282,12 +285,8 @@ class AvailableIPAddressesView(ObjectValidationMixin, APIView):
         parent = self.get_parent(request, pk)
         limit = get_results_limit(request)
 
-        # Calculate available IPs within the parent
-        ip_list = []
-        for index, ip in enumerate(parent.get_available_ips(), start=1):
-            ip_list.append(ip)
-            if index == limit:
-                break
+        # Find the first available IPs within the parent (without materializing the full set)
+        ip_list = list(islice(parent.iter_available_ips(), limit))
         serializer = serializers.AvailableIPSerializer(ip_list, many=True, context={
             'request': request,
             'parent': parent,
@@ -300,17 +299,22 @@ class AvailableIPAddressesView(ObjectValidationMixin, APIView):
         request_body=serializers.AvailableIPSerializer,
         responses={201: serializers.IPAddressSerializer(many=True)}
     )
-    @advisory_lock(ADVISORY_LOCK_KEYS['available-ips'])
     def post(self, request, pk):
         self.queryset = self.queryset.restrict(request.user, 'add')
         parent = self.get_parent(request, pk)
 
+        # Serialize allocations from this parent (and any prefix or range which overlaps it)
+        with ip_allocation_lock(parent):
+            return self._create_ips(request, parent)
+
+    def _create_ips(self, request, parent):
+
         # Normalize to a list of objects
         requested_ips = request.data if isinstance(request.data, list) else [request.data]
 
         # Determine if the requested number of IPs is available
-        available_ips = parent.get_available_ips()
-        if available_ips.size < len(requested_ips):
+        available_ips = list(islice(parent.iter_available_ips(), len(requested_ips)))
+        if len(available_ips) < len(requested_ips):
             return Response(
                 {
                     "detail": f"An insufficient number of IP addresses are available within {parent} "
@@ -320,9 +324,8 @@ class AvailableIPAddressesView(ObjectValidationMixin, APIView):
             )
 
         # Assign addresses from the list of available IPs and copy VRF assignment from the parent
-        available_ips = iter(available_ips)
-        for requested_ip in requested_ips:
-            requested_ip['address'] = f'{next(available_ips)}/{parent.mask_length}'
+        for requested_ip, available_ip in zip(requested_ips, available_ips):
+            requested_ip['address'] = f'{available_ip}/{parent.mask_length}'
             requested_ip['vrf'] = parent.vrf.pk if parent.vrf else None
 
         # Initialize the serializer with a list or a single object depending on what was requested
@@ -365,7 +368,7 @@ class AvailableVLANsView(ObjectValidationMixin, APIView):
         vlangroup = get_object_or_404(VLANGroup.objects.restrict(request.user), pk=pk)
         limit = get_results_limit(request)
 
-        available_vlans = vlangroup.get_available_vids()[:limit]
+        available_vlans = list(islice(vlangroup.iter_available_vids(), limit))
         serializer = serializers.AvailableVLANSerializer(available_vlans, many=True, context={
             'request': request,
             'group': vlangroup,
@@ -377,11 +380,15 @@ class AvailableVLANsView(ObjectValidationMixin, APIView):
         request_body=serializers.CreateAvailableVLANSerializer,
         responses={201: serializers.VLANSerializer(many=True)}
     )
-    @advisory_lock(ADVISORY_LOCK_KEYS['available-vlans'])
     def post(self, request, pk):
         self.queryset = self.queryset.restrict(request.user, 'add')
         vlangroup = get_object_or_404(VLANGroup.objects.restrict(request.user), pk=pk)
-        available_vlans = vlangroup.get_available_vids()
+
+        # Serialize allocations within this VLAN group
+        with vlan_allocation_lock(vlangroup):
+            return self._create_vlans(request, vlangroup)
+
+    def _create_vlans(self, request, vlangroup):
         many = isinstance(request.data, list)
 
         # Validate requested VLANs
@@ -401,14 +408,15 @@ class AvailableVLANsView(ObjectValidationMixin, APIView):
 
         requested_vlans = serializer.validated_data
 
-        for i, requested_vlan in enumerate(requested_vlans):
-            try:
-                requested_vlan['vid'] = available_vlans.pop(0)
-                requested_vlan['group'] = vlangroup.pk
-            except IndexError:
-                return Response({
-                    "detail": "The requested number of VLANs is not available"
-                }, status=status.HTTP_409_CONFLICT)
+        # Find only as many available VIDs as have been requested
+        available_vids = list(islice(vlangroup.iter_available_vids(), len(requested_vlans)))
+        if len(available_vids) < len(requested_vlans):
+            return Response({
+                "detail": "The requested number of VLANs is not available"
+            }, status=status.HTTP_409_CONFLICT)
+        for requested_vlan, vid in zip(requested_vlans, available_vids):
+            requested_vlan['vid'] = vid
+            requested_vlan['group'] = vlangroup.pk
 
         # Initialize the serializer with a list or a single object depending on what was requested
         context = {'request': request}
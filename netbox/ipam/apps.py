@@ -7,3 +7,8 @@ class IPAMConfig(AppConfig):
 
     def ready(self):
         import ipam.signals
+        from netbox import counters
+        from .models import VLANGroup
+
+        # Register counter fields
+        counters.register(VLANGroup)
@@ -0,0 +1,210 @@
+import heapq
+
+import netaddr
+from django.db import connection
+from django.db.models.functions import Cast
+
+from .fields import IPAddressField
+from .lookups import Host
+
+__all__ = (
+    'AvailableIPAddressList',
+    'allocate_prefixes',
+    'get_host',
+    'iter_available_ips',
+    'iter_available_ranges',
+    'iter_used_ranges',
+)
+
+
+def get_host(field_name):
+    """
+    Return an expression for the host portion of an IP address field (without regard to its mask), which can be used
+    to sort addresses numerically.
+    """
+    return Cast(Host(field_name), output_field=IPAddressField())
+
+
+def iter_used_ranges(ip_queryset=None, range_queryset=None, prefix_queryset=None, chunk_size=1000):
+    """
+    Stream the address ranges occupied by the given IPAddresses, IPRanges, and/or Prefixes from the database in order.
+    Yields a two-tuple of the first and last integer values of each range.
+    """
+    streams = []
+    if ip_queryset is not None:
+        ips = ip_queryset.annotate(host_address=get_host('address')).order_by('host_address')
+        streams.append(
+            (ip.value, ip.value) for ip in ips.values_list('host_address', flat=True).iterator(chunk_size=chunk_size)
+        )
+    if range_queryset is not None:
+        ranges = range_queryset.annotate(
+            host_start=get_host('start_address'),
+            host_end=get_host('end_address')
+        ).order_by('host_start')
+        streams.append(
+            (start.value, end.value)
+            for start, end in ranges.values_list('host_start', 'host_end').iterator(chunk_size=chunk_size)
+        )
+    if prefix_queryset is not None:
+        prefixes = prefix_queryset.order_by('prefix')
+        streams.append(
+            (prefix.first, prefix.last)
+            for prefix in prefixes.values_list('prefix', flat=True).iterator(chunk_size=chunk_size)
+        )
+
+    return heapq.merge(*streams)
+
+
+def iter_available_ranges(first, last, used_ranges):
+    """
+    Yield each range of integer values between first and last (inclusive) which is not covered by any of the given
+    used ranges. Used ranges must be sorted by their first value; they may overlap. Ranges are yielded lazily as
+    two-tuples of their first and last values.
+    """
+    cursor = first
+    for start, end in used_ranges:
+        if cursor > last or start > last:
+            break
+        if start > cursor:
+            yield cursor, start - 1
+        cursor = max(cursor, end + 1)
+
+    if cursor <= last:
+        yield cursor, last
+
+
+def iter_available_ips(first, last, used_ranges, version):
+    """
+    Yield each available IP address (as a netaddr.IPAddress) between first and last (inclusive) in order.
+    """
+    for start, end in iter_available_ranges(first, last, used_ranges):
+        for value in range(start, end + 1):
+            yield netaddr.IPAddress(value, version)
+
+
+def allocate_prefixes(available_ranges, prefix_lengths):
+    """
+    Allocate a prefix of each of the given lengths in turn, choosing the first available prefix of sufficient size.
+    Available ranges are consumed from the given iterator (of netaddr.IPRanges, in order) only as far as is necessary
+    to satisfy the requested lengths. Returns a list of netaddr.IPNetworks, or None if insufficient space is available.
+    """
+    available_ranges = iter(available_ranges)
+    available = netaddr.IPSet()
+    allocated = []
+    for prefix_length in prefix_lengths:
+        while True:
+            cidr = next((cidr for cidr in available.iter_cidrs() if prefix_length >= cidr.prefixlen), None)
+            if cidr is not None:
+                break
+            available_range = next(available_ranges, None)
+            if available_range is None:
+                return None
+            available.update(available_range.cidrs())
+
+        prefix = netaddr.IPNetwork(f'{cidr.network}/{prefix_length}')
+        available.remove(prefix)
+        allocated.append(prefix)
+
+    return allocated
+
+
+class AvailableIPAddressList:
+    """
+    A lazy sequence of the IPAddresses within a prefix, interspersed with ranges of available addresses. Each range is
+    represented as a two-tuple of its size and its first address. Only the IPAddresses (and ranges) requested by each
+    slice are retrieved: gaps are located and numbered by the database, so that a page of results can be retrieved
+    without loading every IPAddress within the prefix.
+    """
+    # Rows are numbered in the order of the IPAddress model (by address, then PK), as for a fully materialized list
+    # (see add_available_ipaddresses()). Under this ordering the mask length sorts before the host address, so a gap is
+    # only counted where the host address increases by more than one from that of the preceding row.
+    ROWS_SQL = (
+        'SELECT id, host, prev, gap, last_host, ROW_NUMBER() OVER w + SUM(gap) OVER w AS pos FROM ('
+        '  SELECT id, address, host_address AS host, LAG(host_address) OVER w AS prev,'
+        '  LAST_VALUE(host_address) OVER (w ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING) AS last_host,'
+        '  CASE'
+        '    WHEN LAG(host_address) OVER w IS NULL THEN (host_address > %s::inet)::int'
+        '    WHEN LAG(host_address) OVER w = host_address THEN 0'
+        '    ELSE (LAG(host_address) OVER w + 1 < host_address)::int'
+        '  END AS gap'
+        '  FROM ({}) T'
+        '  WINDOW w AS (ORDER BY address, id)'
+        ') U '
+        'WINDOW w AS (ORDER BY address, id)'
+    )
+
+    def __init__(self, prefix, queryset, is_pool=False):
+        self.prefix = prefix
+        self.queryset = queryset
+        self._length = None
+
+        # Ignore the network and broadcast addresses for non-pool IPv4 prefixes larger than /31.
+        if prefix.version == 4 and prefix.prefixlen < 31 and not is_pool:
+            self.first_ip = netaddr.IPAddress(prefix.first + 1)
+            self.last_ip = netaddr.IPAddress(prefix.last - 1)
+        else:
+            self.first_ip = netaddr.IPAddress(prefix.first)
+            self.last_ip = netaddr.IPAddress(prefix.last)
+
+    def _execute(self, sql, params=()):
+        base_sql, base_params = self.queryset.order_by().annotate(
+            host_address=get_host('address')
+        ).values('pk', 'address', 'host_address').query.sql_with_params()
+        rows_sql = self.ROWS_SQL.format(base_sql)
+        with connection.cursor() as cursor:
+            cursor.execute(sql.format(rows_sql), (str(self.first_ip), *base_params, *params))
+            return cursor.fetchall()
+
+    def _get_range(self, first, last):
+        return int(last - first + 1), f'{first}/{self.prefix.prefixlen}'
+
+    def __len__(self):
+        if self._length is None:
+            # Any trailing range follows the host address of the last row
+            count, gaps, last_host = self._execute(
+                'SELECT COUNT(*), COALESCE(SUM(gap), 0), MAX(last_host) FROM ({}) R'
+            )[0]
+            self._trailing_range = None
+            if last_host is None:
+                self._trailing_range = (self.first_ip, self.last_ip)
+            elif netaddr.IPAddress(last_host) < self.last_ip:
+                self._trailing_range = (netaddr.IPAddress(last_host) + 1, self.last_ip)
+            self._length = count + gaps + (1 if self._trailing_range else 0)
+        return self._length
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            if key < 0:
+                key += len(self)
+            results = self[key:key + 1]
+            if not results:
+                raise IndexError('Index out of range')
+            return results[0]
+
+        start, stop, step = key.indices(len(self))
+        if step != 1:
+            raise ValueError('Slicing with a step is not supported')
+        if start >= stop:
+            return []
+
+        # Retrieve the IPAddresses (and preceding ranges) which fall within the slice
+        rows = self._execute(
+            'SELECT id, host, prev, gap, pos FROM ({}) R WHERE pos > %s AND pos - gap <= %s ORDER BY pos',
+            (start, stop)
+        )
+        ipaddresses = self.queryset.in_bulk([row[0] for row in rows])
+
+        entries = {}
+        for pk, host, prev, gap, pos in rows:
+            if gap:
+                first = netaddr.IPAddress(prev) + 1 if prev is not None else self.first_ip
+                entries[pos - 2] = self._get_range(first, netaddr.IPAddress(host) - 1)
+            entries[pos - 1] = ipaddresses.get(pk)
+        if self._trailing_range:
+            entries[self._length - 1] = self._get_range(*self._trailing_range)
+
+        return [entries[i] for i in range(start, stop) if entries.get(i) is not None]
+
+    def __iter__(self, chunk_size=1000):
+        for i in range(0, len(self), chunk_size):
+            yield from self[i:i + chunk_size]
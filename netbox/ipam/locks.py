@@ -0,0 +1,122 @@
+from contextlib import ExitStack, contextmanager
+
+from django.db.models import Q
+from django_pglocks import advisory_lock
+
+from utilities.constants import ADVISORY_LOCK_KEYS
+from .gaps import get_host
+from .models import IPRange, Prefix
+
+__all__ = (
+    'get_ip_allocation_locks',
+    'ip_allocation_lock',
+    'prefix_allocation_lock',
+    'vlan_allocation_lock',
+)
+
+
+def get_lock_id(key, pk):
+    """
+    Return the two-part advisory lock ID for an object. (Each part of the ID is a 32-bit integer, so the primary key is
+    wrapped if necessary. A collision merely serializes unrelated allocations.)
+    """
+    return ADVISORY_LOCK_KEYS[key], pk % 2 ** 31
+
+
+@contextmanager
+def advisory_locks(exclusive, shared=()):
+    """
+    Acquire an exclusive advisory lock for each of the given lock IDs, and a shared lock for each of the shared lock
+    IDs. Locks are always acquired in the same order, so that concurrent requests for overlapping sets of locks cannot
+    deadlock. All locks are released on exit.
+    """
+    locks = {lock_id: True for lock_id in shared}
+    locks.update({lock_id: False for lock_id in exclusive})
+
+    with ExitStack() as stack:
+        for lock_id, is_shared in sorted(locks.items()):
+            stack.enter_context(advisory_lock(lock_id, shared=is_shared))
+        yield
+
+
+def _get_overlapping_ranges(vrf, first, last):
+    """
+    Return the IPRanges within the VRF which overlap the given span of addresses but are not contained by it.
+    """
+    return IPRange.objects.filter(vrf=vrf).annotate(
+        host_start=get_host('start_address'),
+        host_end=get_host('end_address')
+    ).filter(
+        host_start__lte=str(last),
+        host_end__gte=str(first)
+    ).exclude(
+        host_start__gte=str(first),
+        host_end__lte=str(last)
+    )
+
+
+def prefix_allocation_lock(prefix):
+    """
+    Lock a Prefix for the allocation of child prefixes. Allocations within a prefix are serialized by an exclusive
+    lock, while each containing prefix is locked in shared mode: allocations within unrelated (or sibling) prefixes
+    proceed concurrently, but never alongside an allocation within a prefix which overlaps them.
+    """
+    parents = Prefix.objects.filter(
+        vrf=prefix.vrf,
+        prefix__net_contains_or_equals=str(prefix.prefix)
+    ).exclude(pk=prefix.pk)
+
+    return advisory_locks(
+        exclusive=[get_lock_id('available-prefixes', prefix.pk)],
+        shared=[get_lock_id('available-prefixes', pk) for pk in parents.values_list('pk', flat=True)]
+    )
+
+
+def get_ip_allocation_locks(parent):
+    """
+    Return the exclusive and shared lock IDs required to allocate IP addresses from a Prefix or IPRange. The parent is
+    locked exclusively, and every other prefix and range in the same VRF which overlaps the parent (but is not
+    contained within it) is locked in shared mode. Any two parents from which the same address could be allocated
+    therefore conflict, since at least one of them holds a shared lock on the other.
+    """
+    if isinstance(parent, Prefix):
+        first, last = parent.prefix[0], parent.prefix[-1]
+        key = 'available-ips'
+        prefixes = Prefix.objects.filter(
+            vrf=parent.vrf,
+            prefix__net_contains_or_equals=str(parent.prefix)
+        ).exclude(pk=parent.pk)
+    else:
+        first, last = parent.start_address.ip, parent.end_address.ip
+        key = 'available-ips-range'
+        prefixes = Prefix.objects.filter(
+            Q(prefix__net_contains_or_equals=str(first)) | Q(prefix__net_contains_or_equals=str(last)),
+            vrf=parent.vrf
+        )
+    prefix_pks = prefixes.values_list('pk', flat=True)
+    range_pks = _get_overlapping_ranges(parent.vrf, first, last).values_list('pk', flat=True)
+
+    exclusive = [get_lock_id(key, parent.pk)]
+    shared = [
+        *[get_lock_id('available-ips', pk) for pk in prefix_pks],
+        *[get_lock_id('available-ips-range', pk) for pk in range_pks],
+    ]
+
+    return exclusive, shared
+
+
+def ip_allocation_lock(parent):
+    """
+    Lock a Prefix or IPRange for the allocation of IP addresses (see get_ip_allocation_locks()).
+    """
+    exclusive, shared = get_ip_allocation_locks(parent)
+    return advisory_locks(exclusive, shared)
+
+
+def vlan_allocation_lock(vlan_group):
+    """
+    Lock a VLANGroup for the allocation of VLANs.
+    """
+    return advisory_locks(
+        exclusive=[get_lock_id('available-vlans', vlan_group.pk)]
+    )
@@ -0,0 +1,106 @@
+import statistics
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ipam.api.views import PrefixAvailableIPAddressesView
+from ipam.models import IPAddress, Prefix, VRF
+
+
+class Command(BaseCommand):
+    help = "Measure the throughput of concurrent IP address allocations via the REST API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--clients', type=int, default=50,
+            help="Number of clients allocating IP addresses in parallel (default: 50)"
+        )
+        parser.add_argument(
+            '--allocations', type=int, default=10,
+            help="Number of IP addresses allocated by each client (default: 10)"
+        )
+        parser.add_argument(
+            '--username',
+            help="User as whom allocations are made (default: the first superuser)"
+        )
+
+    def handle(self, *args, **options):
+        if options['clients'] < 1 or options['allocations'] < 1:
+            raise CommandError("--clients and --allocations must be at least 1")
+        if options['clients'] * options['allocations'] > 1000:
+            raise CommandError("Each parent prefix is a /22: at most 1000 IP addresses may be allocated in total")
+
+        if options['username']:
+            user = User.objects.filter(username=options['username']).first()
+        else:
+            user = User.objects.filter(is_superuser=True).order_by('pk').first()
+        if user is None:
+            raise CommandError("No user found with which to make allocations")
+
+        # Create a VRF for the benchmark, so that its objects can be removed afterward
+        vrf = VRF.objects.create(name=f'Allocation benchmark {time.time():.0f}', enforce_unique=True)
+        self.stdout.write(f"Created VRF {vrf}")
+        try:
+            parents = [
+                Prefix.objects.create(prefix=f'10.{i // 64}.{i % 64 * 4}.0/22', vrf=vrf)
+                for i in range(options['clients'])
+            ]
+
+            self.stdout.write(f"Distinct parents: {options['clients']} clients, one prefix each...")
+            self.run(user, parents, options['allocations'])
+
+            self.stdout.write(f"Single parent: {options['clients']} clients sharing one prefix...")
+            self.run(user, [parents[0]] * options['clients'], options['allocations'])
+
+        finally:
+            IPAddress.objects.filter(vrf=vrf).delete()
+            Prefix.objects.filter(vrf=vrf).delete()
+            vrf.delete()
+            self.stdout.write(f"Deleted VRF {vrf}")
+
+    def run(self, user, parents, allocations):
+        """
+        Allocate the specified number of IP addresses from each parent, using a separate thread (and database
+        connection) for each.
+        """
+        view = PrefixAvailableIPAddressesView.as_view()
+        factory = APIRequestFactory()
+        latencies = []
+        failures = []
+
+        def client(parent):
+            try:
+                url = reverse('ipam-api:prefix-available-ips', kwargs={'pk': parent.pk})
+                for _ in range(allocations):
+                    request = factory.post(url, {'description': 'Allocation benchmark'}, format='json')
+                    force_authenticate(request, user=user)
+                    start = time.monotonic()
+                    response = view(request, pk=parent.pk)
+                    latencies.append(time.monotonic() - start)
+                    if response.status_code != status.HTTP_201_CREATED:
+                        failures.append(response.data)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=client, args=(parent,)) for parent in parents]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        count = len(latencies) - len(failures)
+        rate = count / elapsed if elapsed else count
+        self.stdout.write(self.style.SUCCESS(
+            f"  {count} allocations in {elapsed:.2f}s ({rate:.1f}/sec); latency mean "
+            f"{statistics.mean(latencies) * 1000:.0f}ms, max {max(latencies) * 1000:.0f}ms"
+        ))
+        if failures:
+            self.stdout.write(self.style.ERROR(f"  {len(failures)} allocations failed: {failures[0]}"))
@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 
 from ipam.models import Prefix, VRF
 from ipam.utils import rebuild_prefixes
+from utilities.utils import count_related
 
 
 class Command(BaseCommand):
@@ -10,18 +11,16 @@ class Command(BaseCommand):
     def handle(self, *model_names, **options):
         self.stdout.write(f'Rebuilding {Prefix.objects.count()} prefixes...')
 
-        # Reset existing counts
-        Prefix.objects.update(_depth=0, _children=0)
-
         # Rebuild the global table
         global_count = Prefix.objects.filter(vrf__isnull=True).count()
         self.stdout.write(f'Global: {global_count} prefixes...')
-        rebuild_prefixes(None)
+        updated_count = rebuild_prefixes(None)
+        self.stdout.write(f'  Updated {updated_count} prefixes')
 
         # Rebuild each VRF
-        for vrf in VRF.objects.all():
-            vrf_count = Prefix.objects.filter(vrf=vrf).count()
-            self.stdout.write(f'VRF {vrf}: {vrf_count} prefixes...')
-            rebuild_prefixes(vrf.pk)
+        for vrf in VRF.objects.annotate(prefix_count=count_related(Prefix, 'vrf')).filter(prefix_count__gt=0):
+            self.stdout.write(f'VRF {vrf}: {vrf.prefix_count} prefixes...')
+            updated_count = rebuild_prefixes(vrf.pk)
+            self.stdout.write(f'  Updated {updated_count} prefixes')
 
         self.stdout.write(self.style.SUCCESS('Finished.'))
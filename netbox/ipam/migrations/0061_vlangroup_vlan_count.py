@@ -0,0 +1,33 @@
+from django.db import migrations
+
+import utilities.fields
+from utilities.utils import count_related
+
+
+def populate_vlan_counts(apps, schema_editor):
+    """
+    Calculate the number of VLANs in each VLAN group.
+    """
+    VLANGroup = apps.get_model('ipam', 'VLANGroup')
+    VLAN = apps.get_model('ipam', 'VLAN')
+
+    VLANGroup.objects.update(_vlan_count=count_related(VLAN, 'group'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipam', '0060_alter_l2vpn_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vlangroup',
+            name='_vlan_count',
+            field=utilities.fields.CounterCacheField(default=0, to_field='group', to_model='ipam.VLAN'),
+        ),
+        migrations.RunPython(
+            code=populate_vlan_counts,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -13,6 +13,7 @@ from netbox.models import OrganizationalModel, NetBoxModel
 from ipam.choices import *
 from ipam.constants import *
 from ipam.fields import IPNetworkField, IPAddressField
+from ipam.gaps import iter_available_ips, iter_available_ranges, iter_used_ranges
 from ipam.managers import IPAddressManager
 from ipam.querysets import PrefixQuerySet
 from ipam.validators import DNSValidator
@@ -33,9 +34,10 @@ __all__ = (
 
 class GetAvailablePrefixesMixin:
 
-    def get_available_prefixes(self):
+    def iter_available_ranges(self):
         """
-        Return all available prefixes within this Aggregate or Prefix as an IPSet.
+        Yield each range of addresses within this Aggregate or Prefix which is not covered by a child prefix, as a
+        netaddr.IPRange. Child prefixes are streamed from the database in order, so that ranges are found lazily.
         """
         params = {
             'prefix__net_contained': str(self.prefix)
@@ -43,17 +45,27 @@ class GetAvailablePrefixesMixin:
         if hasattr(self, 'vrf'):
             params['vrf'] = self.vrf
 
-        child_prefixes = Prefix.objects.filter(**params).values_list('prefix', flat=True)
-        return netaddr.IPSet(self.prefix) - netaddr.IPSet(child_prefixes)
+        used_ranges = iter_used_ranges(prefix_queryset=Prefix.objects.filter(**params))
+        for first, last in iter_available_ranges(self.prefix.first, self.prefix.last, used_ranges):
+            yield netaddr.IPRange(
+                netaddr.IPAddress(first, self.prefix.version),
+                netaddr.IPAddress(last, self.prefix.version)
+            )
+
+    def get_available_prefixes(self):
+        """
+        Return all available prefixes within this Aggregate or Prefix as an IPSet.
+        """
+        return netaddr.IPSet(self.iter_available_ranges())
 
     def get_first_available_prefix(self):
         """
         Return the first available child prefix within the prefix (or None).
         """
-        available_prefixes = self.get_available_prefixes()
-        if not available_prefixes:
+        available_range = next(self.iter_available_ranges(), None)
+        if available_range is None:
             return None
-        return available_prefixes.iter_cidrs()[0]
+        return available_range.cidrs()[0]
 
 
 class RIR(OrganizationalModel):
@@ -504,44 +516,66 @@ class Prefix(GetAvailablePrefixesMixin, NetBoxModel):
         else:
             return IPAddress.objects.filter(address__net_host_contained=str(self.prefix), vrf=self.vrf)
 
-    def get_available_ips(self):
+    def get_usable_bounds(self):
         """
-        Return all available IPs within this prefix as an IPSet.
+        Return the integer values of the first and last usable addresses within the prefix.
         """
-        if self.mark_utilized:
-            return list()
-
-        prefix = netaddr.IPSet(self.prefix)
-        child_ips = netaddr.IPSet([ip.address.ip for ip in self.get_child_ips()])
-        child_ranges = netaddr.IPSet()
-        for iprange in self.get_child_ranges():
-            child_ranges.add(iprange.range)
-        available_ips = prefix - child_ips - child_ranges
-
         # IPv6 /127's, pool, or IPv4 /31-/32 sets are fully usable
         if (self.family == 6 and self.prefix.prefixlen >= 127) or self.is_pool or (self.family == 4 and self.prefix.prefixlen >= 31):
-            return available_ips
+            return self.prefix.first, self.prefix.last
 
         if self.family == 4:
             # For "normal" IPv4 prefixes, omit first and last addresses
-            available_ips -= netaddr.IPSet([
-                netaddr.IPAddress(self.prefix.first),
-                netaddr.IPAddress(self.prefix.last),
-            ])
-        else:
-            # For IPv6 prefixes, omit the Subnet-Router anycast address
-            # per RFC 4291
-            available_ips -= netaddr.IPSet([netaddr.IPAddress(self.prefix.first)])
-        return available_ips
+            return self.prefix.first + 1, self.prefix.last - 1
+
+        # For IPv6 prefixes, omit the Subnet-Router anycast address
+        # per RFC 4291
+        return self.prefix.first + 1, self.prefix.last
+
+    def iter_available_ranges(self):
+        """
+        Yield each range of available IPs within this prefix as a netaddr.IPRange. Child IPs and IP ranges are streamed
+        from the database in order, so that ranges are found lazily.
+        """
+        if self.mark_utilized:
+            return
+
+        first, last = self.get_usable_bounds()
+        used_ranges = iter_used_ranges(ip_queryset=self.get_child_ips(), range_queryset=self.get_child_ranges())
+        for start, end in iter_available_ranges(first, last, used_ranges):
+            yield netaddr.IPRange(
+                netaddr.IPAddress(start, self.prefix.version),
+                netaddr.IPAddress(end, self.prefix.version)
+            )
+
+    def iter_available_ips(self):
+        """
+        Yield each available IP within this prefix (as a netaddr.IPAddress) in order.
+        """
+        if self.mark_utilized:
+            return
+
+        first, last = self.get_usable_bounds()
+        used_ranges = iter_used_ranges(ip_queryset=self.get_child_ips(), range_queryset=self.get_child_ranges())
+        yield from iter_available_ips(first, last, used_ranges, self.prefix.version)
+
+    def get_available_ips(self):
+        """
+        Return all available IPs within this prefix as an IPSet.
+        """
+        if self.mark_utilized:
+            return list()
+
+        return netaddr.IPSet(self.iter_available_ranges())
 
     def get_first_available_ip(self):
         """
         Return the first available IP within the prefix (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
+        available_ip = next(self.iter_available_ips(), None)
+        if available_ip is None:
             return None
-        return '{}/{}'.format(next(available_ips.__iter__()), self.prefix.prefixlen)
+        return '{}/{}'.format(available_ip, self.prefix.prefixlen)
 
     def get_utilization(self):
         """
@@ -734,25 +768,37 @@ class IPRange(NetBoxModel):
             vrf=self.vrf
         )
 
+    def iter_available_ips(self):
+        """
+        Yield each available IP within this range (as a netaddr.IPAddress) in order.
+        """
+        used_ranges = iter_used_ranges(ip_queryset=self.get_child_ips())
+        yield from iter_available_ips(
+            self.start_address.ip.value, self.end_address.ip.value, used_ranges, self.family
+        )
+
     def get_available_ips(self):
         """
         Return all available IPs within this range as an IPSet.
         """
-        range = netaddr.IPRange(self.start_address.ip, self.end_address.ip)
-        child_ips = netaddr.IPSet([ip.address.ip for ip in self.get_child_ips()])
-
-        return netaddr.IPSet(range) - child_ips
+        used_ranges = iter_used_ranges(ip_queryset=self.get_child_ips())
+        return netaddr.IPSet([
+            netaddr.IPRange(netaddr.IPAddress(first, self.family), netaddr.IPAddress(last, self.family))
+            for first, last in iter_available_ranges(
+                self.start_address.ip.value, self.end_address.ip.value, used_ranges
+            )
+        ])
 
     @cached_property
     def first_available_ip(self):
         """
         Return the first available IP within the range (or None).
         """
-        available_ips = self.get_available_ips()
-        if not available_ips:
+        available_ip = next(self.iter_available_ips(), None)
+        if available_ip is None:
             return None
 
-        return '{}/{}'.format(next(available_ips.__iter__()), self.start_address.prefixlen)
+        return '{}/{}'.format(available_ip, self.start_address.prefixlen)
 
     @cached_property
     def utilization(self):
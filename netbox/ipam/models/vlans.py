@@ -8,9 +8,11 @@ from django.urls import reverse
 from dcim.models import Interface
 from ipam.choices import *
 from ipam.constants import *
+from ipam.gaps import iter_available_ranges
 from ipam.models import L2VPNTermination
 from ipam.querysets import VLANQuerySet
 from netbox.models import OrganizationalModel, NetBoxModel
+from utilities.fields import CounterCacheField
 from virtualization.models import VMInterface
 
 
@@ -68,6 +70,12 @@ class VLANGroup(OrganizationalModel):
         blank=True
     )
 
+    # Cached counts
+    _vlan_count = CounterCacheField(
+        to_model='ipam.VLAN',
+        to_field='group'
+    )
+
     class Meta:
         ordering = ('name', 'pk')  # Name may be non-unique
         unique_together = [
@@ -98,23 +106,27 @@ class VLANGroup(OrganizationalModel):
                 'max_vid': "Maximum child VID must be greater than or equal to minimum child VID"
             })
 
+    def iter_available_vids(self):
+        """
+        Yield each available VLAN ID within this group in order. Assigned VIDs are streamed from the database in order,
+        so that available VIDs are found lazily.
+        """
+        vids = VLAN.objects.filter(group=self).order_by('vid').values_list('vid', flat=True)
+        used_ranges = ((vid, vid) for vid in vids.iterator())
+        for first, last in iter_available_ranges(self.min_vid, self.max_vid, used_ranges):
+            yield from range(first, last + 1)
+
     def get_available_vids(self):
         """
         Return all available VLANs within this group.
         """
-        available_vlans = {vid for vid in range(self.min_vid, self.max_vid + 1)}
-        available_vlans -= set(VLAN.objects.filter(group=self).values_list('vid', flat=True))
-
-        return sorted(available_vlans)
+        return list(self.iter_available_vids())
 
     def get_next_available_vid(self):
         """
         Return the first available VLAN ID (1-4094) in the group.
         """
-        available_vids = self.get_available_vids()
-        if available_vids:
-            return available_vids[0]
-        return None
+        return next(self.iter_available_vids(), None)
 
 
 class VLAN(NetBoxModel):
@@ -5,6 +5,22 @@ from django.db.models.expressions import RawSQL
 from utilities.querysets import RestrictedQuerySet
 
 
+# Count the distinct prefixes containing, and the prefixes contained by, each Prefix within its VRF. Null VRF values
+# are cast to zero for comparison (NULL != NULL).
+PREFIX_DEPTH_SQL = (
+    'SELECT COUNT(DISTINCT U0."prefix") AS "c" '
+    'FROM "ipam_prefix" U0 '
+    'WHERE (U0."prefix" >> "ipam_prefix"."prefix" '
+    'AND COALESCE(U0."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", 0))'
+)
+PREFIX_CHILDREN_SQL = (
+    'SELECT COUNT(U1."prefix") AS "c" '
+    'FROM "ipam_prefix" U1 '
+    'WHERE (U1."prefix" << "ipam_prefix"."prefix" '
+    'AND COALESCE(U1."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", 0))'
+)
+
+
 class PrefixQuerySet(RestrictedQuerySet):
 
     def annotate_hierarchy(self):
@@ -13,20 +29,8 @@ class PrefixQuerySet(RestrictedQuerySet):
         comparison. (NULL != NULL).
         """
         return self.annotate(
-            hierarchy_depth=RawSQL(
-                'SELECT COUNT(DISTINCT U0."prefix") AS "c" '
-                'FROM "ipam_prefix" U0 '
-                'WHERE (U0."prefix" >> "ipam_prefix"."prefix" '
-                'AND COALESCE(U0."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", 0))',
-                ()
-            ),
-            hierarchy_children=RawSQL(
-                'SELECT COUNT(U1."prefix") AS "c" '
-                'FROM "ipam_prefix" U1 '
-                'WHERE (U1."prefix" << "ipam_prefix"."prefix" '
-                'AND COALESCE(U1."vrf_id", 0) = COALESCE("ipam_prefix"."vrf_id", 0))',
-                ()
-            )
+            hierarchy_depth=RawSQL(PREFIX_DEPTH_SQL, ()),
+            hierarchy_children=RawSQL(PREFIX_CHILDREN_SQL, ())
         )
 
 
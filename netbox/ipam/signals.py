@@ -1,29 +1,35 @@
+from django.db.models import Case, F, PositiveSmallIntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
 from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from dcim.models import Device
 from virtualization.models import VirtualMachine
 from .models import IPAddress, Prefix
+from .querysets import PREFIX_DEPTH_SQL
 
 
-def update_parents_children(prefix):
+def update_hierarchy(pk, vrf_id, prefix, delta, recalculate_depth=False):
     """
-    Update depth on prefix & containing prefixes
+    Adjust the depth & children counts of all prefixes within the hierarchy of a prefix which has been added to
+    (delta=1) or removed from (delta=-1) the specified VRF, using a single UPDATE statement. Each containing prefix
+    gains or loses a child. Because depth counts only distinct containing prefixes, each contained prefix gains or
+    loses a level of depth only if no other prefix with the same value exists. If recalculate_depth is True, the depth
+    of each contained prefix is instead recalculated in full.
     """
-    parents = prefix.get_parents(include_self=True).annotate_hierarchy()
-    for parent in parents:
-        parent._children = parent.hierarchy_children
-    Prefix.objects.bulk_update(parents, ['_children'], batch_size=100)
+    if recalculate_depth:
+        depth = RawSQL(PREFIX_DEPTH_SQL, (), output_field=PositiveSmallIntegerField())
+    else:
+        duplicates = Prefix.objects.filter(vrf_id=vrf_id, prefix=str(prefix)).exclude(pk=pk)
+        depth = F('_depth') + (0 if duplicates.exists() else delta)
 
-
-def update_children_depth(prefix):
-    """
-    Update children count on prefix & contained prefixes
-    """
-    children = prefix.get_children(include_self=True).annotate_hierarchy()
-    for child in children:
-        child._depth = child.hierarchy_depth
-    Prefix.objects.bulk_update(children, ['_depth'], batch_size=100)
+    Prefix.objects.filter(
+        Q(prefix__net_contains=prefix) | Q(prefix__net_contained=prefix),
+        vrf_id=vrf_id
+    ).exclude(pk=pk).update(
+        _children=F('_children') + Case(When(prefix__net_contains=prefix, then=Value(delta)), default=Value(0)),
+        _depth=Case(When(prefix__net_contained=prefix, then=depth), default=F('_depth'))
+    )
 
 
 @receiver(post_save, sender=Prefix)
@@ -32,21 +38,42 @@ def handle_prefix_saved(instance, created, **kwargs):
     # Prefix has changed (or new instance has been created)
     if created or instance.vrf_id != instance._vrf_id or instance.prefix != instance._prefix:
 
-        update_parents_children(instance)
-        update_children_depth(instance)
-
-        # If this is not a new prefix, clean up parent/children of previous prefix
+        # If this is not a new prefix, remove it from the hierarchy of its previous prefix
         if not created:
-            old_prefix = Prefix(vrf_id=instance._vrf_id, prefix=instance._prefix)
-            update_parents_children(old_prefix)
-            update_children_depth(old_prefix)
+            update_hierarchy(instance.pk, instance._vrf_id, instance._prefix, -1)
+
+        update_hierarchy(instance.pk, instance.vrf_id, instance.prefix, 1)
+
+        # Calculate the depth & children count of the prefix itself
+        instance._depth, instance._children = Prefix.objects.filter(pk=instance.pk).annotate_hierarchy().values_list(
+            'hierarchy_depth', 'hierarchy_children'
+        ).get()
+        Prefix.objects.filter(pk=instance.pk).update(_depth=instance._depth, _children=instance._children)
+
+        # Record the prefix's new position in the hierarchy, in case it is saved again
+        instance._prefix = instance.prefix
+        instance._vrf_id = instance.vrf_id
+
+
+@receiver(pre_delete, sender=Prefix)
+def handle_prefix_deleting(instance, **kwargs):
+    """
+    Note whether the prefix being deleted has any duplicates. (If several duplicates are deleted together, none remain
+    once each deletion is handled, so the depth of their children cannot be adjusted incrementally.)
+    """
+    instance._has_duplicates = instance.get_duplicates().exists()
 
 
 @receiver(post_delete, sender=Prefix)
 def handle_prefix_deleted(instance, **kwargs):
 
-    update_parents_children(instance)
-    update_children_depth(instance)
+    update_hierarchy(
+        instance.pk,
+        instance.vrf_id,
+        instance.prefix,
+        -1,
+        recalculate_depth=getattr(instance, '_has_duplicates', False)
+    )
 
 
 @receiver(pre_delete, sender=IPAddress)
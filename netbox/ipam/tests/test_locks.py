@@ -0,0 +1,49 @@
+from django.test import TestCase
+from netaddr import IPNetwork
+
+from ipam.locks import get_ip_allocation_locks
+from ipam.models import IPRange, Prefix, VRF
+from utilities.constants import ADVISORY_LOCK_KEYS
+
+PREFIX_KEY = ADVISORY_LOCK_KEYS['available-ips']
+RANGE_KEY = ADVISORY_LOCK_KEYS['available-ips-range']
+
+
+class IPAllocationLockTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        vrf = VRF.objects.create(name='VRF 1')
+        Prefix.objects.bulk_create((
+            Prefix(prefix=IPNetwork('10.0.0.0/16')),
+            Prefix(prefix=IPNetwork('10.0.0.0/24')),
+            Prefix(prefix=IPNetwork('10.0.0.0/26')),
+            Prefix(prefix=IPNetwork('10.0.1.0/24')),
+            Prefix(prefix=IPNetwork('10.0.0.0/24'), vrf=vrf),
+        ))
+        IPRange.objects.create(start_address=IPNetwork('10.0.0.10/24'), end_address=IPNetwork('10.0.0.20/24'))
+        IPRange.objects.create(start_address=IPNetwork('10.0.0.200/24'), end_address=IPNetwork('10.0.1.50/24'))
+
+    def test_prefix_locks(self):
+        prefix = Prefix.objects.get(prefix='10.0.0.0/24', vrf__isnull=True)
+        exclusive, shared = get_ip_allocation_locks(prefix)
+        self.assertEqual(exclusive, [(PREFIX_KEY, prefix.pk)])
+
+        # Containing prefixes and partially overlapping ranges are shared. Contained prefixes and ranges, sibling
+        # prefixes, and prefixes in other VRFs are not locked.
+        self.assertEqual(sorted(shared), sorted([
+            (PREFIX_KEY, Prefix.objects.get(prefix='10.0.0.0/16').pk),
+            (RANGE_KEY, IPRange.objects.get(start_address='10.0.0.200/24').pk),
+        ]))
+
+    def test_range_locks(self):
+        iprange = IPRange.objects.get(start_address='10.0.0.200/24')
+        exclusive, shared = get_ip_allocation_locks(iprange)
+        self.assertEqual(exclusive, [(RANGE_KEY, iprange.pk)])
+
+        # Both prefixes which contain part of the range are shared
+        self.assertEqual(sorted(shared), sorted([
+            (PREFIX_KEY, Prefix.objects.get(prefix='10.0.0.0/16').pk),
+            (PREFIX_KEY, Prefix.objects.get(prefix='10.0.0.0/24', vrf__isnull=True).pk),
+            (PREFIX_KEY, Prefix.objects.get(prefix='10.0.1.0/24').pk),
+        ]))
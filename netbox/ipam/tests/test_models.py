@@ -4,7 +4,9 @@ from django.test import TestCase, override_settings
 
 from dcim.models import Interface, Device, DeviceRole, DeviceType, Manufacturer, Site
 from ipam.choices import IPAddressRoleChoices, PrefixStatusChoices
+from ipam.gaps import allocate_prefixes
 from ipam.models import Aggregate, IPAddress, IPRange, Prefix, RIR, VLAN, VLANGroup, VRF, L2VPN, L2VPNTermination
+from ipam.utils import add_available_ipaddresses, rebuild_prefixes
 
 
 class TestAggregate(TestCase):
@@ -198,6 +200,51 @@ class TestPrefix(TestCase):
         parent_prefix = Prefix.objects.create(prefix=IPNetwork('2001:db8:500:5::/127'))
         self.assertEqual(parent_prefix.get_first_available_ip(), '2001:db8:500:5::/127')
 
+    def test_iter_available_ips(self):
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/24'))
+        IPAddress.objects.bulk_create((
+            IPAddress(address=IPNetwork('10.0.0.2/16')),
+            IPAddress(address=IPNetwork('10.0.0.1/24')),
+            IPAddress(address=IPNetwork('10.0.0.1/25')),
+        ))
+        IPRange.objects.create(
+            start_address=IPNetwork('10.0.0.4/24'),
+            end_address=IPNetwork('10.0.0.253/24')
+        )
+        self.assertEqual(
+            [str(ip) for ip in parent_prefix.iter_available_ips()],
+            ['10.0.0.3', '10.0.0.254']
+        )
+
+    def test_allocate_prefixes(self):
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/22'))
+        Prefix.objects.bulk_create((
+            Prefix(prefix=IPNetwork('10.0.0.0/25')),
+            Prefix(prefix=IPNetwork('10.0.1.0/24')),
+        ))
+        allocated = allocate_prefixes(parent_prefix.iter_available_ranges(), [26, 24, 25])
+        self.assertEqual([str(p) for p in allocated], ['10.0.0.128/26', '10.0.2.0/24', '10.0.3.0/25'])
+
+        # Insufficient space
+        self.assertIsNone(allocate_prefixes(parent_prefix.iter_available_ranges(), [24, 24, 24]))
+
+    def test_available_ipaddress_list(self):
+        parent_prefix = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/24'))
+        IPAddress.objects.bulk_create((
+            IPAddress(address=IPNetwork('10.0.0.5/24')),
+            IPAddress(address=IPNetwork('10.0.0.5/25')),
+            IPAddress(address=IPNetwork('10.0.0.6/24')),
+            IPAddress(address=IPNetwork('10.0.0.10/24')),
+        ))
+        queryset = parent_prefix.get_child_ips()
+        expected = add_available_ipaddresses(parent_prefix.prefix, list(queryset.order_by('address', 'pk')))
+        ip_list = add_available_ipaddresses(parent_prefix.prefix, queryset)
+
+        # Compare individual pages against the fully materialized list
+        self.assertEqual(len(ip_list), len(expected))
+        for i in range(len(expected)):
+            self.assertEqual(ip_list[i:i + 2], expected[i:i + 2])
+
     def test_get_utilization_container(self):
         prefixes = (
             Prefix(prefix=IPNetwork('10.0.0.0/24'), status=PrefixStatusChoices.STATUS_CONTAINER),
@@ -449,6 +496,42 @@ class TestPrefixHierarchy(TestCase):
         self.assertEqual(prefixes[3]._depth, 2)
         self.assertEqual(prefixes[3]._children, 0)
 
+    def test_delete_duplicate_prefixes4(self):
+        # Duplicate 10.0.0.0/16, then delete both copies together
+        Prefix(prefix='10.0.0.0/16').save()
+        Prefix.objects.filter(prefix='10.0.0.0/16').delete()
+
+        prefixes = Prefix.objects.filter(prefix__family=4)
+        self.assertEqual(prefixes[0].prefix, IPNetwork('10.0.0.0/8'))
+        self.assertEqual(prefixes[0]._depth, 0)
+        self.assertEqual(prefixes[0]._children, 1)
+        self.assertEqual(prefixes[1].prefix, IPNetwork('10.0.0.0/24'))
+        self.assertEqual(prefixes[1]._depth, 1)
+        self.assertEqual(prefixes[1]._children, 0)
+
+    def test_rebuild_prefixes(self):
+        Prefix.objects.update(_depth=0, _children=0)
+        Prefix.objects.bulk_create((
+            Prefix(prefix='10.0.0.0/16'),
+            Prefix(prefix='10.1.0.0/16'),
+        ))
+
+        # Only those prefixes whose depth/children have changed should be updated
+        self.assertEqual(rebuild_prefixes(None), 8)
+
+        prefixes = Prefix.objects.filter(prefix__family=4)
+        self.assertEqual(
+            [(str(p.prefix), p._depth, p._children) for p in prefixes],
+            [
+                ('10.0.0.0/8', 0, 4),
+                ('10.0.0.0/16', 1, 1),
+                ('10.0.0.0/16', 1, 1),
+                ('10.0.0.0/24', 2, 0),
+                ('10.1.0.0/16', 1, 0),
+            ]
+        )
+        self.assertEqual(rebuild_prefixes(None), 0)
+
 
 class TestIPAddress(TestCase):
 
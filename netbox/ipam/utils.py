@@ -1,6 +1,11 @@
+import itertools
+
 import netaddr
+from django.db import connection
+from django.db.models import QuerySet
 
 from .constants import *
+from .gaps import AvailableIPAddressList, iter_available_ranges
 from .models import Prefix, VLAN
 
 
@@ -14,19 +19,25 @@ def add_requested_prefixes(parent, prefix_list, show_available=True, show_assign
     :param show_available: Include available prefixes.
     :param show_assigned: Show assigned prefixes.
     """
+    prefix_list = sorted(prefix_list, key=lambda p: p.prefix)
     child_prefixes = []
 
     # Add available prefixes to the table if requested
     if prefix_list and show_available:
 
-        # Find all unallocated space, add fake Prefix objects to child_prefixes.
-        available_prefixes = netaddr.IPSet(parent) ^ netaddr.IPSet([p.prefix for p in prefix_list])
-        available_prefixes = [Prefix(prefix=p, status=None) for p in available_prefixes.iter_cidrs()]
-        child_prefixes = child_prefixes + available_prefixes
+        # Find all unallocated space in a single pass over the sorted child prefixes, and add fake Prefix objects
+        # to child_prefixes.
+        used_ranges = ((p.prefix.first, p.prefix.last) for p in prefix_list)
+        for first, last in iter_available_ranges(parent.first, parent.last, used_ranges):
+            available_range = netaddr.IPRange(
+                netaddr.IPAddress(first, parent.version),
+                netaddr.IPAddress(last, parent.version)
+            )
+            child_prefixes.extend(Prefix(prefix=p, status=None) for p in available_range.cidrs())
 
     # Add assigned prefixes to the table if requested
     if prefix_list and show_assigned:
-        child_prefixes = child_prefixes + list(prefix_list)
+        child_prefixes = child_prefixes + prefix_list
 
     # Sort child prefixes after additions
     child_prefixes.sort(key=lambda p: p.prefix)
@@ -38,7 +49,13 @@ def add_available_ipaddresses(prefix, ipaddress_list, is_pool=False):
     """
     Annotate ranges of available IP addresses within a given prefix. If is_pool is True, the first and last IP will be
     considered usable (regardless of mask length).
+
+    If ipaddress_list is a QuerySet, a lazy AvailableIPAddressList is returned: only the IP addresses and ranges
+    within each requested slice are retrieved from the database. Otherwise, ipaddress_list must be a list of
+    IPAddresses sorted by address.
     """
+    if isinstance(ipaddress_list, QuerySet):
+        return AvailableIPAddressList(prefix, ipaddress_list, is_pool)
 
     output = []
     prev_ip = None
@@ -126,61 +143,74 @@ def add_available_vlans(vlans, vlan_group=None):
     return vlans
 
 
-def rebuild_prefixes(vrf):
+def rebuild_prefixes(vrf, batch_size=1000):
     """
-    Rebuild the prefix hierarchy for all prefixes in the specified VRF (or global table).
+    Rebuild the prefix hierarchy for all prefixes in the specified VRF (or global table) in a single sweep through the
+    VRF's prefixes in sorted order. Only those prefixes whose depth or children count has changed are updated. Returns
+    the number of prefixes updated.
     """
     def contains(parent, child):
         return child in parent and child != parent
 
-    def push_to_stack(prefix):
-        # Increment child count on parent nodes
-        for n in stack:
-            n['children'] += 1
-        stack.append({
-            'pk': [prefix['pk']],
-            'prefix': prefix['prefix'],
-            'children': 0,
-        })
+    def pop_from_stack():
+        node = stack.pop()
+        for pk, depth, children in node['prefixes']:
+            if depth != len(stack) or children != node['children']:
+                update_queue.append((pk, len(stack), node['children']))
+
+    def flush_update_queue():
+        if not update_queue:
+            return
+        values = ', '.join(['(%s, %s, %s)'] * len(update_queue))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE "ipam_prefix" SET "_depth" = v.depth, "_children" = v.children '
+                f'FROM (VALUES {values}) AS v(id, depth, children) '
+                f'WHERE "ipam_prefix"."id" = v.id',
+                list(itertools.chain.from_iterable(update_queue))
+            )
+        update_queue.clear()
 
     stack = []
     update_queue = []
-    prefixes = Prefix.objects.filter(vrf=vrf).values('pk', 'prefix')
+    update_count = 0
+    prefixes = Prefix.objects.filter(vrf=vrf).order_by('prefix', 'pk').values_list('pk', 'prefix', '_depth', '_children')
 
     # Iterate through all Prefixes in the VRF, growing and shrinking the stack as we go
-    for i, p in enumerate(prefixes):
-
-        # Grow the stack if this is a child of the most recent prefix
-        if not stack or contains(stack[-1]['prefix'], p['prefix']):
-            push_to_stack(p)
+    for pk, prefix, depth, children in prefixes.iterator(chunk_size=batch_size):
 
         # Handle duplicate prefixes
-        elif stack[-1]['prefix'] == p['prefix']:
-            stack[-1]['pk'].append(p['pk'])
-
-        # If this is a sibling or parent of the most recent prefix, pop nodes from the
-        # stack until we reach a parent prefix (or the root)
-        else:
-            while stack and not contains(stack[-1]['prefix'], p['prefix']):
-                node = stack.pop()
-                for pk in node['pk']:
-                    update_queue.append(
-                        Prefix(pk=pk, _depth=len(stack), _children=node['children'])
-                    )
-            push_to_stack(p)
-
-        # Flush the update queue once it reaches 100 Prefixes
-        if len(update_queue) >= 100:
-            Prefix.objects.bulk_update(update_queue, ['_depth', '_children'])
-            update_queue = []
+        if stack and stack[-1]['prefix'] == prefix:
+            stack[-1]['prefixes'].append((pk, depth, children))
+            for node in stack[:-1]:
+                node['children'] += 1
+            continue
+
+        # If this is not a child of the most recent prefix, pop nodes from the stack until we reach a parent prefix
+        # (or the root)
+        while stack and not contains(stack[-1]['prefix'], prefix):
+            pop_from_stack()
+
+        # Increment the child count of all parent nodes, and push this prefix onto the stack
+        for node in stack:
+            node['children'] += 1
+        stack.append({
+            'prefix': prefix,
+            'prefixes': [(pk, depth, children)],
+            'children': 0,
+        })
+
+        # Flush the update queue once it reaches the batch size
+        if len(update_queue) >= batch_size:
+            update_count += len(update_queue)
+            flush_update_queue()
 
     # Clear out any prefixes remaining in the stack
     while stack:
-        node = stack.pop()
-        for pk in node['pk']:
-            update_queue.append(
-                Prefix(pk=pk, _depth=len(stack), _children=node['children'])
-            )
+        pop_from_stack()
 
     # Final flush of any remaining Prefixes
-    Prefix.objects.bulk_update(update_queue, ['_depth', '_children'])
+    update_count += len(update_queue)
+    flush_update_queue()
+
+    return update_count
@@ -1,10 +1,11 @@
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Prefetch
+from django.db.models import F, Prefetch
 from django.db.models.expressions import RawSQL
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django_tables2.data import TableListData
 
-from circuits.models import Provider, Circuit
+from circuits.models import Provider
 from circuits.tables import ProviderTable
 from dcim.filtersets import InterfaceFilterSet
 from dcim.models import Interface, Site, Device
@@ -227,7 +228,7 @@ class ASNView(generic.ObjectView):
 
         # Gather assigned Providers
         providers = instance.providers.restrict(request.user, 'view').annotate(
-            count_circuits=count_related(Circuit, 'provider')
+            count_circuits=F('_circuit_count')
         )
         providers_table = ProviderTable(providers, user=request.user)
         providers_table.configure(request)
@@ -527,7 +528,8 @@ class PrefixIPAddressesView(generic.ObjectChildrenView):
 
     def prep_table_data(self, request, queryset, parent):
         if not request.GET.get('q') and not request.GET.get('sort'):
-            return add_available_ipaddresses(parent.prefix, queryset, parent.is_pool)
+            # Wrap the lazy list of IPs and available ranges to avoid its evaluation by django-tables2
+            return TableListData(add_available_ipaddresses(parent.prefix, queryset, parent.is_pool))
         return queryset
 
     def get_extra_context(self, request, instance):
@@ -809,7 +811,7 @@ class IPAddressBulkDeleteView(generic.BulkDeleteView):
 
 class VLANGroupListView(generic.ObjectListView):
     queryset = VLANGroup.objects.annotate(
-        vlan_count=count_related(VLAN, 'group')
+        vlan_count=F('_vlan_count')
     )
     filterset = filtersets.VLANGroupFilterSet
     filterset_form = forms.VLANGroupFilterForm
@@ -863,7 +865,7 @@ class VLANGroupBulkImportView(generic.BulkImportView):
 
 class VLANGroupBulkEditView(generic.BulkEditView):
     queryset = VLANGroup.objects.annotate(
-        vlan_count=count_related(VLAN, 'group')
+        vlan_count=F('_vlan_count')
     )
     filterset = filtersets.VLANGroupFilterSet
     table = tables.VLANGroupTable
@@ -872,7 +874,7 @@ class VLANGroupBulkEditView(generic.BulkEditView):
 
 class VLANGroupBulkDeleteView(generic.BulkDeleteView):
     queryset = VLANGroup.objects.annotate(
-        vlan_count=count_related(VLAN, 'group')
+        vlan_count=F('_vlan_count')
     )
     filterset = filtersets.VLANGroupFilterSet
     table = tables.VLANGroupTable
@@ -1,22 +1,67 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
 from django.db.models import QuerySet
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from netbox.config import get_config
 
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+
+
+def get_estimated_count(queryset):
+    """
+    Return the number of rows the PostgreSQL query planner estimates the given QuerySet will return. This is much
+    faster than counting the rows, but may be inaccurate (particularly for filtered queries).
+    """
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        # The query can never return any rows (e.g. QuerySet.none())
+        return 0
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']['Plan Rows']
+
 
 class OptionalLimitOffsetPagination(LimitOffsetPagination):
     """
     Override the stock paginator to allow setting limit=0 to disable pagination for a request. This returns all objects
     matching a query, but retains the same format as a paginated request. The limit can only be disabled if
     MAX_PAGE_SIZE has been set to 0 or None.
+
+    Also supports keyset pagination, enabled by passing the cursor parameter (initially empty). Objects are returned
+    ordered by ID, and each page is retrieved by filtering on the last ID of the previous page rather than using an
+    offset, so that retrieving later pages is no slower than retrieving the first. The total count of objects may be
+    estimated or omitted using the count parameter.
     """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+
     def __init__(self):
         self.default_limit = get_config().PAGINATE_COUNT
+        self.cursor = None
+        self.next_cursor = None
+        self.page_length = 0
 
     def paginate_queryset(self, queryset, request, view=None):
 
+        # Keyset pagination (QuerySets only)
+        if isinstance(queryset, QuerySet) and self.cursor_query_param in request.query_params:
+            return self.paginate_queryset_by_cursor(queryset, request)
+
         if isinstance(queryset, QuerySet):
-            self.count = self.get_queryset_count(queryset)
+            self.count = self.get_count(queryset, request)
         else:
             # We're dealing with an iterable, not a QuerySet
             self.count = len(queryset)
@@ -25,16 +70,19 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         self.offset = self.get_offset(request)
         self.request = request
 
-        if self.limit and self.count > self.limit and self.template is not None:
+        if self.limit and self.count is not None and self.count > self.limit and self.template is not None:
             self.display_page_controls = True
 
-        if self.count == 0 or self.offset > self.count:
+        if self.count == 0 or (self.count is not None and self.offset > self.count):
             return list()
 
         if self.limit:
-            return list(queryset[self.offset:self.offset + self.limit])
+            results = list(queryset[self.offset:self.offset + self.limit])
         else:
-            return list(queryset[self.offset:])
+            results = list(queryset[self.offset:])
+        self.page_length = len(results)
+
+        return results
 
     def get_limit(self, request):
         if self.limit_query_param:
@@ -52,15 +100,105 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
 
         return self.default_limit
 
+    def paginate_queryset_by_cursor(self, queryset, request):
+        self.limit = self.get_limit(request)
+        self.offset = 0
+        self.request = request
+        self.cursor = self.decode_cursor(request.query_params[self.cursor_query_param])
+        self.count = self.get_count(queryset, request)
+
+        queryset = queryset.order_by('pk')
+        if self.cursor is not None:
+            queryset = queryset.filter(pk__gt=self.cursor)
+
+        # Pagination has been disabled
+        if not self.limit:
+            return list(queryset)
+
+        # Retrieve one extra object to determine whether another page follows
+        results = list(queryset[:self.limit + 1])
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            self.next_cursor = results[-1].pk
+
+        return results
+
+    def get_count(self, queryset, request):
+        """
+        Return the count of objects in the QuerySet: exact (the default), estimated, or None if the count has been
+        disabled by the count parameter.
+        """
+        count_mode = request.query_params.get(self.count_query_param, COUNT_EXACT).lower()
+        if count_mode == COUNT_NONE:
+            return None
+        if count_mode == COUNT_ESTIMATE:
+            return get_estimated_count(queryset)
+        return self.get_queryset_count(queryset)
+
     def get_queryset_count(self, queryset):
         return queryset.count()
 
+    def get_schema_fields(self, view):
+        return [
+            *super().get_schema_fields(view),
+            coreapi.Field(
+                name=self.cursor_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.String(
+                    title='Cursor',
+                    description='Enables keyset pagination (ordered by ID). Pass an empty value for the first page.'
+                )
+            ),
+            coreapi.Field(
+                name=self.count_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.Enum(
+                    (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE),
+                    title='Count',
+                    description='Whether to count the total number of results exactly (default), estimate it, or omit it.'
+                )
+            ),
+        ]
+
+    @staticmethod
+    def encode_cursor(pk):
+        return urlsafe_b64encode(str(pk).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(value):
+        """
+        Return the ID encoded by a cursor, or None for an empty cursor (indicating the first page).
+        """
+        if not value:
+            return None
+        try:
+            return int(urlsafe_b64decode(value.encode()).decode())
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound("Invalid cursor")
+
     def get_next_link(self):
 
         # Pagination has been disabled
         if not self.limit:
             return None
 
+        if self.cursor_query_param in self.request.query_params:
+            if self.next_cursor is None:
+                return None
+            url = self.request.build_absolute_uri()
+            url = remove_query_param(url, self.offset_query_param)
+            return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_cursor))
+
+        if self.count is None:
+            # Without a count, assume another page follows any full page
+            if self.page_length < self.limit:
+                return None
+            url = self.request.build_absolute_uri()
+            url = replace_query_param(url, self.limit_query_param, self.limit)
+            return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
         return super().get_next_link()
 
     def get_previous_link(self):
@@ -69,6 +207,10 @@ class OptionalLimitOffsetPagination(LimitOffsetPagination):
         if not self.limit:
             return None
 
+        # Keyset pagination proceeds forward only
+        if self.cursor_query_param in self.request.query_params:
+            return None
+
         return super().get_previous_link()
 
 
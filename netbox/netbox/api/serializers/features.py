@@ -27,9 +27,13 @@ class CustomFieldModelSerializer(serializers.Serializer):
 
         if self.instance is not None:
 
-            # Retrieve the set of CustomFields which apply to this type of object
-            content_type = ContentType.objects.get_for_model(self.Meta.model)
-            fields = CustomField.objects.filter(content_types=content_type)
+            # Retrieve the set of CustomFields which apply to this type of object (if not already provided by the view)
+            queryset = getattr(self.context.get('view'), 'queryset', None)
+            if 'custom_fields' in self.context and getattr(queryset, 'model', None) is self.Meta.model:
+                fields = self.context['custom_fields']
+            else:
+                content_type = ContentType.objects.get_for_model(self.Meta.model)
+                fields = CustomField.objects.filter(content_types=content_type)
 
             # Populate custom field values for each instance from database
             if type(self.instance) in (list, tuple):
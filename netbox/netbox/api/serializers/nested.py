@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django.core.exceptions import FieldError, MultipleObjectsReturned, ObjectDoesNotExist
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
@@ -9,6 +11,7 @@ from .base import BaseModelSerializer
 __all__ = (
     'NestedTagSerializer',
     'WritableNestedSerializer',
+    'resolve_nested_objects',
 )
 
 
@@ -23,12 +26,27 @@ class WritableNestedSerializer(BaseModelSerializer):
         if data is None:
             return None
 
+        # Objects resolved in advance (see resolve_nested_objects()), keyed by PK or by lookup parameters
+        nested_objects = self.context.get('nested_objects')
+        if nested_objects is not None:
+            nested_objects = nested_objects.setdefault(self.Meta.model, {})
+
         # Dictionary of related object attributes
         if isinstance(data, dict):
             params = dict_to_filter_params(data)
+            try:
+                key = tuple(sorted(params.items()))
+                hash(key)
+            except TypeError:
+                key = None
+            if nested_objects is not None and key in nested_objects:
+                return nested_objects[key]
             queryset = self.Meta.model.objects
             try:
-                return queryset.get(**params)
+                obj = queryset.get(**params)
+                if nested_objects is not None and key is not None:
+                    nested_objects[key] = obj
+                return obj
             except ObjectDoesNotExist:
                 raise ValidationError(f"Related object not found using the provided attributes: {params}")
             except MultipleObjectsReturned:
@@ -47,12 +65,46 @@ class WritableNestedSerializer(BaseModelSerializer):
             )
 
         # Look up object by PK
+        if nested_objects is not None and pk in nested_objects:
+            return nested_objects[pk]
         try:
             return self.Meta.model.objects.get(pk=pk)
         except ObjectDoesNotExist:
             raise ValidationError(f"Related object not found using the provided numeric ID: {pk}")
 
 
+def resolve_nested_objects(serializer, data_list):
+    """
+    Retrieve all related objects referenced by numeric ID in a list of data for the given serializer, using a single
+    query per related model. Resolved objects are cached in the serializer's context for use by its writable nested
+    fields, which also cache objects found by attributes so that each is looked up only once.
+
+    :param serializer: The Serializer (or the child of a ListSerializer) which will validate the data
+    :param data_list: A list of dictionaries of data
+    """
+    pks = defaultdict(set)
+    for field in serializer.fields.values():
+        many = isinstance(field, serializers.ListSerializer)
+        nested_serializer = field.child if many else field
+        if field.read_only or not isinstance(nested_serializer, WritableNestedSerializer):
+            continue
+        model = nested_serializer.Meta.model
+        for data in data_list:
+            if not isinstance(data, dict) or data.get(field.field_name) is None:
+                continue
+            values = data[field.field_name]
+            for value in (values if many and isinstance(values, list) else [values]):
+                if isinstance(value, (int, str)):
+                    try:
+                        pks[model].add(int(value))
+                    except ValueError:
+                        pass
+
+    nested_objects = serializer.context.setdefault('nested_objects', {})
+    for model, model_pks in pks.items():
+        nested_objects.setdefault(model, {}).update(model.objects.in_bulk(model_pks))
+
+
 # Declared here for use by PrimaryModelSerializer, but should be imported from extras.api.nested_serializers
 class NestedTagSerializer(WritableNestedSerializer):
     url = serializers.HyperlinkedIdentityField(view_name='extras-api:tag-detail')
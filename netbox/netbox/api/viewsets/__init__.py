@@ -6,10 +6,12 @@ from django.db import transaction
 from django.db.models import ProtectedError
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
 from rest_framework.viewsets import ModelViewSet
 
 from extras.models import ExportTemplate
 from netbox.api.exceptions import SerializerNotFound
+from netbox.api.serializers import resolve_nested_objects
 from netbox.constants import NESTED_SERIALIZER_PREFIX
 from utilities.api import get_serializer_for_model
 from utilities.exceptions import AbortRequest
@@ -30,9 +32,11 @@ HTTP_ACTIONS = {
 }
 
 
-class NetBoxModelViewSet(BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectValidationMixin, ModelViewSet):
+class NetBoxModelViewSet(
+    BulkCreateModelMixin, BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectValidationMixin, ModelViewSet
+):
     """
-    Extend DRF's ModelViewSet to support bulk update and delete functions.
+    Extend DRF's ModelViewSet to support bulk create, update, and delete functions.
     """
     brief = False
     brief_prefetch_fields = []
@@ -52,6 +56,12 @@ class NetBoxModelViewSet(BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectVali
         # If a list of objects has been provided, initialize the serializer with many=True
         if isinstance(kwargs.get('data', {}), list):
             kwargs['many'] = True
+            serializer = super().get_serializer(*args, **kwargs)
+
+            # Resolve all related objects referenced by the list of objects in advance
+            resolve_nested_objects(serializer.child, kwargs['data'])
+
+            return serializer
 
         return super().get_serializer(*args, **kwargs)
 
@@ -151,13 +161,17 @@ class NetBoxModelViewSet(BulkUpdateModelMixin, BulkDestroyModelMixin, ObjectVali
     def perform_create(self, serializer):
         model = self.queryset.model
         logger = logging.getLogger('netbox.api.views.ModelViewSet')
-        logger.info(f"Creating new {model._meta.verbose_name}")
 
         # Enforce object-level permissions on save()
         try:
             with transaction.atomic():
-                instance = serializer.save()
-                self._validate_objects(instance)
+                if isinstance(serializer, ListSerializer):
+                    logger.info(f"Creating {len(serializer.validated_data)} new {model._meta.verbose_name_plural}")
+                    self.perform_bulk_create(serializer)
+                else:
+                    logger.info(f"Creating new {model._meta.verbose_name}")
+                    instance = serializer.save()
+                    self._validate_objects(instance)
         except ObjectDoesNotExist:
             raise PermissionDenied()
 
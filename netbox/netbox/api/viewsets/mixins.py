@@ -1,17 +1,78 @@
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.db import transaction
-from rest_framework import status
+from rest_framework import serializers, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from netbox.api.serializers import BulkOperationSerializer
+from extras.context_managers import deferred_change_logging
+from netbox.api.serializers import BulkOperationSerializer, TaggableModelSerializer, resolve_nested_objects
+from utilities.bulk import bulk_delete, bulk_save, get_m2m_field_names, supports_bulk_delete, supports_bulk_save
 
 __all__ = (
+    'BulkCreateModelMixin',
     'BulkUpdateModelMixin',
     'BulkDestroyModelMixin',
     'ObjectValidationMixin',
 )
 
 
+def supports_bulk_write(serializer):
+    """
+    Return True if objects can be written in bulk from the validated data of the given serializer: i.e. the serializer
+    does not customize the creation or modification of objects (other than assigning tags), and its model supports
+    bulk saves.
+    """
+    serializer_class = type(serializer)
+    return (
+        serializer_class.create in (serializers.ModelSerializer.create, TaggableModelSerializer.create) and
+        serializer_class.update in (serializers.ModelSerializer.update, TaggableModelSerializer.update) and
+        supports_bulk_save(serializer.Meta.model)
+    )
+
+
+def apply_validated_data(model, validated_data, instance=None):
+    """
+    Apply the validated data from a serializer to a new or existing instance (without saving it), as the serializer's
+    create() or update() method would. Returns the instance and a dictionary of many-to-many values to be assigned
+    once it has been saved.
+    """
+    attrs = dict(validated_data)
+    m2m_values = {
+        name: attrs.pop(name) for name in get_m2m_field_names(model) if name in attrs
+    }
+    if instance is None:
+        instance = model(**attrs)
+    else:
+        for attr, value in attrs.items():
+            setattr(instance, attr, value)
+
+    return instance, m2m_values
+
+
+class BulkCreateModelMixin:
+    """
+    Support the creation of multiple objects using bulk queries, by POSTing a list of JSON objects to the list endpoint
+    for a model. Related objects referenced by numeric ID are resolved using a single query per model. If the
+    serializer or model requires objects to be created individually (see supports_bulk_write()), each object is saved
+    in turn. In either case, change records are written in bulk.
+    """
+    def perform_bulk_create(self, serializer):
+        with deferred_change_logging():
+            if supports_bulk_write(serializer.child):
+                model = serializer.child.Meta.model
+                instances, m2m_values = [], []
+                for validated_data in serializer.validated_data:
+                    instance, m2m = apply_validated_data(model, validated_data)
+                    instances.append(instance)
+                    m2m_values.append(m2m)
+                serializer.instance = bulk_save(instances, m2m_values)
+            else:
+                serializer.save()
+            self._validate_objects(serializer.instance)
+
+        return serializer.instance
+
+
 class BulkUpdateModelMixin:
     """
     Support bulk modification of objects using the list endpoint for a model. Accepts a PATCH action with a list of one
@@ -48,18 +109,51 @@ class BulkUpdateModelMixin:
         return Response(data, status=status.HTTP_200_OK)
 
     def perform_bulk_update(self, objects, update_data, partial):
+        objects = {obj.pk: obj for obj in objects}
+        context = self.get_serializer_context()
+        resolve_nested_objects(self.get_serializer(context=context), list(update_data.values()))
+
+        # Validate all objects, reporting any errors for each
+        serializer_list = []
+        errors = []
+        for pk, data in update_data.items():
+            obj = objects.get(pk)
+            if obj is None:
+                errors.append({})
+                continue
+            if hasattr(obj, 'snapshot'):
+                obj.snapshot()
+            serializer = self.get_serializer(obj, data=data, partial=partial, context=context)
+            errors.append({} if serializer.is_valid() else serializer.errors)
+            serializer_list.append(serializer)
+        if any(errors):
+            raise ValidationError(errors)
+
         with transaction.atomic():
-            data_list = []
-            for obj in objects:
-                data = update_data.get(obj.id)
-                if hasattr(obj, 'snapshot'):
-                    obj.snapshot()
-                serializer = self.get_serializer(obj, data=data, partial=partial)
-                serializer.is_valid(raise_exception=True)
-                self.perform_update(serializer)
-                data_list.append(serializer.data)
-
-            return data_list
+            if serializer_list and supports_bulk_write(serializer_list[0]):
+                self._perform_bulk_save(serializer_list)
+            else:
+                with deferred_change_logging():
+                    for serializer in serializer_list:
+                        self.perform_update(serializer)
+
+        return [serializer.data for serializer in serializer_list]
+
+    def _perform_bulk_save(self, serializer_list):
+        model = type(serializer_list[0].instance)
+        instances, m2m_values = [], []
+        for serializer in serializer_list:
+            instance, m2m = apply_validated_data(model, serializer.validated_data, serializer.instance)
+            instances.append(instance)
+            m2m_values.append(m2m)
+
+        # Enforce object-level permissions
+        try:
+            with deferred_change_logging():
+                bulk_save(instances, m2m_values)
+                self._validate_objects(instances)
+        except ObjectDoesNotExist:
+            raise PermissionDenied()
 
     def bulk_partial_update(self, request, *args, **kwargs):
         kwargs['partial'] = True
@@ -89,11 +183,18 @@ class BulkDestroyModelMixin:
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def perform_bulk_destroy(self, objects):
+        objects = list(objects)
+        for obj in objects:
+            if hasattr(obj, 'snapshot'):
+                obj.snapshot()
+
         with transaction.atomic():
-            for obj in objects:
-                if hasattr(obj, 'snapshot'):
-                    obj.snapshot()
-                self.perform_destroy(obj)
+            with deferred_change_logging():
+                if supports_bulk_delete(self.queryset.model):
+                    bulk_delete(objects)
+                else:
+                    for obj in objects:
+                        self.perform_destroy(obj)
 
 
 class ObjectValidationMixin:
@@ -8,10 +8,10 @@ from django.contrib.auth.models import Group, AnonymousUser
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models import Q
 
-from users.constants import CONSTRAINT_TOKEN_USER
+from users.cache import get_cached_object_permissions
 from users.models import ObjectPermission
 from utilities.permissions import (
-    permission_is_exempt, qs_filter_from_constraints, resolve_permission, resolve_permission_ct,
+    get_constraints_filter, permission_is_exempt, resolve_permission, resolve_permission_ct,
 )
 
 UserModel = get_user_model()
@@ -65,7 +65,9 @@ class ObjectPermissionMixin:
         if not user_obj.is_active or user_obj.is_anonymous:
             return dict()
         if not hasattr(user_obj, '_object_perm_cache'):
-            user_obj._object_perm_cache = self.get_object_permissions(user_obj)
+            user_obj._object_perm_cache = get_cached_object_permissions(
+                user_obj, self.get_permission_filter(user_obj), self.get_object_permissions
+            )
         return user_obj._object_perm_cache
 
     def get_permission_filter(self, user_obj):
@@ -123,10 +125,7 @@ class ObjectPermissionMixin:
             raise ValueError(f"Invalid permission {perm} for model {model}")
 
         # Compile a QuerySet filter that matches all instances of the specified model
-        tokens = {
-            CONSTRAINT_TOKEN_USER: user_obj,
-        }
-        qs_filter = qs_filter_from_constraints(object_permissions[perm], tokens)
+        qs_filter, _ = get_constraints_filter(user_obj, perm, model)
 
         # Permission to perform the requested action on the object depends on whether the specified object matches
         # the specified constraints. Note that this check is made against the *database* record representing the object,
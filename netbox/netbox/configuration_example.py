@@ -83,10 +83,21 @@ AUTH_PASSWORD_VALIDATORS = [
     # },
 ]
 
+# Bulk import, edit, rename, and delete operations involving more than this number of objects are executed as
+# background jobs (set to None to disable).
+BACKGROUND_JOB_THRESHOLD = 1000
+
 # Base URL path if accessing NetBox within a directory. For example, if installed at https://example.com/netbox/, set:
 # BASE_PATH = 'netbox/'
 BASE_PATH = ''
 
+# Buffer change records and webhooks for each request, coalescing multiple changes to the same object, and write them
+# in bulk once the request has completed.
+CHANGELOG_DEFERRED = False
+
+# The number of seconds for which rendered config contexts are cached (set to 0 to disable caching).
+CONFIG_CONTEXT_CACHE_TIMEOUT = 86400
+
 # API Cross-Origin Resource Sharing (CORS) settings. If CORS_ORIGIN_ALLOW_ALL is set to True, all origins will be
 # allowed. Otherwise, define a list of allowed origins using either CORS_ORIGIN_WHITELIST or
 # CORS_ORIGIN_REGEX_WHITELIST. For more information, see https://github.com/ottoyiu/django-cors-headers
@@ -133,6 +144,9 @@ EXEMPT_VIEW_PERMISSIONS = [
 # NetBox from an internal IP.
 INTERNAL_IPS = ('127.0.0.1', '::1')
 
+# The maximum number of compiled Jinja2 templates (e.g. for custom links and export templates) to retain in memory.
+JINJA2_TEMPLATE_CACHE_SIZE = 1024
+
 # Enable custom logging. Please see the Django documentation for detailed guidance on configuring custom logs:
 #   https://docs.djangoproject.com/en/stable/topics/logging/
 LOGGING = {}
@@ -166,6 +180,9 @@ LOGIN_TIMEOUT = None
 # Expose Prometheus monitoring metrics at the HTTP endpoint '/metrics'
 METRICS_ENABLED = False
 
+# The number of seconds for which each user's object permissions are cached (set to 0 to disable caching).
+OBJECT_PERMISSION_CACHE_TIMEOUT = 300
+
 # Enable installed plugins. Add the name of each plugin to the list.
 PLUGINS = []
 
@@ -178,6 +195,9 @@ PLUGINS = []
 #     }
 # }
 
+# The number of seconds for which rendered rack elevation SVGs are cached (set to 0 to disable caching).
+RACK_ELEVATION_CACHE_TIMEOUT = 86400
+
 # Remote authentication support
 REMOTE_AUTH_ENABLED = False
 REMOTE_AUTH_BACKEND = 'netbox.authentication.RemoteUserBackend'
@@ -198,6 +218,19 @@ RELEASE_CHECK_URL = None
 # Maximum execution time for background tasks, in seconds.
 RQ_DEFAULT_TIMEOUT = 300
 
+# Enqueue all webhooks triggered by a request as a single background job, and the maximum number of webhooks to which
+# that job may deliver concurrently.
+WEBHOOKS_BATCHED = False
+WEBHOOKS_CONCURRENCY = 4
+
+# The maximum number of concurrent webhook requests to any one endpoint (scheme, host, and port).
+WEBHOOKS_ENDPOINT_CONCURRENCY = 4
+
+# The number of times a failed webhook request will be retried, and the backoff factor (in seconds) by which the delay
+# between successive retries grows.
+WEBHOOKS_RETRIES = 2
+WEBHOOKS_RETRY_BACKOFF = 0.5
+
 # The file path where custom scripts will be stored. A trailing slash is not needed. Note that the default value of
 # this setting is derived from the installed location.
 # SCRIPTS_ROOT = '/opt/netbox/netbox/scripts'
@@ -3,3 +3,7 @@ NESTED_SERIALIZER_PREFIX = 'Nested'
 
 # Max results per object type
 SEARCH_MAX_RESULTS = 15
+
+# Maximum runtime (in seconds) allowed per object processed by a bulk operation background job, in addition to
+# RQ_DEFAULT_TIMEOUT
+BACKGROUND_JOB_TIMEOUT_PER_OBJECT = 1
@@ -0,0 +1,124 @@
+import logging
+
+from django.apps import apps
+from django.db.models import F
+from django.db.models.signals import post_delete, post_init, post_save
+
+from extras.registry import registry
+from utilities.fields import CounterCacheField
+from utilities.utils import count_related
+
+
+logger = logging.getLogger('netbox.counters')
+
+
+def register(*models):
+    """
+    Register the CounterCacheFields of the given models, so that each is kept up-to-date as the objects it counts are
+    created, deleted, or reassigned to another parent.
+
+    Args:
+        models: One or more models with CounterCacheFields
+    """
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if type(field) is not CounterCacheField:
+                continue
+            logger.debug(f'Registering counter field {model._meta.label}.{field.name}')
+
+            to_model = apps.get_model(field.to_model_name)
+            to_field = to_model._meta.get_field(field.to_field_name)
+            registry['counter_fields'][to_model].append(
+                (to_field, model, field.name)
+            )
+
+            dispatch_uid = f'counters_{to_model._meta.label_lower}'
+            post_init.connect(cache_related_ids, sender=to_model, dispatch_uid=dispatch_uid)
+            post_save.connect(update_counters_on_save, sender=to_model, dispatch_uid=dispatch_uid)
+            post_delete.connect(update_counters_on_delete, sender=to_model, dispatch_uid=dispatch_uid)
+
+
+def get_counters(model=None):
+    """
+    Return a list of (model, counter field name, related field) tuples for all registered counters, or for only those
+    stored on the specified model.
+    """
+    return [
+        (counter_model, counter_name, to_field)
+        for counters in registry['counter_fields'].values()
+        for to_field, counter_model, counter_name in counters
+        if model is None or counter_model is model
+    ]
+
+
+def recalculate(model, counter_name, to_field):
+    """
+    Recalculate a counter for all instances of the model using a single UPDATE statement, returning the number of
+    objects updated.
+    """
+    return model.objects.update(**{
+        counter_name: count_related(to_field.model, to_field.name)
+    })
+
+
+def _update_counter(model, pk, counter_name, delta):
+    model.objects.filter(pk=pk).update(**{
+        counter_name: F(counter_name) + delta
+    })
+
+
+#
+# Signal receivers
+#
+
+def cache_related_ids(sender, instance, **kwargs):
+    """
+    Record the parent objects to which an instance is assigned when it is loaded, so that reassignments can be
+    detected once it has been saved. Deferred fields are omitted.
+    """
+    instance._counter_related_ids = {
+        field.attname: instance.__dict__[field.attname]
+        for field, model, counter_name in registry['counter_fields'][sender]
+        if field.attname in instance.__dict__
+    }
+
+
+def update_counters_on_save(sender, instance, created, raw, update_fields=None, **kwargs):
+    """
+    Increment the counters of the new parent of a created or reassigned object, and decrement those of its previous
+    parent.
+    """
+    # Skip objects being populated from raw data
+    if raw:
+        return
+
+    related_ids = instance._counter_related_ids
+    for field, model, counter_name in registry['counter_fields'][sender]:
+        attname = field.attname
+        if update_fields is not None and field.name not in update_fields:
+            continue
+        if not created and attname not in related_ids:
+            # The object's original parent is unknown (its field was deferred when it was loaded)
+            continue
+
+        old_pk = None if created else related_ids[attname]
+        new_pk = getattr(instance, attname)
+        if old_pk != new_pk:
+            if old_pk is not None:
+                _update_counter(model, old_pk, counter_name, -1)
+            if new_pk is not None:
+                _update_counter(model, new_pk, counter_name, 1)
+
+        # Record the object's new parent, in case it is saved again
+        related_ids[attname] = new_pk
+
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    """
+    Decrement the counters of the parent of a deleted object.
+    """
+    related_ids = instance._counter_related_ids
+    for field, model, counter_name in registry['counter_fields'][sender]:
+        pk = related_ids[field.attname] if field.attname in related_ids else getattr(instance, field.attname)
+        if pk is not None:
+            _update_counter(model, pk, counter_name, -1)
@@ -0,0 +1,295 @@
+import logging
+import traceback
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import ProtectedError
+
+from extras.choices import JobResultStatusChoices
+from extras.changelog import flush_changes
+from extras.context_managers import change_logging, deferred_change_logging
+from extras.signals import clear_webhooks
+from extras.webhooks import flush_webhooks
+from netbox import thread_locals
+from utilities.bulk import BULK_BATCH_SIZE
+from utilities.bulk_import import CSVImporter
+from utilities.exceptions import AbortRequest, AbortTransaction, PermissionsViolation
+from utilities.forms import restrict_form_fields
+
+__all__ = (
+    'delete_objects',
+    'edit_objects',
+    'import_objects',
+    'rename_objects',
+)
+
+
+class JobCancelled(Exception):
+    """
+    Raised to stop a background job whose cancellation has been requested.
+    """
+    pass
+
+
+def _get_view(view_class, job_result, action, request):
+    """
+    Return an instance of the view which initiated a job, set up to process the given request. Its queryset is
+    restricted to the objects on which the JobResult's user is permitted to perform the specified action.
+    """
+    view = view_class()
+    view.setup(request)
+    view.queryset = view_class.queryset.restrict(job_result.user, action)
+    return view
+
+
+def _get_form_errors(form):
+    return [
+        f'{field}: {error}' if field != '__all__' else error
+        for field, errors in form.errors.items() for error in errors
+    ]
+
+
+def _commit_chunk(func, pk_list):
+    """
+    Process a chunk of objects within its own transaction, writing its change records before the transaction is
+    committed and queuing its webhooks once it has been. If the chunk fails, its change records and webhooks are
+    discarded along with its changes.
+    """
+    try:
+        with transaction.atomic(), deferred_change_logging():
+            count = func(pk_list)
+            # Write the changes buffered for the chunk (including under CHANGELOG_DEFERRED) before it is committed
+            thread_locals.webhook_queue.extend(flush_changes(thread_locals.changelog_queue))
+            thread_locals.changelog_queue.clear()
+    except Exception:
+        if hasattr(thread_locals, 'changelog_queue'):
+            thread_locals.changelog_queue.clear()
+        thread_locals.webhook_queue.clear()
+        raise
+
+    flush_webhooks(thread_locals.webhook_queue)
+    thread_locals.webhook_queue.clear()
+    return count
+
+
+def _run_in_chunks(job_result, request, pk_list, func, verb):
+    """
+    Process the objects with the given primary keys in chunks of BULK_BATCH_SIZE, each of which is committed in its own
+    transaction. Progress is reported after each chunk, and the job stops before the next chunk once cancellation has
+    been requested. If the job fails or is cancelled, the changes of completed chunks are retained: the number of
+    objects processed, and the number in the chunk which failed (if any), are recorded in the JobResult's data.
+
+    :param job_result: The JobResult tracking the job
+    :param request: A copy of the request which initiated the job
+    :param pk_list: A list of the primary keys of all objects to be processed
+    :param func: A callable which processes the objects with the given primary keys and returns the number processed
+    :param verb: A past-tense verb describing the operation (e.g. "Updated"), used to summarize its result
+    """
+    logger = logging.getLogger('netbox.jobs')
+    model_name = job_result.obj_type.model_class()._meta.verbose_name_plural
+    job_result.set_status(JobResultStatusChoices.STATUS_RUNNING)
+    job_result.data = {
+        'objects': 0,
+        'failed': 0,
+        'message': 'No changes have been made.',
+        'errors': [],
+    }
+    job_result.save()
+
+    total = len(pk_list)
+    count = 0
+    chunk = []
+    with change_logging(request):
+        try:
+            for start in range(0, total, BULK_BATCH_SIZE):
+                if job_result.cancel_requested:
+                    raise JobCancelled()
+                chunk = pk_list[start:start + BULK_BATCH_SIZE]
+                count += _commit_chunk(func, chunk)
+                chunk = []
+                job_result.data['objects'] = count
+                job_result.set_progress(min(start + BULK_BATCH_SIZE, total), total)
+
+            job_result.data['message'] = f"{verb} {count} {model_name}"
+            job_result.set_status(JobResultStatusChoices.STATUS_COMPLETED)
+            logger.info(f"{job_result.name}: {job_result.data['message']}")
+
+        except JobCancelled:
+            job_result.set_status(JobResultStatusChoices.STATUS_CANCELLED)
+
+        except (AbortRequest, PermissionsViolation) as e:
+            job_result.data['errors'] = [e.message]
+            job_result.set_status(JobResultStatusChoices.STATUS_FAILED)
+
+        except ProtectedError as e:
+            job_result.data['errors'] = [e.args[0]]
+            job_result.set_status(JobResultStatusChoices.STATUS_FAILED)
+
+        except ValidationError as e:
+            job_result.data['errors'] = e.messages
+            job_result.set_status(JobResultStatusChoices.STATUS_FAILED)
+
+        except Exception as e:
+            logger.error(f"Exception raised during {job_result.name}: {e}")
+            job_result.data['errors'] = [f"An exception occurred: {type(e).__name__}: {e}", traceback.format_exc()]
+            job_result.set_status(JobResultStatusChoices.STATUS_ERRORED)
+
+        finally:
+            if job_result.status != JobResultStatusChoices.STATUS_COMPLETED:
+                job_result.data['failed'] = len(chunk)
+                if count:
+                    job_result.data['message'] = f"{verb} {count} of {total} {model_name} before the job stopped"
+                    if chunk:
+                        job_result.data['message'] += f"; a chunk of {len(chunk)} failed and was not changed"
+            job_result.save()
+
+
+def _fail(job_result, errors):
+    job_result.data = {
+        'objects': 0,
+        'message': 'No changes have been made.',
+        'errors': errors,
+    }
+    job_result.set_status(JobResultStatusChoices.STATUS_FAILED)
+    job_result.save()
+
+
+def import_objects(job_result, model_form, headers, records, request):
+    """
+    Background job which creates objects from CSV data (see BulkImportView). All objects are created within a single
+    transaction, which is rolled back if any row fails validation or the job is cancelled. The number of objects
+    created and any errors are recorded in the JobResult's data, along with a summary message. Object-level
+    permissions are enforced for the JobResult's user.
+
+    :param job_result: The JobResult tracking this job
+    :param model_form: The CSV form class used to validate each row
+    :param headers: The dictionary of column headers returned by parse_csv()
+    :param records: The list of rows returned by parse_csv()
+    :param request: A copy of the request which initiated the job (see copy_safe_request())
+    """
+    logger = logging.getLogger('netbox.jobs.import_objects')
+    model = job_result.obj_type.model_class()
+    queryset = model.objects.restrict(job_result.user, 'add')
+    job_result.set_status(JobResultStatusChoices.STATUS_RUNNING)
+    job_result.save()
+
+    importer = CSVImporter(model_form, headers, request.user)
+    job_result.data = {
+        'objects': 0,
+        'message': 'No changes have been made.',
+        'errors': [],
+    }
+
+    def progress(completed, total):
+        job_result.set_progress(completed, total)
+        if job_result.cancel_requested:
+            raise JobCancelled()
+
+    with change_logging(request):
+        try:
+            with deferred_change_logging(), transaction.atomic():
+                progress(0, len(records))
+                new_objs = importer.run(records, progress=progress)
+                if importer.errors:
+                    raise AbortTransaction()
+
+                # Enforce object-level permissions
+                if queryset.filter(pk__in=[obj.pk for obj in new_objs]).count() != len(new_objs):
+                    raise PermissionsViolation
+
+            job_result.data['objects'] = len(new_objs)
+            job_result.data['message'] = f"Imported {len(new_objs)} {model._meta.verbose_name_plural}"
+            job_result.set_status(JobResultStatusChoices.STATUS_COMPLETED)
+            logger.info(job_result.data['message'])
+
+        except JobCancelled:
+            job_result.set_status(JobResultStatusChoices.STATUS_CANCELLED)
+            clear_webhooks.send(request)
+
+        except AbortTransaction:
+            job_result.data['errors'] = importer.errors
+            job_result.set_status(JobResultStatusChoices.STATUS_FAILED)
+            clear_webhooks.send(request)
+
+        except (AbortRequest, PermissionsViolation) as e:
+            job_result.data['errors'] = [e.message]
+            job_result.set_status(JobResultStatusChoices.STATUS_FAILED)
+            clear_webhooks.send(request)
+
+        except Exception as e:
+            logger.error(f"Exception raised during import: {e}")
+            job_result.data['errors'] = [f"An exception occurred: {type(e).__name__}: {e}", traceback.format_exc()]
+            job_result.set_status(JobResultStatusChoices.STATUS_ERRORED)
+            clear_webhooks.send(request)
+
+        finally:
+            job_result.save()
+
+
+def edit_objects(job_result, view_class, pk_list, initial, request):
+    """
+    Background job which modifies objects in bulk using the submitted bulk edit form (see BulkEditView).
+
+    :param job_result: The JobResult tracking this job
+    :param view_class: The BulkEditView subclass which initiated the job
+    :param pk_list: A list of the primary keys of the objects to be modified
+    :param initial: The initial data for the bulk edit form
+    :param request: A copy of the request which initiated the job (see copy_safe_request())
+    """
+    view = _get_view(view_class, job_result, 'change', request)
+    queryset = view.queryset
+    form = view.form(request.POST, initial=initial)
+    restrict_form_fields(form, request.user)
+    if not form.is_valid():
+        return _fail(job_result, _get_form_errors(form))
+
+    def update_objects(pk_list):
+        view.queryset = queryset.filter(pk__in=pk_list)
+        updated_objects = view._update_objects(form, request)
+
+        # Enforce object-level permissions
+        if queryset.filter(pk__in=[obj.pk for obj in updated_objects]).count() != len(updated_objects):
+            raise PermissionsViolation
+
+        return len(updated_objects)
+
+    _run_in_chunks(job_result, request, pk_list, update_objects, 'Updated')
+
+
+def rename_objects(job_result, view_class, pk_list, request):
+    """
+    Background job which renames objects in bulk using the submitted bulk rename form (see BulkRenameView).
+
+    :param job_result: The JobResult tracking this job
+    :param view_class: The BulkRenameView subclass which initiated the job
+    :param pk_list: A list of the primary keys of the objects to be renamed
+    :param request: A copy of the request which initiated the job (see copy_safe_request())
+    """
+    view = _get_view(view_class, job_result, 'change', request)
+    queryset = view.queryset
+    form = view.form(request.POST, initial={'pk': pk_list})
+    if not form.is_valid():
+        return _fail(job_result, _get_form_errors(form))
+
+    def rename_objects(pk_list):
+        return view._apply_renames(form, queryset.filter(pk__in=pk_list))
+
+    _run_in_chunks(job_result, request, pk_list, rename_objects, 'Renamed')
+
+
+def delete_objects(job_result, view_class, pk_list, request):
+    """
+    Background job which deletes objects in bulk (see BulkDeleteView).
+
+    :param job_result: The JobResult tracking this job
+    :param view_class: The BulkDeleteView subclass which initiated the job
+    :param pk_list: A list of the primary keys of the objects to be deleted
+    :param request: A copy of the request which initiated the job (see copy_safe_request())
+    """
+    view = _get_view(view_class, job_result, 'delete', request)
+    queryset = view.queryset
+
+    def delete_objects(pk_list):
+        return view._delete_objects(queryset.filter(pk__in=pk_list))
+
+    _run_in_chunks(job_result, request, pk_list, delete_objects, 'Deleted')
@@ -1,3 +1,5 @@
+from django.db.models import F
+
 import circuits.filtersets
 import circuits.tables
 import dcim.filtersets
@@ -24,14 +26,18 @@ from utilities.utils import count_related
 from wireless.models import WirelessLAN, WirelessLink
 from virtualization.models import Cluster, VirtualMachine
 
+# Each type may declare the local fields to be stored in the search index (see extras.search), if its filterset's q
+# filter matches only on those fields. Types which are also matched on related objects or by network containment
+# declare no fields, and are always searched using their filterset.
 CIRCUIT_TYPES = {
     'provider': {
         'queryset': Provider.objects.annotate(
-            count_circuits=count_related(Circuit, 'provider')
+            count_circuits=F('_circuit_count')
         ),
         'filterset': circuits.filtersets.ProviderFilterSet,
         'table': circuits.tables.ProviderTable,
         'url': 'circuits:provider_list',
+        'fields': ('name', 'account', 'noc_contact', 'admin_contact', 'comments'),
     },
     'circuit': {
         'queryset': Circuit.objects.prefetch_related(
@@ -46,6 +52,7 @@ CIRCUIT_TYPES = {
         'filterset': circuits.filtersets.ProviderNetworkFilterSet,
         'table': circuits.tables.ProviderNetworkTable,
         'url': 'circuits:providernetwork_list',
+        'fields': ('name', 'service_id', 'description', 'comments'),
     },
 }
 
@@ -58,11 +65,12 @@ DCIM_TYPES = {
     },
     'rack': {
         'queryset': Rack.objects.prefetch_related('site', 'location', 'tenant', 'tenant__group', 'role').annotate(
-            device_count=count_related(Device, 'rack')
+            device_count=F('_device_count')
         ),
         'filterset': dcim.filtersets.RackFilterSet,
         'table': dcim.tables.RackTable,
         'url': 'dcim:rack_list',
+        'fields': ('name', 'facility_id', 'serial', 'asset_tag', 'comments'),
     },
     'rackreservation': {
         'queryset': RackReservation.objects.prefetch_related('rack', 'user'),
@@ -87,10 +95,11 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.LocationFilterSet,
         'table': dcim.tables.LocationTable,
         'url': 'dcim:location_list',
+        'fields': ('name', 'description'),
     },
     'devicetype': {
         'queryset': DeviceType.objects.prefetch_related('manufacturer').annotate(
-            instance_count=count_related(Device, 'device_type')
+            instance_count=F('_device_count')
         ),
         'filterset': dcim.filtersets.DeviceTypeFilterSet,
         'table': dcim.tables.DeviceTypeTable,
@@ -107,7 +116,7 @@ DCIM_TYPES = {
     },
     'moduletype': {
         'queryset': ModuleType.objects.prefetch_related('manufacturer').annotate(
-            instance_count=count_related(Module, 'module_type')
+            instance_count=F('_module_count')
         ),
         'filterset': dcim.filtersets.ModuleTypeFilterSet,
         'table': dcim.tables.ModuleTypeTable,
@@ -120,10 +129,11 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.ModuleFilterSet,
         'table': dcim.tables.ModuleTable,
         'url': 'dcim:module_list',
+        'fields': ('serial', 'asset_tag', 'comments'),
     },
     'virtualchassis': {
         'queryset': VirtualChassis.objects.prefetch_related('master').annotate(
-            member_count=count_related(Device, 'virtual_chassis')
+            member_count=F('_member_count')
         ),
         'filterset': dcim.filtersets.VirtualChassisFilterSet,
         'table': dcim.tables.VirtualChassisTable,
@@ -134,12 +144,14 @@ DCIM_TYPES = {
         'filterset': dcim.filtersets.CableFilterSet,
         'table': dcim.tables.CableTable,
         'url': 'dcim:cable_list',
+        'fields': ('label',),
     },
     'powerfeed': {
         'queryset': PowerFeed.objects.all(),
         'filterset': dcim.filtersets.PowerFeedFilterSet,
         'table': dcim.tables.PowerFeedTable,
         'url': 'dcim:powerfeed_list',
+        'fields': ('name', 'comments'),
     },
 }
 
@@ -149,6 +161,7 @@ IPAM_TYPES = {
         'filterset': ipam.filtersets.VRFFilterSet,
         'table': ipam.tables.VRFTable,
         'url': 'ipam:vrf_list',
+        'fields': ('name', 'rd', 'description'),
     },
     'aggregate': {
         'queryset': Aggregate.objects.prefetch_related('rir'),
@@ -167,24 +180,28 @@ IPAM_TYPES = {
         'filterset': ipam.filtersets.IPAddressFilterSet,
         'table': ipam.tables.IPAddressTable,
         'url': 'ipam:ipaddress_list',
+        'fields': ('address', 'dns_name', 'description'),
     },
     'vlan': {
         'queryset': VLAN.objects.prefetch_related('site', 'group', 'tenant', 'tenant__group', 'role'),
         'filterset': ipam.filtersets.VLANFilterSet,
         'table': ipam.tables.VLANTable,
         'url': 'ipam:vlan_list',
+        'fields': ('name', 'vid', 'description'),
     },
     'asn': {
         'queryset': ASN.objects.prefetch_related('rir', 'tenant', 'tenant__group'),
         'filterset': ipam.filtersets.ASNFilterSet,
         'table': ipam.tables.ASNTable,
         'url': 'ipam:asn_list',
+        'fields': ('asn', 'description'),
     },
     'service': {
         'queryset': Service.objects.prefetch_related('device', 'virtual_machine'),
         'filterset': ipam.filtersets.ServiceFilterSet,
         'table': ipam.tables.ServiceTable,
         'url': 'ipam:service_list',
+        'fields': ('name', 'description'),
     },
 }
 
@@ -194,6 +211,7 @@ TENANCY_TYPES = {
         'filterset': tenancy.filtersets.TenantFilterSet,
         'table': tenancy.tables.TenantTable,
         'url': 'tenancy:tenant_list',
+        'fields': ('name', 'slug', 'description', 'comments'),
     },
     'contact': {
         'queryset': Contact.objects.prefetch_related('group', 'assignments').annotate(
@@ -201,18 +219,20 @@ TENANCY_TYPES = {
         'filterset': tenancy.filtersets.ContactFilterSet,
         'table': tenancy.tables.ContactTable,
         'url': 'tenancy:contact_list',
+        'fields': ('name', 'title', 'phone', 'email', 'address', 'link', 'comments'),
     },
 }
 
 VIRTUALIZATION_TYPES = {
     'cluster': {
         'queryset': Cluster.objects.prefetch_related('type', 'group').annotate(
-            device_count=count_related(Device, 'cluster'),
-            vm_count=count_related(VirtualMachine, 'cluster')
+            device_count=F('_device_count'),
+            vm_count=F('_virtualmachine_count')
         ),
         'filterset': virtualization.filtersets.ClusterFilterSet,
         'table': virtualization.tables.ClusterTable,
         'url': 'virtualization:cluster_list',
+        'fields': ('name', 'comments'),
     },
     'virtualmachine': {
         'queryset': VirtualMachine.objects.prefetch_related(
@@ -221,6 +241,7 @@ VIRTUALIZATION_TYPES = {
         'filterset': virtualization.filtersets.VirtualMachineFilterSet,
         'table': virtualization.tables.VirtualMachineTable,
         'url': 'virtualization:virtualmachine_list',
+        'fields': ('name', 'comments'),
     },
 }
 
@@ -232,12 +253,14 @@ WIRELESS_TYPES = {
         'filterset': wireless.filtersets.WirelessLANFilterSet,
         'table': wireless.tables.WirelessLANTable,
         'url': 'wireless:wirelesslan_list',
+        'fields': ('ssid', 'description'),
     },
     'wirelesslink': {
         'queryset': WirelessLink.objects.prefetch_related('interface_a__device', 'interface_b__device'),
         'filterset': wireless.filtersets.WirelessLinkFilterSet,
         'table': wireless.tables.WirelessLinkTable,
         'url': 'wireless:wirelesslink_list',
+        'fields': ('ssid', 'description'),
     },
 }
 
@@ -247,6 +270,7 @@ JOURNAL_TYPES = {
         'filterset': extras.filtersets.JournalEntryFilterSet,
         'table': extras.tables.JournalEntryTable,
         'url': 'extras:journalentry_list',
+        'fields': ('comments',),
     },
 }
 
@@ -78,9 +78,12 @@ DEPLOYMENT_ID = hashlib.sha256(SECRET_KEY.encode('utf-8')).hexdigest()[:16]
 # Set static config parameters
 ADMINS = getattr(configuration, 'ADMINS', [])
 AUTH_PASSWORD_VALIDATORS = getattr(configuration, 'AUTH_PASSWORD_VALIDATORS', [])
+BACKGROUND_JOB_THRESHOLD = getattr(configuration, 'BACKGROUND_JOB_THRESHOLD', 1000)
 BASE_PATH = getattr(configuration, 'BASE_PATH', '')
 if BASE_PATH:
     BASE_PATH = BASE_PATH.strip('/') + '/'  # Enforce trailing slash only
+CHANGELOG_DEFERRED = getattr(configuration, 'CHANGELOG_DEFERRED', False)
+CONFIG_CONTEXT_CACHE_TIMEOUT = getattr(configuration, 'CONFIG_CONTEXT_CACHE_TIMEOUT', 86400)
 CORS_ORIGIN_ALLOW_ALL = getattr(configuration, 'CORS_ORIGIN_ALLOW_ALL', False)
 CORS_ORIGIN_REGEX_WHITELIST = getattr(configuration, 'CORS_ORIGIN_REGEX_WHITELIST', [])
 CORS_ORIGIN_WHITELIST = getattr(configuration, 'CORS_ORIGIN_WHITELIST', [])
@@ -97,14 +100,17 @@ FIELD_CHOICES = getattr(configuration, 'FIELD_CHOICES', {})
 HTTP_PROXIES = getattr(configuration, 'HTTP_PROXIES', None)
 INTERNAL_IPS = getattr(configuration, 'INTERNAL_IPS', ('127.0.0.1', '::1'))
 JINJA2_FILTERS = getattr(configuration, 'JINJA2_FILTERS', {})
+JINJA2_TEMPLATE_CACHE_SIZE = getattr(configuration, 'JINJA2_TEMPLATE_CACHE_SIZE', 1024)
 LOGGING = getattr(configuration, 'LOGGING', {})
 LOGIN_PERSISTENCE = getattr(configuration, 'LOGIN_PERSISTENCE', False)
 LOGIN_REQUIRED = getattr(configuration, 'LOGIN_REQUIRED', False)
 LOGIN_TIMEOUT = getattr(configuration, 'LOGIN_TIMEOUT', None)
 MEDIA_ROOT = getattr(configuration, 'MEDIA_ROOT', os.path.join(BASE_DIR, 'media')).rstrip('/')
 METRICS_ENABLED = getattr(configuration, 'METRICS_ENABLED', False)
+OBJECT_PERMISSION_CACHE_TIMEOUT = getattr(configuration, 'OBJECT_PERMISSION_CACHE_TIMEOUT', 300)
 PLUGINS = getattr(configuration, 'PLUGINS', [])
 PLUGINS_CONFIG = getattr(configuration, 'PLUGINS_CONFIG', {})
+RACK_ELEVATION_CACHE_TIMEOUT = getattr(configuration, 'RACK_ELEVATION_CACHE_TIMEOUT', 86400)
 RELEASE_CHECK_URL = getattr(configuration, 'RELEASE_CHECK_URL', None)
 REMOTE_AUTH_AUTO_CREATE_USER = getattr(configuration, 'REMOTE_AUTH_AUTO_CREATE_USER', False)
 REMOTE_AUTH_BACKEND = getattr(configuration, 'REMOTE_AUTH_BACKEND', 'netbox.authentication.RemoteUserBackend')
@@ -136,6 +142,11 @@ STORAGE_BACKEND = getattr(configuration, 'STORAGE_BACKEND', None)
 STORAGE_CONFIG = getattr(configuration, 'STORAGE_CONFIG', {})
 TIME_FORMAT = getattr(configuration, 'TIME_FORMAT', 'g:i a')
 TIME_ZONE = getattr(configuration, 'TIME_ZONE', 'UTC')
+WEBHOOKS_BATCHED = getattr(configuration, 'WEBHOOKS_BATCHED', False)
+WEBHOOKS_CONCURRENCY = getattr(configuration, 'WEBHOOKS_CONCURRENCY', 4)
+WEBHOOKS_ENDPOINT_CONCURRENCY = getattr(configuration, 'WEBHOOKS_ENDPOINT_CONCURRENCY', 4)
+WEBHOOKS_RETRIES = getattr(configuration, 'WEBHOOKS_RETRIES', 2)
+WEBHOOKS_RETRY_BACKOFF = getattr(configuration, 'WEBHOOKS_RETRY_BACKOFF', 0.5)
 
 # Check for hard-coded dynamic config parameters
 for param in PARAMS:
@@ -1,33 +1,116 @@
+import time
+from contextlib import nullcontext
+from itertools import islice
+
 import django_tables2 as tables
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import FieldDoesNotExist
-from django.db.models.fields.related import RelatedField
+from django.db import connection, models
+from django.utils.encoding import force_str
 from django_tables2.data import TableQuerysetData
+from django_tables2.utils import Accessor
+from django_tables2.rows import BoundRow
 
 from extras.models import CustomField, CustomLink
 from extras.choices import CustomFieldVisibilityChoices
 from netbox.tables import columns
 from utilities.paginator import EnhancedPaginator, get_paginate_count
+from utilities.streaming import iter_queryset_chunks
 
 __all__ = (
     'BaseTable',
     'NetBoxTable',
 )
 
+# The number of rows for which related objects are retrieved at once when exporting a table
+EXPORT_CHUNK_SIZE = 1000
+
+
+class QueryReport:
+    """
+    Records the database queries executed while retrieving and rendering a table's rows. Used as a database
+    execution wrapper.
+    """
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        """
+        Total execution time of all queries, in milliseconds.
+        """
+        return sum(duration for sql, duration in self.queries) * 1000
+
+    @property
+    def duplicates(self):
+        """
+        The number of queries which repeat a previous SQL statement (with any parameters), as is typical of N+1 queries.
+        """
+        return self.count - len({sql for sql, duration in self.queries})
+
+    def get_summary(self):
+        """
+        Return a list of (SQL, count, duration) for each distinct SQL statement, with the most frequent first.
+        """
+        summary = {}
+        for sql, duration in self.queries:
+            count, total = summary.get(sql, (0, 0))
+            summary[sql] = (count + 1, total + duration)
+        return sorted(
+            [(sql, count, total * 1000) for sql, (count, total) in summary.items()],
+            key=lambda query: query[1],
+            reverse=True
+        )
+
+
+class RecordedRows:
+    """
+    Wraps a table's rows to record any queries executed while they are retrieved and rendered.
+    """
+    def __init__(self, rows, report):
+        self.rows = rows
+        self.report = report
+
+    def __iter__(self):
+        with connection.execute_wrapper(self.report):
+            yield from self.rows
+
+    def __len__(self):
+        with connection.execute_wrapper(self.report):
+            return len(self.rows)
+
+    def __getitem__(self, key):
+        return self.rows[key]
+
 
 class BaseTable(tables.Table):
     """
     Base table class for NetBox objects. Adds support for:
 
         * User configuration (column preferences)
-        * Automatic prefetching of related objects
+        * Automatic retrieval of related objects (via select_related() and prefetch_related())
+        * Deferred loading of unused text fields
         * BS5 styling
 
     :param user: Personalize table display for the given user (optional). Has no effect if AnonymousUser is passed.
     """
     exempt_columns = ()
+    # Text and JSON fields which must not be deferred (e.g. because a column's template reads them)
+    defer_exempt = ()
 
     class Meta:
         attrs = {
@@ -74,31 +157,105 @@ class BaseTable(tables.Table):
             self.sequence.remove('actions')
             self.sequence.append('actions')
 
-        # Dynamically update the table's QuerySet to ensure related fields are pre-fetched
-        if isinstance(self.data, TableQuerysetData):
+        # Record the queries issued while retrieving the table's rows (debugging only)
+        self.query_report = QueryReport() if settings.DEBUG else None
+
+        # Dynamically update the table's QuerySet to ensure related objects are retrieved efficiently
+        if isinstance(self.data, TableQuerysetData) and self.data.data._fields is None:
+            select_fields, prefetch_fields = self._get_related_fields()
+            queryset = self.data.data
+            if queryset.query.combinator:
+                # select_related() is not supported for combined queries
+                select_fields, prefetch_fields = [], [*select_fields, *prefetch_fields]
+            if select_fields:
+                queryset = queryset.select_related(*select_fields)
+            if prefetch_fields:
+                queryset = queryset.prefetch_related(*prefetch_fields)
+            if not queryset.query.combinator and (defer_fields := self._get_deferrable_fields()):
+                queryset = queryset.defer(*defer_fields)
+            self.data.data = queryset
+
+    def _get_related_fields(self):
+        """
+        Return the lookup paths of related objects needed to render the visible columns, as two lists: those which can
+        be retrieved by joining (forward ForeignKey and one-to-one relationships) via select_related(), and those which
+        must be retrieved by separate queries (reverse and many-to-many relationships, GenericForeignKeys) via
+        prefetch_related().
+        """
+        select_fields = []
+        prefetch_fields = []
+        for column in self.columns:
+            if not column.visible:
+                continue
+            model = self._meta.model
+            accessor = column.accessor
+            path = []
+            is_multiple = False
+            for field_name in accessor.split(accessor.SEPARATOR):
+                try:
+                    field = model._meta.get_field(field_name)
+                except FieldDoesNotExist:
+                    break
+                if isinstance(field, GenericForeignKey):
+                    # Can't follow relations beyond a GenericForeignKey
+                    path.append(field_name)
+                    is_multiple = True
+                    break
+                if not field.is_relation or field.related_model is None:
+                    break
+                # Follow the relationship to the related model
+                path.append(field_name)
+                is_multiple = is_multiple or field.many_to_many or field.one_to_many
+                model = field.related_model
+            if path:
+                lookup = '__'.join(path)
+                if is_multiple:
+                    prefetch_fields.append(lookup)
+                else:
+                    select_fields.append(lookup)
+
+        return select_fields, prefetch_fields
+
+    def _get_deferrable_fields(self):
+        """
+        Return the names of any large text and JSON fields on the model which are not referenced by the table's
+        columns (by their accessors or explicit ordering) or by the model's ordering. Loading of these fields is
+        deferred. Invisible columns are considered as well, since they may be included when exporting the table.
+        Fields which are read by a column's template or render method must be listed in defer_exempt.
+        """
+        model = self._meta.model
+        candidates = [
+            field.name for field in model._meta.concrete_fields
+            if isinstance(field, (models.TextField, models.JSONField)) and field.name not in self.defer_exempt
+        ]
+        if not candidates:
+            return []
+
+        lookups = [str(ordering) for ordering in model._meta.ordering]
+        for bound_column in self.columns.iterall():
+            if isinstance(bound_column.column, columns.CustomLinkColumn):
+                # Custom links may be rendered using any field
+                return []
+            lookups.append(str(bound_column.accessor))
+            lookups.extend(bound_column.column.order_by or ())
+        references = {lookup.lstrip('-').split(Accessor.SEPARATOR)[0] for lookup in lookups}
 
-            prefetch_fields = []
-            for column in self.columns:
-                if column.visible:
-                    model = getattr(self.Meta, 'model')
-                    accessor = column.accessor
-                    prefetch_path = []
-                    for field_name in accessor.split(accessor.SEPARATOR):
-                        try:
-                            field = model._meta.get_field(field_name)
-                        except FieldDoesNotExist:
-                            break
-                        if isinstance(field, RelatedField):
-                            # Follow ForeignKeys to the related model
-                            prefetch_path.append(field_name)
-                            model = field.remote_field.model
-                        elif isinstance(field, GenericForeignKey):
-                            # Can't prefetch beyond a GenericForeignKey
-                            prefetch_path.append(field_name)
-                            break
-                    if prefetch_path:
-                        prefetch_fields.append('__'.join(prefetch_path))
-            self.data.data = self.data.data.prefetch_related(*prefetch_fields)
+        return [name for name in candidates if name not in references]
+
+    def record_queries(self):
+        """
+        Return a context manager which records all queries executed within it to the table's query report (if enabled).
+        """
+        if self.query_report is None:
+            return nullcontext()
+        return connection.execute_wrapper(self.query_report)
+
+    def paginate(self, *args, **kwargs):
+        with self.record_queries():
+            super().paginate(*args, **kwargs)
+        if self.query_report is not None:
+            self.page.object_list = RecordedRows(self.page.object_list, self.query_report)
+        return self
 
     def _get_columns(self, visible=True):
         columns = []
@@ -192,3 +349,61 @@ class NetBoxTable(BaseTable):
         ])
 
         super().__init__(*args, extra_columns=extra_columns, **kwargs)
+
+    def prefetch_custom_field_objects(self, records, visible_only=False):
+        """
+        Retrieve the objects referenced by object and multi-object custom field columns for the given records, using a
+        single query per custom field.
+        """
+        custom_fields = [
+            bound_column.column.customfield for bound_column in self.columns.iterall()
+            if isinstance(bound_column.column, columns.CustomFieldColumn) and (bound_column.visible or not visible_only)
+        ]
+        if not custom_fields:
+            return
+        records = [record for record in records if hasattr(record, 'custom_field_data')]
+        for cf in custom_fields:
+            cf.prefetch_objects(record.custom_field_data.get(cf.name) for record in records)
+
+    def prefetch_records(self, records, visible_only=False):
+        """
+        Retrieve in bulk any data required to render the given records (e.g. a page of the table), ahead of rendering.
+        Subclasses may extend this to populate per-record caches. If visible_only is True, only data needed by visible
+        columns is retrieved.
+        """
+        self.prefetch_custom_field_objects(records, visible_only=visible_only)
+
+    def paginate(self, *args, **kwargs):
+        super().paginate(*args, **kwargs)
+        with self.record_queries():
+            self.prefetch_records([row.record for row in self.page.object_list], visible_only=True)
+        return self
+
+    def as_values(self, exclude_columns=None):
+        """
+        Extend as_values() to stream records from the database in chunks, prefetching the data required to render each
+        chunk (see prefetch_records()).
+        """
+        if exclude_columns is None:
+            exclude_columns = ()
+
+        bound_columns = [
+            column for column in self.columns.iterall()
+            if not (column.column.exclude_from_export or column.name in exclude_columns)
+        ]
+        yield [force_str(column.header, strings_only=True) for column in bound_columns]
+
+        # Stream QuerySets from the database rather than loading all records at once
+        if isinstance(self.data, TableQuerysetData):
+            chunks = iter_queryset_chunks(self.data.data, EXPORT_CHUNK_SIZE)
+        else:
+            records = (row.record for row in self.rows)
+            chunks = iter(lambda: list(islice(records, EXPORT_CHUNK_SIZE)), [])
+
+        for chunk in chunks:
+            self.prefetch_records(chunk)
+            for record in chunk:
+                row = BoundRow(record, table=self)
+                yield [
+                    force_str(row.get_cell_value(column.name), strings_only=True) for column in bound_columns
+                ]
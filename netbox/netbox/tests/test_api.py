@@ -1,5 +1,7 @@
+from django.test import override_settings
 from django.urls import reverse
 
+from dcim.models import Site
 from utilities.testing import APITestCase
 
 
@@ -16,3 +18,62 @@ class AppTest(APITestCase):
         response = self.client.get('{}?format=api'.format(url), **self.header)
 
         self.assertEqual(response.status_code, 200)
+
+
+class PaginationTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([
+            Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 8)
+        ])
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_cursor_pagination(self):
+        url = reverse('dcim-api:site-list')
+        pks = list(Site.objects.order_by('pk').values_list('pk', flat=True))
+
+        # Retrieve the first page
+        response = self.client.get(f'{url}?cursor=&limit=3', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual([site['id'] for site in response.data['results']], pks[:3])
+        self.assertIsNone(response.data['previous'])
+
+        # Follow the next links to the last page
+        response = self.client.get(response.data['next'], **self.header)
+        self.assertEqual([site['id'] for site in response.data['results']], pks[3:6])
+        response = self.client.get(response.data['next'], **self.header)
+        self.assertEqual([site['id'] for site in response.data['results']], pks[6:])
+        self.assertIsNone(response.data['next'])
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_invalid_cursor(self):
+        url = reverse('dcim-api:site-list')
+        response = self.client.get(f'{url}?cursor=invalid', **self.header)
+        self.assertHttpStatus(response, 404)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_count_none(self):
+        url = reverse('dcim-api:site-list')
+        response = self.client.get(f'{url}?count=none&limit=3', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertIsNone(response.data['count'])
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['next'])
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_count_estimate(self):
+        url = reverse('dcim-api:site-list')
+        response = self.client.get(f'{url}?count=estimate&limit=3', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertIsInstance(response.data['count'], int)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=['*'])
+    def test_count_estimate_empty(self):
+        # An invalid prefix yields a query which can never match any rows
+        url = reverse('ipam-api:prefix-list')
+        response = self.client.get(f'{url}?prefix=bogus&count=estimate', **self.header)
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data['count'], 0)
+        self.assertEqual(response.data['results'], [])
@@ -524,3 +524,71 @@ class ObjectPermissionAPIViewTestCase(TestCase):
                       kwargs={'pk': self.prefixes[0].pk})
         response = self.client.delete(url, format='json', **self.header)
         self.assertEqual(response.status_code, 204)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_modify_permission(self):
+        url = reverse('ipam-api:prefix-list')
+
+        # Assign object permission
+        obj_perm = ObjectPermission(
+            name='Test permission',
+            constraints={'site__name': 'Site 1'},
+            actions=['view']
+        )
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Prefix))
+
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.data['count'], 3)
+
+        # Modifying the permission should invalidate any cached permissions
+        obj_perm.constraints = [{'site__name': 'Site 1'}, {'site__name': 'Site 2'}]
+        obj_perm.save()
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.data['count'], 6)
+
+        # Removing the user from the permission should revoke access
+        obj_perm.users.remove(self.user)
+        response = self.client.get(url, **self.header)
+        self.assertEqual(response.status_code, 403)
+
+
+class RestrictedQuerySetTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        sites = (
+            Site(name='Site 1', slug='site-1'),
+            Site(name='Site 2', slug='site-2'),
+        )
+        Site.objects.bulk_create(sites)
+        Prefix.objects.bulk_create((
+            Prefix(prefix=IPNetwork('10.0.0.0/24'), site=sites[0]),
+            Prefix(prefix=IPNetwork('10.0.1.0/24'), site=sites[1]),
+        ))
+
+    def setUp(self):
+        self.user = User.objects.create(username='testuser')
+
+    def _restrict(self, constraints):
+        obj_perm = ObjectPermission(name='Test permission', constraints=constraints, actions=['view'])
+        obj_perm.save()
+        obj_perm.users.add(self.user)
+        obj_perm.object_types.add(ContentType.objects.get_for_model(Prefix))
+        user = User.objects.get(pk=self.user.pk)
+        return Prefix.objects.restrict(user, 'view')
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_single_valued_constraints(self):
+        # Constraints which follow only ForeignKeys are applied directly (without a subquery)
+        queryset = self._restrict({'site__name': 'Site 1'})
+        self.assertEqual(str(queryset.query).count('SELECT'), 1)
+        self.assertEqual(queryset.count(), 1)
+
+    @override_settings(EXEMPT_VIEW_PERMISSIONS=[])
+    def test_multi_valued_constraints(self):
+        # Constraints which span a many-to-many relationship are applied as a subquery to avoid duplicate results
+        queryset = self._restrict({'tags__isnull': True})
+        self.assertEqual(str(queryset.query).count('SELECT'), 2)
+        self.assertEqual(queryset.count(), 2)
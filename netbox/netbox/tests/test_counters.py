@@ -0,0 +1,80 @@
+from django.core.management import call_command
+from django.test import TestCase
+
+from circuits.models import Circuit, CircuitType, Provider
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Rack, Site
+from utilities.bulk import bulk_save
+
+
+class CounterCacheTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        DeviceRole.objects.create(name='Device Role 1', slug='device-role-1', color='ff0000')
+        Rack.objects.create(site=site, name='Rack 1')
+        Rack.objects.create(site=site, name='Rack 2')
+
+    def get_device(self, name, rack):
+        return Device(
+            site=Site.objects.first(),
+            rack=rack,
+            name=name,
+            device_type=DeviceType.objects.first(),
+            device_role=DeviceRole.objects.first()
+        )
+
+    def assertCounts(self, rack1, rack2):
+        self.assertEqual(Rack.objects.get(name='Rack 1')._device_count, rack1)
+        self.assertEqual(Rack.objects.get(name='Rack 2')._device_count, rack2)
+
+    def test_create_and_delete(self):
+        rack1 = Rack.objects.get(name='Rack 1')
+        device = self.get_device('Device 1', rack1)
+        device.save()
+        self.assertCounts(1, 0)
+        self.assertEqual(DeviceType.objects.first()._device_count, 1)
+
+        Device.objects.get(pk=device.pk).delete()
+        self.assertCounts(0, 0)
+        self.assertEqual(DeviceType.objects.first()._device_count, 0)
+
+    def test_reassign(self):
+        rack1 = Rack.objects.get(name='Rack 1')
+        rack2 = Rack.objects.get(name='Rack 2')
+        device = self.get_device('Device 1', rack1)
+        device.save()
+
+        device.rack = rack2
+        device.save()
+        self.assertCounts(0, 1)
+
+        # Reassignment is detected for objects retrieved from the database
+        device = Device.objects.get(pk=device.pk)
+        device.rack = None
+        device.save()
+        self.assertCounts(0, 0)
+
+    def test_bulk_save(self):
+        provider = Provider.objects.create(name='Provider 1', slug='provider-1')
+        circuit_type = CircuitType.objects.create(name='Circuit Type 1', slug='circuit-type-1')
+        bulk_save([Circuit(cid=f'Circuit {i}', provider=provider, type=circuit_type) for i in range(1, 4)])
+        self.assertEqual(Provider.objects.get(pk=provider.pk)._circuit_count, 3)
+
+    def test_save_parent(self):
+        rack1 = Rack.objects.get(name='Rack 1')
+        self.get_device('Device 1', rack1).save()
+
+        # Saving an instance whose count is stale does not overwrite the stored count
+        rack1.save()
+        self.assertCounts(1, 0)
+
+    def test_recalculate_counters(self):
+        rack1 = Rack.objects.get(name='Rack 1')
+        self.get_device('Device 1', rack1).save()
+        Rack.objects.update(_device_count=5)
+
+        call_command('recalculate_counters', 'dcim.Rack', verbosity=0)
+        self.assertCounts(1, 0)
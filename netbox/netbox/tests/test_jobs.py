@@ -0,0 +1,102 @@
+import uuid
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.http import QueryDict
+from django.test import TestCase
+
+from dcim.choices import SiteStatusChoices
+from dcim.models import Rack, Site
+from dcim.views import SiteBulkDeleteView, SiteBulkEditView
+from extras.choices import JobResultStatusChoices, ObjectChangeActionChoices
+from extras.models import JobResult, ObjectChange
+from netbox.jobs import delete_objects, edit_objects
+from utilities.utils import NetBoxFakeRequest
+
+
+@patch('netbox.jobs.BULK_BATCH_SIZE', 2)
+class BulkJobTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', is_superuser=True)
+        Site.objects.bulk_create([Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 6)])
+
+    def get_job_result(self, name):
+        return JobResult.objects.create(
+            name=name,
+            obj_type=ContentType.objects.get_for_model(Site),
+            user=self.user,
+            job_id=uuid.uuid4()
+        )
+
+    def get_request(self, data=None):
+        post = QueryDict(mutable=True)
+        for key, value in (data or {}).items():
+            post.setlist(key, value if isinstance(value, list) else [value])
+        return NetBoxFakeRequest({
+            'META': {},
+            'POST': post,
+            'GET': QueryDict(),
+            'FILES': {},
+            'user': self.user,
+            'path': '/',
+            'id': uuid.uuid4(),
+        })
+
+    def test_edit_objects(self):
+        pk_list = [str(pk) for pk in Site.objects.values_list('pk', flat=True)]
+        request = self.get_request({'pk': pk_list, 'status': SiteStatusChoices.STATUS_PLANNED, '_apply': ''})
+        job_result = self.get_job_result('Update sites')
+
+        edit_objects(job_result, SiteBulkEditView, pk_list, {'pk': pk_list}, request)
+
+        job_result.refresh_from_db()
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_COMPLETED)
+        self.assertEqual(job_result.data['message'], 'Updated 5 sites')
+        self.assertEqual(Site.objects.filter(status=SiteStatusChoices.STATUS_PLANNED).count(), 5)
+        self.assertEqual(ObjectChange.objects.filter(action=ObjectChangeActionChoices.ACTION_UPDATE).count(), 5)
+
+    def test_delete_objects(self):
+        pk_list = list(Site.objects.values_list('pk', flat=True))
+        job_result = self.get_job_result('Delete sites')
+
+        delete_objects(job_result, SiteBulkDeleteView, pk_list, self.get_request())
+
+        job_result.refresh_from_db()
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_COMPLETED)
+        self.assertEqual(job_result.data['objects'], 5)
+        self.assertFalse(Site.objects.exists())
+        self.assertEqual(ObjectChange.objects.filter(action=ObjectChangeActionChoices.ACTION_DELETE).count(), 5)
+
+    def test_cancel_job(self):
+        pk_list = list(Site.objects.values_list('pk', flat=True))
+        job_result = self.get_job_result('Delete sites')
+        job_result.cancel()
+
+        delete_objects(job_result, SiteBulkDeleteView, pk_list, self.get_request())
+
+        job_result.refresh_from_db()
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_CANCELLED)
+        self.assertEqual(job_result.data['message'], 'No changes have been made.')
+        self.assertEqual(Site.objects.count(), 5)
+
+    def test_failed_job_retains_completed_chunks(self):
+        pk_list = list(Site.objects.order_by('pk').values_list('pk', flat=True))
+        job_result = self.get_job_result('Delete sites')
+
+        # The last site cannot be deleted, which fails the job after earlier chunks have been committed
+        Rack.objects.create(name='Rack 1', site=Site.objects.get(pk=pk_list[-1]))
+        delete_objects(job_result, SiteBulkDeleteView, pk_list, self.get_request())
+
+        job_result.refresh_from_db()
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_FAILED)
+        self.assertEqual(job_result.data['objects'], 4)
+        self.assertEqual(job_result.data['failed'], 1)
+        self.assertEqual(
+            job_result.data['message'],
+            'Deleted 4 of 5 sites before the job stopped; a chunk of 1 failed and was not changed'
+        )
+        self.assertEqual(list(Site.objects.values_list('pk', flat=True)), pk_list[-1:])
+        self.assertEqual(ObjectChange.objects.filter(action=ObjectChangeActionChoices.ACTION_DELETE).count(), 4)
@@ -35,3 +35,45 @@ class TagColumnTest(TestCase):
             'table': table
         })
         template.render(context)
+
+
+class QueryPlanTable(NetBoxTable):
+    region = columns.TemplateColumn(accessor='region__name', template_code='{{ value }}')
+    tags = columns.TagColumn(url_name='dcim:site_list')
+    devices = columns.ManyToManyColumn(accessor='devices__name')
+
+    class Meta(NetBoxTable.Meta):
+        model = Site
+        fields = ('pk', 'name', 'region', 'tenant', 'tags', 'devices', 'description')
+        default_columns = ('pk', 'name', 'region', 'tags')
+
+
+class QueryPlanTest(TestCase):
+
+    def test_related_fields(self):
+        table = QueryPlanTable(Site.objects.all())
+        queryset = table.data.data
+
+        # Forward relationships are joined; reverse & many-to-many relationships are prefetched
+        self.assertEqual(queryset.query.select_related, {'region': {}})
+        self.assertEqual(queryset._prefetch_related_lookups, ('tags',))
+
+    def test_deferred_fields(self):
+        table = QueryPlanTable(Site.objects.all())
+        deferred_fields, is_defer = table.data.data.query.deferred_loading
+
+        # Unreferenced text fields are deferred
+        self.assertTrue(is_defer)
+        self.assertIn('comments', deferred_fields)
+        self.assertIn('custom_field_data', deferred_fields)
+
+        # Fields listed in defer_exempt are always loaded
+        class DeferExemptTable(QueryPlanTable):
+            defer_exempt = ('comments',)
+
+            class Meta(QueryPlanTable.Meta):
+                pass
+
+        deferred_fields, is_defer = DeferExemptTable(Site.objects.all()).data.data.query.deferred_loading
+        self.assertNotIn('comments', deferred_fields)
+        self.assertIn('custom_field_data', deferred_fields)
@@ -1,5 +1,8 @@
 import urllib.parse
 
+from netaddr import IPNetwork
+
+from ipam.models import Prefix
 from utilities.testing import TestCase
 from django.urls import reverse
 
@@ -22,3 +25,15 @@ class HomeViewTestCase(TestCase):
 
         response = self.client.get('{}?{}'.format(url, urllib.parse.urlencode(params)))
         self.assertHttpStatus(response, 200)
+
+    def test_search_network(self):
+        """
+        Searching for an IP address should return the prefixes which contain it.
+        """
+        self.add_permissions('ipam.view_prefix')
+        Prefix.objects.create(prefix=IPNetwork('192.0.2.0/24'))
+
+        url = reverse('search')
+        response = self.client.get('{}?{}'.format(url, urllib.parse.urlencode({'q': '192.0.2.1'})))
+        self.assertHttpStatus(response, 200)
+        self.assertContains(response, '192.0.2.0/24')
@@ -2,6 +2,7 @@ import platform
 import sys
 
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.http import HttpResponseServerError
 from django.shortcuts import redirect, render
@@ -19,6 +20,7 @@ from dcim.models import (
     Cable, ConsolePort, Device, DeviceType, Interface, PowerPanel, PowerFeed, PowerPort, Rack, Site,
 )
 from extras.models import ObjectChange
+from extras.search import get_indexed_models, search
 from extras.tables import ObjectChangeTable
 from ipam.models import Aggregate, IPAddress, IPRange, Prefix, VLAN, VRF
 from netbox.constants import SEARCH_MAX_RESULTS
@@ -160,6 +162,12 @@ class SearchView(View):
                 url = reverse(SEARCH_TYPES[object_type]['url'])
                 return redirect(f"{url}?q={form.cleaned_data['q']}")
 
+            # Determine which indexed object types have matches in the search index. Types which are not indexed
+            # are always searched.
+            query = form.cleaned_data['q']
+            indexed_models = get_indexed_models()
+            matched_types = set(search(query).values_list('object_type', flat=True).distinct())
+
             for obj_type in SEARCH_TYPES.keys():
 
                 queryset = SEARCH_TYPES[obj_type]['queryset'].restrict(request.user, 'view')
@@ -167,8 +175,12 @@ class SearchView(View):
                 table = SEARCH_TYPES[obj_type]['table']
                 url = SEARCH_TYPES[obj_type]['url']
 
+                model = queryset.model
+                if model in indexed_models and ContentType.objects.get_for_model(model).pk not in matched_types:
+                    continue
+
                 # Construct the results table for this object type
-                filtered_queryset = filterset({'q': form.cleaned_data['q']}, queryset=queryset).qs
+                filtered_queryset = filterset({'q': query}, queryset=queryset).qs
                 table = table(filtered_queryset, orderable=False)
                 table.paginate(per_page=SEARCH_MAX_RESULTS)
 
@@ -1,6 +1,7 @@
 import logging
 import re
 from copy import deepcopy
+from functools import partial
 
 from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
@@ -9,13 +10,15 @@ from django.db import transaction, IntegrityError
 from django.db.models import ManyToManyField, ProtectedError
 from django.db.models.fields.reverse_related import ManyToManyRel
 from django.forms import Form, ModelMultipleChoiceField, MultipleHiddenInput
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django_tables2.export import TableExport
 from django.utils.safestring import mark_safe
 
+from extras.context_managers import deferred_change_logging
 from extras.models import ExportTemplate
 from extras.signals import clear_webhooks
+from netbox.jobs import delete_objects, edit_objects, import_objects, rename_objects
+from utilities.bulk_import import CSVImporter
 from utilities.error_handlers import handle_protectederror
 from utilities.exceptions import AbortRequest, PermissionsViolation
 from utilities.forms import (
@@ -23,9 +26,10 @@ from utilities.forms import (
 )
 from utilities.htmx import is_htmx
 from utilities.permissions import get_permission_for_model
+from utilities.streaming import LazyQuerySet, iter_buffered, iter_csv
 from utilities.views import GetReturnURLMixin
 from .base import BaseMultiObjectView
-from .mixins import ActionsMixin, TableMixin
+from .mixins import ActionsMixin, BackgroundJobMixin, TableMixin
 from .utils import get_prerequisite_model
 
 __all__ = (
@@ -63,15 +67,15 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
 
     def export_yaml(self):
         """
-        Export the queryset of objects as concatenated YAML documents.
+        Export the queryset of objects as concatenated YAML documents. Objects are retrieved from the database and
+        rendered as the output is consumed.
         """
-        yaml_data = [obj.to_yaml() for obj in self.queryset]
-
-        return '---\n'.join(yaml_data)
+        for i, obj in enumerate(LazyQuerySet(self.queryset)):
+            yield f'---\n{obj.to_yaml()}' if i else obj.to_yaml()
 
     def export_table(self, table, columns=None, filename=None):
         """
-        Export all table data in CSV format.
+        Export all table data in CSV format as a streaming response.
 
         Args:
             table: The Table instance to export
@@ -85,14 +89,16 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
             exclude_columns.update({
                 col for col in all_columns if col not in columns
             })
-        exporter = TableExport(
-            export_format=TableExport.CSV,
-            table=table,
-            exclude_columns=exclude_columns
-        )
-        return exporter.response(
-            filename=filename or f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
+        filename = filename or f'netbox_{self.queryset.model._meta.verbose_name_plural}.csv'
+
+        # Stream the CSV data to the client as rows are rendered
+        response = StreamingHttpResponse(
+            iter_csv(table.as_values(exclude_columns=exclude_columns)),
+            content_type='text/csv; charset=utf-8'
         )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+
+        return response
 
     def export_template(self, template, request):
         """
@@ -147,7 +153,7 @@ class ObjectListView(BaseMultiObjectView, ActionsMixin, TableMixin):
 
             # Check for YAML export support on the model
             elif hasattr(model, 'to_yaml'):
-                response = HttpResponse(self.export_yaml(), content_type='text/yaml')
+                response = StreamingHttpResponse(iter_buffered(self.export_yaml()), content_type='text/yaml')
                 filename = 'netbox_{}.yaml'.format(self.queryset.model._meta.verbose_name_plural)
                 response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
                 return response
@@ -286,7 +292,7 @@ class BulkCreateView(GetReturnURLMixin, BaseMultiObjectView):
         })
 
 
-class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
+class BulkImportView(BackgroundJobMixin, GetReturnURLMixin, BaseMultiObjectView):
     """
     Import objects in bulk (CSV format).
 
@@ -321,23 +327,28 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
 
         return ImportForm(*args, **kwargs)
 
-    def _create_objects(self, form, request):
-        new_objs = []
+    def _get_records(self, form, request):
+        """
+        Return the column headers and rows of the submitted CSV data.
+        """
         if request.FILES:
-            headers, records = form.cleaned_data['csv_file']
-        else:
-            headers, records = form.cleaned_data['csv']
+            return form.cleaned_data['csv_file']
+        return form.cleaned_data['csv']
 
-        for row, data in enumerate(records, start=1):
-            obj_form = self.model_form(data, headers=headers)
-            restrict_form_fields(obj_form, request.user)
-
-            if obj_form.is_valid():
-                obj = self._save_obj(obj_form, request)
-                new_objs.append(obj)
-            else:
-                for field, err in obj_form.errors.items():
-                    form.add_error('csv', f'Row {row} {field}: {err[0]}')
+    def _create_objects(self, form, request):
+        headers, records = self._get_records(form, request)
+
+        # Save each row using _save_obj() only if it has been overridden
+        save_obj = None
+        if type(self)._save_obj is not BulkImportView._save_obj:
+            save_obj = partial(self._save_obj, request=request)
+
+        importer = CSVImporter(self.model_form, headers, request.user, save_obj=save_obj)
+        with deferred_change_logging():
+            new_objs = importer.run(records)
+            if importer.errors:
+                for error in importer.errors:
+                    form.add_error('csv', error)
                 raise ValidationError("")
 
         return new_objs
@@ -372,8 +383,22 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
         if form.is_valid():
             logger.debug("Form validation was successful")
 
+            # Large imports are executed as background jobs (unless _save_obj() has been customized)
+            headers, records = self._get_records(form, request)
+            if type(self)._save_obj is BulkImportView._save_obj and self.run_as_job(len(records)):
+                logger.info(f"Enqueuing background job to import {len(records)} objects")
+                return self.enqueue_job(
+                    request,
+                    import_objects,
+                    'Import',
+                    len(records),
+                    model_form=self.model_form,
+                    headers=headers,
+                    records=records
+                )
+
             try:
-                # Iterate through CSV data and bind each row to a new model form instance.
+                # Validate and save the CSV data in batches
                 with transaction.atomic():
                     new_objs = self._create_objects(form, request)
 
@@ -414,7 +439,7 @@ class BulkImportView(GetReturnURLMixin, BaseMultiObjectView):
         })
 
 
-class BulkEditView(GetReturnURLMixin, BaseMultiObjectView):
+class BulkEditView(BackgroundJobMixin, GetReturnURLMixin, BaseMultiObjectView):
     """
     Edit objects in bulk.
 
@@ -525,6 +550,21 @@ class BulkEditView(GetReturnURLMixin, BaseMultiObjectView):
             if form.is_valid():
                 logger.debug("Form validation was successful")
 
+                # Operations involving many objects are executed as background jobs
+                object_count = form.cleaned_data['pk'].count()
+                if self.run_as_job(object_count):
+                    logger.info(f"Enqueuing background job to update {object_count} objects")
+                    pk_list = list(form.cleaned_data['pk'].values_list('pk', flat=True))
+                    return self.enqueue_job(
+                        request,
+                        edit_objects,
+                        'Update',
+                        object_count,
+                        view_class=type(self),
+                        pk_list=pk_list,
+                        initial={**initial_data, 'pk': pk_list}
+                    )
+
                 try:
 
                     with transaction.atomic():
@@ -573,7 +613,7 @@ class BulkEditView(GetReturnURLMixin, BaseMultiObjectView):
         })
 
 
-class BulkRenameView(GetReturnURLMixin, BaseMultiObjectView):
+class BulkRenameView(BackgroundJobMixin, GetReturnURLMixin, BaseMultiObjectView):
     """
     An extendable view for renaming objects in bulk.
     """
@@ -617,6 +657,21 @@ class BulkRenameView(GetReturnURLMixin, BaseMultiObjectView):
 
         return renamed_pks
 
+    def _apply_renames(self, form, selected_objects):
+        """
+        Rename and save the selected objects, returning the number of objects renamed.
+        """
+        renamed_pks = self._rename_objects(form, selected_objects)
+        for obj in selected_objects:
+            obj.name = obj.new_name
+            obj.save()
+
+        # Enforce constrained permissions
+        if self.queryset.filter(pk__in=renamed_pks).count() != len(selected_objects):
+            raise PermissionsViolation
+
+        return len(selected_objects)
+
     def post(self, request):
         logger = logging.getLogger('netbox.views.BulkRenameView')
 
@@ -625,23 +680,31 @@ class BulkRenameView(GetReturnURLMixin, BaseMultiObjectView):
             selected_objects = self.queryset.filter(pk__in=form.initial['pk'])
 
             if form.is_valid():
+
+                # Operations involving many objects are executed as background jobs
+                if '_apply' in request.POST:
+                    object_count = selected_objects.count()
+                    if self.run_as_job(object_count):
+                        logger.info(f"Enqueuing background job to rename {object_count} objects")
+                        return self.enqueue_job(
+                            request,
+                            rename_objects,
+                            'Rename',
+                            object_count,
+                            view_class=type(self),
+                            pk_list=list(selected_objects.values_list('pk', flat=True))
+                        )
+
                 try:
                     with transaction.atomic():
-                        renamed_pks = self._rename_objects(form, selected_objects)
-
                         if '_apply' in request.POST:
-                            for obj in selected_objects:
-                                obj.name = obj.new_name
-                                obj.save()
-
-                            # Enforce constrained permissions
-                            if self.queryset.filter(pk__in=renamed_pks).count() != len(selected_objects):
-                                raise PermissionsViolation
-
+                            renamed_count = self._apply_renames(form, selected_objects)
                             model_name = self.queryset.model._meta.verbose_name_plural
-                            messages.success(request, f"Renamed {len(selected_objects)} {model_name}")
+                            messages.success(request, f"Renamed {renamed_count} {model_name}")
                             return redirect(self.get_return_url(request))
 
+                        self._rename_objects(form, selected_objects)
+
                 except (AbortRequest, PermissionsViolation) as e:
                     logger.debug(e.message)
                     form.add_error(None, e.message)
@@ -659,7 +722,7 @@ class BulkRenameView(GetReturnURLMixin, BaseMultiObjectView):
         })
 
 
-class BulkDeleteView(GetReturnURLMixin, BaseMultiObjectView):
+class BulkDeleteView(BackgroundJobMixin, GetReturnURLMixin, BaseMultiObjectView):
     """
     Delete objects in bulk.
 
@@ -683,6 +746,20 @@ class BulkDeleteView(GetReturnURLMixin, BaseMultiObjectView):
 
         return BulkDeleteForm
 
+    def _delete_objects(self, queryset):
+        """
+        Delete each object in the given queryset, returning the number of objects deleted.
+        """
+        deleted_count = 0
+        for obj in queryset:
+            # Take a snapshot of change-logged models
+            if hasattr(obj, 'snapshot'):
+                obj.snapshot()
+            obj.delete()
+            deleted_count += 1
+
+        return deleted_count
+
     #
     # Request handlers
     #
@@ -713,12 +790,21 @@ class BulkDeleteView(GetReturnURLMixin, BaseMultiObjectView):
                 # Delete objects
                 queryset = self.queryset.filter(pk__in=pk_list)
                 deleted_count = queryset.count()
+
+                # Operations involving many objects are executed as background jobs
+                if self.run_as_job(deleted_count):
+                    logger.info(f"Enqueuing background job to delete {deleted_count} objects")
+                    return self.enqueue_job(
+                        request,
+                        delete_objects,
+                        'Delete',
+                        deleted_count,
+                        view_class=type(self),
+                        pk_list=list(queryset.values_list('pk', flat=True))
+                    )
+
                 try:
-                    for obj in queryset:
-                        # Take a snapshot of change-logged models
-                        if hasattr(obj, 'snapshot'):
-                            obj.snapshot()
-                        obj.delete()
+                    self._delete_objects(queryset)
 
                 except ProtectedError as e:
                     logger.info("Caught ProtectedError while attempting to delete objects")
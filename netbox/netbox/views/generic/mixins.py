@@ -1,9 +1,20 @@
 from collections import defaultdict
 
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.contenttypes.models import ContentType
+from django.shortcuts import redirect
+from django_rq.queues import get_connection
+from rq import Worker
+
+from extras.models import JobResult
+from netbox.constants import BACKGROUND_JOB_TIMEOUT_PER_OBJECT
 from utilities.permissions import get_permission_for_model
+from utilities.utils import copy_safe_request
 
 __all__ = (
     'ActionsMixin',
+    'BackgroundJobMixin',
     'TableMixin',
 )
 
@@ -29,6 +40,53 @@ class ActionsMixin:
         ]
 
 
+class BackgroundJobMixin:
+    """
+    Enables a bulk operation view to execute operations involving many objects as background jobs.
+    """
+    def run_as_job(self, object_count):
+        """
+        Return True if an operation involving the given number of objects should be executed as a background job:
+        i.e. the number exceeds BACKGROUND_JOB_THRESHOLD and an RQ worker is available.
+        """
+        threshold = settings.BACKGROUND_JOB_THRESHOLD
+        if threshold is None or object_count <= threshold:
+            return False
+        return bool(Worker.count(get_connection('default')))
+
+    def enqueue_job(self, request, func, action, object_count, **kwargs):
+        """
+        Enqueue a background job and redirect the user to its result page. The job is allowed to run for
+        RQ_DEFAULT_TIMEOUT plus BACKGROUND_JOB_TIMEOUT_PER_OBJECT seconds for each object involved.
+
+        The model's ContentType and the user are recorded on the JobResult, from which the job rebuilds the permitted
+        queryset: querysets must not be passed to the job, as they would be evaluated when the job is serialized.
+
+        Args:
+            request: The current request
+            func: The job function to be executed
+            action: A verb describing the operation (e.g. "Update"), used to name the job
+            object_count: The number of objects involved in the operation
+            kwargs: Additional keyword arguments to pass to the job function
+        """
+        model = self.queryset.model
+        request_copy = copy_safe_request(request)
+        request_copy.FILES = {}  # Uploaded files cannot be passed to the job
+
+        job_result = JobResult.enqueue_job(
+            func,
+            f'{action} {model._meta.verbose_name_plural}',
+            ContentType.objects.get_for_model(model),
+            request.user,
+            request=request_copy,
+            job_timeout=settings.RQ_DEFAULT_TIMEOUT + object_count * BACKGROUND_JOB_TIMEOUT_PER_OBJECT,
+            **kwargs
+        )
+        messages.info(request, f"{job_result.name} has been queued for processing.")
+
+        return redirect('extras:jobresult', job_result_pk=job_result.pk)
+
+
 class TableMixin:
 
     def get_table(self, data, request, bulk_actions=True):
@@ -0,0 +1,43 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utilities.cache import get_revision, invalidate_revision
+
+__all__ = (
+    'get_cached_object_permissions',
+    'invalidate_object_permissions',
+)
+
+REVISION_KEY = 'object_permissions_revision'
+
+
+def invalidate_object_permissions():
+    """
+    Discard all cached permission maps, following a change to any ObjectPermission or its assignments.
+    """
+    invalidate_revision(REVISION_KEY)
+
+
+def get_cached_object_permissions(user, permission_filter, loader):
+    """
+    Return the map of permissions to constraints granted to a user, retrieving it from the cache where possible.
+
+    :param user: The User being authorized
+    :param permission_filter: The Q object which selects the ObjectPermissions assigned to the user
+    :param loader: A callable which retrieves the permission map for the user from the database
+    """
+    timeout = settings.OBJECT_PERMISSION_CACHE_TIMEOUT
+    if not timeout:
+        return loader(user)
+
+    # The permission filter may reference more than the user (e.g. remote group names), so include it in the key
+    digest = hashlib.sha1(str(permission_filter).encode()).hexdigest()
+    key = f'object_permissions:{get_revision(REVISION_KEY)}:{user.pk}:{digest}'
+
+    perms = cache.get(key)
+    if perms is None:
+        perms = dict(loader(user))
+        cache.set(key, perms, timeout)
+    return perms
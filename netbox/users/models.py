@@ -6,7 +6,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
 from django.core.validators import MinLengthValidator
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 from netaddr import IPNetwork
@@ -15,6 +15,7 @@ from ipam.fields import IPNetworkField
 from netbox.config import get_config
 from utilities.querysets import RestrictedQuerySet
 from utilities.utils import flatten_dict
+from .cache import invalidate_object_permissions
 from .constants import *
 
 __all__ = (
@@ -327,3 +328,17 @@ class ObjectPermission(models.Model):
         if type(self.constraints) is not list:
             return [self.constraints]
         return self.constraints
+
+
+@receiver((post_save, post_delete), sender=ObjectPermission)
+@receiver(post_delete, sender=Group)
+@receiver(m2m_changed, sender=ObjectPermission.object_types.through)
+@receiver(m2m_changed, sender=ObjectPermission.groups.through)
+@receiver(m2m_changed, sender=ObjectPermission.users.through)
+@receiver(m2m_changed, sender=User.groups.through)
+def handle_object_permission_changed(sender, **kwargs):
+    """
+    Invalidate all cached permission maps when an ObjectPermission (or its assignment to users or groups, or a user's
+    group membership) is created, modified, or deleted.
+    """
+    invalidate_object_permissions()
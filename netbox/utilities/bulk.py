@@ -0,0 +1,130 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, router
+from django.db.models.deletion import Collector
+from django.db.models.signals import post_save, pre_save
+from taggit.managers import TaggableManager
+from taggit.models import GenericTaggedItemBase
+
+from utilities.fields import CachedValueField, CounterCacheField
+
+__all__ = (
+    'bulk_delete',
+    'bulk_save',
+    'get_m2m_field_names',
+    'supports_bulk_delete',
+    'supports_bulk_save',
+)
+
+# The number of objects written per query
+BULK_BATCH_SIZE = 500
+
+
+def supports_bulk_save(model):
+    """
+    Return True if instances of the model can be saved using bulk queries. This requires that the model either does
+    not override save(), or defines prepare_save() to make any changes its save() method would make to an instance
+    prior to writing it.
+    """
+    return model.save is models.Model.save or hasattr(model, 'prepare_save')
+
+
+def supports_bulk_delete(model):
+    """
+    Return True if instances of the model can be deleted using bulk queries (i.e. it does not override delete()).
+    """
+    return model.delete is models.Model.delete
+
+
+def get_m2m_field_names(model):
+    """
+    Return the names of all forward many-to-many fields (including tags) on a model.
+    """
+    return [
+        field.name for field in model._meta.get_fields() if field.many_to_many and not field.auto_created
+    ]
+
+
+def _set_tags(model, field, instances, m2m_values):
+    """
+    Assign tags to newly created instances using a single query.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+    field.through.objects.bulk_create([
+        field.through(tag=tag, content_type=content_type, object_id=instance.pk)
+        for instance, values in zip(instances, m2m_values)
+        for tag in values.get(field.name) or []
+    ], batch_size=BULK_BATCH_SIZE)
+
+
+def bulk_save(instances, m2m_values=None):
+    """
+    Save new and/or modified instances of a model using bulk queries. The pre_save and post_save signals are sent for
+    each instance as they would be by save(). post_save is sent only once any many-to-many assignments have been made,
+    so that change records reflect the final state of each object.
+
+    :param instances: A list of instances of a single model (see supports_bulk_save())
+    :param m2m_values: A list of dictionaries (one per instance) mapping many-to-many field names to the objects to be
+        assigned (optional)
+    """
+    if not instances:
+        return instances
+    model = type(instances[0])
+    using = router.db_for_write(model)
+    if m2m_values is None:
+        m2m_values = [{} for _ in instances]
+
+    created = []
+    for instance in instances:
+        if hasattr(instance, 'prepare_save'):
+            instance.prepare_save()
+        pre_save.send(sender=model, instance=instance, raw=False, using=using, update_fields=None)
+        created.append(instance._state.adding)
+
+    new_instances = [instance for instance, is_new in zip(instances, created) if is_new]
+    if new_instances:
+        model.objects.bulk_create(new_instances, batch_size=BULK_BATCH_SIZE)
+
+    existing_instances = [instance for instance, is_new in zip(instances, created) if not is_new]
+    if existing_instances:
+        # Cached counts and values are maintained separately, and are never written from the instance
+        fields = [
+            field for field in model._meta.concrete_fields
+            if not field.primary_key and not isinstance(field, (CachedValueField, CounterCacheField))
+        ]
+        for instance in existing_instances:
+            # Apply auto_now and similar field values, as save() would
+            for field in fields:
+                setattr(instance, field.attname, field.pre_save(instance, False))
+        model.objects.bulk_update(existing_instances, [field.name for field in fields], batch_size=BULK_BATCH_SIZE)
+
+    # Assign many-to-many relationships. Tags for new objects are created in bulk.
+    for field_name in {name for values in m2m_values for name in values}:
+        field = model._meta.get_field(field_name)
+        bulk_tags = isinstance(field, TaggableManager) and issubclass(field.through, GenericTaggedItemBase)
+        if bulk_tags:
+            _set_tags(model, field, new_instances, [
+                values for values, is_new in zip(m2m_values, created) if is_new
+            ])
+        for instance, values, is_new in zip(instances, m2m_values, created):
+            if field_name in values and not (bulk_tags and is_new):
+                getattr(instance, field_name).set(values[field_name] or [])
+
+    for instance, is_new in zip(instances, created):
+        post_save.send(sender=model, instance=instance, created=is_new, update_fields=None, raw=False, using=using)
+
+    return instances
+
+
+def bulk_delete(instances):
+    """
+    Delete the given instances (along with any dependent objects) using bulk queries. The pre_delete and post_delete
+    signals are sent for each deleted object. Returns the number of objects deleted and a dictionary of deletions per
+    model, like QuerySet.delete().
+
+    :param instances: A list of instances of a single model (see supports_bulk_delete())
+    """
+    if not instances:
+        return 0, {}
+    collector = Collector(using=router.db_for_write(type(instances[0])))
+    collector.collect(instances)
+    return collector.delete()
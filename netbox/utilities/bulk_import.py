@@ -0,0 +1,209 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, IntegrityError, transaction
+
+from utilities.bulk import BULK_BATCH_SIZE, bulk_save, supports_bulk_save
+from utilities.forms.fields import CSVContentTypeField, CSVModelChoiceField
+from utilities.forms.utils import restrict_form_fields
+
+__all__ = (
+    'CSVImporter',
+)
+
+
+class CSVImporter:
+    """
+    Create objects from parsed CSV data, validating each row with an instance of the given model form. Rows are
+    processed in batches: the related objects referenced by each column are retrieved using a single query per batch,
+    and valid rows are written using bulk queries where the form and model permit (see can_bulk_save()). Otherwise,
+    each row is saved individually once it has been validated.
+
+    Validation errors for all rows are collected in `errors`, in the form "Row <n> <field>: <error>". No rows are
+    written once an error has been encountered in a batch which is saved in bulk, so the caller should discard any
+    changes if errors are present.
+
+    :param model_form: The CSV form class used to validate each row
+    :param headers: The dictionary of column headers returned by parse_csv()
+    :param user: The User performing the import; used to restrict the objects which may be referenced
+    :param save_obj: A callable which saves a valid form and returns the new object (optional). If provided, each row
+        is saved individually using this callable.
+    :param batch_size: The number of rows to validate and save at once
+    """
+    def __init__(self, model_form, headers, user, save_obj=None, batch_size=BULK_BATCH_SIZE):
+        self.model_form = self._get_form_class(model_form)
+        self.headers = headers
+        self.user = user
+        self.save_obj = save_obj
+        self.batch_size = batch_size
+        self.errors = []
+
+        form = self.model_form(headers=headers)
+        self.model = form._meta.model
+
+        # Identify the columns which reference related objects by a single attribute. The original filter of each
+        # field's queryset is recorded so that rows for which the form has customized the queryset can be identified.
+        self.reference_fields = {
+            name: field for name, field in form.fields.items()
+            if name in headers and isinstance(field, CSVModelChoiceField) and not isinstance(field, CSVContentTypeField)
+        }
+        self._initial_filters = {
+            name: field.queryset.query.where for name, field in self.reference_fields.items()
+        }
+        restrict_form_fields(form, user)
+        self._resolved_objects = {name: {} for name in self.reference_fields}
+        self._resolved_values = {name: set() for name in self.reference_fields}
+
+        self.bulk = save_obj is None and self.can_bulk_save(form)
+
+    @staticmethod
+    def _get_form_class(model_form):
+        """
+        Return a subclass of the model form which retrieves the applicable custom fields only once, rather than once
+        for each row.
+        """
+        if not hasattr(model_form, '_get_custom_fields'):
+            return model_form
+        custom_fields = {}
+
+        class ImportForm(model_form):
+
+            def _get_custom_fields(self, content_type):
+                if content_type not in custom_fields:
+                    custom_fields[content_type] = list(super()._get_custom_fields(content_type))
+                return custom_fields[content_type]
+
+        return ImportForm
+
+    def can_bulk_save(self, form):
+        """
+        Return True if valid rows can be saved using bulk queries. This requires that the form does not override save(),
+        that the model supports bulk saves, and that no field may reference an object of the model being imported
+        (which might be created by an earlier row).
+        """
+        return (
+            type(form).save is forms.ModelForm.save and
+            supports_bulk_save(self.model) and
+            not any(
+                getattr(field, 'queryset', None) is not None and field.queryset.model is self.model
+                for field in form.fields.values()
+            )
+        )
+
+    def resolve_references(self, records):
+        """
+        Retrieve the related objects referenced by the given records, using a single query per column. Values which
+        match no object (or more than one object) are left to be validated individually by the form.
+        """
+        for name, field in self.reference_fields.items():
+            resolved_values = self._resolved_values[name]
+            values = {
+                record[name] for record in records
+                if record.get(name) not in field.empty_values and record[name] not in resolved_values
+            }
+            if not values:
+                continue
+            resolved_values.update(values)
+
+            key = field.to_field_name or 'pk'
+            try:
+                with transaction.atomic():
+                    objects = list(field.queryset.filter(**{f'{key}__in': values}))
+            except (ValueError, TypeError, ValidationError, DatabaseError):
+                # One or more values is invalid for the field. Errors will be reported as each row is validated.
+                continue
+
+            matches = {}
+            for obj in objects:
+                matches.setdefault(str(getattr(obj, key)), []).append(obj)
+            self._resolved_objects[name].update({
+                value: objs[0] for value, objs in matches.items() if value in values and len(objs) == 1
+            })
+
+    def get_form(self, data):
+        """
+        Return an instance of the model form bound to the given row, with its fields restricted to objects which the
+        user is permitted to view.
+        """
+        form = self.model_form(data, headers=self.headers)
+
+        # Fields whose querysets have not been customized for this row may use the objects resolved in advance
+        resolvable = [
+            name for name, where in self._initial_filters.items()
+            if name in form.fields and form.fields[name].queryset.query.where == where
+        ]
+        restrict_form_fields(form, self.user)
+        for name in resolvable:
+            form.fields[name].resolved_objects = self._resolved_objects[name]
+
+        return form
+
+    def add_errors(self, row, form):
+        for field, err in form.errors.items():
+            self.errors.append(f'Row {row} {field}: {err[0]}')
+
+    def run(self, records, progress=None):
+        """
+        Validate and save all records, returning a list of the created objects.
+
+        :param records: A list of dictionaries mapping column names to values, as returned by parse_csv()
+        :param progress: A callable to be passed the number of rows processed and the total number of rows after each
+            batch (optional)
+        """
+        objects = []
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            self.resolve_references(batch)
+            if self.bulk:
+                objects.extend(self._import_batch(batch, start))
+            else:
+                objects.extend(self._import_rows(batch, start))
+            if progress is not None:
+                progress(start + len(batch), len(records))
+
+        return objects
+
+    def _import_rows(self, records, start):
+        """
+        Validate and save each row individually.
+        """
+        objects = []
+        for row, data in enumerate(records, start=start + 1):
+            form = self.get_form(data)
+            if form.is_valid():
+                obj = self.save_obj(form) if self.save_obj else form.save()
+                objects.append(obj)
+            else:
+                self.add_errors(row, form)
+
+        return objects
+
+    def _import_batch(self, records, start):
+        """
+        Validate all rows in the batch, then save them using bulk queries.
+        """
+        valid_forms = []
+        for row, data in enumerate(records, start=start + 1):
+            form = self.get_form(data)
+            if form.is_valid():
+                valid_forms.append(form)
+            else:
+                self.add_errors(row, form)
+        if self.errors:
+            return []
+
+        instances = [form.instance for form in valid_forms]
+        m2m_values = [
+            {
+                field.name: form.cleaned_data[field.name]
+                for field in self.model._meta.many_to_many if field.name in form.cleaned_data
+            } for form in valid_forms
+        ]
+        try:
+            with transaction.atomic():
+                bulk_save(instances, m2m_values)
+        except IntegrityError:
+            # Rows within the batch conflict with one another (e.g. by duplicating a unique name). Import each row in
+            # turn, so that conflicts are reported as validation errors for the offending rows.
+            return self._import_rows(records, start)
+
+        return instances
@@ -0,0 +1,36 @@
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+__all__ = (
+    'get_revision',
+    'invalidate_revision',
+)
+
+
+def get_revision(*keys):
+    """
+    Return the current revision identified by the given cache keys, as a single string. A new revision is started for
+    any key which has not yet been set. Cached data should incorporate the revision in its own key, so that it is
+    discarded once the revision changes.
+    """
+    revisions = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in revisions}
+    if missing:
+        cache.set_many(missing, None)
+        revisions.update(missing)
+    return ':'.join(revisions[key] for key in keys)
+
+
+def invalidate_revision(*keys):
+    """
+    Start a new revision for each of the given cache keys. Each revision is updated immediately and again once the
+    current transaction (if any) has been committed, so that no process caches stale data under the new revision in
+    the interim.
+    """
+    def new_revision():
+        cache.set_many({key: uuid.uuid4().hex for key in keys}, None)
+
+    new_revision()
+    transaction.on_commit(new_revision)
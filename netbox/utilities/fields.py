@@ -71,3 +71,61 @@ class NaturalOrderingField(models.CharField):
             [self.target_field],
             kwargs,
         )
+
+
+class CounterCacheField(models.PositiveBigIntegerField):
+    """
+    A field which stores the number of objects of another model which are related to its parent model by a ForeignKey.
+    The count is maintained by signal receivers (see netbox.counters) rather than by saving the parent object.
+
+    :param to_model: The label of the related model whose objects are counted (e.g. "dcim.Device")
+    :param to_field: The name of the ForeignKey field on the related model which references the parent model
+    """
+    description = "Stores a cached count of related objects"
+
+    def __init__(self, to_model, to_field, *args, **kwargs):
+        self.to_model_name = to_model
+        self.to_field_name = to_field
+        kwargs['default'] = kwargs.get('default', 0)
+        kwargs['editable'] = False
+        super().__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        """
+        Retain the stored count when an existing object is saved, as the value held by the instance may be stale.
+        """
+        if add:
+            return super().pre_save(model_instance, add)
+        return models.F(self.attname)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop('editable', None)
+        kwargs['to_model'] = self.to_model_name
+        kwargs['to_field'] = self.to_field_name
+        return name, path, args, kwargs
+
+
+class CachedValueField(models.JSONField):
+    """
+    A JSONField which stores a value derived from other objects. As with CounterCacheField, the value is maintained by
+    updating it in the database rather than by saving its parent object.
+    """
+    description = "Stores a cached value derived from other objects"
+
+    def __init__(self, *args, **kwargs):
+        kwargs['editable'] = False
+        super().__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        """
+        Retain the stored value when an existing object is saved, as the value held by the instance may be stale.
+        """
+        if add:
+            return super().pre_save(model_instance, add)
+        return models.F(self.attname)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop('editable', None)
+        return name, path, args, kwargs
@@ -145,7 +145,13 @@ class CSVModelChoiceField(forms.ModelChoiceField):
         'invalid_choice': 'Object not found.',
     }
 
+    # An optional mapping of values to the objects they reference, retrieved in advance by a bulk import. Values
+    # which are not present are looked up individually.
+    resolved_objects = None
+
     def to_python(self, value):
+        if self.resolved_objects and value in self.resolved_objects:
+            return self.resolved_objects[value]
         try:
             return super().to_python(value)
         except MultipleObjectsReturned:
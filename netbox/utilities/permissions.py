@@ -1,8 +1,13 @@
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
 from django.db.models import Q
 
+from users.constants import CONSTRAINT_TOKEN_USER
+
 __all__ = (
+    'constraints_span_multiple',
+    'get_constraints_filter',
     'get_permission_for_model',
     'permission_is_exempt',
     'qs_filter_from_constraints',
@@ -104,3 +109,53 @@ def qs_filter_from_constraints(constraints, tokens=None):
             return Q()
 
     return params
+
+
+def constraints_span_multiple(model, constraints):
+    """
+    Return True if any of the given ObjectPermission constraints spans a many-to-many or reverse relationship (and thus
+    may match an object more than once when applied as a filter).
+
+    :param model: The model to which the constraints apply
+    :param constraints: An iterable of constraint sets (dictionaries)
+    """
+    for constraint in constraints:
+        for lookup in (constraint or {}):
+            field_model = model
+            for field_name in lookup.split('__'):
+                try:
+                    field = field_model._meta.get_field(field_name)
+                except FieldDoesNotExist:
+                    # Not a field (e.g. a lookup or transform)
+                    break
+                if field.many_to_many or field.one_to_many:
+                    return True
+                if not field.is_relation or field.related_model is None:
+                    break
+                field_model = field.related_model
+
+    return False
+
+
+def get_constraints_filter(user, permission, model):
+    """
+    Return a Q filter compiled from the constraints of the specified permission granted to a user, and a boolean
+    indicating whether the filter may be applied directly to a QuerySet (i.e. without risk of duplicate results).
+    Results are memoized on the user instance.
+
+    :param user: The User whose permissions have been resolved (see ObjectPermissionMixin.get_all_permissions())
+    :param permission: Permission name in the format <app_label>.<action>_<model>
+    :param model: The model to which the permission applies
+    """
+    compiled = user.__dict__.setdefault('_object_perm_filters', {})
+    if permission not in compiled:
+        constraints = user._object_perm_cache[permission]
+        tokens = {
+            CONSTRAINT_TOKEN_USER: user,
+        }
+        compiled[permission] = (
+            qs_filter_from_constraints(constraints, tokens),
+            not constraints_span_multiple(model, constraints)
+        )
+
+    return compiled[permission]
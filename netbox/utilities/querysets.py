@@ -1,7 +1,6 @@
 from django.db.models import QuerySet
 
-from users.constants import CONSTRAINT_TOKEN_USER
-from utilities.permissions import permission_is_exempt, qs_filter_from_constraints
+from utilities.permissions import get_constraints_filter, permission_is_exempt
 
 
 class RestrictedQuerySet(QuerySet):
@@ -29,13 +28,52 @@ class RestrictedQuerySet(QuerySet):
 
         # Filter the queryset to include only objects with allowed attributes
         else:
-            tokens = {
-                CONSTRAINT_TOKEN_USER: user,
-            }
-            attrs = qs_filter_from_constraints(user._object_perm_cache[permission_required], tokens)
-            # #8715: Avoid duplicates when JOIN on many-to-many fields without using DISTINCT.
-            # DISTINCT acts globally on the entire request, which may not be desirable.
-            allowed_objects = self.model.objects.filter(attrs)
-            qs = self.filter(pk__in=allowed_objects)
+            attrs, is_flat = get_constraints_filter(user, permission_required, self.model)
+            if is_flat:
+                # Constraints which don't span many-to-many or reverse relationships can be applied directly
+                qs = self.filter(attrs)
+            else:
+                # #8715: Avoid duplicates when JOIN on many-to-many fields without using DISTINCT.
+                # DISTINCT acts globally on the entire request, which may not be desirable.
+                allowed_objects = self.model.objects.filter(attrs)
+                qs = self.filter(pk__in=allowed_objects)
 
         return qs
+
+    #
+    # Bulk writes bypass the post_save and post_delete signals, so the search index is updated explicitly
+    #
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from extras.search import cache_objects
+
+        objs = super().bulk_create(objs, *args, **kwargs)
+        cache_objects([obj for obj in objs if obj.pk is not None])
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        from extras.search import cache_objects, get_indexed_models
+
+        objs = list(objs)
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if set(fields) & set(get_indexed_models().get(self.model, ())):
+            cache_objects(objs)
+        return rows
+
+    def update(self, **kwargs):
+        from extras.search import get_indexed_models, recache_objects
+
+        if not set(kwargs) & set(get_indexed_models().get(self.model, ())):
+            return super().update(**kwargs)
+
+        # Identify the affected objects before their values (which may be filtered on) are changed
+        pks = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        recache_objects(self.model, pks)
+        return rows
+
+    def _raw_delete(self, using):
+        from extras.search import remove_objects
+
+        remove_objects(self.model, self.values('pk'))
+        return super()._raw_delete(using)
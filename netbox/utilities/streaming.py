@@ -0,0 +1,92 @@
+import csv
+import io
+from itertools import islice
+
+from django.db.models import prefetch_related_objects
+
+__all__ = (
+    'LazyQuerySet',
+    'iter_buffered',
+    'iter_csv',
+    'iter_queryset_chunks',
+)
+
+# The number of objects retrieved from the database at once when streaming a QuerySet
+STREAM_CHUNK_SIZE = 1000
+
+# The approximate size (in characters) of each piece of content yielded to a streaming response
+STREAM_BUFFER_SIZE = 65536
+
+
+def iter_queryset_chunks(queryset, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Iterate over a QuerySet without caching its results, yielding lists of up to chunk_size objects. Any
+    prefetch_related() lookups on the QuerySet are applied to each list (QuerySet.iterator() otherwise ignores them).
+    """
+    lookups = queryset._prefetch_related_lookups
+    objects = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(objects, chunk_size)):
+        if lookups:
+            prefetch_related_objects(chunk, *lookups)
+        yield chunk
+
+
+class LazyQuerySet:
+    """
+    Wraps a QuerySet so that iterating over it streams objects from the database in chunks (see
+    iter_queryset_chunks()) rather than loading all objects into memory. All other attributes are passed through to the
+    QuerySet.
+    """
+    def __init__(self, queryset, chunk_size=STREAM_CHUNK_SIZE):
+        self._queryset = queryset
+        self._chunk_size = chunk_size
+
+    def __iter__(self):
+        for chunk in iter_queryset_chunks(self._queryset, self._chunk_size):
+            yield from chunk
+
+    def __len__(self):
+        return self._queryset.count()
+
+    def __bool__(self):
+        return self._queryset.exists()
+
+    def __getitem__(self, key):
+        return self._queryset[key]
+
+    def __getattr__(self, name):
+        return getattr(self._queryset, name)
+
+
+def iter_buffered(strings, size=STREAM_BUFFER_SIZE):
+    """
+    Join an iterable of (typically small) strings into pieces of at least the given size, for efficient delivery by a
+    StreamingHttpResponse.
+    """
+    buffer = []
+    length = 0
+    for string in strings:
+        buffer.append(string)
+        length += len(string)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def iter_csv(rows, size=STREAM_BUFFER_SIZE):
+    """
+    Render an iterable of rows (each an iterable of values) as CSV, yielding pieces of at least the given size.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
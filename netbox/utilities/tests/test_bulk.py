@@ -0,0 +1,81 @@
+from django.db.models.signals import post_save
+from django.test import TestCase
+
+from dcim.choices import InterfaceModeChoices, InterfaceTypeChoices
+from dcim.models import Device, DeviceRole, DeviceType, Interface, Manufacturer, Site
+from extras.models import Tag
+from ipam.models import VLAN
+from utilities.bulk import bulk_delete, bulk_save, supports_bulk_delete, supports_bulk_save
+
+
+class BulkSaveTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Tag.objects.create(name='Tag 1', slug='tag-1')
+
+    def test_supports_bulk_save(self):
+        self.assertTrue(supports_bulk_save(Site))
+        self.assertTrue(supports_bulk_save(Interface))  # Defines prepare_save()
+        self.assertFalse(supports_bulk_save(Device))
+        self.assertTrue(supports_bulk_delete(Site))
+
+    def test_bulk_save(self):
+        signals = []
+
+        def receiver(instance, created, **kwargs):
+            signals.append((instance.name, created, list(instance.tags.all())))
+
+        post_save.connect(receiver, sender=Site)
+        try:
+            # Create new objects
+            tag = Tag.objects.first()
+            sites = [Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 4)]
+            bulk_save(sites, [{'tags': [tag]}, {}, {'tags': []}])
+            self.assertTrue(all(site.pk for site in sites))
+            self.assertEqual(Site.objects.count(), 3)
+            self.assertEqual(list(sites[0].tags.all()), [tag])
+            self.assertEqual(sites[1].tags.count(), 0)
+
+            # post_save is sent once tags have been assigned
+            self.assertEqual(signals[0], ('Site 1', True, [tag]))
+
+            # Modify existing objects
+            signals.clear()
+            for site in sites:
+                site.description = 'New description'
+            bulk_save(sites, [{}, {'tags': [tag]}, {}])
+            self.assertEqual(Site.objects.filter(description='New description').count(), 3)
+            self.assertEqual(list(sites[1].tags.all()), [tag])
+            self.assertEqual([created for name, created, tags in signals], [False, False, False])
+        finally:
+            post_save.disconnect(receiver, sender=Site)
+
+    def test_bulk_save_prepare_save(self):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        device = Device.objects.create(site=site, device_type=device_type, device_role=device_role)
+        vlan = VLAN.objects.create(vid=100, name='VLAN 100')
+        interface = Interface(device=device, name='Interface 1', type=InterfaceTypeChoices.TYPE_1GE_FIXED,
+                              untagged_vlan=vlan)
+        bulk_save([interface])
+
+        # An untagged VLAN may not be assigned to an interface without a mode
+        interface.refresh_from_db()
+        self.assertIsNone(interface.untagged_vlan)
+
+        interface.mode = InterfaceModeChoices.MODE_ACCESS
+        interface.untagged_vlan = vlan
+        bulk_save([interface])
+        interface.refresh_from_db()
+        self.assertEqual(interface.untagged_vlan, vlan)
+
+    def test_bulk_delete(self):
+        sites = [Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 4)]
+        Site.objects.bulk_create(sites)
+
+        count, deleted = bulk_delete(sites[:2])
+        self.assertEqual(deleted['dcim.Site'], 2)
+        self.assertEqual(list(Site.objects.all()), [sites[2]])
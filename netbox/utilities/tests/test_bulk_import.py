@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from dcim.forms import InterfaceCSVForm, RackCSVForm, SiteCSVForm
+from dcim.models import Site
+from tenancy.models import Tenant
+from utilities.bulk_import import CSVImporter
+
+
+class CSVImporterTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', is_superuser=True)
+        Tenant.objects.bulk_create((
+            Tenant(name='Tenant 1', slug='tenant-1'),
+            Tenant(name='Tenant 2', slug='tenant-2'),
+        ))
+
+    def test_can_bulk_save(self):
+        headers = {'name': None, 'slug': None, 'status': None}
+        self.assertTrue(CSVImporter(SiteCSVForm, headers, self.user).bulk)
+
+        # Interfaces may reference other interfaces (e.g. a parent) created by earlier rows
+        headers = {'device': None, 'name': None, 'type': None}
+        self.assertFalse(CSVImporter(InterfaceCSVForm, headers, self.user).bulk)
+
+    def test_resolve_references(self):
+        headers = {'name': None, 'slug': None, 'status': None, 'tenant': None}
+        records = [
+            {'name': 'Site 1', 'slug': 'site-1', 'status': 'active', 'tenant': 'Tenant 1'},
+            {'name': 'Site 2', 'slug': 'site-2', 'status': 'active', 'tenant': 'Tenant 2'},
+            {'name': 'Site 3', 'slug': 'site-3', 'status': 'active', 'tenant': 'Tenant 1'},
+        ]
+        importer = CSVImporter(SiteCSVForm, headers, self.user)
+        with CaptureQueriesContext(connection) as context:
+            importer.resolve_references(records)
+        self.assertEqual(len([q for q in context.captured_queries if q['sql'].startswith('SELECT')]), 1)
+
+        # Referenced objects are not retrieved again for each row
+        tenant = Tenant.objects.get(name='Tenant 1')
+        form = importer.get_form(records[0])
+        with self.assertNumQueries(0):
+            self.assertEqual(form.fields['tenant'].clean('Tenant 1'), tenant)
+
+        sites = importer.run(records)
+        self.assertEqual(importer.errors, [])
+        self.assertEqual(len(sites), 3)
+        self.assertEqual(Site.objects.get(name='Site 2').tenant.name, 'Tenant 2')
+
+    def test_customized_querysets(self):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        headers = {'site': None, 'location': None, 'name': None, 'status': None, 'width': None, 'u_height': None}
+        record = {
+            'site': 'Site 1', 'location': '', 'name': 'Rack 1', 'status': 'active', 'width': '19', 'u_height': '42',
+        }
+        importer = CSVImporter(RackCSVForm, headers, self.user)
+        importer.resolve_references([record])
+
+        # The location queryset is limited by site for each row, so locations are not resolved in advance
+        form = importer.get_form(record)
+        self.assertEqual(form.fields['site'].resolved_objects, {'Site 1': site})
+        self.assertIsNone(form.fields['location'].resolved_objects)
+
+    def test_errors(self):
+        headers = {'name': None, 'slug': None, 'status': None, 'tenant': None}
+        records = [
+            {'name': 'Site 1', 'slug': 'site-1', 'status': 'active', 'tenant': 'Tenant 3'},
+            {'name': 'Site 2', 'slug': 'site-2', 'status': 'active', 'tenant': 'Tenant 1'},
+            {'name': 'Site 3', 'slug': 'site-3', 'status': 'invalid', 'tenant': ''},
+        ]
+        importer = CSVImporter(SiteCSVForm, headers, self.user, batch_size=2)
+        self.assertEqual(importer.run(records), [])
+
+        # Errors are reported for all rows
+        self.assertEqual(len(importer.errors), 2)
+        self.assertTrue(importer.errors[0].startswith('Row 1 tenant:'))
+        self.assertTrue(importer.errors[1].startswith('Row 3 status:'))
+        self.assertFalse(Site.objects.exists())
+
+    def test_conflicting_rows(self):
+        headers = {'name': None, 'slug': None, 'status': None}
+        records = [
+            {'name': 'Site 1', 'slug': 'site-1', 'status': 'active'},
+            {'name': 'Site 1', 'slug': 'site-2', 'status': 'active'},
+        ]
+        importer = CSVImporter(SiteCSVForm, headers, self.user)
+        importer.run(records)
+
+        # Conflicts between rows in the same batch are reported as validation errors
+        self.assertEqual(len(importer.errors), 1)
+        self.assertTrue(importer.errors[0].startswith('Row 2 name:'))
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from utilities.cache import get_revision, invalidate_revision
+
+
+class RevisionTest(TransactionTestCase):
+    """
+    Validate the operation of get_revision() and invalidate_revision().
+    """
+    def test_revision(self):
+        revision = get_revision('test_revision_a', 'test_revision_b')
+        self.assertEqual(get_revision('test_revision_a', 'test_revision_b'), revision)
+
+        # Invalidating either key starts a new revision
+        invalidate_revision('test_revision_b')
+        self.assertNotEqual(get_revision('test_revision_a', 'test_revision_b'), revision)
+
+    def test_revision_on_commit(self):
+        with transaction.atomic():
+            invalidate_revision('test_revision_a')
+            revision = get_revision('test_revision_a')
+
+        # The revision is updated again once the transaction has been committed
+        self.assertNotEqual(get_revision('test_revision_a'), revision)
@@ -0,0 +1,42 @@
+from django.test import TestCase
+
+from dcim.models import Site
+from utilities.streaming import LazyQuerySet, iter_buffered, iter_csv, iter_queryset_chunks
+
+
+class StreamingTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Site.objects.bulk_create([Site(name=f'Site {i}', slug=f'site-{i}') for i in range(1, 6)])
+
+    def test_iter_queryset_chunks(self):
+        queryset = Site.objects.order_by('name').prefetch_related('tags')
+        chunks = list(iter_queryset_chunks(queryset, chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(chunks[0][0].name, 'Site 1')
+
+        # Prefetched relations are populated for each chunk
+        with self.assertNumQueries(0):
+            for chunk in chunks:
+                for site in chunk:
+                    list(site.tags.all())
+
+    def test_lazy_queryset(self):
+        queryset = LazyQuerySet(Site.objects.order_by('name'), chunk_size=2)
+        self.assertEqual([site.name for site in queryset], [f'Site {i}' for i in range(1, 6)])
+        self.assertEqual(len(queryset), 5)
+        self.assertTrue(queryset)
+        self.assertEqual(queryset.first().name, 'Site 1')
+        self.assertEqual(queryset[1].name, 'Site 2')
+
+    def test_iter_buffered(self):
+        self.assertEqual(list(iter_buffered(['ab', 'cd', 'e'], size=3)), ['abcd', 'e'])
+        self.assertEqual(list(iter_buffered([])), [])
+
+    def test_iter_csv(self):
+        rows = [('Name', 'Description'), ('Site 1', 'Contains, a comma')]
+        self.assertEqual(
+            ''.join(iter_csv(rows, size=1)),
+            'Name,Description\r\nSite 1,"Contains, a comma"\r\n'
+        )
@@ -1,7 +1,12 @@
+import hashlib
+
 from django.http import QueryDict
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
-from utilities.utils import deepmerge, dict_to_filter_params, normalize_querydict
+from utilities.utils import (
+    deepmerge, dict_to_filter_params, get_jinja2_environment, get_jinja2_template, jinja2_template_cache,
+    normalize_querydict, render_jinja2,
+)
 
 
 class DictToFilterParamsTest(TestCase):
@@ -128,3 +133,34 @@ class DeepMergeTest(TestCase):
             deepmerge(dict1, dict2),
             merged
         )
+
+
+class Jinja2TemplateCacheTest(TestCase):
+    """
+    Validate the caching of compiled Jinja2 templates.
+    """
+
+    def test_template_reuse(self):
+        template = get_jinja2_template('{{ foo }}')
+        self.assertIs(get_jinja2_template('{{ foo }}'), template)
+        self.assertIsNot(get_jinja2_template('{{ bar }}'), template)
+        self.assertEqual(render_jinja2('{{ foo }}', {'foo': 'abc'}), 'abc')
+
+    @override_settings(JINJA2_TEMPLATE_CACHE_SIZE=2)
+    def test_cache_eviction(self):
+        template1 = get_jinja2_template('{{ a }}')
+        get_jinja2_template('{{ b }}')
+        get_jinja2_template('{{ a }}')
+        get_jinja2_template('{{ c }}')
+
+        # The least recently used template ({{ b }}) should have been evicted
+        self.assertIs(get_jinja2_template('{{ a }}'), template1)
+        self.assertNotIn(hashlib.sha256(b'{{ b }}').digest(), jinja2_template_cache.templates)
+
+    def test_filters_changed(self):
+        environment = get_jinja2_environment()
+        template = get_jinja2_template('{{ foo }}')
+        with override_settings(JINJA2_FILTERS={'uppercase': str.upper}):
+            self.assertIsNot(get_jinja2_environment(), environment)
+            self.assertIsNot(get_jinja2_template('{{ foo }}'), template)
+            self.assertEqual(render_jinja2('{{ foo|uppercase }}', {'foo': 'abc'}), 'ABC')
@@ -1,16 +1,21 @@
 import datetime
 import decimal
+import hashlib
 import json
+import threading
+from collections import OrderedDict
 from decimal import Decimal
 from itertools import count, groupby
 
 import bleach
+from django.conf import settings
 from django.core.serializers import serialize
 from django.db.models import Count, OuterRef, Subquery
 from django.db.models.functions import Coalesce
 from django.http import QueryDict
 from jinja2.sandbox import SandboxedEnvironment
 from mptt.models import MPTTModel
+from prometheus_client import Counter
 
 from dcim.choices import CableLengthUnitChoices
 from extras.plugins import PluginConfig
@@ -270,13 +275,82 @@ def to_meters(length, unit):
     raise ValueError(f"Unknown unit {unit}. Must be 'km', 'm', 'cm', 'mi', 'ft', or 'in'.")
 
 
+jinja2_template_cache_hits = Counter(
+    'netbox_jinja2_template_cache_hits_total',
+    'Number of Jinja2 templates retrieved from the compiled template cache'
+)
+jinja2_template_cache_misses = Counter(
+    'netbox_jinja2_template_cache_misses_total',
+    'Number of Jinja2 templates compiled due to a miss on the compiled template cache'
+)
+
+
+class Jinja2TemplateCache:
+    """
+    A process-wide sandboxed Jinja2 environment, together with a bounded LRU cache of the templates compiled by it
+    (keyed by a hash of their source). The environment and cache are discarded whenever JINJA2_FILTERS changes.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.environment = None
+        self.filters = None
+        self.templates = OrderedDict()
+
+    def get_environment(self):
+        filters = get_config().JINJA2_FILTERS
+        with self.lock:
+            if self.environment is None or filters != self.filters:
+                self.environment = SandboxedEnvironment()
+                self.environment.filters.update(filters)
+                self.filters = dict(filters)
+                self.templates.clear()
+            return self.environment
+
+    def get_template(self, source):
+        environment = self.get_environment()
+        key = hashlib.sha256(source.encode('utf8')).digest()
+
+        with self.lock:
+            template = self.templates.get(key)
+            if template is not None:
+                self.templates.move_to_end(key)
+                jinja2_template_cache_hits.inc()
+                return template
+
+        jinja2_template_cache_misses.inc()
+        template = environment.from_string(source=source)
+
+        with self.lock:
+            if environment is self.environment:
+                self.templates[key] = template
+                while len(self.templates) > settings.JINJA2_TEMPLATE_CACHE_SIZE:
+                    self.templates.popitem(last=False)
+
+        return template
+
+
+jinja2_template_cache = Jinja2TemplateCache()
+
+
+def get_jinja2_environment():
+    """
+    Return the shared sandboxed Jinja2 environment including any custom filters.
+    """
+    return jinja2_template_cache.get_environment()
+
+
+def get_jinja2_template(template_code):
+    """
+    Return the compiled Jinja2 template for the given template code, compiling it only if it is not already cached.
+    """
+    return jinja2_template_cache.get_template(template_code)
+
+
 def render_jinja2(template_code, context):
     """
     Render a Jinja2 template with the provided context. Return the rendered content.
     """
-    environment = SandboxedEnvironment()
-    environment.filters.update(get_config().JINJA2_FILTERS)
-    return environment.from_string(source=template_code).render(**context)
+    return get_jinja2_template(template_code).render(**context)
 
 
 def prepare_cloned_fields(instance):
@@ -1,6 +1,6 @@
+from django.db.models import F
 from rest_framework.routers import APIRootView
 
-from dcim.models import Device
 from extras.api.views import ConfigContextQuerySetMixin
 from netbox.api.viewsets import NetBoxModelViewSet
 from utilities.utils import count_related
@@ -41,8 +41,8 @@ class ClusterViewSet(NetBoxModelViewSet):
     queryset = Cluster.objects.prefetch_related(
         'type', 'group', 'tenant', 'site', 'tags'
     ).annotate(
-        device_count=count_related(Device, 'cluster'),
-        virtualmachine_count=count_related(VirtualMachine, 'cluster')
+        device_count=F('_device_count'),
+        virtualmachine_count=F('_virtualmachine_count')
     )
     serializer_class = serializers.ClusterSerializer
     filterset_class = filtersets.ClusterFilterSet
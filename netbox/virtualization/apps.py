@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class VirtualizationConfig(AppConfig):
     name = 'virtualization'
+
+    def ready(self):
+        from netbox import counters
+        from .models import Cluster
+
+        # Register counter fields
+        counters.register(Cluster)
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+import utilities.fields
+from utilities.utils import count_related
+
+
+def populate_counters(apps, schema_editor):
+    """
+    Calculate the number of devices and virtual machines assigned to each cluster.
+    """
+    Cluster = apps.get_model('virtualization', 'Cluster')
+    Device = apps.get_model('dcim', 'Device')
+    VirtualMachine = apps.get_model('virtualization', 'VirtualMachine')
+
+    Cluster.objects.update(
+        _device_count=count_related(Device, 'cluster'),
+        _virtualmachine_count=count_related(VirtualMachine, 'cluster')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('virtualization', '0032_virtualmachine_update_sites'),
+        ('dcim', '0163_counter_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cluster',
+            name='_device_count',
+            field=utilities.fields.CounterCacheField(default=0, to_field='cluster', to_model='dcim.Device'),
+        ),
+        migrations.AddField(
+            model_name='cluster',
+            name='_virtualmachine_count',
+            field=utilities.fields.CounterCacheField(default=0, to_field='cluster', to_model='virtualization.VirtualMachine'),
+        ),
+        migrations.RunPython(
+            code=populate_counters,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
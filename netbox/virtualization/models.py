@@ -9,7 +9,7 @@ from extras.models import ConfigContextModel
 from extras.querysets import ConfigContextModelQuerySet
 from netbox.config import get_config
 from netbox.models import OrganizationalModel, NetBoxModel
-from utilities.fields import NaturalOrderingField
+from utilities.fields import CounterCacheField, NaturalOrderingField
 from utilities.ordering import naturalize_interface
 from utilities.query_functions import CollateAsChar
 from .choices import *
@@ -153,6 +153,16 @@ class Cluster(NetBoxModel):
         to='tenancy.ContactAssignment'
     )
 
+    # Cached counts
+    _device_count = CounterCacheField(
+        to_model='dcim.Device',
+        to_field='cluster'
+    )
+    _virtualmachine_count = CounterCacheField(
+        to_model='virtualization.VirtualMachine',
+        to_field='cluster'
+    )
+
     clone_fields = (
         'type', 'group', 'status', 'tenant', 'site',
     )
@@ -1,6 +1,6 @@
 from django.contrib import messages
 from django.db import transaction
-from django.db.models import Prefetch
+from django.db.models import F, Prefetch
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 
@@ -36,8 +36,8 @@ class ClusterTypeView(generic.ObjectView):
         clusters = Cluster.objects.restrict(request.user, 'view').filter(
             type=instance
         ).annotate(
-            device_count=count_related(Device, 'cluster'),
-            vm_count=count_related(VirtualMachine, 'cluster')
+            device_count=F('_device_count'),
+            vm_count=F('_virtualmachine_count')
         )
         clusters_table = tables.ClusterTable(clusters, user=request.user, exclude=('type',))
         clusters_table.configure(request)
@@ -98,8 +98,8 @@ class ClusterGroupView(generic.ObjectView):
         clusters = Cluster.objects.restrict(request.user, 'view').filter(
             group=instance
         ).annotate(
-            device_count=count_related(Device, 'cluster'),
-            vm_count=count_related(VirtualMachine, 'cluster')
+            device_count=F('_device_count'),
+            vm_count=F('_virtualmachine_count')
         )
         clusters_table = tables.ClusterTable(clusters, user=request.user, exclude=('group',))
         clusters_table.configure(request)
@@ -149,8 +149,8 @@ class ClusterGroupBulkDeleteView(generic.BulkDeleteView):
 class ClusterListView(generic.ObjectListView):
     permission_required = 'virtualization.view_cluster'
     queryset = Cluster.objects.annotate(
-        device_count=count_related(Device, 'cluster'),
-        vm_count=count_related(VirtualMachine, 'cluster')
+        device_count=F('_device_count'),
+        vm_count=F('_virtualmachine_count')
     )
     table = tables.ClusterTable
     filterset = filtersets.ClusterFilterSet
@@ -364,7 +364,7 @@ class VirtualMachineInterfacesView(generic.ObjectChildrenView):
 
 
 class VirtualMachineConfigContextView(ObjectConfigContextView):
-    queryset = VirtualMachine.objects.annotate_config_context_data()
+    queryset = VirtualMachine.objects.all()
     base_template = 'virtualization/virtualmachine.html'
 
 
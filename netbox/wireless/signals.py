@@ -52,5 +52,5 @@ def nullify_connected_interfaces(instance, **kwargs):
         Interface.objects.filter(pk=instance.interface_b.pk).update(wireless_link=None)
 
     # Delete and retrace any dependent cable paths
-    for cablepath in CablePath.objects.filter(_nodes__contains=instance):
+    for cablepath in CablePath.objects.traversing(instance):
         cablepath.delete()